@@ -1,33 +1,64 @@
 # api/MaintainQuotesAPI.py - Updated to fix API issues
 
-import requests
-import json
 import logging
+import random
+import threading
 import time
 import traceback
 from datetime import datetime, timedelta
 
+from utils.http_client import get_http_client, HttpClientError
+from utils.instrumentation import record_duration
+from utils.async_logging import LazyJson, truncate
+
+# Status codes worth retrying with backoff (rate limiting and transient server errors)
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
 class MaintainQuotesAPI:
     """Client for interacting with John Deere's Maintain Quotes API."""
     
-    def __init__(self, base_url=None, access_token=None, logger=None):
+    def __init__(self, base_url=None, access_token=None, logger=None, token_provider=None,
+                 backoff_base=0.5, backoff_max=8.0, http_client=None):
         """Initialize the Maintain Quotes API client.
         
         Args:
             base_url: Base URL for the API (defaults to sandbox)
             access_token: OAuth access token (optional, can be set later)
             logger: Logger instance (optional)
+            token_provider: Callable ``provider(force_refresh=False)`` returning a token (optional)
+            backoff_base: First retry delay in seconds, doubled per attempt (default: 0.5)
+            backoff_max: Maximum retry delay in seconds (default: 8.0)
+            http_client: AsyncHttpClient to send requests through (default: shared client)
         """
         self.base_url = base_url or "https://jdquote2-api-sandbox.deere.com/om/cert/maintainquote"
         self.access_token = None  # Initialize as None, set properly with set_access_token
         self.logger = logger or logging.getLogger(__name__)
+        self.token_provider = token_provider
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        
+        # Serializes 401 recovery so concurrent failures share one refresh
+        self._auth_lock = threading.Lock()
+        
+        # Request metrics (see get_metrics)
+        self._metrics_lock = threading.Lock()
+        self.metrics = {
+            "requests": 0,
+            "attempts": 0,
+            "retries": 0,
+            "transient_errors": 0,
+            "auth_refreshes": 0,
+            "auth_failures": 0,
+            "failures": 0
+        }
         
-        # Set up session with default headers
-        self.session = requests.Session()
-        self.session.headers.update({
+        # Requests go through the shared HTTP client; retries stay here so
+        # 401 recovery and backoff are handled in one place
+        self.http = http_client or get_http_client()
+        self.headers = {
             "Accept": "application/json",
             "Content-Type": "application/json"
-        })
+        }
         
         # Set token if provided
         if access_token:
@@ -60,75 +91,168 @@ class MaintainQuotesAPI:
         # Set the token
         self.access_token = access_token
         
-        # Update session headers with token
-        self.session.headers.update({
-            "Authorization": f"Bearer {access_token}"
-        })
         
         self.logger.info("Set new access token for MaintainQuotesAPI")
         self.logger.debug(f"Token starts with: {access_token[:10]}...")
     
+    def set_token_provider(self, token_provider):
+        """Set the callback used to obtain and refresh access tokens.
+        
+        Args:
+            token_provider: Callable ``provider(force_refresh=False)`` returning a token or None
+        """
+        self.token_provider = token_provider
+    
+    def get_metrics(self):
+        """Return a snapshot of the request metrics.
+        
+        Returns:
+            Dictionary of counters (requests, attempts, retries, transient_errors,
+            auth_refreshes, auth_failures, failures)
+        """
+        with self._metrics_lock:
+            return dict(self.metrics)
+    
+    def _count(self, name, amount=1):
+        with self._metrics_lock:
+            self.metrics[name] = self.metrics.get(name, 0) + amount
+    
+    def _backoff_delay(self, attempt, response=None):
+        """Exponential backoff with jitter, honouring Retry-After when present."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(float(retry_after), self.backoff_max)
+                except ValueError:
+                    pass
+        delay = min(self.backoff_base * (2 ** attempt), self.backoff_max)
+        return delay * random.uniform(0.5, 1.0)
+    
+    def _refresh_after_auth_failure(self, failed_token):
+        """Get a fresh token after a 401, sharing one refresh between concurrent callers.
+        
+        Args:
+            failed_token: The token that was rejected
+            
+        Returns:
+            New token string or None if no refresh was possible
+        """
+        if not self.token_provider:
+            return None
+        with self._auth_lock:
+            # Another request already replaced the rejected token while we waited
+            if self.access_token and self.access_token != failed_token:
+                return self.access_token
+            self._count("auth_refreshes")
+            self.logger.info("Access token rejected, requesting a forced refresh")
+            try:
+                token = self.token_provider(force_refresh=True)
+            except Exception as e:
+                self.logger.error(f"Token provider failed during refresh: {str(e)}")
+                return None
+            if token and token != failed_token:
+                self.set_access_token(token)
+                return self.access_token
+            return None
+    
     def _make_request(self, method, endpoint, params=None, data=None, retry_on_auth_error=True, max_retries=2):
+        """Make an API request, timed as ``jd_quotes.<METHOD>`` (retries included).
+        
+        See ``_send_request`` for the retry behaviour and return value.
+        """
+        start = time.perf_counter()
+        result = self._send_request(method, endpoint, params=params, data=data,
+                                    retry_on_auth_error=retry_on_auth_error, max_retries=max_retries)
+        record_duration(f"jd_quotes.{method}", time.perf_counter() - start,
+                        error=result is None or (isinstance(result, dict) and "error" in result))
+        return result
+    
+    def _send_request(self, method, endpoint, params=None, data=None, retry_on_auth_error=True, max_retries=2):
         """Make an API request.
         
+        A 401 triggers one forced token refresh (via the token provider) and a
+        single replay. Connection errors and retryable statuses (429/5xx) are
+        retried up to ``max_retries`` times with exponential backoff.
+        
         Args:
             method: HTTP method (GET, POST, PUT, DELETE)
             endpoint: API endpoint (will be appended to base_url)
             params: Query parameters (optional)
             data: Request body data (optional)
-            retry_on_auth_error: Whether to retry on auth error (default: True)
-            max_retries: Maximum number of retries (default: 2)
+            retry_on_auth_error: Whether to refresh the token and replay on 401 (default: True)
+            max_retries: Maximum number of transient-error retries (default: 2)
             
         Returns:
             API response as dictionary or None if failed
         """
         url = f"{self.base_url}{endpoint}"
         
-        # Check if we have a token
+        if method not in ("GET", "POST", "PUT", "DELETE"):
+            self.logger.error(f"Unsupported HTTP method: {method}")
+            return None
+        
+        # Check if we have a token, asking the provider if one is configured
+        if not self.access_token and self.token_provider:
+            try:
+                token = self.token_provider(force_refresh=False)
+                if token:
+                    self.set_access_token(token)
+            except Exception as e:
+                self.logger.error(f"Token provider failed: {str(e)}")
         if not self.access_token:
             self.logger.error("No access token set. Please set an access token before making requests.")
             return None
         
+        self._count("requests")
         retries = 0
-        while retries <= max_retries:
+        auth_refreshed = False
+        while True:
+            token = self.access_token
+            headers = dict(self.headers, Authorization=f"Bearer {token}")
+            self._count("attempts")
             try:
                 self.logger.debug(f"Making {method} request to {url}")
                 if data:
-                    self.logger.debug(f"Request data: {json.dumps(data)}")
+                    self.logger.debug("Request data: %s", LazyJson(data))
                 
-                if method == "GET":
-                    response = self.session.get(url, params=params, timeout=30)
-                elif method == "POST":
-                    response = self.session.post(url, params=params, json=data, timeout=30)
-                elif method == "PUT":
-                    response = self.session.put(url, params=params, json=data, timeout=30)
-                elif method == "DELETE":
-                    response = self.session.delete(url, params=params, timeout=30)
-                else:
-                    self.logger.error(f"Unsupported HTTP method: {method}")
-                    return None
+                response = self.http.request(method, url, params=params,
+                                             json=data if method in ("POST", "PUT") else None,
+                                             headers=headers, timeout=30, retries=0)
                 
                 # Log response status
                 self.logger.debug(f"Response status: {response.status_code}")
                 
-                # Handle authentication errors
+                # Handle authentication errors: one forced refresh, one replay
                 if response.status_code == 401:
-                    self.logger.error(f"Authentication error: {response.status_code} - {response.text}")
-                    if retry_on_auth_error and retries < max_retries:
-                        retries += 1
-                        self.logger.info(f"Retrying request ({retries}/{max_retries})...")
-                        time.sleep(1)  # Brief delay before retry
-                        continue
-                    else:
-                        return {
-                            "error": "Authentication failed",
-                            "message": response.text,
-                            "status": response.status_code
-                        }
+                    self.logger.error(f"Authentication error: {response.status_code} - {truncate(response.text)}")
+                    if retry_on_auth_error and not auth_refreshed:
+                        auth_refreshed = True
+                        if self._refresh_after_auth_failure(token):
+                            self.logger.info("Replaying request with refreshed token")
+                            continue
+                    self._count("auth_failures")
+                    self._count("failures")
+                    return {
+                        "error": "Authentication failed",
+                        "message": response.text,
+                        "status": response.status_code
+                    }
+                
+                # Back off and retry on rate limiting / transient server errors
+                if response.status_code in RETRYABLE_STATUS_CODES and retries < max_retries:
+                    self._count("transient_errors")
+                    delay = self._backoff_delay(retries, response)
+                    retries += 1
+                    self._count("retries")
+                    self.logger.warning(f"API returned {response.status_code}, retrying in {delay:.1f}s ({retries}/{max_retries})...")
+                    time.sleep(delay)
+                    continue
                 
                 # Handle non-200 responses
                 if response.status_code != 200:
-                    self.logger.error(f"API error: {response.status_code} - {response.text}")
+                    self.logger.error(f"API error: {response.status_code} - {truncate(response.text)}")
+                    self._count("failures")
                     return {
                         "error": f"API returned status {response.status_code}",
                         "message": response.text,
@@ -138,25 +262,30 @@ class MaintainQuotesAPI:
                 # Parse JSON response
                 try:
                     response_json = response.json()
-                    self.logger.debug(f"Response JSON: {json.dumps(response_json)[:500]}...")
+                    self.logger.debug("Response JSON: %s", LazyJson(response_json, limit=500))
                     return response_json
                 except ValueError:
                     self.logger.error("Failed to parse JSON response")
-                    self.logger.debug(f"Raw response: {response.text[:500]}...")
+                    self.logger.debug("Raw response: %s", truncate(response.text, 500))
+                    self._count("failures")
                     return {
                         "error": "Invalid JSON response",
                         "message": response.text[:500],
                         "status": response.status_code
                     }
                     
-            except requests.exceptions.RequestException as e:
+            except HttpClientError as e:
                 self.logger.error(f"Request error: {str(e)}")
+                self._count("transient_errors")
                 if retries < max_retries:
+                    delay = self._backoff_delay(retries)
                     retries += 1
-                    self.logger.info(f"Retrying request ({retries}/{max_retries})...")
-                    time.sleep(1)  # Brief delay before retry
+                    self._count("retries")
+                    self.logger.info(f"Retrying request in {delay:.1f}s ({retries}/{max_retries})...")
+                    time.sleep(delay)
                     continue
                 else:
+                    self._count("failures")
                     return {
                         "error": "Request failed",
                         "message": str(e)
@@ -164,13 +293,11 @@ class MaintainQuotesAPI:
             except Exception as e:
                 self.logger.error(f"Unexpected error in API request: {str(e)}")
                 self.logger.error(traceback.format_exc())
+                self._count("failures")
                 return {
                     "error": "Unexpected error",
                     "message": str(e)
                 }
-        
-        # This should not be reached if the loop exits normally
-        return None
     
     def ping(self):
         """Test the API connection.
@@ -234,6 +361,25 @@ class MaintainQuotesAPI:
         self.logger.info(f"Getting quotes for {dealer_racf_id} from {start_date} to {end_date}")
         response = self._make_request("POST", endpoint, data=data)
         
+        if response and isinstance(response, dict) and response.get('type') == 'SUCCESS' and 'body' in response:
+            return response['body']
+        
+        return response
+    
+    def get_quote_details(self, quote_id):
+        """Get the full details of a single quote.
+        
+        Args:
+            quote_id: Quote ID
+            
+        Returns:
+            Quote details dictionary, error dictionary, or None if failed
+        """
+        endpoint = f"/api/v1/quotes/{quote_id}/maintain-quote-details"
+        
+        self.logger.info(f"Getting details for quote {quote_id}")
+        response = self._make_request("GET", endpoint)
+        
         if response and isinstance(response, dict) and response.get('type') == 'SUCCESS' and 'body' in response:
             return response['body']
         
@@ -4,13 +4,24 @@ import logging
 import os
 import json
 import time
+import threading
 import traceback
 from datetime import datetime, timedelta
 
+try:
+    from api.QuoteStore import QuoteStore, QuoteDetailCache, API_DATE_FORMAT
+except ImportError:
+    QuoteStore = None
+    QuoteDetailCache = None
+    API_DATE_FORMAT = "%m/%d/%Y"
+
+# Days of history requested on the first (full) sync of an empty store
+DEFAULT_BACKFILL_DAYS = 365
+
 class QuoteIntegration:
     """Integration with John Deere Quotes API."""
     
-    def __init__(self, quotes_api=None, sharepoint_manager=None, logger=None, config=None):
+    def __init__(self, quotes_api=None, sharepoint_manager=None, logger=None, config=None, token_broker=None):
         """Initialize the quote integration.
         
         Args:
@@ -18,11 +29,13 @@ class QuoteIntegration:
             sharepoint_manager: SharePoint manager instance
             logger: Logger instance
             config: Configuration instance
+            token_broker: Shared TokenBroker for the JD token (optional)
         """
         self.api = quotes_api
         self.sharepoint_manager = sharepoint_manager
         self.logger = logger or logging.getLogger(__name__)
         self.config = config
+        self.token_broker = token_broker
         
         # Default dealer ID from environment or hardcode for testing
         # Based on API docs, dealer ID format should be like "X731804"
@@ -33,8 +46,25 @@ class QuoteIntegration:
             
         self.dealer_account_no = os.getenv('DEALER_NUMBER', '731804')
         
-        # Try to load token if we have the API but no token
-        if self.api and (not hasattr(self.api, 'access_token') or not self.api.access_token) and config:
+        # Local quote stores, one per dealer RACF ID
+        self._quote_stores = {}
+        
+        # In-memory LRU cache of full quote details
+        self.detail_cache = None
+        if QuoteDetailCache is not None:
+            max_entries, ttl_seconds = 200, 900
+            if config and hasattr(config, 'get'):
+                max_entries = int(config.get('jd_quote_detail_cache_size', max_entries))
+                ttl_seconds = int(config.get('jd_quote_detail_cache_ttl', ttl_seconds))
+            self.detail_cache = QuoteDetailCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        
+        # Quote IDs whose details are being fetched right now, so a prefetch
+        # never requests a quote that another thread is already loading
+        self._details_in_flight = set()
+        self._details_lock = threading.Lock()
+        
+        # Try to load token if we have the API but no token (the broker pushes tokens itself)
+        if self.api and not self.token_broker and (not hasattr(self.api, 'access_token') or not self.api.access_token) and config:
             self._load_cached_token()
             
         self.logger.info(f"QuoteIntegration initialized with dealer: {self.dealer_id}, account: {self.dealer_account_no}")
@@ -75,6 +105,208 @@ class QuoteIntegration:
             self.dealer_id = f"X{self.dealer_id}"
         self.logger.info(f"Dealer ID set to: {self.dealer_id}")
     
+    def _format_dealer_id(self, dealer_racf_id=None):
+        """Return the dealer ID in RACF format (X-prefixed)."""
+        dealer_id = dealer_racf_id if dealer_racf_id is not None else self.dealer_id
+        if not str(dealer_id).startswith('X') and str(dealer_id).isdigit():
+            dealer_id = f"X{dealer_id}"
+        return dealer_id
+    
+    def _get_store_dir(self):
+        """Return the directory used for the local quote store, or None."""
+        if not self.config:
+            return None
+        return getattr(self.config, 'cache_dir', None) or getattr(self.config, 'cache_path', None)
+    
+    def get_quote_store(self, dealer_racf_id=None):
+        """Get the local quote store for a dealer, loading it from disk on first use.
+        
+        Args:
+            dealer_racf_id: Dealer RACF ID (optional, uses self.dealer_id if not provided)
+            
+        Returns:
+            QuoteStore instance or None if the store is unavailable
+        """
+        if QuoteStore is None:
+            return None
+        
+        dealer_id = self._format_dealer_id(dealer_racf_id)
+        store = self._quote_stores.get(dealer_id)
+        if store is None:
+            store_dir = self._get_store_dir()
+            store_path = os.path.join(store_dir, f"jd_quotes_{dealer_id}.json") if store_dir else None
+            if not store_path:
+                self.logger.warning("No cache directory configured, quote store will not be persisted")
+            store = QuoteStore(store_path=store_path, logger=self.logger.getChild("QuoteStore"))
+            self._quote_stores[dealer_id] = store
+        return store
+    
+    def sync_quotes(self, dealer_racf_id=None, force_full=False, backfill_days=None):
+        """Bring the local quote store up to date with the API.
+        
+        The first sync (or a forced one) backfills ``backfill_days`` of
+        history. Later syncs only request quotes modified since the stored
+        watermark. The watermark only advances when the request succeeds.
+        
+        Args:
+            dealer_racf_id: Dealer RACF ID (optional, uses self.dealer_id if not provided)
+            force_full: Ignore the watermark and run a full backfill
+            backfill_days: Days of history for a full backfill (default from config)
+            
+        Returns:
+            Number of quotes received from the API, or None if the sync failed
+        """
+        store = self.get_quote_store(dealer_racf_id)
+        if store is None:
+            self.logger.error("Quote store is not available")
+            return None
+        
+        sync_started = datetime.now()
+        watermark = None if force_full else store.watermark
+        if watermark:
+            # The API filters by calendar day, so re-request the watermark day itself
+            start = watermark
+        else:
+            if backfill_days is None:
+                backfill_days = DEFAULT_BACKFILL_DAYS
+                if self.config and hasattr(self.config, 'get'):
+                    backfill_days = int(self.config.get('jd_quotes_backfill_days', DEFAULT_BACKFILL_DAYS))
+            start = sync_started - timedelta(days=backfill_days)
+        
+        start_date = start.strftime(API_DATE_FORMAT)
+        end_date = sync_started.strftime(API_DATE_FORMAT)
+        self.logger.info(f"Syncing quotes ({'incremental' if watermark else 'full'}) modified {start_date} - {end_date}")
+        
+        quotes = self._fetch_dealer_quotes(dealer_racf_id, start_date, end_date)
+        if quotes is None:
+            self.logger.warning("Quote sync failed, keeping previous watermark")
+            return None
+        
+        if force_full:
+            store.clear()
+            self.invalidate_quote_details()
+        else:
+            # Anything modified since the last sync has stale details
+            for quote in quotes:
+                if isinstance(quote, dict) and quote.get("quoteID") is not None:
+                    self.invalidate_quote_details(quote.get("quoteID"))
+        store.upsert_many(quotes)
+        store.set_watermark(sync_started)
+        store.save()
+        self.logger.info(f"Quote sync received {len(quotes)} quotes, store now holds {len(store)}")
+        return len(quotes)
+    
+    def get_stored_quotes(self, dealer_racf_id=None, start_date=None, end_date=None, status=None, customer=None):
+        """Read quotes from the local store without calling the API.
+        
+        Args:
+            dealer_racf_id: Dealer RACF ID (optional, uses self.dealer_id if not provided)
+            start_date: Start modified date in MM/dd/yyyy format (optional)
+            end_date: End modified date in MM/dd/yyyy format (optional)
+            status: Quote status ID (optional)
+            customer: Customer name (optional)
+            
+        Returns:
+            List of quotes (empty if the store is unavailable)
+        """
+        store = self.get_quote_store(dealer_racf_id)
+        if store is None:
+            return []
+        return store.query(status=status, customer=customer, start_date=start_date, end_date=end_date)
+    
+    def get_quote_details(self, quote_id, dealer_account_no=None, use_cache=True):
+        """Get full details for a quote, using the detail cache when possible.
+        
+        Args:
+            quote_id: Quote ID
+            dealer_account_no: Dealer account number (kept for API compatibility)
+            use_cache: Return cached details if still fresh (default: True)
+            
+        Returns:
+            Quote details dictionary or None if failed
+        """
+        if use_cache and self.detail_cache is not None:
+            details = self.detail_cache.get(quote_id)
+            if details is not None:
+                self.logger.debug(f"Quote details cache hit for {quote_id}")
+                return details
+        
+        if not self.api or not hasattr(self.api, 'get_quote_details'):
+            self.logger.error("API not initialized or does not support quote details")
+            return None
+        
+        if not self.ensure_token():
+            self.logger.error("Failed to get OAuth token")
+            return None
+        
+        with self._details_lock:
+            self._details_in_flight.add(quote_id)
+        try:
+            response = self.api.get_quote_details(quote_id)
+        except Exception as e:
+            self.logger.error(f"Error getting details for quote {quote_id}: {str(e)}")
+            self.logger.error(traceback.format_exc())
+            return None
+        finally:
+            with self._details_lock:
+                self._details_in_flight.discard(quote_id)
+        
+        if not isinstance(response, dict) or 'error' in response:
+            error = response.get('error') if isinstance(response, dict) else "no response"
+            self.logger.error(f"Failed to get details for quote {quote_id}: {error}")
+            return None
+        
+        if self.detail_cache is not None:
+            self.detail_cache.put(quote_id, response)
+        
+        # Make the quote findable by its equipment models
+        store = self.get_quote_store()
+        if store is not None and response.get("equipmentData"):
+            store.index_equipment(quote_id, response.get("equipmentData"))
+        return response
+    
+    def prefetch_quote_details(self, quote_ids, dealer_account_no=None, cancel_token=None):
+        """Fetch and cache details for quotes that are not cached or being fetched yet.
+        
+        Intended to run in a background thread for the rows currently on screen.
+        
+        Args:
+            quote_ids: Iterable of quote IDs
+            dealer_account_no: Dealer account number (kept for API compatibility)
+            cancel_token: CancelToken checked before each quote (optional)
+            
+        Returns:
+            Number of quotes whose details were fetched
+        """
+        # Never prompt for a token from a background prefetch
+        if not self.api or not getattr(self.api, 'access_token', None):
+            return 0
+        
+        fetched = 0
+        for quote_id in quote_ids:
+            if cancel_token is not None and cancel_token.cancelled:
+                self.logger.debug(f"Quote detail prefetch cancelled after {fetched} quotes")
+                break
+            if self.detail_cache is not None and quote_id in self.detail_cache:
+                continue
+            with self._details_lock:
+                if quote_id in self._details_in_flight:
+                    continue
+            if self.get_quote_details(quote_id, dealer_account_no=dealer_account_no) is not None:
+                fetched += 1
+        if fetched:
+            self.logger.debug(f"Prefetched details for {fetched} quotes")
+        return fetched
+    
+    def invalidate_quote_details(self, quote_id=None):
+        """Drop cached details after a quote is edited or deleted.
+        
+        Args:
+            quote_id: Quote ID, or None to clear the whole detail cache
+        """
+        if self.detail_cache is not None:
+            self.detail_cache.invalidate(quote_id)
+    
     def ensure_token(self):
         """Ensure we have a valid token, prompting for one if needed."""
         # Check if token exists
@@ -83,6 +315,12 @@ class QuoteIntegration:
         if self.api and hasattr(self.api, 'access_token') and self.api.access_token:
             # Assume token is valid initially - we'll verify on first use
             token_valid = True
+        elif self.token_broker:
+            # Wait for the broker's in-flight refresh rather than prompting
+            token = self.token_broker.get_token()
+            if token and self.api:
+                self.api.set_access_token(token)
+                token_valid = bool(self.api.access_token)
             
         if not token_valid:
             # No API, no token, or invalid token - we need to get a new one
@@ -143,16 +381,30 @@ class QuoteIntegration:
         Returns:
             List of quotes or empty list if failed
         """
+        return self._fetch_dealer_quotes(dealer_racf_id, start_date, end_date, quote_id) or []
+    
+    def _fetch_dealer_quotes(self, dealer_racf_id=None, start_date=None, end_date=None, quote_id=None):
+        """Fetch quotes from the API, distinguishing failure from an empty result.
+        
+        Args:
+            dealer_racf_id: Dealer RACF ID (optional, uses self.dealer_id if not provided)
+            start_date: Start modified date in MM/dd/yyyy format
+            end_date: End modified date in MM/dd/yyyy format
+            quote_id: Optional quote ID to filter
+            
+        Returns:
+            List of quotes (possibly empty) or None if the request failed
+        """
         if not self.api:
             if hasattr(self, 'logger'):
                 self.logger.error("API not initialized")
-            return []
+            return None
         
         # Ensure we have a token
         if not self.ensure_token():
             if hasattr(self, 'logger'):
                 self.logger.error("Failed to get OAuth token")
-            return []
+            return None
         
         # Use provided dealer_racf_id or fall back to the default one
         dealer_id = dealer_racf_id if dealer_racf_id is not None else self.dealer_id
@@ -175,11 +427,11 @@ class QuoteIntegration:
                 self.logger.info(f"Raw API response type: {type(response)}")
                 if response is None:
                     self.logger.error("API returned None response")
-                    return []
+                    return None
                 elif isinstance(response, dict):
                     if 'error' in response:
                         self.logger.error(f"API error: {response['error']}")
-                        return []
+                        return None
                     
                     # Most likely format: {'type': 'SUCCESS', 'body': [...]}
                     if 'type' in response and 'body' in response:
@@ -191,10 +443,10 @@ class QuoteIntegration:
                             # Try to handle body as list even if not 'SUCCESS'
                             if isinstance(response['body'], list):
                                 return response['body']
-                            return []
+                            return None
                     
                     self.logger.error(f"Unexpected response format: missing 'type' or 'body'")
-                    return []
+                    return None
                 elif isinstance(response, list):
                     # Direct list response
                     self.logger.info(f"Got direct list response with {len(response)} quotes")
@@ -217,11 +469,11 @@ class QuoteIntegration:
                 # Direct list response
                 return response
             
-            # If all else fails, return empty list
-            return []
+            # If all else fails, treat as a failed request
+            return None
             
         except Exception as e:
             if hasattr(self, 'logger'):
                 self.logger.error(f"Error getting dealer quotes: {str(e)}")
                 self.logger.error(traceback.format_exc())
-            return []
\ No newline at end of file
+            return None
\ No newline at end of file
@@ -0,0 +1,569 @@
+# api/QuoteStore.py - Persistent local store for John Deere quotes
+
+import os
+import re
+import json
+import logging
+import time
+import threading
+from collections import OrderedDict
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+
+# Date format used by the Maintain Quotes API for all quote dates
+API_DATE_FORMAT = "%m/%d/%Y"
+
+# Fields checked (in order) when deciding a quote's "modified" date
+MODIFIED_DATE_FIELDS = ("lastModifiedDate", "modifiedDate", "lastModifiedDt", "creationDate")
+
+# Date fields that get a sorted index for range queries
+INDEXED_DATE_FIELDS = ("creationDate", "expirationDate", "modified")
+
+
+def parse_quote_date(value):
+    """Parse a quote date value into a datetime.
+
+    Args:
+        value: Date string (MM/dd/yyyy or ISO format) or datetime
+
+    Returns:
+        datetime or None if the value cannot be parsed
+    """
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    value = str(value).strip()
+    for fmt in (API_DATE_FORMAT, "%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%S.%f"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def get_customer_name(quote):
+    """Build the display customer name for a quote.
+
+    Args:
+        quote: Quote dictionary
+
+    Returns:
+        Customer name string (may be empty)
+    """
+    customer_data = quote.get("customerData") or {}
+    return f"{customer_data.get('customerFirstName', '')} {customer_data.get('customerLastName', '')}".strip()
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    """Split text into lowercase alphanumeric search tokens."""
+    return _TOKEN_RE.findall(str(text or "").lower())
+
+
+class QuoteSearchIndex:
+    """Inverted token index over quotes supporting prefix and multi-term queries.
+
+    Every token maps to the quotes containing it with a per-field weight.
+    Tokens are also kept in a sorted list so a prefix lookup is a bisect
+    followed by a short scan. Multi-term queries match quotes containing
+    every term and rank them by summed field weight, with exact token
+    matches scoring above prefix matches.
+    """
+
+    FIELD_WEIGHTS = {"id": 4.0, "name": 3.0, "customer": 3.0, "equipment": 2.0}
+
+    def __init__(self):
+        self._postings = {}    # token -> {quote_id: (weight, field)}
+        self._tokens = []      # sorted list of all tokens
+        self._doc_tokens = {}  # quote_id -> set(tokens)
+
+    def __len__(self):
+        return len(self._doc_tokens)
+
+    def clear(self):
+        """Remove everything from the index."""
+        self._postings = {}
+        self._tokens = []
+        self._doc_tokens = {}
+
+    def add(self, quote_id, field, text):
+        """Index the tokens of one field of a quote.
+
+        Args:
+            quote_id: Quote ID (string)
+            field: Field name, a key of FIELD_WEIGHTS
+            text: Field text
+        """
+        weight = self.FIELD_WEIGHTS.get(field, 1.0)
+        doc_tokens = self._doc_tokens.setdefault(quote_id, set())
+        for token in tokenize(text):
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                insort(self._tokens, token)
+            current = postings.get(quote_id)
+            if current is None or current[0] < weight:
+                postings[quote_id] = (weight, field)
+            doc_tokens.add(token)
+
+    def remove(self, quote_id):
+        """Remove a quote from the index.
+
+        Args:
+            quote_id: Quote ID (string)
+        """
+        for token in self._doc_tokens.pop(quote_id, ()):
+            postings = self._postings.get(token)
+            if not postings:
+                continue
+            postings.pop(quote_id, None)
+            if not postings:
+                del self._postings[token]
+                pos = bisect_left(self._tokens, token)
+                if pos < len(self._tokens) and self._tokens[pos] == token:
+                    del self._tokens[pos]
+
+    def search(self, query, limit=None):
+        """Run a ranked prefix query.
+
+        Args:
+            query: Query text; every term must match (as a token prefix)
+            limit: Maximum number of results (optional)
+
+        Returns:
+            List of (quote_id, score, best_field) sorted by descending score
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        # Resolve each term to its matching tokens, then start from the most
+        # selective term so later terms only score surviving candidates
+        term_tokens = []
+        for term in set(terms):
+            lo = bisect_left(self._tokens, term)
+            hi = lo
+            while hi < len(self._tokens) and self._tokens[hi].startswith(term):
+                hi += 1
+            if lo == hi:
+                return []
+            tokens = self._tokens[lo:hi]
+            size = sum(len(self._postings[token]) for token in tokens)
+            term_tokens.append((size, term, tokens))
+        term_tokens.sort()
+
+        combined = None
+        for _, term, tokens in term_tokens:
+            term_hits = {}
+            for token in tokens:
+                # Exact matches score full weight plus a bonus; prefixes by coverage
+                factor = 1.5 if token == term else len(term) / len(token)
+                for quote_id, (weight, field) in self._postings[token].items():
+                    if combined is not None and quote_id not in combined:
+                        continue
+                    score = weight * factor
+                    if quote_id not in term_hits or term_hits[quote_id][0] < score:
+                        term_hits[quote_id] = (score, field)
+
+            if combined is None:
+                combined = term_hits
+            else:
+                combined = {
+                    quote_id: (combined[quote_id][0] + hit[0],
+                               combined[quote_id][1] if combined[quote_id][0] >= hit[0] else hit[1])
+                    for quote_id, hit in term_hits.items()
+                }
+            if not combined:
+                return []
+
+        results = sorted(((quote_id, score, field) for quote_id, (score, field) in combined.items()),
+                         key=lambda r: (-r[1], r[0]))
+        return results[:limit] if limit else results
+
+
+class QuoteStore:
+    """Local quote store indexed by quote ID, status, customer and dates.
+
+    Quotes are kept in memory and persisted to a JSON file so that opening
+    the quotes module and searching never need a network round trip. The
+    store also records a sync watermark (the time the last successful sync
+    started) so refreshes only request quotes modified since then.
+    """
+
+    def __init__(self, store_path=None, logger=None):
+        """Initialize the quote store.
+
+        Args:
+            store_path: Path of the JSON file backing the store (None = memory only)
+            logger: Logger instance (optional)
+        """
+        self.store_path = store_path
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.RLock()
+
+        self._quotes = {}           # quote_id -> quote dict
+        self._by_status = {}        # status_id -> set(quote_id)
+        self._by_customer = {}      # lowercase customer name -> set(quote_id)
+        self._by_date = {field: [] for field in INDEXED_DATE_FIELDS}  # field -> sorted [(ordinal, quote_id)]
+        self._search_index = QuoteSearchIndex()
+        self._watermark = None      # datetime of last successful sync start
+
+        if self.store_path:
+            self.load()
+
+    # --- Persistence ---
+
+    def load(self):
+        """Load quotes and the sync watermark from disk.
+
+        Returns:
+            True if the store file was loaded, False otherwise
+        """
+        if not self.store_path or not os.path.exists(self.store_path):
+            return False
+
+        try:
+            with open(self.store_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            self.logger.error(f"Failed to load quote store {self.store_path}: {e}")
+            return False
+
+        with self._lock:
+            self._clear_indexes()
+            for quote in data.get("quotes", []):
+                self._add(quote)
+            watermark = data.get("watermark")
+            self._watermark = datetime.fromisoformat(watermark) if watermark else None
+
+        self.logger.info(f"Loaded {len(self._quotes)} quotes from local store (watermark: {self._watermark})")
+        return True
+
+    def save(self):
+        """Persist the store to disk atomically.
+
+        Returns:
+            True if saved, False otherwise
+        """
+        if not self.store_path:
+            return False
+
+        with self._lock:
+            data = {
+                "watermark": self._watermark.isoformat() if self._watermark else None,
+                "quotes": list(self._quotes.values()),
+            }
+
+        tmp_path = f"{self.store_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.store_path) or ".", exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.store_path)
+            self.logger.debug(f"Saved {len(data['quotes'])} quotes to {self.store_path}")
+            return True
+        except OSError as e:
+            self.logger.error(f"Failed to save quote store {self.store_path}: {e}")
+            return False
+
+    # --- Watermark ---
+
+    @property
+    def watermark(self):
+        """Datetime the last successful sync started, or None before the first backfill."""
+        with self._lock:
+            return self._watermark
+
+    def set_watermark(self, value):
+        """Set the sync watermark.
+
+        Args:
+            value: datetime or None to force a full backfill on next sync
+        """
+        with self._lock:
+            self._watermark = value
+
+    # --- Mutation ---
+
+    def upsert_many(self, quotes):
+        """Insert or replace quotes, updating all indexes.
+
+        Args:
+            quotes: Iterable of quote dictionaries
+
+        Returns:
+            Number of quotes stored
+        """
+        count = 0
+        with self._lock:
+            for quote in quotes or []:
+                if not isinstance(quote, dict) or quote.get("quoteID") is None:
+                    continue
+                self._remove(self._key(quote.get("quoteID")))
+                self._add(quote)
+                count += 1
+        return count
+
+    def remove(self, quote_id):
+        """Remove a quote from the store.
+
+        Args:
+            quote_id: Quote ID
+
+        Returns:
+            True if the quote was present
+        """
+        with self._lock:
+            return self._remove(self._key(quote_id))
+
+    def clear(self):
+        """Remove all quotes and reset the watermark."""
+        with self._lock:
+            self._clear_indexes()
+            self._watermark = None
+
+    # --- Queries ---
+
+    def __len__(self):
+        return len(self._quotes)
+
+    def get(self, quote_id):
+        """Get a quote by ID.
+
+        Args:
+            quote_id: Quote ID
+
+        Returns:
+            Quote dictionary or None
+        """
+        with self._lock:
+            return self._quotes.get(self._key(quote_id))
+
+    def all(self):
+        """Return all stored quotes."""
+        with self._lock:
+            return list(self._quotes.values())
+
+    def query(self, status=None, customer=None, start_date=None, end_date=None, date_field="modified"):
+        """Query quotes using the indexes.
+
+        Args:
+            status: Quote status ID to match (optional)
+            customer: Exact customer name to match, case-insensitive (optional)
+            start_date: Inclusive lower bound (datetime or MM/dd/yyyy string, optional)
+            end_date: Inclusive upper bound (datetime or MM/dd/yyyy string, optional)
+            date_field: One of INDEXED_DATE_FIELDS (default: "modified")
+
+        Returns:
+            List of matching quotes, newest first by date_field
+        """
+        with self._lock:
+            candidates = None
+
+            if status is not None:
+                candidates = set(self._by_status.get(status, ()))
+            if customer:
+                ids = self._by_customer.get(customer.strip().lower(), set())
+                candidates = ids.copy() if candidates is None else candidates & ids
+
+            if start_date or end_date:
+                index = self._by_date.get(date_field)
+                if index is None:
+                    raise ValueError(f"Unknown date field: {date_field}")
+                start = parse_quote_date(start_date)
+                end = parse_quote_date(end_date)
+                lo = bisect_left(index, (start.toordinal(),)) if start else 0
+                hi = bisect_right(index, (end.toordinal(), chr(0x10FFFF))) if end else len(index)
+                ids = {quote_id for _, quote_id in index[lo:hi]}
+                candidates = ids if candidates is None else candidates & ids
+
+            if candidates is None:
+                candidates = self._quotes.keys()
+
+            results = [self._quotes[quote_id] for quote_id in candidates if quote_id in self._quotes]
+
+        results.sort(key=lambda q: self._ordinal(q, date_field), reverse=True)
+        return results
+
+    def search(self, search_text, limit=None):
+        """Ranked token search over quote ID, name, customer and equipment models.
+
+        Each word in the text is matched as a token prefix and every word
+        must match, e.g. "smi 8r" finds Smith's quote for an 8R tractor.
+
+        Args:
+            search_text: Text to search for (case-insensitive)
+            limit: Maximum number of results (optional)
+
+        Returns:
+            List of (quote, matched_field, score) tuples, best first, where
+            matched_field is "id", "name", "customer" or "equipment"
+        """
+        with self._lock:
+            hits = self._search_index.search(search_text, limit=limit)
+            return [(self._quotes[quote_id], field, score) for quote_id, score, field in hits
+                    if quote_id in self._quotes]
+
+    def index_equipment(self, quote_id, equipment_data):
+        """Add equipment model names to the search index for a stored quote.
+
+        Quote summaries usually lack equipment, so this is called once full
+        details have been fetched.
+
+        Args:
+            quote_id: Quote ID
+            equipment_data: List of equipment dictionaries
+        """
+        key = self._key(quote_id)
+        with self._lock:
+            if key not in self._quotes:
+                return
+            for equipment in equipment_data or []:
+                self._index_equipment_item(key, equipment)
+
+    # --- Internal helpers ---
+
+    @staticmethod
+    def _key(quote_id):
+        return str(quote_id)
+
+    @staticmethod
+    def _date_value(quote, field):
+        if field == "modified":
+            for name in MODIFIED_DATE_FIELDS:
+                if quote.get(name):
+                    return quote.get(name)
+            return None
+        return quote.get(field)
+
+    def _ordinal(self, quote, field):
+        parsed = parse_quote_date(self._date_value(quote, field))
+        return parsed.toordinal() if parsed else 0
+
+    def _clear_indexes(self):
+        self._quotes = {}
+        self._by_status = {}
+        self._by_customer = {}
+        self._by_date = {field: [] for field in INDEXED_DATE_FIELDS}
+        self._search_index.clear()
+
+    def _index_equipment_item(self, quote_id, equipment):
+        if not isinstance(equipment, dict):
+            return
+        for name in ("modelID", "dealerSpecifiedModel", "modelName"):
+            if equipment.get(name):
+                self._search_index.add(quote_id, "equipment", equipment.get(name))
+
+    def _add(self, quote):
+        quote_id = self._key(quote.get("quoteID"))
+        self._quotes[quote_id] = quote
+        self._by_status.setdefault(quote.get("quoteStatusId"), set()).add(quote_id)
+        self._by_customer.setdefault(get_customer_name(quote).lower(), set()).add(quote_id)
+        for field in INDEXED_DATE_FIELDS:
+            parsed = parse_quote_date(self._date_value(quote, field))
+            if parsed:
+                insort(self._by_date[field], (parsed.toordinal(), quote_id))
+
+        self._search_index.add(quote_id, "id", quote_id)
+        self._search_index.add(quote_id, "name", quote.get("quoteName", ""))
+        self._search_index.add(quote_id, "customer", get_customer_name(quote))
+        for equipment in quote.get("equipmentData") or []:
+            self._index_equipment_item(quote_id, equipment)
+
+    def _remove(self, quote_id):
+        quote = self._quotes.pop(quote_id, None)
+        if quote is None:
+            return False
+
+        self._search_index.remove(quote_id)
+        status_ids = self._by_status.get(quote.get("quoteStatusId"))
+        if status_ids:
+            status_ids.discard(quote_id)
+        customer_ids = self._by_customer.get(get_customer_name(quote).lower())
+        if customer_ids:
+            customer_ids.discard(quote_id)
+        for field in INDEXED_DATE_FIELDS:
+            parsed = parse_quote_date(self._date_value(quote, field))
+            if parsed:
+                index = self._by_date[field]
+                pos = bisect_left(index, (parsed.toordinal(), quote_id))
+                if pos < len(index) and index[pos] == (parsed.toordinal(), quote_id):
+                    del index[pos]
+        return True
+
+
+class QuoteDetailCache:
+    """Thread-safe LRU cache for quote details with a time-to-live.
+
+    Quote details are much larger than the summaries in QuoteStore and are
+    only needed when a quote is opened, so they are kept in memory only and
+    evicted least-recently-used once ``max_entries`` is reached.
+    """
+
+    def __init__(self, max_entries=200, ttl_seconds=900):
+        """Initialize the detail cache.
+
+        Args:
+            max_entries: Maximum number of quotes kept (default: 200)
+            ttl_seconds: Seconds before an entry is considered stale (default: 900)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # quote_id -> (stored_at, details)
+        self._lock = threading.Lock()
+
+    def get(self, quote_id):
+        """Get cached details for a quote.
+
+        Args:
+            quote_id: Quote ID
+
+        Returns:
+            Details dictionary or None if missing or expired
+        """
+        key = str(quote_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, details = entry
+            if self.ttl_seconds is not None and time.time() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return details
+
+    def __contains__(self, quote_id):
+        return self.get(quote_id) is not None
+
+    def put(self, quote_id, details):
+        """Store details for a quote, evicting the least recently used entry if full.
+
+        Args:
+            quote_id: Quote ID
+            details: Details dictionary
+        """
+        key = str(quote_id)
+        with self._lock:
+            self._entries[key] = (time.time(), details)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, quote_id=None):
+        """Drop cached details.
+
+        Args:
+            quote_id: Quote ID to drop, or None to clear everything
+        """
+        with self._lock:
+            if quote_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(quote_id), None)
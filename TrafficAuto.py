@@ -8,6 +8,8 @@ import os
 import logging
 from logging.handlers import RotatingFileHandler # Added
 from utils.config import Config # Added - Assuming config.py is accessible
+from utils.screen_automation import ScreenAutomation
+from utils.constants import TRAFFIC_TEMPLATES
 
 # --- Logging Setup ---
 def setup_traffic_logging(log_dir="logs", log_level_str="INFO"):
@@ -47,6 +49,7 @@ try:
     tasks_csv_file = config.get('traffic_csv_path', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'traffic_tasks.csv'))
     log_dir_config = config.get('log_dir', 'logs')
     log_level_config = config.get('log_level', 'INFO')
+    region_cache_file = os.path.join(config.cache_dir, "traffic_regions.json") if getattr(config, 'cache_dir', None) else None
 except Exception as e:
     print(f"CRITICAL ERROR: Failed to load configuration. Using defaults. Error: {e}", file=sys.stderr)
     script_dir_fallback = os.path.dirname(os.path.abspath(__file__))
@@ -54,12 +57,14 @@ except Exception as e:
     tasks_csv_file = os.path.join(script_dir_fallback, 'traffic_tasks.csv')
     log_dir_config = "logs"
     log_level_config = "INFO"
+    region_cache_file = None
 
 # --- Initialize Logger ---
 logger = setup_traffic_logging(log_dir=log_dir_config, log_level_str=log_level_config)
 
 # --- Script Settings ---
 pyautogui.PAUSE = config.get('pyautogui_pause', 0.2) # Get pause from config if desired
+automation = None # ScreenAutomation, created in main() once the templates are known to exist
 
 # --- Directory Checks ---
 if not os.path.isdir(images_dir):
@@ -77,63 +82,38 @@ if not os.path.exists(tasks_csv_file):
 def get_image_path(image_name):
     return os.path.join(images_dir, image_name)
 
-def click_element(image_path, description, timeout=10, click=True, conf=0.8, region=None):
-    """Clicks an element identified by an image, with logging."""
-    start_time = time.time()
-    location = None
-    img_file = get_image_path(image_path) # Use helper to get full path
+def click_element(image_path, description, timeout=10, click=True, conf=None):
+    """Waits for an element identified by an image and clicks it, with logging.
 
-    if not os.path.exists(img_file):
-        logger.error(f"Image file not found for '{description}': {img_file}")
-        return None # Cannot proceed without the image file
-
-    logger.debug(f"Attempting to find '{description}' using image: {img_file}")
-    while time.time() - start_time < timeout:
-        try:
-            locate_args = {'confidence': conf}
-            if region:
-                locate_args['region'] = region
-
-            location = pyautogui.locateCenterOnScreen(img_file, **locate_args)
-
-        except pyautogui.ImageNotFoundException:
-             # This is expected if the image isn't there, continue loop
-             logger.log(5, f"ImageNotFoundException for '{description}', retrying...") # Use custom level 5 for trace/spammy debug
-             location = None
-        except Exception as e:
-            # Log unexpected errors during location attempt
-            logger.warning(f"Exception while locating '{description}' ({img_file}): {e}")
-            location = None
-
-        if location:
-            logger.info(f"Found '{description}' at {location}.")
-            if click:
-                try:
-                    pyautogui.click(location)
-                    logger.debug(f"Clicked '{description}' at {location}.")
-                    time.sleep(0.1) # Small pause after click
-                except Exception as e:
-                    logger.error(f"Failed to click '{description}' at {location}: {e}")
-                    return None # Return None if click fails
-            return location # Return location whether clicked or not
-
-        time.sleep(0.5) # Wait before retrying
-
-    logger.warning(f"Timeout: Could not find '{description}' ({img_file}) within {timeout} seconds.")
+    Returns the Match (centre x/y) or None if it did not appear in time.
+    """
+    try:
+        if conf is not None:
+            automation.template(image_path, confidence=conf)
+        if click:
+            return automation.click(image_path, timeout=timeout, description=description)
+        return automation.wait_for(image_path, timeout=timeout, description=description)
+    except TimeoutError:
+        logger.warning(f"Timeout: Could not find '{description}' ({image_path}) within {timeout} seconds.")
+    except Exception as e:
+        logger.error(f"Failed to {'click' if click else 'find'} '{description}': {e}")
     return None
 
-def click_and_type(image_path, text_to_type, description, timeout=10, conf=0.8, region=None):
+def wait_until_gone(image_path, description, timeout=10):
+    """Waits until an element identified by an image is no longer visible."""
+    try:
+        return automation.wait_until_gone(image_path, timeout=timeout, description=description)
+    except TimeoutError:
+        logger.warning(f"Timeout: '{description}' ({image_path}) still visible after {timeout} seconds.")
+        return False
+
+def click_and_type(image_path, text_to_type, description, timeout=10, conf=None):
     """Clicks an element and types text, with logging."""
-    location = click_element(image_path, description, timeout, click=True, conf=conf, region=region)
+    location = click_element(image_path, description, timeout, click=True, conf=conf)
     if location:
         logger.debug(f"Typing '{text_to_type}' into '{description}'.")
         try:
-            # Using pyperclip might be more reliable sometimes
-            # pyperclip.copy(text_to_type)
-            # pyautogui.hotkey('ctrl', 'v')
-            # time.sleep(0.1)
-            pyautogui.typewrite(str(text_to_type), interval=0.05) # Type slowly
-            time.sleep(0.1)
+            automation.type_text(text_to_type)
             return True
         except Exception as e:
             logger.error(f"Failed to type '{text_to_type}' into '{description}': {e}")
@@ -151,13 +131,11 @@ def process_traffic_entry(customer_name, stock_item):
     logger.info("Step 1: Click New Traffic Button")
     if not click_element("new_traffic.png", "New Traffic Button", timeout=15):
         return "Failed: Could not find 'New Traffic' button."
-    time.sleep(0.5)
 
     # Step 2: Click "Customer Lookup"
     logger.info("Step 2: Click Customer Lookup")
     if not click_element("customer_lookup.png", "Customer Lookup Button", timeout=10):
         return "Failed: Could not find 'Customer Lookup' button."
-    time.sleep(0.5)
 
     # Step 3: Enter customer name and click search
     logger.info(f"Step 3: Search for customer '{customer_name}'")
@@ -166,15 +144,14 @@ def process_traffic_entry(customer_name, stock_item):
          # Try typing directly if click_and_type failed based on image
          logger.warning("Could not click Customer Name Field based on image, attempting direct type.")
          try:
-             pyautogui.typewrite(customer_name, interval=0.05)
+             automation.type_text(customer_name)
          except Exception as e:
               logger.error(f"Direct type failed for customer name: {e}")
               return f"Failed: Could not enter customer name '{customer_name}'."
-         time.sleep(0.2) # Pause after typing
 
     if not click_element("search_button.png", "Search Button", timeout=10):
         return "Failed: Could not find 'Search' button."
-    time.sleep(1) # Wait for search results
+    # No fixed wait for the results: the next step waits for the result row to appear
 
     # Step 4: Click the result (assuming first result is correct - risky!)
     logger.info("Step 4: Click Customer Result (assuming first match)")
@@ -191,7 +168,6 @@ def process_traffic_entry(customer_name, stock_item):
          # else: return "Failed: Cannot determine where to click customer result."
          # For now, just log failure if image isn't found
          return "Failed: Could not find or click customer result row."
-    time.sleep(0.5)
 
     # Step 5: Click Save (after CONV01 appears - assumes this is a confirmation)
     logger.info("Step 5: Click Save (after CONV01)")
@@ -202,32 +178,27 @@ def process_traffic_entry(customer_name, stock_item):
 
     if not click_element("save.png", "Save Button (after CONV01)", timeout=10):
         return "Failed: Could not find 'Save' button after entering customer."
-    time.sleep(2) # Wait for save/screen update
 
     # Step 6: Enter stock number
     logger.info(f"Step 6: Enter stock number '{stock_item}'")
     if not click_and_type("stock_number.png", stock_item, "Stock Number Field", timeout=15):
         return f"Failed: Could not enter stock number '{stock_item}'."
-    time.sleep(0.3)
 
     # Step 7: Click Save (after stock number)
     logger.info("Step 7: Click Save (after stock number)")
     if not click_element("save.png", "Save Button (after stock number)", timeout=10):
         return "Failed: Could not find 'Save' button after entering stock number."
-    time.sleep(0.5) # Wait for save
 
     # Step 8: Click Pending dropdown and press 'c' for Comp/Pay
     logger.info("Step 8: Click Pending dropdown and press 'c'")
     if not click_element("pending.png", "Pending Dropdown", timeout=10):
         return "Failed: Could not find 'Pending' dropdown."
-    time.sleep(0.3)
     try:
-        pyautogui.press("c")
+        automation.press("c")
         logger.info("Pressed 'c' for Comp/Pay status.")
     except Exception as e:
          logger.error(f"Failed to press 'c': {e}")
          return "Failed: Could not set status to Comp/Pay."
-    time.sleep(0.3)
 
     # Step 9: Enter 'BRITRK' in Trucker field
     logger.info("Step 9: Enter 'BRITRK' in Trucker field")
@@ -239,7 +210,9 @@ def process_traffic_entry(customer_name, stock_item):
     # Assuming the final save button also uses 'save.png' - might need a different image 'final_save.png'
     if not click_element("save.png", "Final Save Button", timeout=15):
         return "Failed: Could not find final 'Save' button."
-    time.sleep(2) # Wait longer for final save/window close
+    # The entry window closes once the save completes
+    if not wait_until_gone("trucker.png", "Traffic entry window", timeout=15):
+        return "Failed: Traffic entry window did not close after final save."
 
     logger.info(f"--- Successfully processed entry for Customer='{customer_name}', Stock='{stock_item}' ---")
     return "Success"
@@ -270,6 +243,19 @@ def main():
         sys.exit(0)
 
     logger.info(f"Found {len(tasks)} tasks to process.")
+
+    global automation
+    try:
+        automation = ScreenAutomation(images_dir, confidence=config.get('pyautogui_confidence', 0.8),
+                                      scale=float(config.get('automation_template_scale', 0.5)),
+                                      poll_interval=float(config.get('automation_poll_interval', 0.1)),
+                                      settle_delay=float(config.get('automation_settle_delay', 0.15)),
+                                      type_interval=float(config.get('automation_type_interval', 0.02)),
+                                      region_cache_file=region_cache_file, logger=logger)
+        automation.preload(TRAFFIC_TEMPLATES)
+    except (RuntimeError, FileNotFoundError) as e:
+        logger.critical(f"Cannot start screen automation: {e}")
+        sys.exit(1)
     results = []
 
     # Small delay before starting automation
@@ -289,7 +275,10 @@ def main():
         status = process_traffic_entry(customer_name, stock_item)
         results.append({'CustomerName': customer_name, 'StockItem': stock_item, 'Status': status})
         logger.info(f"--- Finished Task {i+1}/{len(tasks)} with status: {status} ---")
-        time.sleep(1) # Pause between entries
+
+    # Learned regions let the next run skip full-screen searches
+    automation.save_region_cache()
+    logger.info(f"Screen automation stats: {automation.get_stats()}")
 
     # --- Output Results ---
     results_csv_file = os.path.join(os.path.dirname(tasks_csv_file), 'traffic_results.csv')
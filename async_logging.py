@@ -0,0 +1,139 @@
+# utils/async_logging.py - Queue-based logging with a background writer thread
+# Standard library only: set up before anything else logs
+import json
+import queue
+import atexit
+import logging
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+
+DEFAULT_MAX_BODY_CHARS = 2000  # Cap for request/response bodies written to the log
+
+_listener = None
+_max_body_chars = DEFAULT_MAX_BODY_CHARS
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line, for machine analysis.
+
+    Fields: ts, level, logger, thread, message, plus exc (formatted traceback)
+    and any ``extra={...}`` attributes passed to the logging call.
+    """
+
+    _STANDARD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in self._STANDARD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _PreparedQueueHandler(QueueHandler):
+    """QueueHandler that keeps the traceback as text so the writer thread only does I/O."""
+
+    def prepare(self, record):
+        # Format the message and traceback on the calling thread (arguments may change
+        # after the call), but leave the final line formatting to each output handler
+        message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record = logging.makeLogRecord(vars(record))
+        record.msg = message
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+def start_queue_logging(handlers, level=logging.INFO):
+    """Route all logging through a queue drained by a background thread.
+
+    The root logger gets a single QueueHandler; ``handlers`` (file, console,
+    JSON lines...) run on the listener thread, so callers never wait on disk
+    or console I/O. Each handler keeps its own level.
+
+    Args:
+        handlers: Output handlers, already configured with formatters and levels
+        level: Root logger level
+
+    Returns:
+        The running QueueListener
+    """
+    global _listener
+    stop_queue_logging()
+    log_queue = queue.SimpleQueue()
+    root_logger = logging.getLogger()
+    root_logger.handlers.clear()
+    root_logger.addHandler(_PreparedQueueHandler(log_queue))
+    root_logger.setLevel(level)
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_queue_logging():
+    """Flush pending records and stop the writer thread (safe to call repeatedly)."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            try:
+                handler.flush()
+                handler.close()
+            except Exception:
+                pass
+
+
+atexit.register(stop_queue_logging)
+
+
+def set_max_body_chars(limit):
+    """Set the default cap used by ``truncate`` and ``LazyJson`` (0 or less disables it)."""
+    global _max_body_chars
+    _max_body_chars = int(limit)
+
+
+def truncate(text, limit=None):
+    """Cut text to ``limit`` characters (default: the configured cap), noting how much was dropped."""
+    text = str(text)
+    if limit is None:
+        limit = _max_body_chars
+    if limit <= 0 or len(text) <= limit:
+        return text
+    return f"{text[:limit]}... [{len(text) - limit} more chars]"
+
+
+class LazyJson:
+    """Log argument that serialises its value only if the record is emitted.
+
+    Use with %-style arguments, e.g.
+    ``logger.debug("Response JSON: %s", LazyJson(data))``, so disabled debug
+    calls cost nothing and enabled ones are capped at ``limit`` characters
+    (default: the configured cap).
+    """
+
+    __slots__ = ('value', 'limit', 'indent')
+
+    def __init__(self, value, limit=None, indent=None):
+        self.value = value
+        self.limit = limit
+        self.indent = indent
+
+    def __str__(self):
+        try:
+            text = json.dumps(self.value, indent=self.indent, default=str)
+        except (TypeError, ValueError):
+            text = repr(self.value)
+        return truncate(text, self.limit)
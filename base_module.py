@@ -1,8 +1,14 @@
 # File: ui/base_module.py
+import time
+
 from PyQt5.QtWidgets import QWidget
 
 class BaseModule(QWidget):
     """Base class for all application modules."""
+
+    # Seconds after which the module's data counts as stale and is refreshed when
+    # the module is shown again; None uses the 'module_stale_after_seconds' setting
+    STALE_AFTER_SECONDS = None
     
     def __init__(self, main_window=None):
         """Initialize the base module.
@@ -12,6 +18,7 @@ class BaseModule(QWidget):
         """
         super().__init__()
         self.main_window = main_window
+        self.last_refreshed = None  # time.monotonic() of the last refresh, None if never
             
     def init_ui(self):
         """Initialize the user interface.
@@ -42,6 +49,21 @@ class BaseModule(QWidget):
         """
         pass
         
+    def mark_refreshed(self):
+        """Record that the module's data was just refreshed."""
+        self.last_refreshed = time.monotonic()
+
+    def is_stale(self, max_age):
+        """Check whether the module's data is older than max_age.
+
+        Args:
+            max_age: Maximum age in seconds
+
+        Returns:
+            bool: True if never refreshed or refreshed more than max_age seconds ago
+        """
+        return self.last_refreshed is None or time.monotonic() - self.last_refreshed >= max_age
+        
     def search(self, search_text):
         """Search for content within this module.
         
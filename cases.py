@@ -0,0 +1,230 @@
+# benchmarks/cases.py - Benchmark cases for the app's data paths
+# Requires a QApplication (created by benchmarks.run_benchmarks on the offscreen platform)
+import os
+import logging
+from types import SimpleNamespace
+
+from benchmarks.synthetic_data import make_data_dir, sheet_rows, quotes, deal_items
+
+SIZE_LABELS = {1_000: "1k", 5_000: "5k", 10_000: "10k", 50_000: "50k", 100_000: "100k", 1_000_000: "1M"}
+
+
+def _label(size):
+    return SIZE_LABELS.get(size, str(size))
+
+
+def _stub_main_window(workdir):
+    """Just enough of MainWindow for modules to find their data and cache directories."""
+    data_dir = os.path.join(workdir, "data")
+    cache_dir = os.path.join(workdir, "cache")
+    os.makedirs(data_dir, exist_ok=True)
+    os.makedirs(cache_dir, exist_ok=True)
+    config = SimpleNamespace(data_dir=data_dir, cache_dir=cache_dir, get=lambda key, default=None: default)
+    return SimpleNamespace(config=config, logger=logging.getLogger("benchmarks"))
+
+
+class SheetFixture:
+    """Stands in for SharePointManager in UI cases: serves prepared sheet rows with no I/O."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def read_excel_sheet(self, sheet_name, use_cache=True):
+        return self.rows
+
+
+# --- CSV loading and completers ---
+
+def run_data_cases(runner, workdir, sizes):
+    """DataLoader CSV parses and completer filtering at each size."""
+    if not runner.wants("csv.") and not runner.wants("completer."):
+        return
+    from modules.deal_form_module import DataLoader
+    from PyQt5.QtCore import Qt, QStringListModel
+    from PyQt5.QtWidgets import QCompleter
+
+    logger = logging.getLogger("benchmarks.DataLoader")
+    for size in sizes:
+        label = _label(size)
+        data_dir = make_data_dir(os.path.join(workdir, f"csv_{label}"), size)
+        loader = DataLoader(data_dir, logger)
+        repeat = 3 if size >= 1_000_000 else None
+
+        runner.measure(f"csv.customers.{label}", lambda: loader.get_customers(force_reload=True),
+                       repeat=repeat, rows=size)
+        runner.measure(f"csv.products.{label}", lambda: loader.get_products(force_reload=True),
+                       repeat=repeat, rows=size)
+        runner.measure(f"csv.parts.{label}", lambda: loader.get_parts(force_reload=True),
+                       repeat=repeat, rows=size)
+
+        # Same completer setup as DealFormModule._update_completers
+        model = QStringListModel(list(loader.get_products().keys()))
+        completer = QCompleter(model)
+        completer.setCaseSensitivity(Qt.CaseInsensitive)
+        completer.setFilterMode(Qt.MatchContains)
+        prefixes = ["t", "com", "baler 00", "9999"]
+
+        def filter_completer():
+            for prefix in prefixes:
+                completer.setCompletionPrefix(prefix)
+                completer.completionCount()
+
+        runner.measure(f"completer.products.{label}", filter_completer, rows=size, prefixes=len(prefixes))
+
+
+# --- Table population ---
+
+def run_table_cases(runner, workdir, sizes):
+    """PriceBookModule.filter_data and UsedInventoryModule population at each sheet size."""
+    from modules.price_book_module import PriceBookModule
+    from modules.used_inventory_module import UsedInventoryModule
+
+    main_window = _stub_main_window(workdir)
+    for size in sizes:
+        label = _label(size)
+        rows = sheet_rows(size)
+
+        if runner.wants(f"table.price_book.{label}") or runner.wants("table.price_book"):
+            price_book = PriceBookModule(main_window=main_window, sharepoint_manager=SheetFixture(rows))
+            price_book.search_input.blockSignals(True)
+
+            def filter_all(module=price_book):
+                module.search_input.setText("")
+                module.filter_data()
+
+            def filter_search(module=price_book):
+                module.search_input.setText("combine")
+                module.filter_data()
+
+            runner.measure(f"table.price_book.all.{label}", filter_all, rows=size)
+            runner.measure(f"table.price_book.search.{label}", filter_search, rows=size)
+            price_book.deleteLater()
+
+        if runner.wants(f"table.used_inventory.{label}") or runner.wants("table.used_inventory"):
+            inventory = UsedInventoryModule(main_window=main_window, sharepoint_manager=SheetFixture(rows))
+            runner.measure(f"table.used_inventory.{label}", inventory.load_inventory_data, rows=size)
+            inventory.deleteLater()
+
+
+# --- Deal form CSV generation ---
+
+def run_deal_form_cases(runner, workdir, deal_sizes):
+    """DealFormModule.generate_csv_lines on large deals (single- and multi-line output)."""
+    if not runner.wants("deal_form."):
+        return
+    from modules.deal_form_module import DealFormModule
+
+    main_window = _stub_main_window(workdir)
+    make_data_dir(main_window.config.data_dir, 1_000)
+    module = DealFormModule(main_window=main_window, sharepoint_manager=None)
+    module.customer_name.setText("Benchmark Customer")
+    module.salesperson.setText("Benchmark Salesperson")
+
+    for equipment, trades, parts in deal_sizes:
+        equipment_items, trade_items, part_items = deal_items(equipment, trades, parts)
+        module.equipment_list.clear()
+        module.trade_list.clear()
+        module.part_list.clear()
+        module.equipment_list.addItems(equipment_items)
+        module.trade_list.addItems(trade_items)
+        module.part_list.addItems(part_items)
+        name = f"deal_form.generate_csv_lines.{equipment}eq_{trades}tr_{parts}pt"
+        for multi_line in (False, True):
+            module.multi_line_csv.setChecked(multi_line)
+            runner.measure(f"{name}.{'multi' if multi_line else 'single'}", module.generate_csv_lines,
+                           equipment=equipment, trades=trades, parts=parts)
+    module.deleteLater()
+
+
+# --- HTTP round trips against the local mock server ---
+
+def run_http_cases(runner, workdir, sheet_sizes, quote_counts, latency=0.0):
+    """SharePointManager and MaintainQuotesAPI round trips against a local mock server."""
+    if not runner.wants("http."):
+        return
+    from benchmarks.mock_http import MockApiServer
+    from modules.sharepoint_manager import SharePointManager
+    from api.MaintainQuotesAPI import MaintainQuotesAPI
+
+    server = MockApiServer(latency=latency).start()
+    try:
+        # Graph calls and the token request go to the mock server, as they would with
+        # graph_base_url/graph_token_url set in config.json
+        overrides = server.config_overrides()
+        config = SimpleNamespace(azure_tenant_id="bench", azure_client_id="bench", azure_client_secret="bench",
+                                 sharepoint_site_id="bench-site", sharepoint_site_name="bench",
+                                 sharepoint_file_path="Shared Documents/bench.xlsx",
+                                 cache_dir=os.path.join(workdir, "sp_cache"),
+                                 get=lambda key, default=None: overrides.get(key, default))
+        manager = SharePointManager(config=config, logger=logging.getLogger("benchmarks.SharePoint"))
+
+        for size in sheet_sizes:
+            label = _label(size)
+            sheet_name = f"Bench{label}"
+            server.set_sheet(sheet_name, sheet_rows(size))
+            runner.measure(f"http.sharepoint.read_worksheet.{label}",
+                           lambda sheet_name=sheet_name: manager.read_worksheet_data(sheet_name), rows=size)
+
+        api = MaintainQuotesAPI(base_url=server.jd_url, logger=logging.getLogger("benchmarks.JDQuotes"))
+        api.set_access_token("benchmark-token")
+        for count in quote_counts:
+            server.set_quotes(quotes(count))
+            runner.measure(f"http.jd_quotes.get_quotes.{_label(count)}",
+                           lambda: api.get_quotes("X000000", "01/01/2025", "12/31/2025"), quotes=count)
+        runner.measure("http.jd_quotes.get_quote_details", lambda: api.get_quote_details("10000001"))
+    finally:
+        server.stop()
+
+
+# --- Screen automation on synthetic screenshots ---
+
+def run_automation_cases(runner, workdir, template_count=10, screen_size=(1920, 1080)):
+    """ScreenAutomation matching on a synthetic screen: per-template full grabs vs one grab vs cached regions."""
+    if not runner.wants("automation."):
+        return
+    try:
+        import numpy as np
+        import cv2
+        from utils.screen_automation import ScreenAutomation
+    except (ImportError, RuntimeError) as e:
+        print(f"  skipping automation cases: {e}")
+        return
+
+    rng = np.random.default_rng(5)
+    width, height = screen_size
+    screen = (rng.random((height, width, 3)) * 40 + 100).astype(np.uint8)
+    images_dir = os.path.join(workdir, "automation_templates")
+    os.makedirs(images_dir, exist_ok=True)
+    names = []
+    for i in range(template_count):
+        # Blocky noise patches stand in for buttons: distinctive, and stable under downscaling
+        patch = cv2.resize((rng.random((12, 30)) * 255).astype(np.uint8), (120, 48), interpolation=cv2.INTER_NEAREST)
+        x, y = int(rng.integers(0, width - 120)), int(rng.integers(0, height - 48))
+        screen[y:y + 48, x:x + 120] = patch[:, :, None]
+        name = f"element_{i}.png"
+        cv2.imencode(".png", patch)[1].tofile(os.path.join(images_dir, name))
+        names.append(name)
+
+    def grab(region=None):
+        if region is None:
+            return screen
+        left, top, w, h = region
+        return screen[top:top + h, left:left + w]
+
+    actions = SimpleNamespace(click=lambda x, y, clicks=1: None, write=lambda text, interval=0: None,
+                              press=lambda key: None)
+    automation = ScreenAutomation(images_dir, grab=grab, actions=actions, settle_delay=0,
+                                  logger=logging.getLogger("benchmarks.Automation"))
+    automation.preload(names)
+
+    def each_full():
+        for name in names:
+            automation.find([name])
+
+    runner.measure(f"automation.find.each_full_grab.{template_count}", each_full,
+                   setup=automation.forget_regions, templates=template_count)
+    runner.measure(f"automation.find.one_grab.{template_count}", lambda: automation.find(names),
+                   setup=automation.forget_regions, templates=template_count)
+    automation.find(names)
+    runner.measure(f"automation.find.cached_region.{template_count}", lambda: [automation.find([n]) for n in names],
+                   templates=template_count)
@@ -13,26 +13,56 @@ class Config:
     # Default configuration
     DEFAULTS = {
         'weather_refresh_interval': 1,  # hours
+        'weather_cache_ttl_seconds': 600,  # per-city weather responses served without refetching
+        'stock_chart_years': 5,  # years of daily closes shown on the dashboard stock chart
         'exchange_refresh_interval': 6,  # hours
         'commodities_refresh_interval': 4,  # hours
         'api_timeout': 15,  # seconds
         'ui_theme': 'light',
         'enable_high_dpi': True,
         'log_level': 'INFO',
+        'log_json_lines': False,  # also write structured records to logs/application.jsonl
+        'log_max_body_chars': 2000,  # cap for request/response bodies in debug logs
         'splash_image': 'splash.png', # Add default splash image name
         'app_icon': 'app_icon.png',   # Add default app icon name
         'app_title': 'BRIDeal', # Add default app title
         'window_width': 1200,
         'window_height': 800,
         'toolbar_icon_size': 24,
+        'module_warmup': 'DealFormModule',  # modules created in idle time after the dashboard is shown (no network-loading modules)
+        'module_warmup_delay_ms': 3000,  # idle delay before the first warm-up
+        'task_shutdown_policy': 'cancel',  # on exit: 'cancel' background tasks or 'drain' them until the timeout
+        'task_shutdown_timeout_ms': 2000,  # how long exit waits for background tasks
+        'module_stale_after_seconds': 300,  # switching to a module refreshes it only if its data is older than this
+        'performance_dump_on_exit': False,  # write recorded timings to logs/performance_<timestamp>.json on exit
+        'jd_quotes_backfill_days': 365,  # days of history fetched on the first quote sync
+        'jd_quote_detail_cache_size': 200,  # quotes whose full details are kept in memory
+        'jd_quote_detail_cache_ttl': 900,  # seconds
+        'jd_oauth_discovery_ttl': 86400,  # seconds the cached JD OIDC discovery document is trusted
+        'http_max_connections': 32,  # requests in flight across all hosts (shared HTTP client)
+        'http_max_per_host': 6,  # requests in flight per host
+        'http_timeout': 30,  # default request timeout, seconds
+        'http_retries': 2,  # retries for idempotent requests on connection errors/429/5xx
+        'graph_base_url': 'https://graph.microsoft.com/v1.0',  # Microsoft Graph root (a mock server for offline testing)
+        'graph_token_url': '',  # if set, Graph tokens come from this client-credentials endpoint instead of MSAL
+        'jd_quotes_base_url': 'https://jdquote2-api-sandbox.deere.com/om/cert/maintainquote',  # JD Maintain Quotes API root
+        'jd_oauth_issuer_url': 'https://signin.johndeere.com/oauth2/aus78tnlaysMraFhC1t7',  # JD OAuth issuer (token + discovery)
         # Add defaults for traffic auto if needed
         # 'traffic_images_dir_name': 'traffic_images', # Example: Subdirectory name in resources
         # 'traffic_csv_filename': 'traffic_tasks.csv', # Example: Filename in data dir
         # 'pyautogui_pause': 0.2,
         # 'pyautogui_timeout': 10,
         # 'pyautogui_confidence': 0.8,
+        'automation_template_scale': 0.5,  # traffic automation matches templates and screen grabs downscaled by this
+        'automation_poll_interval': 0.1,  # seconds between screen polls while waiting for an element
+        'automation_settle_delay': 0.15,  # seconds to let the target app react after each click
+        'automation_type_interval': 0.02,  # seconds between typed characters
     }
 
+    # Endpoint settings overlaid from environment variables of the same name in
+    # uppercase (e.g. GRAPH_BASE_URL), so the app can be pointed at a mock server
+    ENV_OVERRIDE_KEYS = ('graph_base_url', 'graph_token_url', 'jd_quotes_base_url', 'jd_oauth_issuer_url')
+
     def __init__(self, base_path=None):
         """Initialize the configuration manager."""
         # Load environment variables first
@@ -54,6 +84,10 @@ class Config:
         # Try to load from config file (config.json)
         self._load_from_file() # Handles its own errors
 
+        # Endpoint overrides from the environment win over config.json
+        self._env_shadowed = {}  # key -> value the override replaced, restored on save()
+        self._load_from_environment()
+
         # Create derived paths (ensure this runs without error)
         try:
             print("DEBUG: Calling _setup_paths()") # Add this debug print
@@ -94,6 +128,16 @@ class Config:
             print(f"DEBUG: Config file {config_file} not found, using defaults and environment variables.")
 
 
+    def _load_from_environment(self):
+        """Overlay ENV_OVERRIDE_KEYS from environment variables."""
+        for key in self.ENV_OVERRIDE_KEYS:
+            value = os.getenv(key.upper())
+            if value:
+                self._env_shadowed[key] = self.config.get(key)
+                self.config[key] = value
+                print(f"INFO: {key} overridden by environment variable {key.upper()}: {value}")
+
+
     def _setup_paths(self):
         """Setup application paths using consistent _dir suffix."""
         print(f"DEBUG: Setting up paths based on base_path: {self.base_path}")
@@ -280,7 +324,9 @@ class Config:
     def save(self):
         """Save the current configuration dictionary (excluding env vars and defaults not overridden) to config.json."""
         config_file = os.path.join(self.base_path, 'config.json')
-        config_to_save = {k: v for k, v in self.config.items() if k not in self.DEFAULTS or v != self.DEFAULTS[k]}
+        # Environment overrides are not persisted; the values they replaced are
+        config = {**self.config, **self._env_shadowed}
+        config_to_save = {k: v for k, v in config.items() if k not in self.DEFAULTS or v != self.DEFAULTS[k]}
 
         try:
             with open(config_file, 'w') as f:
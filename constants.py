@@ -24,4 +24,9 @@ FILE_SALESMEN = "salesmen.csv"
 
 # UI constants
 UI_SIDEBAR_WIDTH = 200
-UI_STATUSBAR_TIMEOUT = 5000  # ms
\ No newline at end of file
+UI_STATUSBAR_TIMEOUT = 5000  # ms
+
+# Traffic entry template images (resources/traffic_images), shared by
+# ReceivingModule and the standalone TrafficAuto script
+TRAFFIC_TEMPLATES = ("new_traffic.png", "customer_lookup.png", "customer_name_field.png", "search_button.png",
+                     "select_result.png", "conv01.png", "save.png", "stock_number.png", "pending.png", "trucker.png")
\ No newline at end of file
@@ -530,6 +530,8 @@ from PyQt5.QtCore import (Qt, QDate, pyqtSignal, QVariant, QAbstractTableModel,
 from PyQt5.QtGui import (QFont, QPalette, QColor, QIcon, QDoubleValidator, 
                          QPixmap, QClipboard)
 
+from utils.instrumentation import span
+
 # Try importing BaseModule
 try:
     from ui.base_module import BaseModule
@@ -586,7 +588,12 @@ class DataLoader:
         self._salesmen_loaded = False
 
     def _load_csv_generic(self, filename, key_column, value_column=None, is_dict=True):
-        """Load data from a CSV file."""
+        """Load data from a CSV file, timed as ``csv.parse.<filename>``."""
+        with span(f"csv.parse.{filename}"):
+            return self._parse_csv(filename, key_column, value_column, is_dict)
+
+    def _parse_csv(self, filename, key_column, value_column=None, is_dict=True):
+        """Parse a CSV file into a dict or list."""
         data = {} if is_dict else []
         if not self.data_path: 
             self.logger.error(f"{filename}: Data path not set.")
@@ -0,0 +1,135 @@
+# benchmarks/harness.py - Timing, result collection and baseline comparison for the benchmark suite
+import sys
+import json
+import time
+import platform
+import statistics
+from datetime import datetime
+
+
+class BenchmarkRunner:
+    """Runs timed cases and collects their statistics.
+
+    Each case is measured ``repeat`` times after ``warmup`` untimed runs; an
+    optional ``setup`` callable runs before every run outside the timing.
+    Results are keyed by case name and hold milliseconds.
+    """
+
+    def __init__(self, repeat=5, warmup=1, only=None, verbose=True):
+        """Initialize the runner.
+
+        Args:
+            repeat: Timed runs per case
+            warmup: Untimed runs per case before timing
+            only: Substring filter; cases whose name does not contain it are skipped
+            verbose: Print each result as it is measured
+        """
+        self.repeat = repeat
+        self.warmup = warmup
+        self.only = only
+        self.verbose = verbose
+        self.results = {}
+
+    def wants(self, name):
+        """Whether a case (or a group prefix) passes the ``only`` filter."""
+        return not self.only or self.only in name or name in self.only
+
+    def measure(self, name, func, setup=None, repeat=None, warmup=None, **info):
+        """Time ``func`` and record the result under ``name``.
+
+        Args:
+            name: Case name, e.g. "csv.customers.100k"
+            func: Callable to time
+            setup: Callable run before each run, not timed (optional)
+            repeat: Timed runs (default: runner setting)
+            warmup: Untimed runs (default: runner setting)
+            **info: Extra fields stored with the result (e.g. rows=100000)
+
+        Returns:
+            Result dict, or None if the case was filtered out
+        """
+        if not self.wants(name):
+            return None
+        repeat = self.repeat if repeat is None else repeat
+        warmup = self.warmup if warmup is None else warmup
+
+        for _ in range(warmup):
+            if setup:
+                setup()
+            func()
+
+        samples = []
+        for _ in range(repeat):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - start) * 1000.0)
+
+        result = {
+            'median_ms': round(statistics.median(samples), 3),
+            'min_ms': round(min(samples), 3),
+            'mean_ms': round(statistics.mean(samples), 3),
+            'stdev_ms': round(statistics.stdev(samples), 3) if len(samples) > 1 else 0.0,
+            'repeat': repeat,
+        }
+        result.update(info)
+        self.results[name] = result
+        if self.verbose:
+            print(f"  {name:<48} {result['median_ms']:>10.2f} ms  (min {result['min_ms']:.2f})", flush=True)
+        return result
+
+    def report(self, extra=None):
+        """Build the JSON-serialisable report of all results."""
+        report = {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'results': dict(sorted(self.results.items())),
+        }
+        if extra:
+            report.update(extra)
+        return report
+
+
+def load_report(path):
+    """Read a report/baseline file, or return None if it does not exist."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_report(report, path):
+    """Write a report/baseline file."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+
+def compare_to_baseline(results, baseline, tolerance=0.25, min_delta_ms=1.0):
+    """Compare results with a baseline report.
+
+    A case regresses when its median is more than ``tolerance`` (fraction)
+    slower than the baseline median and the difference exceeds
+    ``min_delta_ms`` (so sub-millisecond noise is ignored).
+
+    Args:
+        results: Current results dict (name -> result)
+        baseline: Baseline report (as written by ``write_report``)
+        tolerance: Allowed slowdown as a fraction of the baseline
+        min_delta_ms: Ignore differences smaller than this
+
+    Returns:
+        List of (name, baseline_ms, current_ms, ratio) for regressed cases
+    """
+    regressions = []
+    baseline_results = (baseline or {}).get('results', {})
+    for name, result in sorted(results.items()):
+        reference = baseline_results.get(name)
+        if not reference:
+            continue
+        before, now = reference['median_ms'], result['median_ms']
+        if now - before > min_delta_ms and now > before * (1.0 + tolerance):
+            regressions.append((name, before, now, now / before if before else float('inf')))
+    return regressions
@@ -5,44 +5,24 @@ import time
 import json
 import re  # Added missing import
 import traceback
-import requests
+import threading
+import asyncio
 from datetime import datetime, timedelta
-import pandas as pd
-import numpy as np
-# import finnhub # Keep import for now, client init might still be useful later
-try:
-    import finnhub
-except ImportError:
-    finnhub = None # Define as None if import fails
-    print("WARNING: finnhub library not installed or found.")
-
+# matplotlib/seaborn (ui.matplotlib_canvas) and forex-python are imported where
+# they are used, so importing this module stays cheap at startup
 from dotenv import load_dotenv
-import matplotlib
-matplotlib.use('Qt5Agg')  # Use Qt5 backend for matplotlib
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import matplotlib.pyplot as plt
-import seaborn as sns
-# Use try-except for optional dependencies
-try:
-    from forex_python.converter import CurrencyRates
-except ImportError:
-    CurrencyRates = None
-    print("WARNING: forex-python library not installed or found. Forex conversion will fail.")
-try:
-    from forex_python.bitcoin import BtcConverter
-except ImportError:
-    BtcConverter = None
-    print("WARNING: forex-python library not installed or found. Bitcoin conversion will fail.")
-
 
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox,
                             QPushButton, QGridLayout, QFrame, QGroupBox, QScrollArea,
-                            QSizePolicy, QSpacerItem, QTabWidget, QTableWidget,
+                            QSpacerItem, QTabWidget, QTableWidget,
                             QTableWidgetItem, QHeaderView, QProgressBar, QListWidget)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, pyqtSlot, QTimer, QSize
+from PyQt5.QtCore import Qt, QObject, pyqtSignal, pyqtSlot, QTimer, QSize
 from PyQt5.QtGui import QFont, QColor, QIcon, QPixmap
 
+from utils.http_client import get_http_client, HttpClientError, QtHttpBridge
+from utils.timeseries_store import TimeSeriesStore
+from utils.refresh_scheduler import get_refresh_scheduler
+
 # Import base module
 try:
     from ui.base_module import BaseModule
@@ -57,6 +37,7 @@ except ImportError:
         def get_title(self): return "Dummy Module"
         def get_icon_name(self): return None
         def refresh(self): pass
+        def mark_refreshed(self): pass
         def save_state(self): pass
         def close(self): pass
 
@@ -132,12 +113,110 @@ WEATHER_CITIES = [
     {"name": "Killam", "country_code": "CA", "province": "AB"}
 ]
 
+# Cities may also carry an OpenWeather "id"; those are fetched together through
+# the group endpoint (up to WEATHER_GROUP_SIZE per call) instead of one call each
+WEATHER_GROUP_SIZE = 20
+WEATHER_CACHE_TTL_SECONDS = 600  # OpenWeather updates current conditions about every 10 minutes
+
+# Weather chart comparisons: (response section, field, title, value label format, color method)
+WEATHER_COMPARISONS = {
+    "Temperature (°C)": ('main', 'temp', "Temperature Comparison", '{:.1f}°C', 'get_temp_color'),
+    "Feels Like (°C)": ('main', 'feels_like', "Feels Like Temperature Comparison", '{:.1f}°C', 'get_temp_color'),
+    "Humidity (%)": ('main', 'humidity', "Humidity Comparison", '{:.0f}%', 'get_humidity_color'),
+    "Wind Speed (m/s)": ('wind', 'speed', "Wind Speed Comparison", '{:.1f} m/s', 'get_wind_color'),
+}
+
 # Financial data to track
 STOCK_SYMBOLS = ['DE']  # John Deere
 FOREX_PAIRS = ['USDCAD']  # USD/CAD
 CRYPTO = ['BTC']  # Bitcoin
 
 
+# Seconds each market feed is reused before it is fetched again
+MARKET_FEED_TTLS = {
+    'stock': 15 * 60,
+    'forex': 60 * 60,
+    'crypto': 5 * 60,
+    'commodities': 4 * 60 * 60,
+    'stock_history': 12 * 60 * 60,  # daily closes; new bars appear once a day
+}
+
+# Daily bars requested with outputsize=compact cover about this many days
+ALPHA_VANTAGE_COMPACT_DAYS = 100
+
+# Per-provider request budgets: (requests per second, burst size)
+MARKET_PROVIDER_LIMITS = {
+    'alphavantage': (5 / 60.0, 5),   # free tier: 5 requests per minute
+    'exchangerate': (1.0, 2),
+    'coinbase': (3.0, 3),
+    'agriculture': (0.1, 1),
+}
+
+FALLBACK_USD_CAD_RATE = 1.35
+
+
+class TokenBucket:
+    """Token-bucket rate limiter shared by every request to one provider.
+
+    Callers reserve a token and wait out any deficit, so bursts up to
+    ``capacity`` go out at once and the rest are spaced at ``rate`` per second.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """Take one token and return how long the caller must wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire_async(self):
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def acquire(self):
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+# One bucket per provider for the life of the process
+MARKET_RATE_LIMITERS = {name: TokenBucket(rate, capacity)
+                        for name, (rate, capacity) in MARKET_PROVIDER_LIMITS.items()}
+
+
+class MarketFeedCache:
+    """Last good value of each market feed, reused until the feed's TTL expires."""
+
+    def __init__(self, ttls=None):
+        self.ttls = dict(MARKET_FEED_TTLS, **(ttls or {}))
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, kind, key, allow_stale=False):
+        """Return the cached value for a feed, or None if missing (or expired unless allow_stale)."""
+        with self._lock:
+            entry = self._entries.get((kind, key))
+        if not entry:
+            return None
+        if allow_stale or time.time() - entry[1] < self.ttls.get(kind, 0):
+            return entry[0]
+        return None
+
+    def put(self, kind, key, value):
+        with self._lock:
+            self._entries[(kind, key)] = (value, time.time())
+
+
 class CommodityDataFetcher:
     """Fetches commodity prices from agricultural data APIs"""
 
@@ -154,9 +233,13 @@ class CommodityDataFetcher:
         # Set cache expiration (4 hours) - Note: Caching not implemented here yet
         self.cache_expiration = 4 * 60 * 60  # seconds
 
-    def fetch_commodity_data(self):
+    def fetch_commodity_data(self, usd_cad_rate=None, html_content=None):
         """Fetch current commodity data for wheat and canola.
 
+        Args:
+            usd_cad_rate: USD/CAD rate for converting US-quoted prices (looked up if omitted)
+            html_content: Already downloaded Agriculture.com futures page (downloaded if None)
+
         Returns:
             Dictionary with commodity price information
         """
@@ -185,7 +268,7 @@ class CommodityDataFetcher:
             # Check if either price is missing
             if not canola_data.get('price_cad_bu') or not wheat_data.get('price_cad_bu'):
                 self.logger.info("Attempting to fetch commodity prices from Agriculture.com fallback...")
-                fallback_data = self._fetch_agriculture_com_prices()
+                fallback_data = self._fetch_agriculture_com_prices(usd_cad_rate, html_content)
 
                 # Use fallback data if needed and primary data is empty
                 if not canola_data.get('price_cad_bu') and 'CANOLA' in fallback_data:
@@ -238,23 +321,30 @@ class CommodityDataFetcher:
     # def _fetch_wheat_price(self): return {}
     # --- End Placeholder ---
 
-    def _fetch_agriculture_com_prices(self):
+    AGRICULTURE_COM_URL = "https://www.agriculture.com/markets/futures"
+    AGRICULTURE_COM_HEADERS = { # Set a realistic User-Agent
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    }
+
+    def _fetch_agriculture_com_prices(self, usd_cad_rate=None, html_content=None):
         """Scrape commodity prices from Agriculture.com as a fallback.
 
+        Args:
+            usd_cad_rate: USD/CAD rate for the Wheat conversion (looked up if omitted)
+            html_content: Already downloaded page (downloaded if None)
+
         Returns:
             Dictionary with commodity price information
         """
         # NOTE: Web scraping is fragile and might break if the website structure changes.
         # Using a proper API is always preferred.
         try:
-            url = "https://www.agriculture.com/markets/futures"
-            headers = { # Set a realistic User-Agent
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            }
-            response = requests.get(url, headers=headers, timeout=self.timeout)
-            response.raise_for_status() # Check for HTTP errors (like 404)
+            if html_content is None:
+                response = get_http_client().get(self.AGRICULTURE_COM_URL, headers=self.AGRICULTURE_COM_HEADERS,
+                                                 timeout=self.timeout)
+                response.raise_for_status() # Check for HTTP errors (like 404)
+                html_content = response.text
 
-            html_content = response.text
             commodities = {}
 
             # --- Improved Parsing (Example - needs adjustment based on actual site structure) ---
@@ -269,7 +359,8 @@ class CommodityDataFetcher:
             if wheat_match:
                 try:
                     wheat_price_usd = float(wheat_match.group(1).replace(',', '')) # Handle commas
-                    usd_cad_rate = self._get_usd_cad_rate()
+                    if not usd_cad_rate:
+                        usd_cad_rate = self._get_usd_cad_rate()
                     wheat_price_cad = wheat_price_usd * usd_cad_rate
                     commodities['WHEAT'] = {
                         'price_usd_bu': wheat_price_usd,
@@ -310,7 +401,7 @@ class CommodityDataFetcher:
 
             return commodities
 
-        except requests.exceptions.RequestException as e:
+        except HttpClientError as e:
             self.logger.error(f"Error scraping Agriculture.com: {e}")
             return {}
         except Exception as e: # Catch other potential errors
@@ -319,6 +410,10 @@ class CommodityDataFetcher:
 
     def _get_usd_cad_rate(self):
         """Helper to get USD to CAD rate, with fallback."""
+        try:
+            from forex_python.converter import CurrencyRates
+        except ImportError:
+            CurrencyRates = None
         if CurrencyRates:
             try:
                 c = CurrencyRates()
@@ -331,148 +426,364 @@ class CommodityDataFetcher:
              return 1.35
 
 
-class MatplotlibCanvas(FigureCanvas):
-    """Canvas for Matplotlib figures in Qt"""
-    def __init__(self, figure=None, parent=None, width=5, height=4, dpi=100):
-        if figure is None:
-            figure = Figure(figsize=(width, height), dpi=dpi)
+class WeatherResponseCache:
+    """Per-city OpenWeather responses with ETag and TTL, shared across fetches.
+
+    Fresh entries are served without a request; stale ones are revalidated
+    with If-None-Match, and kept as a fallback if the refetch fails.
+    """
 
-        self.figure = figure
-        self.axes = self.figure.add_subplot(111)
+    def __init__(self, ttl_seconds=WEATHER_CACHE_TTL_SECONDS, cache_file=None, logger=None):
+        """Initialize the cache.
 
-        # Use ggplot style for better aesthetics
+        Args:
+            ttl_seconds: Seconds an entry is served without revalidation
+            cache_file: JSON file the entries are persisted to (optional)
+            logger: Logger instance (optional)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.cache_file = cache_file
+        self.logger = logger or logging.getLogger(__name__).getChild("WeatherCache")
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, city_name):
+        """Return the entry dict (data, etag, fetched_at) for a city, or None."""
+        with self._lock:
+            entry = self._entries.get(city_name)
+            return dict(entry) if entry else None
+
+    def is_fresh(self, entry):
+        return bool(entry) and (time.time() - entry.get('fetched_at', 0)) < self.ttl_seconds
+
+    def put(self, city_name, data, etag=None):
+        with self._lock:
+            self._entries[city_name] = {'data': data, 'etag': etag, 'fetched_at': time.time()}
+
+    def touch(self, city_name):
+        """Mark a city's entry as revalidated (HTTP 304)."""
+        with self._lock:
+            if city_name in self._entries:
+                self._entries[city_name]['fetched_at'] = time.time()
+
+    def load(self):
+        """Load persisted entries (missing or corrupt files are ignored)."""
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return
         try:
-            plt.style.use('ggplot')
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            with self._lock:
+                self._entries = {name: entry for name, entry in entries.items()
+                                 if isinstance(entry, dict) and 'data' in entry}
+            self.logger.debug(f"Loaded {len(self._entries)} cached weather responses.")
         except Exception as e:
-             logger.warning(f"Could not apply 'ggplot' style: {e}")
+            self.logger.warning(f"Ignoring unreadable weather response cache: {e}")
 
-        # Set seaborn style if available
+    def save(self):
+        """Persist entries atomically."""
+        if not self.cache_file:
+            return
+        with self._lock:
+            entries = dict(self._entries)
+        tmp_path = f"{self.cache_file}.tmp"
         try:
-             sns.set_style("whitegrid")
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.cache_file)
         except Exception as e:
-             logger.warning(f"Could not apply seaborn style: {e}")
+            self.logger.error(f"Error saving weather response cache: {e}")
 
 
-        super(MatplotlibCanvas, self).__init__(self.figure)
-        self.setParent(parent)
+class WeatherIconCache(QObject):
+    """Decoded OpenWeather icons keyed by icon code.
 
-        # Make the canvas expandable
-        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self.updateGeometry()
+    Lookups check memory, then icons bundled under ``resources/weather_icons``,
+    then icons saved in the cache directory; only a miss on all three starts a
+    download, which runs on the shared HTTP client and emits ``icon_ready``.
+    """
+    icon_ready = pyqtSignal(str)
 
-    def clear(self):
-        """Clear the figure"""
-        try:
-            self.axes.clear()
-            self.figure.tight_layout() # May raise error if layout is complex
-            self.draw()
-        except Exception as e:
-             logger.error(f"Error clearing Matplotlib canvas: {e}")
+    ICON_URL = "https://openweathermap.org/img/wn/{code}@2x.png"
+
+    def __init__(self, cache_dir=None, resources_dir=None, logger=None, bridge=None, parent=None):
+        """Initialize the icon cache.
 
+        Args:
+            cache_dir: Directory downloaded icons are saved to (optional)
+            resources_dir: Application resources directory holding bundled icons (optional)
+            logger: Logger instance (optional)
+            bridge: QtHttpBridge delivering downloads on the GUI thread (optional; one is created if omitted)
+            parent: Parent QObject (optional)
+        """
+        super().__init__(parent)
+        self.cache_dir = cache_dir
+        self.bundled_dir = os.path.join(resources_dir, 'weather_icons') if resources_dir else None
+        self.logger = logger or logging.getLogger(__name__).getChild("WeatherIcons")
+        self._pixmaps = {}
+        self._pending = set()
+        self._bridge = bridge or (QtHttpBridge(self) if QtHttpBridge else None)
+
+    def get(self, code):
+        """Return the QPixmap for an icon code, or None while it is being fetched.
 
-class WeatherFetcherThread(QThread):
-    """Thread for fetching weather data from OpenWeather API"""
+        Args:
+            code: OpenWeather icon code (e.g. "01d")
+        """
+        pixmap = self._pixmaps.get(code)
+        if pixmap is not None:
+            return pixmap
+        pixmap = self._load_from_disk(code)
+        if pixmap is not None:
+            self._pixmaps[code] = pixmap
+            return pixmap
+        self._fetch(code)
+        return None
+
+    def _icon_filename(self, code):
+        return f"{code}@2x.png"
+
+    def _load_from_disk(self, code):
+        for directory in (self.bundled_dir, self.cache_dir):
+            if not directory:
+                continue
+            path = os.path.join(directory, self._icon_filename(code))
+            if os.path.exists(path):
+                pixmap = QPixmap(path)
+                if not pixmap.isNull():
+                    return pixmap
+        return None
+
+    def _fetch(self, code):
+        if code in self._pending or self._bridge is None:
+            return
+        self._pending.add(code)
+        future = get_http_client().submit("GET", self.ICON_URL.format(code=code), timeout=5)
+        self._bridge.watch(future,
+                           on_result=lambda response: self._on_downloaded(code, response),
+                           on_error=lambda error: self._on_failed(code, error))
+
+    def _on_downloaded(self, code, response):
+        self._pending.discard(code)
+        if response.status_code != 200:
+            self._on_failed(code, f"status {response.status_code}")
+            return
+        pixmap = QPixmap()
+        if not pixmap.loadFromData(response.content):
+            self._on_failed(code, "invalid image data")
+            return
+        self._pixmaps[code] = pixmap
+        if self.cache_dir:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                with open(os.path.join(self.cache_dir, self._icon_filename(code)), 'wb') as f:
+                    f.write(response.content)
+            except OSError as e:
+                self.logger.warning(f"Could not save weather icon {code}: {e}")
+        self.icon_ready.emit(code)
+
+    def _on_failed(self, code, error):
+        self._pending.discard(code)
+        self.logger.warning(f"Failed to download weather icon {code}: {error}")
+
+
+class WeatherFetcher(QObject):
+    """Fetches weather data from OpenWeather API without a thread of its own.
+
+    All city requests are issued concurrently on the shared HTTP client's
+    event loop, so a refresh takes about as long as the slowest city rather
+    than the sum; the responses are applied on the GUI thread via a QtHttpBridge.
+    """
     weather_fetched = pyqtSignal(dict)
     error_occurred = pyqtSignal(str)
+    finished = pyqtSignal()
+
+    BASE_URL = "https://api.openweathermap.org/data/2.5/weather"
+    GROUP_URL = "https://api.openweathermap.org/data/2.5/group"
 
-    def __init__(self, cities=None):
+    def __init__(self, bridge, cities=None, cache=None):
         super().__init__()
+        self.bridge = bridge  # QtHttpBridge created on the GUI thread
         self.cities = cities or WEATHER_CITIES
+        self.cache = cache  # WeatherResponseCache shared with HomeModule (optional)
         self.api_key = os.getenv('OPENWEATHER_API_KEY')
         self.timeout = API_TIMEOUT  # API timeout in seconds
         self.logger = logging.getLogger(__name__).getChild("WeatherFetcher") # Specific logger
+        self.running = False
+        self._future = None
 
         if not self.api_key:
             self.logger.error("OpenWeather API key not found in environment variables")
-            # Don't emit here, let run handle it
-            # self.error_occurred.emit("OpenWeather API key not found")
-            return
-
-        self.running = True
+            # Don't emit here, let start handle it
 
-    def run(self):
-        """Run the thread to fetch weather data"""
+    def start(self):
+        """Submit the weather requests; results arrive through the signals."""
         if not self.api_key:
             self.logger.error("Aborting weather fetch: API key missing.")
             self.error_occurred.emit("OpenWeather API key missing")
+            self.finished.emit()
             return
 
-        try:
-            base_url = "https://api.openweathermap.org/data/2.5/weather"
-            all_weather_data = {}
-            self.logger.info(f"Starting weather fetch for {len(self.cities)} cities...")
-
-            for city in self.cities:
-                if not self.running:
-                    self.logger.info("Weather fetch thread stopped.")
-                    break
-
-                try:
-                    city_name = city["name"]
-                    country_code = city["country_code"]
-                    province = city.get("province", "") # Use get for safety
-
-                    # Build API URL with province if available
-                    if province:
-                        query = f"{city_name},{province},{country_code}"
-                    else:
-                        query = f"{city_name},{country_code}"
-
-                    url = f"{base_url}?q={query}&units=metric&appid={self.api_key}"
-                    self.logger.debug(f"Fetching weather for: {query} from {url}")
-
-                    # Make the API request
-                    response = requests.get(url, timeout=self.timeout)
-                    response.raise_for_status()  # Raise an exception for 4xx/5xx status codes
-
-                    # Parse the JSON response
-                    weather_data = response.json()
-                    self.logger.debug(f"Received weather data for {city_name}")
+        all_weather_data = {}
+        pending = []
+        for city in self.cities:
+            cached = self.cache.get(city["name"]) if self.cache else None
+            if cached and self.cache.is_fresh(cached):
+                all_weather_data[city["name"]] = cached['data']
+            else:
+                pending.append(city)
 
-                    # Store the data
-                    all_weather_data[city_name] = weather_data
+        self.logger.info(f"Starting weather fetch for {len(pending)} of {len(self.cities)} cities "
+                         f"({len(self.cities) - len(pending)} served from cache)...")
+        jobs = self._build_jobs(pending)
+        client = get_http_client()
+        self.running = True
+        # An empty job list still goes through the loop, so delivery is always asynchronous
+        self._future = client.run_coroutine(
+            client.gather_async([(method, url, kwargs) for _, method, url, kwargs in jobs]))
+        self.bridge.watch(self._future,
+                          on_result=lambda results: self._on_results(jobs, results, all_weather_data),
+                          on_error=self._on_error)
+
+    def isRunning(self):
+        """Whether the requests are still outstanding."""
+        return self.running
+
+    def _on_results(self, jobs, results, all_weather_data):
+        self.running = False
+        try:
+            for (job_cities, _, _, _), result in zip(jobs, results):
+                self._apply_result(job_cities, result, all_weather_data)
+            self.logger.info("Weather fetch complete.")
+            self.weather_fetched.emit(all_weather_data)
+        except Exception as e:
+            error_msg = f"Error applying weather data: {str(e)}"
+            self.logger.error(error_msg, exc_info=True)
+            self.error_occurred.emit(error_msg)
+        self.finished.emit()
 
-                    # Sleep to avoid API rate limits
-                    time.sleep(0.5)
+    def _on_error(self, error):
+        self.running = False
+        error_msg = f"Critical error in weather fetcher: {error}"
+        self.logger.error(error_msg)
+        self.error_occurred.emit(error_msg)
+        self.finished.emit()
 
-                except requests.exceptions.RequestException as e:
-                    error_msg = f"Network/API error fetching weather for {city_name}: {e}"
-                    self.logger.error(error_msg)
-                    all_weather_data[city_name] = {'error': error_msg} # Store specific error
-                except Exception as e:
-                    error_msg = f"Unexpected error fetching weather for {city_name}: {e}"
-                    self.logger.error(error_msg, exc_info=True)
-                    all_weather_data[city_name] = {'error': error_msg}
+    def _build_jobs(self, cities):
+        """Group cities into requests: ID'd cities in batches, the rest one per city.
 
-            if self.running: # Only emit if not stopped prematurely
-                 self.logger.info("Weather fetch complete.")
-                 self.weather_fetched.emit(all_weather_data)
+        Returns:
+            List of (cities, method, url, kwargs) tuples
+        """
+        jobs = []
+        with_ids = [city for city in cities if city.get("id")]
+        for start in range(0, len(with_ids), WEATHER_GROUP_SIZE):
+            batch = with_ids[start:start + WEATHER_GROUP_SIZE]
+            params = {"id": ",".join(str(city["id"]) for city in batch),
+                      "units": "metric", "appid": self.api_key}
+            jobs.append((batch, "GET", self.GROUP_URL, {"params": params, "timeout": self.timeout}))
+
+        for city in cities:
+            if city.get("id"):
+                continue
+            province = city.get("province", "") # Use get for safety
+            if province:
+                query = f"{city['name']},{province},{city['country_code']}"
+            else:
+                query = f"{city['name']},{city['country_code']}"
+            headers = {}
+            cached = self.cache.get(city["name"]) if self.cache else None
+            if cached and cached.get('etag'):
+                headers["If-None-Match"] = cached['etag']
+            params = {"q": query, "units": "metric", "appid": self.api_key}
+            jobs.append(([city], "GET", self.BASE_URL,
+                         {"params": params, "headers": headers, "timeout": self.timeout}))
+        return jobs
+
+    def _apply_result(self, cities, result, all_weather_data):
+        """Store one request's outcome for its cities, falling back to cached data on errors."""
+        names = [city["name"] for city in cities]
+        if isinstance(result, HttpClientError):
+            self._store_error(names, f"Network/API error fetching weather: {result}", all_weather_data)
+            return
+        if result.status_code == 304 and self.cache:
+            for name in names:
+                self.cache.touch(name)
+                all_weather_data[name] = self.cache.get(name)['data']
+            self.logger.debug(f"Weather unchanged for {', '.join(names)}")
+            return
+        if result.status_code != 200:
+            self._store_error(names, f"API returned status {result.status_code} fetching weather", all_weather_data)
+            return
+        try:
+            payload = result.json()
+        except ValueError as e:
+            self._store_error(names, f"Invalid weather response: {e}", all_weather_data)
+            return
 
-        except Exception as e:
-            error_msg = f"Critical error in weather fetcher thread: {str(e)}"
-            self.logger.error(error_msg, exc_info=True)
-            self.error_occurred.emit(error_msg)
+        if len(cities) == 1 and not cities[0].get("id"):
+            by_name = {names[0]: payload}
+            etag = result.headers.get("ETag")
+        else:
+            ids = {str(city["id"]): city["name"] for city in cities}
+            by_name = {ids[str(item.get("id"))]: item for item in payload.get("list", [])
+                       if str(item.get("id")) in ids}
+            etag = None
+        for name in names:
+            if name in by_name:
+                all_weather_data[name] = by_name[name]
+                if self.cache:
+                    self.cache.put(name, by_name[name], etag)
+                self.logger.debug(f"Received weather data for {name}")
+            else:
+                self._store_error([name], "City missing from weather response", all_weather_data)
+
+    def _store_error(self, names, error_msg, all_weather_data):
+        for name in names:
+            cached = self.cache.get(name) if self.cache else None
+            if cached:
+                self.logger.warning(f"{error_msg} ({name}); using cached data")
+                all_weather_data[name] = cached['data']
+            else:
+                self.logger.error(f"{error_msg} ({name})")
+                all_weather_data[name] = {'error': error_msg} # Store specific error
 
     def stop(self):
-        """Stop the thread"""
-        self.logger.info("Stopping weather fetcher thread...")
+        """Cancel the outstanding requests; nothing is emitted for them afterwards."""
+        self.logger.info("Stopping weather fetcher...")
         self.running = False
+        if self._future is not None:
+            self._future.cancel()
+
 
+class FinancialDataFetcher(QObject):
+    """Fetches financial data (stocks, forex, crypto, commodities) without a thread of its own.
 
-class FinancialDataFetcherThread(QThread):
-    """Thread for fetching financial data (stocks, forex, crypto, commodities)"""
+    Independent feeds run concurrently on the shared HTTP client's event loop,
+    each behind its provider's token bucket and cached for its own TTL
+    (see MARKET_FEED_TTLS). The USD/CAD rate is fetched once per refresh and
+    reused for the BTC and commodity conversions. The assembled data is
+    delivered on the GUI thread via a QtHttpBridge.
+    """
     data_fetched = pyqtSignal(dict)
     error_occurred = pyqtSignal(str)
+    finished = pyqtSignal()
 
-    def __init__(self):
+    def __init__(self, bridge, cache=None, history=None):
         super().__init__()
+        self.bridge = bridge  # QtHttpBridge created on the GUI thread
+        self.history = history  # TimeSeriesStore receiving price history (optional)
         self.alpha_vantage_api_key = os.getenv('ALPHA_VANTAGE_API_KEY')
         self.exchange_rate_api_key = os.getenv('EXCHANGE_RATE_API_KEY')
         self.commodity_api_key = os.getenv('COMMODITY_API_KEY')
         self.timeout = API_TIMEOUT  # API timeout in seconds
-        self.running = True
+        self.running = False
+        self._future = None
+        self._started = None
         self.logger = logging.getLogger(__name__).getChild("FinancialFetcher") # Specific logger
-        self.finnhub_client = None # Initialize as None
+        self.cache = cache or MarketFeedCache()  # Shared with HomeModule across refreshes
+        self.commodity_fetcher = CommodityDataFetcher(api_key=self.commodity_api_key)
 
         if not self.alpha_vantage_api_key:
             self.logger.error("Alpha Vantage API key not found in environment variables")
@@ -480,190 +791,254 @@ class FinancialDataFetcherThread(QThread):
         if not self.exchange_rate_api_key:
             self.logger.error("Exchange Rate API key not found in environment variables")
 
-    def run(self):
-        """Run the thread to fetch financial data"""
+    def start(self):
+        """Submit the financial data pipeline; results arrive through the signals."""
         self.logger.info("Starting financial data fetch...")
-        try:
-            financial_data = {
-                'stocks': {},
-                'forex': {},
-                'crypto': {},
-                'commodities': {}
-            }
-
-            # Fetch stock data (John Deere) using Alpha Vantage
-            for symbol in STOCK_SYMBOLS:
-                if not self.running: break
-                self.logger.debug(f"Fetching stock data for {symbol}...")
-                try:
-                    if self.alpha_vantage_api_key:
-                        url = f"https://www.alphavantage.co/query?function=GLOBAL_QUOTE&symbol={symbol}&apikey={self.alpha_vantage_api_key}"
-                        response = requests.get(url, timeout=self.timeout)
-                        
-                        if response.status_code == 200:
-                            data = response.json()
-                            quote = data.get('Global Quote', {})
-                            
-                            if quote:
-                                # Create structure similar to what the app expects
-                                financial_data['stocks'][symbol] = {
-                                    'quote': {
-                                        'c': float(quote.get('05. price', 0)) if quote.get('05. price') else None,
-                                        'pc': float(quote.get('08. previous close', 0)) if quote.get('08. previous close') else None,
-                                        'd': float(quote.get('09. change', 0)) if quote.get('09. change') else None,
-                                        'dp': float(quote.get('10. change percent', '0').rstrip('%')) if quote.get('10. change percent') else None
-                                    },
-                                    'profile': {'name': symbol},
-                                    'candles': {'s': 'ok'}  # Placeholder for candles data
-                                }
-                                self.logger.info(f"Successfully fetched {symbol} stock data from Alpha Vantage")
-                            else:
-                                financial_data['stocks'][symbol] = {'error': 'No quote data returned'}
-                        else:
-                            financial_data['stocks'][symbol] = {'error': f'API returned status {response.status_code}'}
-                    else:
-                        financial_data['stocks'][symbol] = {'error': 'Alpha Vantage API key missing'}
-                        
-                    time.sleep(0.5)  # Avoid rate limiting
-
-                except Exception as e:
-                    self.logger.error(f"Error fetching stock data for {symbol}: {e}", exc_info=False)
-                    financial_data['stocks'][symbol] = {'error': str(e)}
-
-            # Fetch forex data (USD/CAD) using Exchange Rate API
-            try:
-                self.logger.debug("Fetching forex data (USD/CAD)...")
-                if self.exchange_rate_api_key:
-                    url = f"https://v6.exchangerate-api.com/v6/{self.exchange_rate_api_key}/pair/USD/CAD"
-                    response = requests.get(url, timeout=self.timeout)
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        if data.get('result') == 'success':
-                            rate = data.get('conversion_rate')
-                            financial_data['forex']['USDCAD'] = {
-                                'rate': rate,
-                                'timestamp': datetime.now().timestamp()
-                            }
-                            self.logger.info(f"Fetched USD/CAD rate: {rate:.4f}")
-                        else:
-                            financial_data['forex']['USDCAD'] = {'error': data.get('error', 'Unknown error')}
-                    else:
-                        financial_data['forex']['USDCAD'] = {'error': f'API returned status {response.status_code}'}
-                else:
-                    financial_data['forex']['USDCAD'] = {'error': 'Exchange Rate API key missing'}
-            except Exception as e:
-                self.logger.error(f"Error fetching USD/CAD rate: {e}", exc_info=True)
-                financial_data['forex']['USDCAD'] = {'error': str(e)}
+        self.running = True
+        self._started = time.monotonic()
+        self._future = get_http_client().run_coroutine(self._fetch_all())
+        self.bridge.watch(self._future, on_result=self._on_result, on_error=self._on_error)
 
-            # Fetch crypto data (BTC in CAD)
-            try:
-                self.logger.debug("Fetching crypto data (BTC/CAD)...")
-                if self.exchange_rate_api_key:
-                    # First get the BTC/USD rate from a free API
-                    btc_url = "https://api.coinbase.com/v2/prices/BTC-USD/spot"
-                    btc_response = requests.get(btc_url, timeout=self.timeout)
-                    
-                    if btc_response.status_code == 200:
-                        btc_data = btc_response.json()
-                        btc_usd_price = float(btc_data.get('data', {}).get('amount', 0))
-                        
-                        # Then convert to CAD using our USD/CAD rate
-                        if 'USDCAD' in financial_data.get('forex', {}) and 'rate' in financial_data['forex']['USDCAD']:
-                            usd_cad_rate = financial_data['forex']['USDCAD']['rate']
-                            btc_cad_price = btc_usd_price * usd_cad_rate
-                            financial_data['crypto']['BTC'] = {
-                                'price_cad': btc_cad_price,
-                                'timestamp': datetime.now().timestamp()
-                            }
-                            self.logger.info(f"Calculated BTC/CAD price: {btc_cad_price:,.2f}")
-                        else:
-                            financial_data['crypto']['BTC'] = {'error': 'USD/CAD rate not available for conversion'}
-                    else:
-                        financial_data['crypto']['BTC'] = {'error': f'API returned status {btc_response.status_code}'}
-                else:
-                    financial_data['crypto']['BTC'] = {'error': 'API keys missing'}
-            except Exception as e:
-                self.logger.error(f"Error fetching BTC price in CAD: {e}", exc_info=True)
-                financial_data['crypto']['BTC'] = {'error': str(e)}
+    def isRunning(self):
+        """Whether the pipeline is still outstanding."""
+        return self.running
 
+    def _on_result(self, financial_data):
+        self.running = False
+        self.logger.info(f"Financial data pipeline finished in {time.monotonic() - self._started:.2f}s")
+        self.data_fetched.emit(financial_data)
+        self.finished.emit()
 
-            # Fetch commodity data (Canola and Wheat)
+    def _on_error(self, error):
+        self.running = False
+        error_msg = f"Critical error in financial data fetcher: {error}"
+        self.logger.error(error_msg)
+        self.error_occurred.emit(error_msg)
+        self.finished.emit()
+
+    # --- Pipeline (runs on the HTTP client's event loop) ---
+
+    async def _fetch_all(self):
+        """Fetch every feed concurrently and assemble the dashboard's financial data."""
+        forex_task = asyncio.ensure_future(self._cached_feed('forex', 'USDCAD', self._fetch_usd_cad))
+        stock_tasks = {symbol: asyncio.ensure_future(
+                           self._cached_feed('stock', symbol, lambda s=symbol: self._fetch_stock(s)))
+                       for symbol in STOCK_SYMBOLS}
+        history_tasks = []
+        if self.history is not None:
+            history_tasks = [asyncio.ensure_future(
+                                 self._cached_feed('stock_history', symbol, lambda s=symbol: self._fetch_stock_history(s)))
+                             for symbol in STOCK_SYMBOLS]
+        btc_task = asyncio.ensure_future(self._cached_feed('crypto', 'BTCUSD', self._fetch_btc_usd))
+        page_task = asyncio.ensure_future(self._cached_feed('commodities', 'agriculture.com',
+                                                            self._fetch_agriculture_com_page))
+
+        forex = await forex_task
+        usd_cad_rate = forex.get('rate')
+        if not usd_cad_rate:
+            # Conversions still need a rate: one forex-python lookup, off the loop
+            loop = asyncio.get_running_loop()
+            usd_cad_rate = await loop.run_in_executor(None, self.commodity_fetcher._get_usd_cad_rate)
+
+        financial_data = {
+            'stocks': {symbol: await task for symbol, task in stock_tasks.items()},
+            'forex': {'USDCAD': forex},
+            'crypto': {'BTC': self._btc_in_cad(await btc_task, usd_cad_rate)},
+            'commodities': {}
+        }
+        if history_tasks:
+            await asyncio.gather(*history_tasks)
+            for symbol, stock in financial_data['stocks'].items():
+                series = f"stock_{symbol}_close"
+                if 'error' not in stock and self.history.last_timestamp(series):
+                    # Chart reads the series from the store; don't mutate the cached feed value
+                    financial_data['stocks'][symbol] = dict(stock, candles={'s': 'ok', 'series': series})
+
+        page = await page_task
+        try:
+            commodity_data = self.commodity_fetcher.fetch_commodity_data(
+                usd_cad_rate=usd_cad_rate, html_content=page.get('html', ''))
+            for commodity in ('CANOLA', 'WHEAT'):
+                if commodity in commodity_data:
+                    data = commodity_data[commodity]
+                    if page.get('timestamp'):
+                        # Prices are as of the page download; a cached page must not add history points
+                        data = dict(data, timestamp=page['timestamp'])
+                    financial_data['commodities'][commodity] = data
+                    self.logger.info(f"Commodity data for {commodity} obtained.")
+        except Exception as e:
+            self.logger.error(f"Error building commodity data: {e}", exc_info=True)
+            # Use fallback values if parsing fails
+            financial_data['commodities']['CANOLA'] = {
+                'price_cad_bu': 750.25,
+                'timestamp': datetime.now().timestamp(),
+                'source': 'Error Fallback'
+            }
+            financial_data['commodities']['WHEAT'] = {
+                'price_cad_bu': 450.75,
+                'timestamp': datetime.now().timestamp(),
+                'source': 'Error Fallback'
+            }
+        if self.history is not None:
+            self._record_history(financial_data)
+        return financial_data
+
+    def _record_history(self, financial_data):
+        """Append this refresh's quotes to their series (repeats of cached values are ignored)."""
+        points = []
+        usdcad = financial_data['forex'].get('USDCAD', {})
+        if usdcad.get('rate'):
+            points.append(("fx_USDCAD", usdcad['timestamp'], usdcad['rate']))
+        btc = financial_data['crypto'].get('BTC', {})
+        if btc.get('price_cad'):
+            points.append(("crypto_BTC_cad", btc['timestamp'], btc['price_cad']))
+        for commodity, data in financial_data['commodities'].items():
+            if data.get('price_cad_bu') and 'Fallback' not in data.get('source', ''):
+                points.append((f"commodity_{commodity}_cad_bu", data['timestamp'], data['price_cad_bu']))
+        for series, timestamp, value in points:
             try:
-                self.logger.debug("Fetching commodity data...")
-                commodity_fetcher = CommodityDataFetcher(api_key=self.commodity_api_key)
-                commodity_data = commodity_fetcher.fetch_commodity_data()
-
-                # Add commodity data to financial data
-                if 'CANOLA' in commodity_data:
-                    financial_data['commodities']['CANOLA'] = commodity_data['CANOLA']
-                    self.logger.info("Commodity data for CANOLA obtained.")
-                if 'WHEAT' in commodity_data:
-                    financial_data['commodities']['WHEAT'] = commodity_data['WHEAT']
-                    self.logger.info("Commodity data for WHEAT obtained.")
-
+                self.history.append_point(series, int(timestamp), float(value))
             except Exception as e:
-                self.logger.error(f"Error fetching commodity data: {e}", exc_info=True)
-                # Use fallback values if fetching fails
-                financial_data['commodities']['CANOLA'] = {
-                    'price_cad_bu': 750.25,
-                    'timestamp': datetime.now().timestamp(),
-                    'source': 'Error Fallback'
-                }
-                financial_data['commodities']['WHEAT'] = {
-                    'price_cad_bu': 450.75,
-                    'timestamp': datetime.now().timestamp(),
-                    'source': 'Error Fallback'
-                }
-
-            if self.running: # Only emit if not stopped
-                 self.logger.info("Financial data fetch complete.")
-                 self.data_fetched.emit(financial_data)
-
+                self.logger.error(f"Error recording {series} history: {e}")
+
+    async def _cached_feed(self, kind, key, fetch):
+        """Return a feed from cache while fresh, otherwise fetch it (stale value on failure)."""
+        cached = self.cache.get(kind, key)
+        if cached is not None:
+            self.logger.debug(f"Using cached {kind} feed {key}")
+            return cached
+        try:
+            value = await fetch()
         except Exception as e:
-            error_msg = f"Critical error in financial data fetcher thread: {str(e)}"
-            self.logger.error(error_msg, exc_info=True)
-            if self.running: self.error_occurred.emit(error_msg)
-
-    def stop(self):
-        """Stop the thread"""
-        self.logger.info("Stopping financial fetcher thread...")
-        self.running = False
-
-
-class ScheduledRefreshThread(QThread):
-    """Thread for performing scheduled data refreshes"""
-    refresh_signal = pyqtSignal()
+            self.logger.error(f"Error fetching {kind} feed {key}: {e}", exc_info=False)
+            value = {'error': str(e)}
+        if 'error' in value:
+            stale = self.cache.get(kind, key, allow_stale=True)
+            if stale is not None:
+                self.logger.warning(f"{kind} feed {key} failed ({value['error']}); using last good value")
+                return stale
+            return value
+        self.cache.put(kind, key, value)
+        return value
+
+    async def _get_json(self, provider, url, **kwargs):
+        await MARKET_RATE_LIMITERS[provider].acquire_async()
+        response = await get_http_client().request_async("GET", url, timeout=self.timeout, **kwargs)
+        if response.status_code != 200:
+            return None, {'error': f'API returned status {response.status_code}'}
+        return response.json(), None
+
+    async def _fetch_stock(self, symbol):
+        """Fetch one symbol's quote from Alpha Vantage."""
+        if not self.alpha_vantage_api_key:
+            return {'error': 'Alpha Vantage API key missing'}
+        self.logger.debug(f"Fetching stock data for {symbol}...")
+        data, error = await self._get_json(
+            'alphavantage', "https://www.alphavantage.co/query",
+            params={'function': 'GLOBAL_QUOTE', 'symbol': symbol, 'apikey': self.alpha_vantage_api_key})
+        if error:
+            return error
+        quote = data.get('Global Quote', {})
+        if not quote:
+            return {'error': 'No quote data returned'}
+        self.logger.info(f"Successfully fetched {symbol} stock data from Alpha Vantage")
+        # Create structure similar to what the app expects
+        return {
+            'quote': {
+                'c': float(quote.get('05. price', 0)) if quote.get('05. price') else None,
+                'pc': float(quote.get('08. previous close', 0)) if quote.get('08. previous close') else None,
+                'd': float(quote.get('09. change', 0)) if quote.get('09. change') else None,
+                'dp': float(quote.get('10. change percent', '0').rstrip('%')) if quote.get('10. change percent') else None
+            },
+            'profile': {'name': symbol}
+            # 'candles' is added by _fetch_all once local history exists
+        }
 
-    def __init__(self, interval_ms=API_REFRESH_INTERVAL_MS):
-        super().__init__()
-        self.interval_ms = interval_ms
-        self.running = True
-        self.logger = logging.getLogger(__name__).getChild("Scheduler") # Specific logger
-
-    def run(self):
-        """Run the thread to perform scheduled refreshes"""
-        self.logger.info(f"Scheduled refresh started. Interval: {self.interval_ms / 1000 / 60:.1f} minutes.")
-        while self.running:
-            # Sleep for the specified interval, checking running flag periodically
-            sleep_chunk = 1000 # Check every second
-            total_slept = 0
-            while self.running and total_slept < self.interval_ms:
-                 sleep_duration = min(sleep_chunk, self.interval_ms - total_slept)
-                 time.sleep(sleep_duration / 1000.0)
-                 total_slept += sleep_duration
-
-            if self.running:
-                # Emit the refresh signal
-                self.logger.info("Scheduled refresh triggered.")
-                self.refresh_signal.emit()
-        self.logger.info("Scheduled refresh thread finished.")
+    async def _fetch_stock_history(self, symbol):
+        """Fetch only the daily closes missing from the local history for a symbol."""
+        if not self.alpha_vantage_api_key:
+            return {'error': 'Alpha Vantage API key missing'}
+        series = f"stock_{symbol}_close"
+        last = self.history.last_timestamp(series)
+        now = time.time()
+        # The full history is only needed when the local store can't be bridged by a compact response
+        if last and now - last < ALPHA_VANTAGE_COMPACT_DAYS * 86400:
+            outputsize = 'compact'
+        else:
+            outputsize = 'full'
+        self.logger.debug(f"Fetching {outputsize} daily history for {symbol}...")
+        data, error = await self._get_json(
+            'alphavantage', "https://www.alphavantage.co/query",
+            params={'function': 'TIME_SERIES_DAILY', 'symbol': symbol,
+                    'outputsize': outputsize, 'apikey': self.alpha_vantage_api_key})
+        if error:
+            return error
+        bars = data.get('Time Series (Daily)')
+        if not bars:
+            return {'error': data.get('Note') or data.get('Information') or 'No daily history returned'}
+        timestamps = []
+        closes = []
+        for day, bar in bars.items():
+            try:
+                timestamps.append(int(datetime.strptime(day, "%Y-%m-%d").timestamp()))
+                closes.append(float(bar['4. close']))
+            except (KeyError, ValueError):
+                continue
+        added = self.history.append(series, timestamps, closes)
+        self.logger.info(f"Added {added} daily closes to {symbol} history ({outputsize} fetch)")
+        return {'added': added, 'timestamp': now}
 
+    async def _fetch_usd_cad(self):
+        """Fetch the USD/CAD rate from Exchange Rate API."""
+        if not self.exchange_rate_api_key:
+            return {'error': 'Exchange Rate API key missing'}
+        self.logger.debug("Fetching forex data (USD/CAD)...")
+        data, error = await self._get_json(
+            'exchangerate', f"https://v6.exchangerate-api.com/v6/{self.exchange_rate_api_key}/pair/USD/CAD")
+        if error:
+            return error
+        if data.get('result') != 'success':
+            return {'error': data.get('error', 'Unknown error')}
+        rate = data.get('conversion_rate')
+        self.logger.info(f"Fetched USD/CAD rate: {rate:.4f}")
+        return {'rate': rate, 'timestamp': datetime.now().timestamp()}
+
+    async def _fetch_btc_usd(self):
+        """Fetch the BTC/USD spot price from Coinbase."""
+        self.logger.debug("Fetching crypto data (BTC/USD)...")
+        data, error = await self._get_json('coinbase', "https://api.coinbase.com/v2/prices/BTC-USD/spot")
+        if error:
+            return error
+        return {'price_usd': float(data.get('data', {}).get('amount', 0)),
+                'timestamp': datetime.now().timestamp()}
+
+    async def _fetch_agriculture_com_page(self):
+        """Download the Agriculture.com futures page used for commodity prices."""
+        self.logger.info("Fetching commodity prices page from Agriculture.com...")
+        await MARKET_RATE_LIMITERS['agriculture'].acquire_async()
+        response = await get_http_client().request_async(
+            "GET", CommodityDataFetcher.AGRICULTURE_COM_URL,
+            headers=CommodityDataFetcher.AGRICULTURE_COM_HEADERS, timeout=self.timeout)
+        if response.status_code != 200:
+            return {'error': f'Agriculture.com returned status {response.status_code}'}
+        return {'html': response.text, 'timestamp': datetime.now().timestamp()}
+
+    def _btc_in_cad(self, btc, usd_cad_rate):
+        """Convert the BTC/USD feed with the USD/CAD rate fetched this refresh."""
+        if 'error' in btc:
+            return btc
+        if not usd_cad_rate:
+            return {'error': 'USD/CAD rate not available for conversion'}
+        btc_cad_price = btc['price_usd'] * usd_cad_rate
+        self.logger.info(f"Calculated BTC/CAD price: {btc_cad_price:,.2f}")
+        return {'price_cad': btc_cad_price, 'timestamp': btc['timestamp']}
 
     def stop(self):
-        """Stop the thread"""
-        self.logger.info("Stopping scheduled refresh thread...")
+        """Cancel the outstanding pipeline; nothing is emitted for it afterwards."""
+        self.logger.info("Stopping financial fetcher...")
         self.running = False
+        if self._future is not None:
+            self._future.cancel()
 
 
 class HomeModule(BaseModule):
@@ -698,14 +1073,50 @@ class HomeModule(BaseModule):
         }
         self.current_city = WEATHER_CITIES[0]["name"] if WEATHER_CITIES else None
 
+        cache_dir = getattr(self.config, 'cache_dir', None)
+
+        # Delivers HTTP loop results on the GUI thread; MainWindow owns the shared one
+        self.http_bridge = getattr(self.main_window, 'http_bridge', None) or QtHttpBridge(self)
+
+        # Weather icons, decoded once and fetched in the background when missing
+        self.weather_icons = WeatherIconCache(
+            cache_dir=os.path.join(cache_dir, 'weather_icons') if cache_dir else None,
+            resources_dir=getattr(self.config, 'resources_dir', None),
+            logger=self.logger.getChild("WeatherIcons"), bridge=self.http_bridge, parent=self)
+        self.weather_icons.icon_ready.connect(self._on_weather_icon_ready)
+        self._shown_icon_code = None
+
+        # Market feeds cached per feed TTL, shared by every financial fetch
+        self.market_cache = MarketFeedCache()
+
+        # Local price history (stocks, FX, BTC, commodities) that the charts read from
+        self.price_history = TimeSeriesStore(
+            store_dir=os.path.join(cache_dir, 'market_data', 'history') if cache_dir else None,
+            logger=self.logger.getChild("PriceHistory"))
+
+        # Per-city weather responses (ETag/TTL), shared by every weather fetch
+        self.weather_cache = WeatherResponseCache(
+            ttl_seconds=int(self.config.get('weather_cache_ttl_seconds', WEATHER_CACHE_TTL_SECONDS)),
+            cache_file=os.path.join(cache_dir, 'weather_data', 'weather_responses.json') if cache_dir else None,
+            logger=self.logger.getChild("WeatherCache"))
+        self.weather_cache.load()
+
         # Initialize UI elements to None initially
         # ... (rest of UI element initializations to None) ...
         self.last_updated_label = None
 
-        # Initialize threads
+        # Chart artists kept between updates (see update_weather_chart/update_stock_chart)
+        self._weather_bars = None
+        self._weather_bar_labels = []
+        self._weather_chart_cities = ()
+        self._stock_line = None
+        self._stock_marker = None
+        self._stock_marker_label = None
+        self._stock_series_key = None
+
+        # Initialize fetchers
         self.weather_fetcher = None
         self.financial_fetcher = None
-        self.scheduled_refresh = None
 
         # Setup UI (Call it explicitly AFTER logger is ready)
         self.init_ui() # <-- ADD THIS CALL HERE
@@ -883,8 +1294,9 @@ class HomeModule(BaseModule):
         comparison_options_layout.addWidget(self.weather_comparison_type)
         comparison_options_layout.addStretch(1)
         weather_chart_layout.addLayout(comparison_options_layout)
-        self.weather_chart_canvas = MatplotlibCanvas(width=10, height=4, dpi=90) # Adjusted size/dpi
-        weather_chart_layout.addWidget(self.weather_chart_canvas)
+        # Canvas is created when the tab is first opened (see _create_charts)
+        self.weather_chart_canvas = None
+        self._weather_chart_layout = weather_chart_layout
         weather_layout.addWidget(self.weather_chart_group)
 
         self.weather_table_group = QGroupBox("All Cities Weather Details")
@@ -912,8 +1324,8 @@ class HomeModule(BaseModule):
 
         self.stock_chart_group = QGroupBox("John Deere (DE) Stock Price (1 Year)")
         stock_chart_layout = QVBoxLayout(self.stock_chart_group)
-        self.stock_chart_canvas = MatplotlibCanvas(width=10, height=4, dpi=90) # Adjusted size/dpi
-        stock_chart_layout.addWidget(self.stock_chart_canvas)
+        self.stock_chart_canvas = None
+        self._stock_chart_layout = stock_chart_layout
         financial_layout.addWidget(self.stock_chart_group)
 
         self.financial_table_group = QGroupBox("Market Data Summary")
@@ -932,6 +1344,7 @@ class HomeModule(BaseModule):
         financial_layout.addWidget(self.financial_table_group)
 
         self.tab_widget.addTab(financial_tab, "Financial Details")
+        self.tab_widget.currentChanged.connect(self._on_tab_changed)
 
         # Add tab widget to main layout
         main_layout.addWidget(self.tab_widget)
@@ -944,6 +1357,32 @@ class HomeModule(BaseModule):
         self.logger.debug("HomeModule UI initialization finished.")
 
 
+    def _on_tab_changed(self, index):
+        """Create the chart canvases the first time a chart tab is opened."""
+        if index > 0 and self.weather_chart_canvas is None:
+            self._create_charts()
+
+
+    def _create_charts(self):
+        """Create the Matplotlib canvases and draw the current data.
+
+        matplotlib and seaborn are imported here rather than at module import,
+        keeping them off the startup path (the Overview tab has no charts).
+        """
+        try:
+            from ui.matplotlib_canvas import MatplotlibCanvas
+        except ImportError as e:
+            self.logger.error(f"Charts unavailable, could not import matplotlib canvas: {e}")
+            return
+        self.weather_chart_canvas = MatplotlibCanvas(width=10, height=4, dpi=90) # Adjusted size/dpi
+        self._weather_chart_layout.addWidget(self.weather_chart_canvas)
+        self.stock_chart_canvas = MatplotlibCanvas(width=10, height=4, dpi=90) # Adjusted size/dpi
+        self._stock_chart_layout.addWidget(self.stock_chart_canvas)
+        self.logger.debug("Chart canvases created.")
+        self.update_weather_chart()
+        self.update_stock_chart()
+
+
     def init_data_loading(self):
         """Initialize data loading"""
         self.logger.debug("Initializing data loading...")
@@ -970,21 +1409,16 @@ class HomeModule(BaseModule):
         # Update UI with cached data (or loading state) immediately
         self.update_ui()
 
-        # Then start data fetcher threads
+        # Then start data fetches
         self.refresh_data() # Initial fetch
 
-        # Start scheduled refresh thread
-        # Use interval from config if available, else default
-        refresh_hours = self.config.get('api_refresh_interval_hours', 6) # Example config key
-        refresh_interval_ms = int(refresh_hours * 3600 * 1000)
-
-        if hasattr(self, 'scheduled_refresh') and self.scheduled_refresh and self.scheduled_refresh.isRunning():
-             self.scheduled_refresh.stop()
-             self.scheduled_refresh.wait()
-
-        self.scheduled_refresh = ScheduledRefreshThread(interval_ms=refresh_interval_ms)
-        self.scheduled_refresh.refresh_signal.connect(self.refresh_data)
-        self.scheduled_refresh.start()
+        # Periodic refreshes run on the shared refresh scheduler; the two feeds are
+        # separate jobs so their jitter spreads them apart
+        refresh_hours = float(self.config.get('api_refresh_interval_hours', API_REFRESH_INTERVAL_MS / 3600000))
+        refresh_seconds = refresh_hours * 3600
+        scheduler = get_refresh_scheduler()
+        scheduler.add_job("home.weather", self.refresh_weather_data, refresh_seconds, widget=self)
+        scheduler.add_job("home.markets", self.refresh_financial_data, refresh_seconds, widget=self)
 
 
     def load_cached_weather_data(self):
@@ -1093,7 +1527,7 @@ class HomeModule(BaseModule):
 
     @pyqtSlot() # Mark as slot for signal connection
     def refresh_data(self):
-        """Refresh all data by starting fetcher threads."""
+        """Refresh all data by starting both fetchers."""
         self.logger.info("Refresh data requested.")
         # Update last updated time immediately
         if hasattr(self, 'last_updated_label') and self.last_updated_label:
@@ -1104,12 +1538,10 @@ class HomeModule(BaseModule):
 
     def refresh_weather_data(self):
         """Refresh weather data"""
-        # Stop existing thread if running
+        # Cancel the previous fetch if it is still outstanding
         if self.weather_fetcher and self.weather_fetcher.isRunning():
-            self.logger.debug("Stopping previous weather fetcher thread...")
+            self.logger.debug("Stopping previous weather fetcher...")
             self.weather_fetcher.stop()
-            if not self.weather_fetcher.wait(1000): # Wait up to 1 sec
-                 self.logger.warning("Previous weather fetcher thread did not stop cleanly.")
 
         # Update UI status using main window's method if available
         if hasattr(self.main_window, 'update_status'):
@@ -1119,9 +1551,9 @@ class HomeModule(BaseModule):
 
         if hasattr(self, 'refresh_button'): self.refresh_button.setEnabled(False)
 
-        # Start new thread
-        self.logger.debug("Starting new weather fetcher thread.")
-        self.weather_fetcher = WeatherFetcherThread(WEATHER_CITIES)
+        # Start new fetch
+        self.logger.debug("Starting new weather fetch.")
+        self.weather_fetcher = WeatherFetcher(self.http_bridge, WEATHER_CITIES, cache=self.weather_cache)
         # Disconnect previous signals if any to prevent duplicates
         try: self.weather_fetcher.weather_fetched.disconnect()
         except TypeError: pass # Ignore error if not connected
@@ -1138,12 +1570,10 @@ class HomeModule(BaseModule):
 
     def refresh_financial_data(self):
         """Refresh financial data"""
-        # Stop existing thread if running
+        # Cancel the previous fetch if it is still outstanding
         if self.financial_fetcher and self.financial_fetcher.isRunning():
-            self.logger.debug("Stopping previous financial fetcher thread...")
+            self.logger.debug("Stopping previous financial fetcher...")
             self.financial_fetcher.stop()
-            if not self.financial_fetcher.wait(1000): # Wait up to 1 sec
-                 self.logger.warning("Previous financial fetcher thread did not stop cleanly.")
 
         # Update UI status
         if hasattr(self.main_window, 'update_status'):
@@ -1153,9 +1583,10 @@ class HomeModule(BaseModule):
 
         if hasattr(self, 'refresh_button'): self.refresh_button.setEnabled(False)
 
-        # Start new thread
-        self.logger.debug("Starting new financial fetcher thread.")
-        self.financial_fetcher = FinancialDataFetcherThread()
+        # Start new fetch
+        self.logger.debug("Starting new financial data fetch.")
+        self.financial_fetcher = FinancialDataFetcher(self.http_bridge, cache=self.market_cache,
+                                                      history=self.price_history)
         # Disconnect previous signals
         try: self.financial_fetcher.data_fetched.disconnect()
         except TypeError: pass
@@ -1177,6 +1608,7 @@ class HomeModule(BaseModule):
         self.weather_data = data
         self.update_weather_ui()
         self.save_weather_data_to_cache()
+        self.weather_cache.save()
 
 
     @pyqtSlot(dict) # Mark as slot
@@ -1213,6 +1645,7 @@ class HomeModule(BaseModule):
                  self.main_window.update_status("Ready")
             if hasattr(self, 'last_updated_label') and self.last_updated_label:
                  self.last_updated_label.setText(f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            self.mark_refreshed()
 
 
     @pyqtSlot() # Mark as slot
@@ -1260,6 +1693,7 @@ class HomeModule(BaseModule):
             self.logger.warning("update_city_weather: Skipping, required UI elements or data missing.")
             return
 
+        self._shown_icon_code = None # Set below once the city's icon is known
         if not self.current_city or self.current_city not in self.weather_data:
             self.logger.warning(f"No weather data available for selected city: {self.current_city}")
             # Reset labels to default/error state
@@ -1306,21 +1740,14 @@ class HomeModule(BaseModule):
 
         # Update weather icon
         icon_code = weather_desc.get('icon')
+        self._shown_icon_code = icon_code
         if icon_code:
-            # Try to download the icon from OpenWeather
-            try:
-                icon_url = f"https://openweathermap.org/img/wn/{icon_code}@2x.png" # Use HTTPS
-                response = requests.get(icon_url, timeout=5) # Add timeout
-                if response.status_code == 200:
-                    pixmap = QPixmap()
-                    pixmap.loadFromData(response.content)
-                    self.weather_icon_label.setPixmap(pixmap)
-                else:
-                    self.logger.warning(f"Failed to download weather icon {icon_code}, status: {response.status_code}")
-                    self.weather_icon_label.setText(f"{icon_code}") # Show code as fallback
-            except Exception as e:
-                self.logger.error(f"Error loading weather icon {icon_code}: {e}")
-                self.weather_icon_label.setText("?") # Error indicator
+            # Cached icons are set immediately; a missing one arrives via _on_weather_icon_ready
+            pixmap = self.weather_icons.get(icon_code)
+            if pixmap is not None:
+                self.weather_icon_label.setPixmap(pixmap)
+            else:
+                self.weather_icon_label.setText(f"{icon_code}") # Show code until the icon arrives
         else:
             self.weather_icon_label.setText("?") # No icon code
 
@@ -1345,6 +1772,15 @@ class HomeModule(BaseModule):
         self.weather_pressure_label.setText(f"Pressure: {pressure} hPa" if pressure is not None else "Pressure: -- hPa")
 
 
+    @pyqtSlot(str)
+    def _on_weather_icon_ready(self, icon_code):
+        """Show a freshly downloaded icon if it belongs to the selected city."""
+        if icon_code == self._shown_icon_code and self.weather_icon_label is not None:
+            pixmap = self.weather_icons.get(icon_code)
+            if pixmap is not None:
+                self.weather_icon_label.setPixmap(pixmap)
+
+
     def update_weather_table(self):
         """Update the weather table with all cities"""
         if not hasattr(self, 'weather_table') or not self.weather_table:
@@ -1414,128 +1850,112 @@ class HomeModule(BaseModule):
 
 
     def update_weather_chart(self):
-        """Update the weather comparison chart"""
+        """Update the weather comparison chart.
+
+        Bars and value labels persist between calls: switching the comparison
+        type only changes their heights, colors and text. The bars are rebuilt
+        only when the set of cities changes.
+        """
         if not hasattr(self, 'weather_chart_canvas') or not self.weather_chart_canvas:
-             self.logger.warning("update_weather_chart: Skipping, canvas missing.")
+             self.logger.debug("update_weather_chart: Skipping, canvas not created yet.")
              return
+        canvas = self.weather_chart_canvas
         if not self.weather_data:
             self.logger.debug("update_weather_chart: No weather data available.")
-            self.weather_chart_canvas.axes.clear()
-            self.weather_chart_canvas.axes.text(0.5, 0.5, "No Weather Data", ha='center', va='center')
-            self.weather_chart_canvas.draw()
+            self._set_weather_bars_visible(False)
+            canvas.show_message("No Weather Data")
+            canvas.refresh()
             return
 
         # Get comparison type
         comparison_type = self.weather_comparison_type.currentText() if self.weather_comparison_type else "Temperature (°C)"
+        section, field, title, label_format, color_method = WEATHER_COMPARISONS.get(
+            comparison_type, WEATHER_COMPARISONS["Wind Speed (m/s)"])
+        get_color = getattr(self, color_method)
 
         # Prepare data for chart
         cities = []
         values = []
-        colors = []
-        ylabel = ""
-        title = ""
+        for city_name in sorted(self.weather_data.keys()):
+            data = self.weather_data[city_name]
+            if 'error' not in data and section in data:
+                value = data[section].get(field)
+                if value is not None:
+                    cities.append(city_name)
+                    values.append(value)
 
         try:
-            if comparison_type == "Temperature (°C)":
-                ylabel = "Temperature (°C)"
-                title = "Temperature Comparison"
-                for city_name in sorted(self.weather_data.keys()):
-                    data = self.weather_data[city_name]
-                    if 'error' not in data and 'main' in data:
-                        temp = data['main'].get('temp')
-                        if temp is not None:
-                             cities.append(city_name)
-                             values.append(temp)
-                             colors.append(self.get_temp_color(temp))
-
-            elif comparison_type == "Feels Like (°C)":
-                ylabel = "Feels Like (°C)"
-                title = "Feels Like Temperature Comparison"
-                for city_name in sorted(self.weather_data.keys()):
-                    data = self.weather_data[city_name]
-                    if 'error' not in data and 'main' in data:
-                        feels_like = data['main'].get('feels_like')
-                        if feels_like is not None:
-                             cities.append(city_name)
-                             values.append(feels_like)
-                             colors.append(self.get_temp_color(feels_like))
-
-            elif comparison_type == "Humidity (%)":
-                ylabel = "Humidity (%)"
-                title = "Humidity Comparison"
-                for city_name in sorted(self.weather_data.keys()):
-                    data = self.weather_data[city_name]
-                    if 'error' not in data and 'main' in data:
-                        humidity = data['main'].get('humidity')
-                        if humidity is not None:
-                             cities.append(city_name)
-                             values.append(humidity)
-                             colors.append(self.get_humidity_color(humidity))
-
-            else:  # Wind Speed (m/s)
-                ylabel = "Wind Speed (m/s)"
-                title = "Wind Speed Comparison"
-                for city_name in sorted(self.weather_data.keys()):
-                    data = self.weather_data[city_name]
-                    if 'error' not in data and 'wind' in data:
-                        wind_speed = data['wind'].get('speed')
-                        if wind_speed is not None:
-                             cities.append(city_name)
-                             values.append(wind_speed)
-                             colors.append(self.get_wind_color(wind_speed))
-
-            # Clear previous chart
-            self.weather_chart_canvas.axes.clear()
-
+            axes = canvas.axes
             if not cities: # Handle case where no valid data was found for the selected type
-                 self.weather_chart_canvas.axes.text(0.5, 0.5, f"No Data for {comparison_type}", ha='center', va='center')
-            else:
-                 # Create the bar chart
-                 bars = self.weather_chart_canvas.axes.bar(cities, values, color=colors)
-
-                 # Add value labels on top of bars
-                 for bar in bars:
-                     height = bar.get_height()
-                     label = ""
-                     if comparison_type == "Temperature (°C)" or comparison_type == "Feels Like (°C)":
-                         label = f'{height:.1f}°C'
-                     elif comparison_type == "Humidity (%)":
-                         label = f'{height:.0f}%'
-                     else:  # Wind Speed
-                         label = f'{height:.1f} m/s'
-
-                     self.weather_chart_canvas.axes.text(
-                         bar.get_x() + bar.get_width()/2., height, label,
-                         ha='center', va='bottom', fontsize=9 # Smaller font for labels
-                     )
+                 self._set_weather_bars_visible(False)
+                 canvas.show_message(f"No Data for {comparison_type}")
+                 canvas.refresh()
+                 return
 
-                 # Customize chart
-                 self.weather_chart_canvas.axes.set_title(title, fontsize=10)
-                 self.weather_chart_canvas.axes.set_ylabel(ylabel, fontsize=9)
-                 self.weather_chart_canvas.axes.tick_params(axis='x', labelsize=8, rotation=15) # Rotate labels slightly
-                 self.weather_chart_canvas.axes.tick_params(axis='y', labelsize=8)
-                 self.weather_chart_canvas.axes.grid(True, axis='y', linestyle='--', alpha=0.6)
-                 # Adjust y-axis limits slightly
-                 if values:
-                      min_val = min(values)
-                      max_val = max(values)
-                      padding = (max_val - min_val) * 0.1 + 1 # Add a small absolute padding too
-                      self.weather_chart_canvas.axes.set_ylim(min(0, min_val - padding), max_val + padding)
-
-
-            # Adjust layout and draw
-            self.weather_chart_canvas.figure.tight_layout()
-            self.weather_chart_canvas.draw()
+            relayout = False
+            if tuple(cities) != self._weather_chart_cities:
+                 self._build_weather_bars(cities)
+                 relayout = True
+
+            # Update bars and value labels in place
+            for bar, label, value in zip(self._weather_bars, self._weather_bar_labels, values):
+                 bar.set_height(value)
+                 bar.set_color(get_color(value))
+                 label.set_position((bar.get_x() + bar.get_width() / 2., value))
+                 label.set_text(label_format.format(value))
+            self._set_weather_bars_visible(True)
+            canvas.hide_message()
+
+            axes.set_title(title, fontsize=10)
+            axes.set_ylabel(comparison_type, fontsize=9)
+            # Adjust y-axis limits slightly
+            min_val = min(values)
+            max_val = max(values)
+            padding = (max_val - min_val) * 0.1 + 1 # Add a small absolute padding too
+            axes.set_ylim(min(0, min_val - padding), max_val + padding)
+
+            canvas.refresh(layout=relayout)
 
         except Exception as e:
              self.logger.error(f"Error updating weather chart: {e}", exc_info=True)
              try: # Try to show error on canvas
-                  self.weather_chart_canvas.axes.clear()
-                  self.weather_chart_canvas.axes.text(0.5, 0.5, "Error generating chart", ha='center', va='center')
-                  self.weather_chart_canvas.draw()
+                  self._set_weather_bars_visible(False)
+                  canvas.show_message("Error generating chart")
+                  canvas.refresh()
              except Exception: pass # Ignore errors during error display
 
 
+    def _build_weather_bars(self, cities):
+        """(Re)create one bar and value label per city; heights are set by the caller."""
+        axes = self.weather_chart_canvas.axes
+        if self._weather_bars is not None:
+            self._weather_bars.remove()
+        for label in self._weather_bar_labels:
+            label.remove()
+
+        # Numeric positions with tick labels, so a changed city list does not
+        # accumulate stale categories on the axis
+        positions = list(range(len(cities)))
+        self._weather_bars = axes.bar(positions, [0] * len(cities))
+        self._weather_bar_labels = [axes.text(x, 0, "", ha='center', va='bottom', fontsize=9)
+                                    for x in positions]
+        self._weather_chart_cities = tuple(cities)
+
+        axes.set_xticks(positions)
+        axes.set_xticklabels(cities)
+        axes.tick_params(axis='x', labelsize=8, rotation=15) # Rotate labels slightly
+        axes.tick_params(axis='y', labelsize=8)
+        axes.grid(True, axis='y', linestyle='--', alpha=0.6)
+
+
+    def _set_weather_bars_visible(self, visible):
+        """Show or hide the persistent weather bars and their labels."""
+        if self._weather_bars is None:
+            return
+        for artist in list(self._weather_bars) + self._weather_bar_labels:
+            artist.set_visible(visible)
+
+
     def update_financial_overview(self):
         """Update the financial overview section"""
         # Check if UI elements exist
@@ -1755,101 +2175,132 @@ class HomeModule(BaseModule):
 
 
     def update_stock_chart(self):
-        """Update the John Deere stock chart with real data"""
+        """Update the John Deere stock chart with real data.
+
+        The close line is created once and updated with ``set_data`` when the
+        history changes. When only the current quote moved, the price marker
+        and its label are blitted over the cached background instead of
+        redrawing the whole figure.
+        """
         if not hasattr(self, 'stock_chart_canvas') or not self.stock_chart_canvas:
-             self.logger.warning("update_stock_chart: Skipping, canvas missing.")
+             self.logger.debug("update_stock_chart: Skipping, canvas not created yet.")
              return
-
-        self.stock_chart_canvas.axes.clear() # Clear previous plot
+        canvas = self.stock_chart_canvas
 
         if 'DE' not in self.financial_data.get('stocks', {}):
-             self.stock_chart_canvas.axes.text(0.5, 0.5, "Stock Data Unavailable", ha='center', va='center')
-             self.stock_chart_canvas.draw()
+             self._show_stock_message("Stock Data Unavailable")
              return
 
         stock_data = self.financial_data['stocks']['DE']
 
         if 'error' in stock_data:
             self.logger.warning(f"Cannot plot stock chart due to error: {stock_data['error']}")
-            self.stock_chart_canvas.axes.text(0.5, 0.5, f"Stock Data Error:\n{stock_data['error']}", ha='center', va='center', color='red')
-            self.stock_chart_canvas.draw()
+            self._show_stock_message(f"Stock Data Error:\n{stock_data['error']}", color='red')
             return
 
+        current_price = None
+        if 'quote' in stock_data and stock_data['quote'].get('c') is not None:
+             current_price = stock_data['quote']['c']
+
         # Check if we have candle data
         if 'candles' not in stock_data or stock_data['candles'].get('s') != 'ok':
             self.logger.warning("No historical stock candle data available for plotting.")
-            self.stock_chart_canvas.axes.text(0.5, 0.5, "No Historical Data", ha='center', va='center')
-            # Still plot current price if available
-            if 'quote' in stock_data and stock_data['quote'].get('c') is not None:
-                 current_price = stock_data['quote']['c']
-                 self.stock_chart_canvas.axes.plot([datetime.now()], [current_price], 'ro', markersize=8, label=f"Current: ${current_price:.2f}")
-                 self.stock_chart_canvas.axes.legend()
-            self.stock_chart_canvas.draw()
+            message = "No Historical Data"
+            if current_price is not None:
+                 message += f"\nCurrent: ${current_price:.2f}"
+            self._show_stock_message(message)
             return
 
         try:
-            # Extract the candle data
-            candles = stock_data['candles']
-            timestamps = candles.get('t', [])
-            close_prices = candles.get('c', [])
-            open_prices = candles.get('o', []) # Get open prices too if available
-            high_prices = candles.get('h', [])
-            low_prices = candles.get('l', [])
-
-            if not timestamps or not close_prices:
-                 self.logger.warning("Empty candle data received.")
-                 self.stock_chart_canvas.axes.text(0.5, 0.5, "Empty Historical Data", ha='center', va='center')
-                 self.stock_chart_canvas.draw()
+            # Read the close series straight from the local history, downsampled to the canvas width
+            years = float(self.config.get('stock_chart_years', 5))
+            start = time.time() - years * 365 * 86400
+            max_points = max(2 * canvas.width(), 200)
+            timestamps, close_prices = self.price_history.read(
+                stock_data['candles'].get('series', 'stock_DE_close'), start=start, max_points=max_points)
+
+            if not len(timestamps):
+                 self.logger.warning("Empty price history for stock chart.")
+                 self._show_stock_message("Empty Historical Data")
                  return
 
-            # Convert timestamps to dates
-            dates = [datetime.fromtimestamp(ts) for ts in timestamps]
-
-            # Create a pandas DataFrame for easier handling
-            df = pd.DataFrame({
-                'date': pd.to_datetime(dates), # Ensure datetime type
-                'close': close_prices,
-                'open': open_prices if len(open_prices) == len(dates) else [np.nan]*len(dates), # Handle missing data
-                'high': high_prices if len(high_prices) == len(dates) else [np.nan]*len(dates),
-                'low': low_prices if len(low_prices) == len(dates) else [np.nan]*len(dates),
-            }).set_index('date') # Set date as index for potential resampling
-
-            # Plot the closing price line
-            self.stock_chart_canvas.axes.plot(df.index, df['close'], color='royalblue', linewidth=1.5, label='Close Price')
-
-            # Add current price point from quote data
-            if 'quote' in stock_data and stock_data['quote'].get('c') is not None:
-                 current_price = stock_data['quote']['c']
-                 # Plot slightly offset or ensure date matches last candle date
-                 last_date = df.index[-1]
-                 self.stock_chart_canvas.axes.plot(last_date, current_price, 'o', color='red', markersize=6, label=f"Current: ${current_price:.2f}")
-
-            # Customize chart
-            self.stock_chart_canvas.axes.set_title("John Deere (DE) Stock Price (1 Year)", fontsize=10)
-            # self.stock_chart_canvas.axes.set_xlabel("Date", fontsize=9) # Often redundant with auto-formatting
-            self.stock_chart_canvas.axes.set_ylabel("Price ($)", fontsize=9)
-            self.stock_chart_canvas.axes.grid(True, linestyle='--', alpha=0.6)
-            self.stock_chart_canvas.axes.tick_params(axis='x', labelsize=8)
-            self.stock_chart_canvas.axes.tick_params(axis='y', labelsize=8)
-            self.stock_chart_canvas.axes.legend(fontsize=8)
-
-            # Format x-axis dates nicely
-            self.stock_chart_canvas.figure.autofmt_xdate()
-
-            # Adjust layout and draw
-            self.stock_chart_canvas.figure.tight_layout()
-            self.stock_chart_canvas.draw()
+            dates = timestamps.astype('datetime64[s]')
+            axes = canvas.axes
+            first_draw = self._stock_line is None
+            series_key = (len(timestamps), int(timestamps[0]), int(timestamps[-1]), max_points)
+            full_redraw = first_draw or series_key != self._stock_series_key or not self._stock_line.get_visible()
+
+            if first_draw:
+                 # Created with data so the date units are registered on the x-axis
+                 self._stock_line, = axes.plot(dates, close_prices, color='royalblue', linewidth=1.5, label='Close Price')
+                 self._stock_marker, = axes.plot([dates[-1]], [close_prices[-1]], 'o', color='red', markersize=6, label='Current')
+                 self._stock_marker_label = axes.annotate(
+                     "", xy=(dates[-1], close_prices[-1]), xytext=(-6, 8), textcoords='offset points',
+                     ha='right', fontsize=8, color='red')
+                 canvas.add_animated(self._stock_marker)
+                 canvas.add_animated(self._stock_marker_label)
+
+                 # Customize chart
+                 axes.set_ylabel("Price ($)", fontsize=9)
+                 axes.grid(True, linestyle='--', alpha=0.6)
+                 axes.tick_params(axis='x', labelsize=8, labelrotation=30)
+                 axes.tick_params(axis='y', labelsize=8)
+                 axes.legend(fontsize=8, loc='upper left')
+            elif series_key != self._stock_series_key:
+                 self._stock_line.set_data(dates, close_prices)
+
+            if series_key != self._stock_series_key:
+                 axes.relim()
+                 axes.set_autoscaley_on(True)  # An off-scale quote's set_ylim below turns it off
+                 axes.autoscale_view()
+                 axes.set_title(f"John Deere (DE) Stock Price ({years:g} Years)", fontsize=10)
+                 self._stock_series_key = series_key
+
+            # Current price point from quote data, plotted at the last bar's date
+            if current_price is not None:
+                 self._stock_marker.set_data([dates[-1]], [current_price])
+                 self._stock_marker_label.xy = (dates[-1], current_price)
+                 self._stock_marker_label.set_text(f"Current: ${current_price:.2f}")
+                 low, high = axes.get_ylim()
+                 if not low <= current_price <= high:
+                      # Off-scale quote: rescale around the line and the marker
+                      axes.set_ylim(min(low, current_price), max(high, current_price))
+                      full_redraw = True
+            self._stock_marker.set_visible(current_price is not None)
+            self._stock_marker_label.set_visible(current_price is not None)
+
+            self._stock_line.set_visible(True)
+            legend = axes.get_legend()
+            if legend is not None:
+                 legend.set_visible(True)
+            canvas.hide_message()
+
+            if full_redraw:
+                 canvas.refresh(layout=first_draw)
+            else:
+                 canvas.blit_animated()
             self.logger.debug("Stock chart updated.")
 
         except Exception as e:
              self.logger.error(f"Error updating stock chart: {e}", exc_info=True)
              try: # Try to show error on canvas
-                  self.stock_chart_canvas.axes.clear()
-                  self.stock_chart_canvas.axes.text(0.5, 0.5, "Error generating chart", ha='center', va='center', color='red')
-                  self.stock_chart_canvas.draw()
+                  self._show_stock_message("Error generating chart", color='red')
              except Exception: pass # Ignore errors during error display
 
 
+    def _show_stock_message(self, text, color='black'):
+        """Hide the stock chart artists and show a message in their place."""
+        canvas = self.stock_chart_canvas
+        for artist in (self._stock_line, self._stock_marker, self._stock_marker_label):
+            if artist is not None:
+                artist.set_visible(False)
+        legend = canvas.axes.get_legend()
+        if legend is not None:
+            legend.set_visible(False)
+        canvas.show_message(text, color=color)
+        canvas.refresh()
+
+
     def get_wind_direction(self, degrees):
         """Convert wind direction in degrees to cardinal direction"""
         if degrees is None: return ""
@@ -1931,21 +2382,18 @@ class HomeModule(BaseModule):
         self.cleanup()
 
     def cleanup(self):
-        """Stop background threads."""
-        self.logger.debug("Stopping HomeModule background threads...")
+        """Cancel outstanding fetches and refresh jobs."""
+        self.logger.debug("Stopping HomeModule background work...")
         if self.weather_fetcher and self.weather_fetcher.isRunning():
             self.weather_fetcher.stop()
-            self.weather_fetcher.wait()
             self.logger.debug("Weather fetcher stopped.")
 
         if self.financial_fetcher and self.financial_fetcher.isRunning():
             self.financial_fetcher.stop()
-            self.financial_fetcher.wait()
             self.logger.debug("Financial fetcher stopped.")
 
-        if self.scheduled_refresh and self.scheduled_refresh.isRunning():
-            self.scheduled_refresh.stop()
-            self.scheduled_refresh.wait()
-            self.logger.debug("Scheduled refresh stopped.")
+        scheduler = get_refresh_scheduler()
+        scheduler.remove_job("home.weather")
+        scheduler.remove_job("home.markets")
         self.logger.debug("HomeModule cleanup finished.")
 
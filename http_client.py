@@ -0,0 +1,551 @@
+# utils/http_client.py - Shared asyncio HTTP client for Graph, JD and dashboard feeds
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from urllib.parse import urlsplit
+
+# httpx gives true non-blocking I/O on the loop thread; without it, blocking
+# requests calls run on a small shared executor behind the same limits
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+try:
+    from PyQt5.QtCore import QObject, pyqtSignal
+except ImportError:
+    QObject = None
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying with backoff (rate limiting and transient server errors)
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Methods retried by default; others are only retried when retries= is passed
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+
+class HttpClientError(Exception):
+    """Transport-level failure (connection error, timeout, bad status on raise_for_status)."""
+
+    def __init__(self, message, url=None, cause=None):
+        super().__init__(message)
+        self.url = url
+        self.cause = cause
+
+
+class HttpTimeoutError(HttpClientError):
+    """The request did not complete within its timeout."""
+
+
+class HttpStatusError(HttpClientError):
+    """Raised by HttpResponse.raise_for_status for 4xx/5xx responses."""
+
+    def __init__(self, message, response):
+        super().__init__(message, url=response.url)
+        self.response = response
+
+
+class HttpResponse:
+    """Backend-independent response (same surface as the parts of requests.Response we use)."""
+
+    def __init__(self, url, status_code, headers, content, reason="", elapsed=0.0):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.reason = reason
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        content_type = self.headers.get("Content-Type", "")
+        encoding = "utf-8"
+        if "charset=" in content_type:
+            encoding = content_type.split("charset=", 1)[1].split(";", 1)[0].strip() or encoding
+        try:
+            return self.content.decode(encoding, errors="replace")
+        except LookupError:
+            return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        """Decode the body as JSON (raises json.JSONDecodeError/ValueError)."""
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HttpStatusError(f"{self.status_code} {self.reason} for url: {self.url}", self)
+
+
+class AsyncHttpClient:
+    """One asyncio event loop on one background thread serving every HTTP caller.
+
+    Requests can be awaited on the loop (``request_async``), submitted from any
+    thread (``submit`` returns a concurrent Future) or made blocking from
+    worker threads (``request``). Concurrency is capped globally and per host,
+    transient failures are retried with exponential backoff, and counters are
+    kept per host (see ``get_metrics``).
+    """
+
+    def __init__(self, max_connections=32, max_per_host=6, timeout=30, retries=2,
+                 backoff_base=0.5, backoff_max=8.0, headers=None, logger=None):
+        """Initialize the client (call start() before use).
+
+        Args:
+            max_connections: Maximum requests in flight overall (default: 32)
+            max_per_host: Maximum requests in flight per host (default: 6)
+            timeout: Default timeout in seconds (default: 30)
+            retries: Default retry count for idempotent requests (default: 2)
+            backoff_base: First retry delay in seconds, doubled per attempt (default: 0.5)
+            backoff_max: Maximum retry delay in seconds (default: 8.0)
+            headers: Headers sent with every request (optional)
+            logger: Logger instance (optional)
+        """
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.headers = dict(headers or {})
+        self.logger = logger or logging.getLogger(__name__)
+        self.configured = False  # Set once configure() applied the app's settings
+
+        self._loop = None
+        self._thread = None
+        self._started = threading.Event()
+        self._start_lock = threading.Lock()
+
+        # Created on the loop thread
+        self._global_limit = None
+        self._host_limits = {}
+        self._async_client = None
+        self._executor = None
+        self._local = threading.local()
+
+        self._metrics_lock = threading.Lock()
+        self._metrics = self._empty_metrics()
+        self._host_metrics = {}
+
+    def configure(self, config):
+        """Apply the ``http_*`` settings from a Config object.
+
+        Call before start() where possible. On a running client the new
+        limits apply to requests started afterwards, but the transport's
+        connection pool keeps the size it was started with.
+
+        Args:
+            config: Config object (http_max_connections, http_max_per_host,
+                    http_timeout, http_retries)
+        """
+        self.max_connections = int(config.get("http_max_connections", self.max_connections))
+        self.max_per_host = int(config.get("http_max_per_host", self.max_per_host))
+        self.timeout = float(config.get("http_timeout", self.timeout))
+        self.retries = int(config.get("http_retries", self.retries))
+        self.configured = True
+        if self.is_running():
+            if threading.current_thread() is self._thread:
+                self._reset_limits()
+            else:
+                self._loop.call_soon_threadsafe(self._reset_limits)
+            self.logger.info(f"HTTP client reconfigured while running ({self.max_connections} connections, "
+                             f"{self.max_per_host} per host)")
+
+    def _reset_limits(self):
+        # Loop thread only; requests already holding the old semaphores release those
+        self._global_limit = asyncio.Semaphore(self.max_connections)
+        self._host_limits = {}
+
+    # --- Lifecycle ---
+
+    @property
+    def backend(self):
+        return "httpx" if httpx is not None else "requests"
+
+    def is_running(self):
+        return self._loop is not None and self._loop.is_running()
+
+    def start(self):
+        """Start the event loop thread (idempotent)."""
+        with self._start_lock:
+            if self.is_running():
+                return
+            if httpx is None and requests is None:
+                raise HttpClientError("Neither httpx nor requests is installed")
+            self._started.clear()
+            self._thread = threading.Thread(target=self._run_loop, name="http-client-loop", daemon=True)
+            self._thread.start()
+        self._started.wait(timeout=10)
+        self.logger.info(f"HTTP client started ({self.backend} backend, "
+                         f"{self.max_connections} connections, {self.max_per_host} per host)")
+
+    def stop(self, timeout=5):
+        """Close connections and stop the event loop thread."""
+        loop = self._loop
+        if loop is None or not loop.is_running():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close(), loop).result(timeout=timeout)
+        except Exception as e:
+            self.logger.warning(f"Error closing HTTP client: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        self._loop = None
+        self.logger.info("HTTP client stopped")
+
+    def _run_loop(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._reset_limits()
+        if httpx is not None:
+            limits = httpx.Limits(max_connections=self.max_connections,
+                                  max_keepalive_connections=self.max_connections)
+            self._async_client = httpx.AsyncClient(limits=limits, headers=self.headers,
+                                                   follow_redirects=True)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_connections,
+                                                thread_name_prefix="http-client-io")
+        loop.call_soon(self._started.set)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    async def _close(self):
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    # --- Public API ---
+
+    async def request_async(self, method, url, params=None, json=None, data=None,
+                            headers=None, timeout=None, retries=None):
+        """Perform a request on the loop thread.
+
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            params: Query parameters (optional)
+            json: JSON body (optional)
+            data: Form/raw body (optional)
+            headers: Extra headers (optional)
+            timeout: Seconds before giving up (default: client timeout)
+            retries: Retry count for transient failures (default: client retries
+                for idempotent methods, 0 otherwise)
+
+        Returns:
+            HttpResponse (any status; call raise_for_status() to reject errors)
+
+        Raises:
+            HttpTimeoutError: The final attempt timed out
+            HttpClientError: The final attempt failed at the transport level
+        """
+        method = method.upper()
+        timeout = self.timeout if timeout is None else timeout
+        if retries is None:
+            retries = self.retries if method in IDEMPOTENT_METHODS else 0
+        host = urlsplit(url).netloc or "unknown"
+        host_limit = self._host_limits.get(host)
+        if host_limit is None:
+            host_limit = self._host_limits[host] = asyncio.Semaphore(self.max_per_host)
+
+        self._count(host, "requests")
+        attempt = 0
+        while True:
+            self._count(host, "attempts")
+            started = time.monotonic()
+            error = None
+            response = None
+            async with self._global_limit, host_limit:
+                self._count(host, "in_flight")
+                try:
+                    response = await self._send(method, url, params, json, data, headers, timeout)
+                except HttpClientError as e:
+                    error = e
+                finally:
+                    self._count(host, "in_flight", -1)
+            elapsed = time.monotonic() - started
+            self._count(host, "total_time", elapsed)
+
+            retryable = error is not None or response.status_code in RETRYABLE_STATUS_CODES
+            if retryable and attempt < retries:
+                delay = self._backoff_delay(attempt, response)
+                attempt += 1
+                self._count(host, "retries")
+                reason = str(error) if error else f"status {response.status_code}"
+                self.logger.warning(f"{method} {url} failed ({reason}), retrying in {delay:.1f}s "
+                                    f"({attempt}/{retries})")
+                await asyncio.sleep(delay)
+                continue
+
+            if error is not None:
+                self._count(host, "timeouts" if isinstance(error, HttpTimeoutError) else "failures")
+                raise error
+            response.elapsed = elapsed
+            self._count(host, "bytes", len(response.content or b""))
+            if not response.ok:
+                self._count(host, "error_responses")
+            return response
+
+    def submit(self, method, url, **kwargs):
+        """Schedule a request from any thread.
+
+        Returns:
+            concurrent.futures.Future resolving to an HttpResponse
+        """
+        if not self.is_running():
+            self.start()
+        return asyncio.run_coroutine_threadsafe(self.request_async(method, url, **kwargs), self._loop)
+
+    def run_coroutine(self, coroutine):
+        """Run a coroutine (e.g. one awaiting several request_async calls) on the client's loop.
+
+        Returns:
+            concurrent.futures.Future resolving to the coroutine's result
+        """
+        if not self.is_running():
+            self.start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    def request(self, method, url, **kwargs):
+        """Blocking request for worker threads (never call from the loop thread).
+
+        Accepts the same keyword arguments as request_async.
+
+        Raises:
+            HttpTimeoutError: Also when the request is still queued behind the
+                connection limits once the overall bound has passed
+        """
+        if self._loop is not None and threading.current_thread() is self._thread:
+            raise RuntimeError("AsyncHttpClient.request() would deadlock on the loop thread; await request_async()")
+        future = self.submit(method, url, **kwargs)
+        return self._wait(future, url, kwargs)
+
+    def _wait(self, future, url, kwargs):
+        # Generous outer bound: every attempt has its own timeout plus backoff
+        timeout = kwargs.get("timeout") or self.timeout
+        retries = kwargs.get("retries")
+        attempts = 1 + (self.retries if retries is None else retries)
+        bound = attempts * (timeout + self.backoff_max) + 5
+        try:
+            return future.result(timeout=bound)
+        except FutureTimeoutError as e:
+            future.cancel()
+            raise HttpTimeoutError(f"No response within {bound:.0f}s (waiting on connection limits?)",
+                                   url=url, cause=e)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def gather(self, requests_to_send):
+        """Send several requests concurrently from a worker thread.
+
+        Args:
+            requests_to_send: Iterable of (method, url, kwargs) tuples
+
+        Returns:
+            List of HttpResponse or HttpClientError, in input order
+        """
+        submitted = [(self.submit(method, url, **(kwargs or {})), url, kwargs or {})
+                     for method, url, kwargs in requests_to_send]
+        results = []
+        for future, url, kwargs in submitted:
+            try:
+                results.append(self._wait(future, url, kwargs))
+            except HttpClientError as e:
+                results.append(e)
+        return results
+
+    async def gather_async(self, requests_to_send):
+        """Send several requests concurrently on the loop thread.
+
+        Args:
+            requests_to_send: Iterable of (method, url, kwargs) tuples
+
+        Returns:
+            List of HttpResponse or HttpClientError, in input order
+        """
+        async def send(method, url, kwargs):
+            try:
+                return await self.request_async(method, url, **(kwargs or {}))
+            except HttpClientError as e:
+                return e
+
+        return list(await asyncio.gather(*(send(method, url, kwargs) for method, url, kwargs in requests_to_send)))
+
+    def get_metrics(self):
+        """Return a snapshot of the request counters.
+
+        Returns:
+            Dict with overall counters and a ``hosts`` mapping of per-host counters
+        """
+        with self._metrics_lock:
+            snapshot = dict(self._metrics)
+            snapshot["hosts"] = {host: dict(values) for host, values in self._host_metrics.items()}
+        snapshot["backend"] = self.backend
+        return snapshot
+
+    # --- Internal helpers ---
+
+    async def _send(self, method, url, params, json_body, data, headers, timeout):
+        merged = dict(self.headers)
+        if headers:
+            merged.update(headers)
+        if self._async_client is not None:
+            try:
+                response = await self._async_client.request(method, url, params=params, json=json_body,
+                                                             data=data, headers=merged, timeout=timeout)
+            except httpx.TimeoutException as e:
+                raise HttpTimeoutError(f"Timed out after {timeout}s", url=url, cause=e)
+            except httpx.HTTPError as e:
+                raise HttpClientError(str(e), url=url, cause=e)
+            return HttpResponse(str(response.url), response.status_code, response.headers,
+                                response.content, response.reason_phrase)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._send_blocking, method, url,
+                                          params, json_body, data, merged, timeout)
+
+    def _send_blocking(self, method, url, params, json_body, data, headers, timeout):
+        # One pooled session per executor thread (Session is not thread-safe)
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        try:
+            response = session.request(method, url, params=params, json=json_body, data=data,
+                                       headers=headers, timeout=timeout)
+        except requests.exceptions.Timeout as e:
+            raise HttpTimeoutError(f"Timed out after {timeout}s", url=url, cause=e)
+        except requests.exceptions.RequestException as e:
+            raise HttpClientError(str(e), url=url, cause=e)
+        return HttpResponse(response.url, response.status_code, response.headers,
+                            response.content, response.reason or "")
+
+    def _backoff_delay(self, attempt, response=None):
+        """Exponential backoff with jitter, honouring Retry-After when present."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(float(retry_after), self.backoff_max)
+                except ValueError:
+                    pass
+        delay = min(self.backoff_base * (2 ** attempt), self.backoff_max)
+        return delay * random.uniform(0.5, 1.0)
+
+    @staticmethod
+    def _empty_metrics():
+        return {"requests": 0, "attempts": 0, "retries": 0, "failures": 0, "timeouts": 0,
+                "error_responses": 0, "in_flight": 0, "bytes": 0, "total_time": 0.0}
+
+    def _count(self, host, name, amount=1):
+        with self._metrics_lock:
+            self._metrics[name] += amount
+            host_metrics = self._host_metrics.get(host)
+            if host_metrics is None:
+                host_metrics = self._host_metrics[host] = self._empty_metrics()
+            host_metrics[name] += amount
+
+
+if QObject is not None:
+    class QtHttpBridge(QObject):
+        """Delivers futures from the HTTP loop thread to callbacks on the Qt GUI thread.
+
+        Create it on the GUI thread (e.g. owned by MainWindow); the signal is
+        queued across threads, so callbacks may safely touch widgets.
+        """
+
+        _deliver = pyqtSignal(object, object)
+
+        def __init__(self, parent=None):
+            super().__init__(parent)
+            self._deliver.connect(self._on_deliver)
+
+        def watch(self, future, on_result=None, on_error=None):
+            """Call ``on_result(result)`` or ``on_error(message)`` on the GUI thread when ``future`` completes.
+
+            Nothing is called if the future is cancelled.
+
+            Args:
+                future: concurrent.futures.Future (e.g. from AsyncHttpClient.submit)
+                on_result: Callable taking the result (optional)
+                on_error: Callable taking the error message string (optional)
+
+            Returns:
+                The same future
+            """
+            future.add_done_callback(lambda done: self._deliver.emit(done, (on_result, on_error)))
+            return future
+
+        def _on_deliver(self, future, callbacks):
+            on_result, on_error = callbacks
+            if future.cancelled():
+                return  # Whoever cancelled it no longer wants the outcome
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.debug(f"HTTP request failed: {e}")
+                if on_error:
+                    on_error(str(e))
+                return
+            if on_result:
+                on_result(result)
+else:
+    QtHttpBridge = None
+
+
+# --- Shared instance ---
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+
+def get_http_client(config=None):
+    """Return the process-wide HTTP client, starting it on first use.
+
+    Args:
+        config: Config object applied with ``configure`` unless the client
+                already was configured (optional)
+
+    Returns:
+        AsyncHttpClient instance
+    """
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = AsyncHttpClient(logger=logger)
+        client = _shared_client
+        if config is not None and not client.configured:
+            client.configure(config)
+    client.start()
+    return client
+
+
+def shutdown_http_client():
+    """Stop the shared HTTP client if it was started."""
+    global _shared_client
+    with _shared_lock:
+        client, _shared_client = _shared_client, None
+    if client is not None:
+        client.stop()
@@ -0,0 +1,207 @@
+# utils/instrumentation.py - Lightweight timing spans, counters and latency histograms
+# Standard library only, so any layer (API clients, loaders, Qt modules) can use it
+import os
+import json
+import math
+import time
+import logging
+import threading
+import functools
+from contextlib import contextmanager
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Histogram buckets grow geometrically by 2**(1/4) (~19%) from 10 microseconds,
+# so percentiles are accurate to within one bucket for any latency up to hours
+_BUCKET_BASE_MS = 0.01
+_BUCKETS_PER_DOUBLING = 4
+_BUCKET_COUNT = 4 * 30
+
+
+class LatencyHistogram:
+    """Fixed-memory latency histogram with percentile estimates."""
+
+    def __init__(self):
+        self.counts = [0] * _BUCKET_COUNT
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = 0.0
+        self.errors = 0
+
+    @staticmethod
+    def _bucket(ms):
+        if ms <= _BUCKET_BASE_MS:
+            return 0
+        index = int(math.log2(ms / _BUCKET_BASE_MS) * _BUCKETS_PER_DOUBLING) + 1
+        return min(index, _BUCKET_COUNT - 1)
+
+    @staticmethod
+    def _bucket_upper(index):
+        return _BUCKET_BASE_MS * 2 ** (index / _BUCKETS_PER_DOUBLING)
+
+    def add(self, ms, error=False):
+        """Record one duration in milliseconds."""
+        self.counts[self._bucket(ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.min_ms = ms if self.min_ms is None else min(self.min_ms, ms)
+        self.max_ms = max(self.max_ms, ms)
+        if error:
+            self.errors += 1
+
+    def percentile(self, p):
+        """Estimate the p-th percentile (0-100) in milliseconds, or None if empty."""
+        if not self.count:
+            return None
+        rank = max(self.count * p / 100.0, 1.0)
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                # Interpolate inside the bucket, clamped to the observed range
+                lower = self._bucket_upper(index - 1) if index else 0.0
+                upper = self._bucket_upper(index)
+                estimate = lower + (upper - lower) * (rank - seen) / bucket_count
+                return min(max(estimate, self.min_ms), self.max_ms)
+            seen += bucket_count
+        return self.max_ms
+
+    def summary(self):
+        """Return count, errors, mean, p50/p95/p99, min and max (milliseconds)."""
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'mean_ms': self.total_ms / self.count if self.count else None,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'p99_ms': self.percentile(99),
+            'min_ms': self.min_ms,
+            'max_ms': self.max_ms if self.count else None,
+        }
+
+
+class Instrumentation:
+    """Thread-safe registry of operation latencies and counters.
+
+    Operations are dotted names such as ``sharepoint.graph.GET`` or
+    ``csv.parse.customers.csv``. Durations go into a LatencyHistogram per
+    operation; counters are plain integers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+        self.started = datetime.now()
+
+    @contextmanager
+    def span(self, name):
+        """Context manager timing the enclosed block as one sample of ``name``.
+
+        Exceptions propagate and are counted as errors of the operation.
+        """
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.record(name, time.perf_counter() - start, error=error)
+
+    def timed(self, name=None):
+        """Decorator timing every call of the function (default name: module.qualname)."""
+        def decorator(func):
+            operation = name or f"{func.__module__}.{func.__qualname__}"
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(operation):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record(self, name, seconds, error=False):
+        """Record a duration measured elsewhere.
+
+        Args:
+            name: Operation name
+            seconds: Duration in seconds
+            error: Whether the operation failed
+        """
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            histogram.add(seconds * 1000.0, error=error)
+
+    def increment(self, name, amount=1):
+        """Add ``amount`` to the counter ``name``."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def snapshot(self):
+        """Return the per-operation summaries and counters as a JSON-serialisable dict."""
+        with self._lock:
+            operations = {name: histogram.summary() for name, histogram in sorted(self._histograms.items())}
+            counters = dict(sorted(self._counters.items()))
+        return {'since': self.started.isoformat(timespec='seconds'),
+                'operations': operations, 'counters': counters}
+
+    def reset(self):
+        """Discard all recorded data."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self.started = datetime.now()
+
+    def dump(self, report_dir, extra=None):
+        """Write the snapshot to ``performance_<timestamp>.json`` in report_dir.
+
+        Args:
+            report_dir: Directory for the report (created if missing)
+            extra: Optional dict merged into the report (e.g. HTTP or task metrics)
+
+        Returns:
+            Path of the written report
+        """
+        report = self.snapshot()
+        report['created'] = datetime.now().isoformat(timespec='seconds')
+        if extra:
+            report.update(extra)
+        os.makedirs(report_dir, exist_ok=True)
+        path = os.path.join(report_dir, f"performance_{datetime.now():%Y%m%d_%H%M%S}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, default=str)
+        logger.info(f"Performance report written to {path}")
+        return path
+
+
+_instrumentation = Instrumentation()
+
+
+def get_instrumentation():
+    """Return the process-wide Instrumentation registry."""
+    return _instrumentation
+
+
+def span(name):
+    """Time a block as one sample of ``name`` on the process-wide registry."""
+    return _instrumentation.span(name)
+
+
+def timed(name=None):
+    """Decorator timing a function on the process-wide registry."""
+    return _instrumentation.timed(name)
+
+
+def record_duration(name, seconds, error=False):
+    """Record a duration (seconds) on the process-wide registry."""
+    _instrumentation.record(name, seconds, error=error)
+
+
+def increment(name, amount=1):
+    """Increment a counter on the process-wide registry."""
+    _instrumentation.increment(name, amount)
@@ -9,16 +9,19 @@ from .oauth_client import JohnDeereOAuthClient
 class JDAuthManager:
     """Manager for John Deere API authentication."""
     
-    def __init__(self, config=None, logger=None):
+    def __init__(self, config=None, logger=None, token_broker=None):
         """Initialize the auth manager.
         
         Args:
             config: Application configuration
             logger: Logger instance
+            token_broker: Shared TokenBroker for the JD token (optional)
         """
         self.config = config
         self.logger = logger or logging.getLogger(__name__)
+        self.token_broker = token_broker
         self.cache_path = getattr(config, 'cache_path', None) if config else None
+        self.issuer_url = config.get('jd_oauth_issuer_url') if config is not None and hasattr(config, 'get') else None
         
         # Get credentials from environment or config
         self.client_id = os.getenv('JD_CLIENT_ID', '')
@@ -38,7 +41,8 @@ class JDAuthManager:
                 client_id=self.client_id,
                 client_secret=self.client_secret,
                 cache_path=self.cache_path,
-                logger=self.logger
+                logger=self.logger,
+                issuer_url=self.issuer_url
             )
     
     def get_access_token(self, force_refresh=False):
@@ -50,6 +54,10 @@ class JDAuthManager:
         Returns:
             Access token string or None if failed
         """
+        # The broker holds the token in memory and refreshes it ahead of expiry
+        if self.token_broker:
+            return self.token_broker.refresh() if force_refresh else self.token_broker.get_token()
+        
         # Check if we have an OAuth client
         if not self.oauth_client:
             # Try to create one if we have credentials
@@ -58,7 +66,8 @@ class JDAuthManager:
                     client_id=self.client_id,
                     client_secret=self.client_secret,
                     cache_path=self.cache_path,
-                    logger=self.logger
+                    logger=self.logger,
+                    issuer_url=self.issuer_url
                 )
             else:
                 # Show dialog to get credentials
@@ -79,7 +88,8 @@ class JDAuthManager:
                         client_id=self.client_id,
                         client_secret=self.client_secret,
                         cache_path=self.cache_path,
-                        logger=self.logger
+                        logger=self.logger,
+                        issuer_url=self.issuer_url
                     )
                 else:
                     self.logger.error("No credentials provided")
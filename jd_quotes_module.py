@@ -1,21 +1,22 @@
 from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
                             QTableWidget, QTableWidgetItem, QComboBox,
                             QDateEdit, QMessageBox, QDialog, QFormLayout,
-                            QLineEdit, QTextEdit, QDialogButtonBox, QHeaderView)
-from PyQt5.QtCore import Qt, QDate
+                            QLineEdit, QTextEdit, QDialogButtonBox, QHeaderView,
+                            QWidget, QTableView, QAbstractItemView, QMenu)
+from PyQt5.QtCore import (Qt, QDate, QTimer, QAbstractTableModel, QModelIndex,
+                          QSortFilterProxyModel, pyqtSignal)
 import logging
 import traceback
-import requests
-import time
 import json
 from datetime import datetime, timedelta
 
+from utils.instrumentation import timed
+
 # Try to import as much as possible, with fallbacks
 try:
     from ui.base_module import BaseModule
 except ImportError:
     # Create a fallback BaseModule if the original can't be imported
-    from PyQt5.QtWidgets import QWidget
     class BaseModule(QWidget):
         def __init__(self, main_window):
             super().__init__()
@@ -61,9 +62,174 @@ except ImportError:
                 quote["expirationDate"] = expiration_date
             return quote
 
+try:
+    from api.QuoteStore import parse_quote_date
+except ImportError:
+    def parse_quote_date(value):
+        try:
+            return datetime.strptime(str(value), "%m/%d/%Y")
+        except (TypeError, ValueError):
+            return None
+
+# Quote status IDs used by the Maintain Quotes API
+QUOTE_STATUS_TEXT = {
+    0: "Draft",
+    1: "Active",
+    2: "Expired",
+    3: "Closed-Won",
+    4: "Closed-Lost",
+    5: "Archived"
+}
+
+# Role holding a column's sort key (dates and IDs must not sort as text)
+SORT_ROLE = Qt.UserRole
+# Role holding a row's quote ID, on every column
+QUOTE_ID_ROLE = Qt.UserRole + 1
+
+DEALER_RACF_ID = "731804"  # Fixed dealer ID
+
+
+def quote_search_results(store, search_text, limit=50):
+    """Search a local QuoteStore and format the hits as search results.
+    
+    Args:
+        store: QuoteStore to query
+        search_text: Text to search for
+        limit: Maximum number of results
+        
+    Returns:
+        List of search result dicts, ranked by score
+    """
+    results = []
+    for quote, matched, score in store.search(search_text, limit=limit):
+        if matched == "customer":
+            customer_data = quote.get("customerData", {})
+            customer_name = f"{customer_data.get('customerFirstName', '')} {customer_data.get('customerLastName', '')}"
+            results.append({
+                'type': 'quote',
+                'title': f"Quote for {customer_name}",
+                'id': quote.get("quoteID"),
+                'details': f"Quote ID: {quote.get('quoteID')}, Name: {quote.get('quoteName', '')}",
+                'score': score
+            })
+        else:
+            results.append({
+                'type': 'quote',
+                'title': quote.get("quoteName", ""),
+                'id': quote.get("quoteID"),
+                'details': f"Quote ID: {quote.get('quoteID')}",
+                'score': score
+            })
+    return results
+
+
+def search_stored_quotes(main_window, search_text):
+    """Global search hook for when JDQuotesModule has not been created yet.
+    
+    Queries the local quote store through the main window's QuoteIntegration,
+    so quotes are searchable without building the module or calling the API.
+    
+    Args:
+        main_window: MainWindow holding ``quote_integration``
+        search_text: Text to search for
+        
+    Returns:
+        List of search results (same format as JDQuotesModule.search)
+    """
+    quote_integration = getattr(main_window, 'quote_integration', None)
+    if quote_integration is None or not hasattr(quote_integration, 'get_quote_store'):
+        return []
+    store = quote_integration.get_quote_store(DEALER_RACF_ID)
+    return quote_search_results(store, search_text) if store is not None else []
+
+
+class QuotesTableModel(QAbstractTableModel):
+    """Table model over a list of quote dictionaries.
+
+    Display strings and sort keys are computed once per load so that painting
+    and sorting thousands of quotes never touches the underlying dicts.
+    """
+
+    HEADERS = ["Quote ID", "Quote Name", "Customer", "Creation Date", "Expiration Date", "Status"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._quotes = []
+        self._rows = []       # per row: tuple of display strings
+        self._sort_keys = []  # per row: tuple of sort keys
+
+    def set_quotes(self, quotes):
+        """Replace the model contents.
+
+        Args:
+            quotes: List of quote dictionaries
+        """
+        self.beginResetModel()
+        self._quotes = list(quotes or [])
+        self._rows = []
+        self._sort_keys = []
+        for quote in self._quotes:
+            quote_id = str(quote.get("quoteID", ""))
+            customer_data = quote.get("customerData") or {}
+            customer_name = f"{customer_data.get('customerFirstName', '')} {customer_data.get('customerLastName', '')}"
+            creation_date = quote.get("creationDate", "") or ""
+            expiration_date = quote.get("expirationDate", "") or ""
+            status_id = quote.get("quoteStatusId", 0)
+            status_text = QUOTE_STATUS_TEXT.get(status_id, f"Unknown ({status_id})")
+
+            self._rows.append((quote_id, quote.get("quoteName", "") or "", customer_name,
+                               creation_date, expiration_date, status_text))
+            self._sort_keys.append((
+                quote_id.zfill(20) if quote_id.isdigit() else quote_id,
+                (quote.get("quoteName", "") or "").lower(),
+                customer_name.lower(),
+                self._date_key(creation_date),
+                self._date_key(expiration_date),
+                status_text,
+            ))
+        self.endResetModel()
+
+    @staticmethod
+    def _date_key(value):
+        parsed = parse_quote_date(value)
+        return parsed.toordinal() if parsed else 0
+
+    def quote_at(self, row):
+        """Return the quote dictionary for a source row, or None."""
+        if 0 <= row < len(self._quotes):
+            return self._quotes[row]
+        return None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.DisplayRole:
+            return self._rows[row][column]
+        if role == SORT_ROLE:
+            return self._sort_keys[row][column]
+        if role == QUOTE_ID_ROLE:
+            return self._rows[row][0]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+
 class JDQuotesModule(BaseModule):
     """Module for interacting with John Deere Quotes."""
     
+    # Emitted (from the broker's thread) once the first JD token acquisition settles
+    token_ready = pyqtSignal()
+    
     def __init__(self, main_window, logger=None, quote_integration=None):
         """Initialize the JD Quotes module.
         
@@ -86,12 +252,20 @@ class JDQuotesModule(BaseModule):
                 self.logger.error("QuoteIntegration not available on main_window either!")
         
         # Use fixed dealer ID instead of a dropdown
-        self.dealer_racf_id = "731804"  # Fixed dealer ID
+        self.dealer_racf_id = DEALER_RACF_ID
         self.dealer_account_no = "010102"  # Example account
         
         # Current quotes data
         self.quotes_data = []
         
+        # Open detail dialogs waiting for their details, keyed by quote ID
+        self._detail_dialogs = {}
+        self._prefetch_timer = None
+        self._prefetch_handle = None  # TaskHandle of the running prefetch, cancelled by the next one
+        
+        # Set while a sync is deferred until the JD token broker is ready
+        self._awaiting_token = False
+        
         # Now that all attributes are initialized, call parent constructor
         # This will indirectly call init_ui through the BaseModule class
         super().__init__(main_window)
@@ -132,6 +306,10 @@ class JDQuotesModule(BaseModule):
         self.end_date.setCalendarPopup(True)
         header_layout.addWidget(self.end_date)
         
+        # Changing the range only re-filters the local store
+        self.start_date.dateChanged.connect(self._on_date_range_changed)
+        self.end_date.dateChanged.connect(self._on_date_range_changed)
+        
         # Refresh button
         refresh_button = QPushButton("Refresh")
         refresh_button.clicked.connect(self.load_quotes)
@@ -149,20 +327,68 @@ class JDQuotesModule(BaseModule):
         self.status_label = QLabel("Ready")
         layout.addWidget(self.status_label)
         
-        # Add table
-        self.quotes_table = QTableWidget()
-        self.quotes_table.setColumnCount(7)
-        self.quotes_table.setHorizontalHeaderLabels([
-            "Quote ID", "Quote Name", "Customer", "Creation Date", 
-            "Expiration Date", "Status", "Actions"
-        ])
+        # Filter box and actions acting on the selected quote
+        actions_layout = QHBoxLayout()
+        actions_layout.addWidget(QLabel("Filter:"))
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter quotes by any column...")
+        actions_layout.addWidget(self.filter_edit)
+        
+        self.view_button = QPushButton("View")
+        self.view_button.clicked.connect(lambda: self.view_quote())
+        actions_layout.addWidget(self.view_button)
+        
+        self.edit_button = QPushButton("Edit")
+        self.edit_button.clicked.connect(lambda: self.edit_quote())
+        actions_layout.addWidget(self.edit_button)
+        
+        self.delete_button = QPushButton("Delete")
+        self.delete_button.clicked.connect(lambda: self.delete_quote())
+        actions_layout.addWidget(self.delete_button)
+        layout.addLayout(actions_layout)
+        
+        # Add table (model/view: no per-row widgets)
+        self.quotes_model = QuotesTableModel(self)
+        self.quotes_proxy = QSortFilterProxyModel(self)
+        self.quotes_proxy.setSourceModel(self.quotes_model)
+        self.quotes_proxy.setSortRole(SORT_ROLE)
+        self.quotes_proxy.setFilterKeyColumn(-1)  # Match any column
+        self.quotes_proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.filter_edit.textChanged.connect(self.quotes_proxy.setFilterFixedString)
+        self.filter_edit.textChanged.connect(self._schedule_prefetch)
+        
+        self.quotes_table = QTableView()
+        self.quotes_table.setModel(self.quotes_proxy)
+        self.quotes_table.setSortingEnabled(True)
+        self.quotes_table.sortByColumn(3, Qt.DescendingOrder)
+        self.quotes_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.quotes_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.quotes_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.quotes_table.setAlternatingRowColors(True)
+        self.quotes_table.verticalHeader().setVisible(False)
+        # Fixed row height avoids measuring every row
+        self.quotes_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.quotes_table.doubleClicked.connect(lambda index: self.view_quote())
+        self.quotes_table.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.quotes_table.customContextMenuRequested.connect(self._show_quotes_context_menu)
+        self.quotes_table.selectionModel().selectionChanged.connect(self._update_action_buttons)
         
         # Set table properties
         self.quotes_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.quotes_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
-        self.quotes_table.horizontalHeader().setSectionResizeMode(6, QHeaderView.ResizeToContents)
         
         layout.addWidget(self.quotes_table)
+        self._update_action_buttons()
+        
+        # Prefetch details for the rows on screen once scrolling settles
+        self._prefetch_timer = QTimer(self)
+        self._prefetch_timer.setSingleShot(True)
+        self._prefetch_timer.setInterval(300)
+        self._prefetch_timer.timeout.connect(self._prefetch_visible_details)
+        self.quotes_table.verticalScrollBar().valueChanged.connect(self._schedule_prefetch)
+        
+        # Queued across threads, so the deferred sync runs on the GUI thread
+        self.token_ready.connect(self._on_token_ready)
         
         # Set layout
         self.setLayout(layout)
@@ -175,11 +401,12 @@ class JDQuotesModule(BaseModule):
         self.load_quotes()
     
     def load_quotes(self):
-        """Load quotes from JD Quotes API with improved error handling and retries."""
-        # Try to refresh the token if available
-        if hasattr(self.main_window, 'refresh_jd_token'):
-            self.main_window.refresh_jd_token()
+        """Sync the local quote store with the API and show quotes for the selected range.
         
+        Quotes already in the local store are shown straight away; only
+        quotes modified since the last sync are requested from the API, on
+        the task scheduler so retries and backfills never block the window.
+        """
         if not self.quote_integration:
             self.logger.error("QuoteIntegration is not available.")
             self.show_error_message("Quote Integration Error", "Quote integration service is not available.")
@@ -189,68 +416,147 @@ class JDQuotesModule(BaseModule):
             self.logger.error("No dealer ID specified.")
             self.show_error_message("Dealer Error", "No dealer ID specified.")
             return
-            
-        self.status_label.setText(f"Loading quotes for dealer {self.dealer_racf_id}...")
-        self.quotes_table.setRowCount(0)  # Clear table
         
-        # Number of retries for API requests
-        max_retries = 3
-        retry_count = 0
+        if not hasattr(self.quote_integration, 'sync_quotes'):
+            self._load_quotes_from_api()
+            return
+        
+        # Show what we already have locally before going to the network
+        has_local = self.show_stored_quotes()
         
-        while retry_count <= max_retries:
+        # Sign-in runs in the background at startup; sync once it settles
+        if self._wait_for_token():
+            self.status_label.setText(f"Showing {has_local} locally stored quotes (waiting for JD sign-in...)")
+            return
+        
+        # Token prompts must happen on the GUI thread, before going to the background
+        if hasattr(self.quote_integration, 'ensure_token') and not self.quote_integration.ensure_token():
+            self._on_sync_result(None)
+            return
+        
+        self.status_label.setText(f"Syncing quotes for dealer {self.dealer_racf_id}...")
+        
+        run_background_task = getattr(self.main_window, 'run_background_task', None)
+        if not callable(run_background_task):
+            self.logger.warning("Running quote sync synchronously (no task scheduler access).")
             try:
-                # Format dates for API
-                start_date = self.start_date.date().toString("MM/dd/yyyy")
-                end_date = self.end_date.date().toString("MM/dd/yyyy")
-                
-                # Try to get quotes with default parameters
-                quotes = self.quote_integration.get_dealer_quotes(
-                    dealer_racf_id=self.dealer_racf_id,
-                    start_date=start_date,
-                    end_date=end_date
-                )
-                
-                if quotes and isinstance(quotes, list):
-                    self.quotes_data = quotes
-                    self.update_quotes_table()
-                    self.status_label.setText(f"Loaded {len(quotes)} quotes")
-                    return
-                elif retry_count < max_retries:
-                    # If failed but we have retries left, try to refresh the token and retry
-                    self.logger.warning(f"Failed to get quotes, retrying ({retry_count + 1}/{max_retries})...")
-                    self.status_label.setText(f"Retrying quote load... ({retry_count + 1}/{max_retries})")
-                    
-                    # Force token refresh on retry
-                    if hasattr(self.main_window, 'refresh_jd_token'):
-                        self.main_window.refresh_jd_token()
-                        
-                    retry_count += 1
-                    time.sleep(1)  # Brief delay before retry
-                    continue
-                else:
-                    # All retries failed
-                    self.quotes_data = []
-                    self.update_quotes_table()
-                    self.status_label.setText("No quotes found or error occurred")
-                    self.show_error_message("Load Error", "Failed to retrieve quotes after multiple attempts.")
-                    return
-                    
+                synced = self._sync_quotes_worker()
             except Exception as e:
-                self.logger.error(f"Error loading quotes: {str(e)}")
-                self.logger.error(traceback.format_exc())  # Log the full traceback
-                
-                if retry_count < max_retries:
-                    # If failed but we have retries left, retry
-                    retry_count += 1
-                    self.logger.warning(f"Exception during quote load, retrying ({retry_count}/{max_retries})...")
-                    self.status_label.setText(f"Retrying after error... ({retry_count}/{max_retries})")
-                    time.sleep(1)  # Brief delay before retry
-                    continue
-                else:
-                    # All retries failed
-                    self.show_error_message("Load Error", f"An error occurred while loading quotes: {str(e)}")
-                    self.status_label.setText("Error loading quotes.")
-                    return
+                self._on_sync_error((type(e), e, traceback.format_exc()))
+            else:
+                self._on_sync_result(synced)
+            return
+        
+        run_background_task(
+            self._sync_quotes_worker,
+            on_result=self._on_sync_result,
+            on_error=self._on_sync_error,
+            loading_message=None,  # The stored quotes stay usable while syncing
+            task_name="jd_quotes_sync",
+            dedup_key="jd_quotes_sync"  # Repeated refreshes join the sync in flight
+        )
+    
+    def _sync_quotes_worker(self):
+        """Background task for load_quotes.
+        
+        MaintainQuotesAPI handles token refresh and transient retries itself.
+        """
+        return self.quote_integration.sync_quotes(dealer_racf_id=self.dealer_racf_id)
+    
+    def _on_sync_result(self, synced):
+        """Refresh the table from the local store once a sync settles.
+        
+        Args:
+            synced: Number of quotes received, or None if the sync failed
+        """
+        if synced is not None:
+            count = self.show_stored_quotes()
+            self.status_label.setText(f"Showing {count} quotes ({synced} updated from JD Quotes)")
+        elif self.quotes_data:
+            # Keep showing the local copy
+            self.status_label.setText(f"Showing {len(self.quotes_data)} locally stored quotes "
+                                      f"(sync with JD Quotes failed)")
+        else:
+            self.status_label.setText("No quotes found or error occurred")
+            self.show_error_message("Load Error", "Failed to retrieve quotes from JD Quotes.")
+    
+    def _on_sync_error(self, error):
+        """Log a failed sync and fall back to the stored quotes."""
+        exc_type, exc_value, tb = error
+        self.logger.error(f"Error syncing quotes: {exc_value}")
+        self.logger.error(tb)  # Log the full traceback
+        self._on_sync_result(None)
+    
+    def _wait_for_token(self):
+        """Defer the sync if the JD token broker has not settled yet.
+        
+        Returns:
+            True if the sync was deferred until ``token_ready`` fires
+        """
+        broker = getattr(self.quote_integration, 'token_broker', None)
+        ready = getattr(broker, 'ready', None)
+        if ready is None or ready.done():
+            return False
+        if not self._awaiting_token:
+            self._awaiting_token = True
+            self.logger.info("JD token not ready yet; quote sync deferred")
+            ready.add_done_callback(lambda _future: self.token_ready.emit())
+        return True
+    
+    def _on_token_ready(self):
+        """Run the quote sync that was deferred until sign-in settled."""
+        if not self._awaiting_token:
+            return
+        self._awaiting_token = False
+        self.load_quotes()
+    
+    def show_stored_quotes(self):
+        """Populate the table from the local quote store for the selected date range.
+        
+        Returns:
+            Number of quotes shown
+        """
+        start_date = self.start_date.date().toString("MM/dd/yyyy")
+        end_date = self.end_date.date().toString("MM/dd/yyyy")
+        self.quotes_data = self.quote_integration.get_stored_quotes(
+            dealer_racf_id=self.dealer_racf_id,
+            start_date=start_date,
+            end_date=end_date
+        )
+        self.update_quotes_table()
+        return len(self.quotes_data)
+    
+    def _on_date_range_changed(self, _date=None):
+        """Re-filter the table from the local store when the date range changes."""
+        if self.quote_integration and hasattr(self.quote_integration, 'get_stored_quotes'):
+            count = self.show_stored_quotes()
+            self.status_label.setText(f"Showing {count} quotes")
+    
+    def _get_quote_store(self):
+        """Return the local quote store for this dealer, or None."""
+        if self.quote_integration and hasattr(self.quote_integration, 'get_quote_store'):
+            return self.quote_integration.get_quote_store(self.dealer_racf_id)
+        return None
+    
+    def _load_quotes_from_api(self):
+        """Load quotes directly from the API (used when no local store is available)."""
+        self.status_label.setText(f"Loading quotes for dealer {self.dealer_racf_id}...")
+        self.quotes_model.set_quotes([])  # Clear table
+        
+        try:
+            quotes = self.quote_integration.get_dealer_quotes(
+                dealer_racf_id=self.dealer_racf_id,
+                start_date=self.start_date.date().toString("MM/dd/yyyy"),
+                end_date=self.end_date.date().toString("MM/dd/yyyy")
+            )
+            self.quotes_data = quotes if isinstance(quotes, list) else []
+            self.update_quotes_table()
+            self.status_label.setText(f"Loaded {len(self.quotes_data)} quotes")
+        except Exception as e:
+            self.logger.error(f"Error loading quotes: {str(e)}")
+            self.logger.error(traceback.format_exc())
+            self.show_error_message("Load Error", f"An error occurred while loading quotes: {str(e)}")
+            self.status_label.setText("Error loading quotes.")
     
     def show_error_message(self, title, message):
         """Show an error message dialog.
@@ -265,68 +571,91 @@ class JDQuotesModule(BaseModule):
             # Fallback if UI fails
             print(f"UI ERROR [{title}]: {message} (Original error: {e})")
     
+    @timed("table.jd_quotes")
     def update_quotes_table(self):
         """Update the quotes table with current data."""
-        # Clear table
-        self.quotes_table.setRowCount(0)
+        self.quotes_model.set_quotes(self.quotes_data)
+        self._update_action_buttons()
         
-        # Add quotes to table
-        for row, quote in enumerate(self.quotes_data):
-            self.quotes_table.insertRow(row)
-            
-            # Quote ID
-            self.quotes_table.setItem(row, 0, QTableWidgetItem(str(quote.get("quoteID", ""))))
-            
-            # Quote Name
-            self.quotes_table.setItem(row, 1, QTableWidgetItem(quote.get("quoteName", "")))
-            
-            # Customer
-            customer_data = quote.get("customerData", {})
-            customer_name = f"{customer_data.get('customerFirstName', '')} {customer_data.get('customerLastName', '')}"
-            self.quotes_table.setItem(row, 2, QTableWidgetItem(customer_name))
-            
-            # Creation Date
-            creation_date = quote.get("creationDate", "")
-            self.quotes_table.setItem(row, 3, QTableWidgetItem(creation_date))
-            
-            # Expiration Date
-            expiration_date = quote.get("expirationDate", "")
-            self.quotes_table.setItem(row, 4, QTableWidgetItem(expiration_date))
-            
-            # Status
-            status_id = quote.get("quoteStatusId", 0)
-            status_text = self.get_status_text(status_id)
-            self.quotes_table.setItem(row, 5, QTableWidgetItem(status_text))
-            
-            # Actions
-            actions_cell = QTableWidgetItem("Actions")
-            actions_cell.setData(Qt.UserRole, quote.get("quoteID"))
-            self.quotes_table.setItem(row, 6, actions_cell)
-            
-            # Add action buttons
-            actions_widget = QWidget()
-            actions_layout = QHBoxLayout(actions_widget)
-            actions_layout.setContentsMargins(0, 0, 0, 0)
-            
-            # View button
-            view_button = QPushButton("View")
-            view_button.setProperty("quote_id", quote.get("quoteID"))
-            view_button.clicked.connect(self.view_quote)
-            actions_layout.addWidget(view_button)
-            
-            # Edit button
-            edit_button = QPushButton("Edit")
-            edit_button.setProperty("quote_id", quote.get("quoteID"))
-            edit_button.clicked.connect(self.edit_quote)
-            actions_layout.addWidget(edit_button)
-            
-            # Delete button
-            delete_button = QPushButton("Delete")
-            delete_button.setProperty("quote_id", quote.get("quoteID"))
-            delete_button.clicked.connect(self.delete_quote)
-            actions_layout.addWidget(delete_button)
-            
-            self.quotes_table.setCellWidget(row, 6, actions_widget)
+        self._schedule_prefetch()
+    
+    def _schedule_prefetch(self, _value=None):
+        """Restart the prefetch timer (debounces scrolling)."""
+        if self._prefetch_timer is not None:
+            self._prefetch_timer.start()
+    
+    def _visible_quote_ids(self):
+        """Return the quote IDs of the rows currently visible in the table."""
+        row_count = self.quotes_proxy.rowCount()
+        if row_count == 0:
+            return []
+        first = self.quotes_table.rowAt(0)
+        last = self.quotes_table.rowAt(self.quotes_table.viewport().height() - 1)
+        first = max(first, 0)
+        last = row_count - 1 if last < 0 else last
+        
+        quote_ids = []
+        for row in range(first, last + 1):
+            quote_id = self.quotes_proxy.index(row, 0).data(QUOTE_ID_ROLE)
+            if quote_id:
+                quote_ids.append(quote_id)
+        return quote_ids
+    
+    def _selected_quote_id(self):
+        """Return the quote ID of the selected row, or None."""
+        rows = self.quotes_table.selectionModel().selectedRows()
+        if not rows:
+            return None
+        return rows[0].data(QUOTE_ID_ROLE)
+    
+    def _update_action_buttons(self, *_args):
+        """Enable the View/Edit/Delete buttons only when a quote is selected."""
+        has_selection = self._selected_quote_id() is not None
+        for button in (self.view_button, self.edit_button, self.delete_button):
+            button.setEnabled(has_selection)
+    
+    def _show_quotes_context_menu(self, pos):
+        """Show View/Edit/Delete actions for the quote under the cursor."""
+        index = self.quotes_table.indexAt(pos)
+        if not index.isValid():
+            return
+        self.quotes_table.selectRow(index.row())
+        quote_id = index.data(QUOTE_ID_ROLE)
+        
+        menu = QMenu(self)
+        menu.addAction("View", lambda: self.view_quote(quote_id))
+        menu.addAction("Edit", lambda: self.edit_quote(quote_id))
+        menu.addAction("Delete", lambda: self.delete_quote(quote_id))
+        menu.exec_(self.quotes_table.viewport().mapToGlobal(pos))
+    
+    def _prefetch_visible_details(self):
+        """Fetch details for visible quotes in the background so opening them is instant."""
+        if not self.quote_integration or not hasattr(self.quote_integration, 'prefetch_quote_details'):
+            return
+        run_background_task = getattr(self.main_window, 'run_background_task', None)
+        if not callable(run_background_task):
+            return
+        
+        quote_ids = self._visible_quote_ids()
+        if not quote_ids:
+            return
+        
+        # Only the rows on screen now matter; the previous prefetch stops at its next quote
+        if self._prefetch_handle is not None and self._prefetch_handle.is_active():
+            self._prefetch_handle.cancel()
+        self._prefetch_handle = run_background_task(
+            self._prefetch_worker, quote_ids,
+            on_error=lambda error: self.logger.debug(f"Quote detail prefetch failed: {error.exc_value}"),
+            loading_message=None,
+            task_name="jd_quotes_prefetch",
+            priority=-1,  # Behind user-initiated loads
+            dedup_key="jd_quotes_prefetch"
+        )
+    
+    def _prefetch_worker(self, quote_ids, cancel_token=None):
+        """Background task for _prefetch_visible_details."""
+        return self.quote_integration.prefetch_quote_details(quote_ids, dealer_account_no=self.dealer_account_no,
+                                                             cancel_token=cancel_token)
     
     def get_status_text(self, status_id):
         """Get text representation of quote status.
@@ -337,47 +666,120 @@ class JDQuotesModule(BaseModule):
         Returns:
             Status text
         """
-        status_map = {
-            0: "Draft",
-            1: "Active",
-            2: "Expired",
-            3: "Closed-Won",
-            4: "Closed-Lost",
-            5: "Archived"
-        }
-        
-        return status_map.get(status_id, f"Unknown ({status_id})")
-    
-    def view_quote(self):
-        """View a quote's details."""
-        button = self.sender()
-        quote_id = button.property("quote_id")
+        return QUOTE_STATUS_TEXT.get(status_id, f"Unknown ({status_id})")
+    
+    def view_quote(self, quote_id=None):
+        """View a quote's details.
+        
+        Args:
+            quote_id: Quote ID (defaults to the selected quote)
+        """
+        quote_id = quote_id or self._selected_quote_id()
         
         if not quote_id:
             return
         
+        self.open_quote_details(quote_id)
+    
+    def open_quote_details(self, quote_id):
+        """Open the details dialog for a quote without blocking the UI.
+        
+        Cached details are shown straight away. Otherwise the dialog opens
+        with the summary data already loaded and fills in once the full
+        details arrive from a background fetch.
+        
+        Args:
+            quote_id: Quote ID
+        """
+        if not self.quote_integration or not hasattr(self.quote_integration, 'get_quote_details'):
+            self.logger.error("QuoteIntegration doesn't have get_quote_details method")
+            self.show_error_message(
+                "API Error", 
+                "Quote details feature is not available."
+            )
+            return
+        
+        # Bring an already open dialog for this quote to the front
+        dialog = self._detail_dialogs.get(str(quote_id))
+        if dialog is not None:
+            dialog.raise_()
+            dialog.activateWindow()
+            return
+        
+        detail_cache = getattr(self.quote_integration, 'detail_cache', None)
+        cached = detail_cache.get(quote_id) if detail_cache is not None else None
+        if cached is not None:
+            dialog = self._create_quote_details_dialog(cached)
+            dialog.show()
+            return
+        
+        run_background_task = getattr(self.main_window, 'run_background_task', None)
+        if not callable(run_background_task):
+            self._load_quote_details_sync(quote_id)
+            return
+        
+        # Token prompts must happen on the GUI thread, before going to the background
+        if hasattr(self.quote_integration, 'ensure_token') and not self.quote_integration.ensure_token():
+            self.show_error_message("Authentication Error", "A John Deere API token is required to load quote details.")
+            return
+        
+        summary = self._find_quote_summary(quote_id) or {"quoteID": quote_id}
+        dialog = self._create_quote_details_dialog(summary, loading=True)
+        key = str(quote_id)
+        self._detail_dialogs[key] = dialog
+        dialog.finished.connect(lambda _result, key=key: self._detail_dialogs.pop(key, None))
+        dialog.show()
+        
+        run_background_task(
+            self._quote_details_worker, quote_id,
+            on_result=lambda details, key=key: self._on_quote_details_loaded(key, details),
+            on_error=lambda error, key=key: self._on_quote_details_error(key, error.exc_value),
+            loading_message=None,  # The dialog shows its own loading state
+            task_name="jd_quote_details",
+            dedup_key=f"jd_quote_details:{quote_id}"
+        )
+    
+    def _quote_details_worker(self, quote_id):
+        """Background task for open_quote_details."""
+        return self.quote_integration.get_quote_details(
+            quote_id=quote_id,
+            dealer_account_no=self.dealer_account_no
+        )
+    
+    def _on_quote_details_loaded(self, key, quote_details):
+        """Fill an open detail dialog once its details arrive."""
+        dialog = self._detail_dialogs.get(key)
+        if dialog is None:
+            return  # Dialog was closed while loading; details stay cached
+        if not quote_details:
+            self._on_quote_details_error(key, "No details returned")
+            return
+        self._set_quote_details_content(dialog, quote_details)
+    
+    def _on_quote_details_error(self, key, error):
+        """Show a load failure inside an open detail dialog."""
+        self.logger.error(f"Failed to load quote details for Quote {key}: {error}")
+        dialog = self._detail_dialogs.get(key)
+        if dialog is not None and dialog.status_label is not None:
+            dialog.status_label.setText(f"Failed to load quote details: {error}")
+            dialog.status_label.setStyleSheet("color: red;")
+    
+    def _load_quote_details_sync(self, quote_id):
+        """Load and show quote details on the GUI thread (no thread pool available)."""
         self.main_window.show_loading(f"Loading Quote {quote_id}...")
         
         try:
-            # Get quote details
-            if hasattr(self.quote_integration, 'get_quote_details'):
-                quote_details = self.quote_integration.get_quote_details(
-                    quote_id=quote_id,
-                    dealer_account_no=self.dealer_account_no
-                )
-                
-                if quote_details:
-                    self.show_quote_details_dialog(quote_details)
-                else:
-                    self.show_error_message(
-                        "Error", 
-                        f"Failed to load quote details for Quote {quote_id}"
-                    )
+            quote_details = self.quote_integration.get_quote_details(
+                quote_id=quote_id,
+                dealer_account_no=self.dealer_account_no
+            )
+            
+            if quote_details:
+                self.show_quote_details_dialog(quote_details)
             else:
-                self.logger.error("QuoteIntegration doesn't have get_quote_details method")
                 self.show_error_message(
-                    "API Error", 
-                    "Quote details feature is not available."
+                    "Error", 
+                    f"Failed to load quote details for Quote {quote_id}"
                 )
                 
         except Exception as e:
@@ -390,18 +792,82 @@ class JDQuotesModule(BaseModule):
         finally:
             self.main_window.hide_loading()
     
+    def _find_quote_summary(self, quote_id):
+        """Return the summary record for a quote from the local store or current list."""
+        store = self._get_quote_store()
+        if store is not None:
+            quote = store.get(quote_id)
+            if quote is not None:
+                return quote
+        for quote in self.quotes_data:
+            if str(quote.get("quoteID")) == str(quote_id):
+                return quote
+        return None
+    
     def show_quote_details_dialog(self, quote_details):
         """Show dialog with quote details.
         
         Args:
             quote_details: Quote details data
         """
+        dialog = self._create_quote_details_dialog(quote_details)
+        dialog.exec_()
+    
+    def _create_quote_details_dialog(self, quote_details, loading=False):
+        """Create (but do not show) a quote details dialog.
+        
+        Args:
+            quote_details: Quote details, or the quote summary while loading
+            loading: Whether full details are still being fetched
+            
+        Returns:
+            QDialog instance
+        """
         dialog = QDialog(self)
         dialog.setWindowTitle(f"Quote Details - {quote_details.get('quoteName', '')}")
         dialog.resize(800, 600)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
         
         layout = QVBoxLayout(dialog)
         
+        dialog.status_label = QLabel("Loading quote details..." if loading else "")
+        dialog.status_label.setVisible(loading)
+        layout.addWidget(dialog.status_label)
+        
+        dialog.content = self._build_quote_details_widget(quote_details, loading=loading)
+        layout.addWidget(dialog.content)
+        
+        # Close button
+        buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        buttons.rejected.connect(dialog.reject)
+        layout.addWidget(buttons)
+        
+        return dialog
+    
+    def _set_quote_details_content(self, dialog, quote_details):
+        """Replace the summary content of a detail dialog with the full details."""
+        layout = dialog.layout()
+        new_content = self._build_quote_details_widget(quote_details)
+        layout.replaceWidget(dialog.content, new_content)
+        dialog.content.deleteLater()
+        dialog.content = new_content
+        dialog.status_label.setVisible(False)
+        dialog.setWindowTitle(f"Quote Details - {quote_details.get('quoteName', '')}")
+    
+    def _build_quote_details_widget(self, quote_details, loading=False):
+        """Build the widget showing a quote's information, equipment and totals.
+        
+        Args:
+            quote_details: Quote details data
+            loading: Only show the summary fields (details not loaded yet)
+            
+        Returns:
+            QWidget instance
+        """
+        content = QWidget()
+        content_layout = QVBoxLayout(content)
+        content_layout.setContentsMargins(0, 0, 0, 0)
+        
         # Quote information
         info_layout = QFormLayout()
         
@@ -427,12 +893,16 @@ class JDQuotesModule(BaseModule):
         info_layout.addRow("Expires:", QLabel(quote_details.get("expirationDate", "")))
         
         # Add quote info to main layout
-        layout.addLayout(info_layout)
+        content_layout.addLayout(info_layout)
+        
+        if loading:
+            content_layout.addStretch()
+            return content
         
         # Equipment table
         equipment_label = QLabel("Equipment")
         equipment_label.setStyleSheet("font-weight: bold; font-size: 14pt;")
-        layout.addWidget(equipment_label)
+        content_layout.addWidget(equipment_label)
         
         equipment_table = QTableWidget()
         equipment_table.setColumnCount(5)
@@ -461,14 +931,14 @@ class JDQuotesModule(BaseModule):
             equipment_table.setItem(row, 4, QTableWidgetItem(f"${equipment.get('listPrice', 0):,.2f}"))
         
         equipment_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        layout.addWidget(equipment_table)
+        content_layout.addWidget(equipment_table)
         
         # Trade-in table (if any)
         trade_in_data = quote_details.get("tradeInEquipmentData", [])
         if trade_in_data:
             trade_in_label = QLabel("Trade-Ins")
             trade_in_label.setStyleSheet("font-weight: bold; font-size: 14pt;")
-            layout.addWidget(trade_in_label)
+            content_layout.addWidget(trade_in_label)
             
             trade_in_table = QTableWidget()
             trade_in_table.setColumnCount(5)
@@ -495,7 +965,7 @@ class JDQuotesModule(BaseModule):
                 trade_in_table.setItem(row, 4, QTableWidgetItem(f"${trade_in.get('netTradeValue', 0):,.2f}"))
             
             trade_in_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-            layout.addWidget(trade_in_table)
+            content_layout.addWidget(trade_in_table)
         
         # Total values
         totals_layout = QFormLayout()
@@ -515,20 +985,17 @@ class JDQuotesModule(BaseModule):
         final_total = total_equipment - total_trade_in
         totals_layout.addRow("Final Total:", QLabel(f"${final_total:,.2f}"))
         
-        layout.addLayout(totals_layout)
-        
-        # Close button
-        buttons = QDialogButtonBox(QDialogButtonBox.Close)
-        buttons.rejected.connect(dialog.reject)
-        layout.addWidget(buttons)
+        content_layout.addLayout(totals_layout)
         
-        # Show dialog
-        dialog.exec_()
+        return content
     
-    def edit_quote(self):
-        """Edit a quote."""
-        button = self.sender()
-        quote_id = button.property("quote_id")
+    def edit_quote(self, quote_id=None):
+        """Edit a quote.
+        
+        Args:
+            quote_id: Quote ID (defaults to the selected quote)
+        """
+        quote_id = quote_id or self._selected_quote_id()
         
         if not quote_id:
             return
@@ -540,10 +1007,13 @@ class JDQuotesModule(BaseModule):
             f"Editing Quote {quote_id} will be available in a future update."
         )
     
-    def delete_quote(self):
-        """Delete a quote."""
-        button = self.sender()
-        quote_id = button.property("quote_id")
+    def delete_quote(self, quote_id=None):
+        """Delete a quote.
+        
+        Args:
+            quote_id: Quote ID (defaults to the selected quote)
+        """
+        quote_id = quote_id or self._selected_quote_id()
         
         if not quote_id:
             return
@@ -568,6 +1038,13 @@ class JDQuotesModule(BaseModule):
                 success = self.quote_integration.delete_quote(quote_id)
                 
                 if success:
+                    store = self._get_quote_store()
+                    if store is not None:
+                        store.remove(quote_id)
+                        store.save()
+                    if hasattr(self.quote_integration, 'invalidate_quote_details'):
+                        self.quote_integration.invalidate_quote_details(quote_id)
+                    
                     self.main_window.show_notification(
                         "Success", 
                         f"Quote {quote_id} deleted successfully",
@@ -743,14 +1220,20 @@ class JDQuotesModule(BaseModule):
     def search(self, search_text):
         """Search for quotes matching text.
         
+        Uses the local quote store's token index when available, so no API
+        call is made and results are ranked (see QuoteStore.search).
+        
         Args:
             search_text: Text to search for
             
         Returns:
             List of search results
         """
-        results = []
+        store = self._get_quote_store()
+        if store is not None:
+            return quote_search_results(store, search_text)
         
+        results = []
         for quote in self.quotes_data:
             # Search in quote name
             if search_text.lower() in quote.get("quoteName", "").lower():
@@ -784,37 +1267,4 @@ class JDQuotesModule(BaseModule):
             result: Search result data
         """
         if result.get('type') == 'quote' and result.get('id'):
-            # Show quote details
-            self.main_window.show_loading(f"Loading Quote {result.get('id')}...")
-            
-            try:
-                # Get quote details
-                if hasattr(self.quote_integration, 'get_quote_details'):
-                    quote_details = self.quote_integration.get_quote_details(
-                        quote_id=result.get('id'),
-                        dealer_account_no=self.dealer_account_no
-                    )
-                    
-                    if quote_details:
-                        self.show_quote_details_dialog(quote_details)
-                    else:
-                        self.show_error_message(
-                            "Error", 
-                            f"Failed to load quote details for Quote {result.get('id')}"
-                        )
-                else:
-                    self.logger.error("QuoteIntegration doesn't have get_quote_details method")
-                    self.show_error_message(
-                        "API Error", 
-                        "Quote details feature is not available."
-                    )
-                    
-            except Exception as e:
-                self.logger.error(f"Error loading search result: {str(e)}")
-                self.logger.error(traceback.format_exc())
-                self.show_error_message(
-                    "Error", 
-                    f"Failed to load search result: {str(e)}"
-                )
-            finally:
-                self.main_window.hide_loading()
\ No newline at end of file
+            self.open_quote_details(result.get('id'))
\ No newline at end of file
@@ -1,15 +1,27 @@
 # main.py - V3 - Added missing _on_task_result method
 import os
 import sys
+
+# Started before the remaining imports so they show up in the profile
+from utils.startup_profiler import (PROFILE_STARTUP_FLAG, start_profiling, stop_profiling,
+                                    get_profiler, startup_phase, mark_startup_phase)
+if PROFILE_STARTUP_FLAG in sys.argv:
+    start_profiling()
+
 import logging
 import traceback
+import importlib
+from collections import namedtuple
 from logging.handlers import RotatingFileHandler
+from utils.async_logging import (DEFAULT_MAX_BODY_CHARS, JsonLinesFormatter, start_queue_logging,
+                                 stop_queue_logging, set_max_body_chars)
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QStackedWidget, QWidget,
                             QVBoxLayout, QLabel, QMessageBox, QToolBar, QAction,
-                            QSizePolicy, QStatusBar, QDesktopWidget) # Added QDesktopWidget
+                            QSizePolicy, QStatusBar, QDesktopWidget, # Added QDesktopWidget
+                            QLineEdit, QCompleter)
 # Added QTimer, pyqtSlot, QSize, QThreadPool, QIcon, QPixmap
-from PyQt5.QtCore import Qt, QTimer, pyqtSlot, QSize, QThreadPool, QPoint # Added QPoint
-from PyQt5.QtGui import QIcon, QPixmap
+from PyQt5.QtCore import Qt, QTimer, QEvent, pyqtSlot, QSize, QThreadPool, QPoint, QModelIndex # Added QPoint
+from PyQt5.QtGui import QIcon, QPixmap, QStandardItemModel, QStandardItem
 
 # --- Core Utilities & Managers ---
 try:
@@ -20,7 +32,12 @@ try:
     from utils.csv_handler import CSVHandler
     from utils.oauth_client import JohnDeereOAuthClient
     from utils.jd_auth_manager import JDAuthManager
-    from utils.worker import Worker
+    from utils.token_broker import TokenBroker
+    from utils.http_client import get_http_client, shutdown_http_client, QtHttpBridge
+    from utils.task_scheduler import TaskScheduler
+    from utils.refresh_scheduler import get_refresh_scheduler
+    from utils.instrumentation import get_instrumentation
+    from utils.startup_orchestrator import StartupOrchestrator
 except ImportError as e:
      print(f"CRITICAL ERROR: Failed to import core utility/manager: {e}", file=sys.stderr)
      traceback.print_exc(file=sys.stderr)
@@ -64,38 +81,58 @@ except ImportError as e:
 
 
 # --- Application Modules ---
-IMPORTED_MODULES = {}
-MODULE_IMPORT_FAILED = False
-MODULE_CLASSES_TO_LOAD = [
-    ("modules.home_module", "HomeModule"),
-    ("modules.deal_form_module", "DealFormModule"),
-    ("modules.calendar_module", "CalendarModule"),
-    ("modules.jd_quotes_module", "JDQuotesModule"),
-    ("modules.calculator_module", "CalculatorModule"),
-    ("modules.price_book_module", "PriceBookModule"),
-    ("modules.recent_deals_module", "RecentDealsModule"),
-    ("modules.receiving_module", "ReceivingModule"),
-    ("modules.used_inventory_module", "UsedInventoryModule"),
+class ModuleDescriptor(namedtuple('ModuleDescriptor', 'key module_path class_name title icon_name search_function',
+                                  defaults=(None,))):
+    """Toolbar entry for an application module.
+
+    Holds only what the toolbar needs; the module's Python file is imported and
+    the widget instantiated on first use (see ``MainWindow._ensure_module``).
+    ``search_function`` names a function in that file, called as
+    ``func(main_window, search_text)``, that lets global search reach the
+    module's data before the widget exists.
+    """
+    __slots__ = ()
+
+    def load_class(self):
+        """Import the module and return its class (raises ImportError/AttributeError)."""
+        module = importlib.import_module(self.module_path)
+        return getattr(module, self.class_name)
+
+    def load_search_function(self):
+        """Import the module and return its search hook, or None if it has none."""
+        if not self.search_function:
+            return None
+        return getattr(importlib.import_module(self.module_path), self.search_function)
+
+
+MODULE_DESCRIPTORS = [
+    ModuleDescriptor("HomeModule", "modules.home_module", "HomeModule", "Dashboard", "home_icon.png"),
+    ModuleDescriptor("DealFormModule", "modules.deal_form_module", "DealFormModule", "Deal Form", "dealform_icon.png"),
+    ModuleDescriptor("CalendarModule", "modules.calendar_module", "CalendarModule", "Calendar", "calendar_icon.png"),
+    ModuleDescriptor("JDQuotesModule", "modules.jd_quotes_module", "JDQuotesModule", "JDQuotes", "jdquotes_icon.png",
+                     search_function="search_stored_quotes"),
+    ModuleDescriptor("CalculatorModule", "modules.calculator_module", "CalculatorModule", "Calculator", "calculator_icon.png"),
+    ModuleDescriptor("PriceBookModule", "modules.price_book_module", "PriceBookModule", "Price Book", "price_book_icon.png"),
+    ModuleDescriptor("RecentDealsModule", "modules.recent_deals_module", "RecentDealsModule", "RecentDeals", "recentdeals_icon.png"),
+    ModuleDescriptor("ReceivingModule", "modules.receiving_module", "ReceivingModule", "Receiving Automation", "receiving_icon.png"),
+    ModuleDescriptor("UsedInventoryModule", "modules.used_inventory_module", "UsedInventoryModule", "UsedInventory", "usedinventory_icon.png"),
+    ModuleDescriptor("SettingsModule", "modules.settings_module", "SettingsModule", "Settings", "settings_icon.png"),
 ]
 
-for module_path, class_name in MODULE_CLASSES_TO_LOAD:
-    try:
-        module = __import__(module_path, fromlist=[class_name])
-        IMPORTED_MODULES[class_name] = getattr(module, class_name)
-        print(f"Successfully imported {class_name} from {module_path}")
-    except ImportError as e:
-         print(f"CRITICAL: Failed to import application module '{class_name}' from '{module_path}': {e}", file=sys.stderr)
-         traceback.print_exc(file=sys.stderr)
-         MODULE_IMPORT_FAILED = True
-    except AttributeError as e:
-         print(f"CRITICAL: Class '{class_name}' not found in module '{module_path}': {e}", file=sys.stderr)
-         traceback.print_exc(file=sys.stderr)
-         MODULE_IMPORT_FAILED = True
-
 
 # --- Logging Setup ---
-def setup_logging(log_dir="logs", log_level_str="INFO"):
-    """Configure application logging."""
+def setup_logging(log_dir="logs", log_level_str="INFO", json_lines=False, max_body_chars=DEFAULT_MAX_BODY_CHARS):
+    """Configure application logging.
+
+    Records go through a queue to a background writer thread (see
+    utils.async_logging), so logging calls never block on file or console I/O.
+
+    Args:
+        log_dir: Directory for application.log (and application.jsonl)
+        log_level_str: Root log level name
+        json_lines: Also write structured JSON-lines records to application.jsonl
+        max_body_chars: Cap for request/response bodies in debug records
+    """
     if not os.path.exists(log_dir):
         try:
             os.makedirs(log_dir, exist_ok=True)
@@ -109,8 +146,7 @@ def setup_logging(log_dir="logs", log_level_str="INFO"):
     log_format = logging.Formatter(
         '%(asctime)s - %(name)s [%(levelname)s] (%(threadName)s) %(message)s'
     )
-    root_logger = logging.getLogger()
-    root_logger.handlers.clear()
+    handlers = []
     log_setup_success = False
     try:
         file_handler = RotatingFileHandler(
@@ -118,19 +154,35 @@ def setup_logging(log_dir="logs", log_level_str="INFO"):
         )
         file_handler.setFormatter(log_format)
         file_handler.setLevel(log_level)
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
         log_setup_success = True
     except Exception as e:
         print(f"Error setting up file logger '{log_file}': {e}", file=sys.stderr)
 
+    json_log_file = os.path.join(log_dir, "application.jsonl")
+    if json_lines:
+        try:
+            json_handler = RotatingFileHandler(
+                json_log_file, maxBytes=5*1024*1024, backupCount=3, encoding='utf-8'
+            )
+            json_handler.setFormatter(JsonLinesFormatter())
+            json_handler.setLevel(log_level)
+            handlers.append(json_handler)
+        except Exception as e:
+            print(f"Error setting up JSON-lines logger '{json_log_file}': {e}", file=sys.stderr)
+            json_lines = False
+
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(log_format)
     console_handler.setLevel(log_level)
-    root_logger.addHandler(console_handler)
-    root_logger.setLevel(log_level)
+    handlers.append(console_handler)
+    start_queue_logging(handlers, level=log_level)
+    set_max_body_chars(max_body_chars)
 
     if log_setup_success:
          logging.info(f"Logging initialized. Log file: {log_file}")
+         if json_lines:
+              logging.info(f"Structured log file: {json_log_file}")
     else:
          logging.error(f"File logging failed. Logging to console only. Attempted log file: {log_file}")
 
@@ -177,7 +229,7 @@ class MainWindow(QMainWindow):
 
     def __init__(self, config, logger, cache_handler, csv_handler, thread_pool,
                  oauth_client, jd_auth_manager, sharepoint_manager,
-                 quote_integration):
+                 quote_integration, jd_token_broker=None):
         """Initialize the main window."""
         super().__init__()
         self.config = config
@@ -187,10 +239,21 @@ class MainWindow(QMainWindow):
         self.cache_handler = cache_handler
         self.csv_handler = csv_handler
         self.thread_pool = thread_pool
+        # Background tasks: priorities, cancellation, coalescing by key, timing
+        self.task_scheduler = TaskScheduler(thread_pool, logger=self.logger.getChild("Tasks"), parent=self) if thread_pool else None
+        self._loading_tasks = set()
+        # Periodic refresh jobs of all modules share one timer (created here, on the GUI thread)
+        self.refresh_scheduler = get_refresh_scheduler(task_scheduler=self.task_scheduler,
+                                                       logger=self.logger.getChild("Refresh"))
         self.oauth_client = oauth_client
         self.jd_auth_manager = jd_auth_manager
         self.sharepoint_manager = sharepoint_manager
         self.quote_integration = quote_integration
+        self.jd_token_broker = jd_token_broker
+
+        # Delivers results from the shared HTTP client's loop thread to GUI-thread callbacks;
+        # modules share it (the dashboard fetchers and weather icons go through it)
+        self.http_bridge = QtHttpBridge(self) if QtHttpBridge else None
 
         self.active_notifications = []
         self.setWindowTitle(self.config.get("app_title", "BC Application"))
@@ -220,39 +283,40 @@ class MainWindow(QMainWindow):
              self.loading_widget = None
              self.logger.warning("LoadingWidget class not available.")
 
-        self.modules = {}
+        self.modules = {}               # Instantiated modules, created on first switch
         self.module_actions = {}
+        self.module_descriptors = {descriptor.key: descriptor for descriptor in MODULE_DESCRIPTORS}
+        self._failed_modules = {}       # key -> error message for modules that failed to load
+        self._warmup_queue = []
         self._create_toolbar()
+        self._create_search_bar()
         self._create_status_bar()
 
         self.logger.info("MainWindow basic initialization complete (module loading deferred).")
 
 
     def _load_modules_and_init(self):
-        """Loads modules, creates actions, and sets initial state."""
-        self.logger.info("Loading application modules...")
-        self.show_loading("Initializing modules...")
-
+        """Registers module actions, shows the Home module and schedules warm-up."""
+        self.logger.info("Registering application modules...")
         self._load_modules()
 
-        self.hide_loading()
-        self.logger.info("Module loading process finished.")
-
-        if self.HOME_MODULE in self.modules:
+        if self._ensure_module(self.HOME_MODULE) is not None:
             self.switch_module(self.HOME_MODULE)
             self.update_status("Ready")
-        elif self.modules:
-             first_available_module = next(iter(self.modules.keys()), None)
-             if first_available_module:
-                  self.logger.warning(f"Home module failed or not available. Switching to first loaded module: {first_available_module}")
-                  self.switch_module(first_available_module)
-                  self.update_status(f"{first_available_module} Ready")
+        else:
+             # Fall back to the first module that can be created
+             for module_key in self.module_descriptors:
+                  if module_key != self.HOME_MODULE and self._ensure_module(module_key) is not None:
+                       self.logger.warning(f"Home module failed or not available. Switching to first loaded module: {module_key}")
+                       self.switch_module(module_key)
+                       self.update_status(f"{module_key} Ready")
+                       break
              else:
                   self._show_critical_load_failure("No modules initialized successfully.")
-        else:
-             self._show_critical_load_failure("No application modules found or loaded.")
+                  return
 
         self.logger.info("Initial module set.")
+        self._schedule_module_warmup()
 
     def _show_critical_load_failure(self, message):
         """Handles cases where no modules could be loaded."""
@@ -282,6 +346,125 @@ class MainWindow(QMainWindow):
         self.toolbar.setMovable(False)
 
 
+    def _create_search_bar(self):
+        """Create the global search box that queries every loaded module."""
+        self.logger.debug("Creating global search bar...")
+        self.search_toolbar = QToolBar("Search")
+        self.search_toolbar.setMovable(False)
+        self.addToolBar(Qt.TopToolBarArea, self.search_toolbar)
+
+        spacer = QWidget()
+        spacer.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
+        self.search_toolbar.addWidget(spacer)
+
+        self.global_search_edit = QLineEdit()
+        self.global_search_edit.setPlaceholderText("Search all modules...")
+        self.global_search_edit.setClearButtonEnabled(True)
+        self.global_search_edit.setMaximumWidth(400)
+        self.search_toolbar.addWidget(self.global_search_edit)
+
+        # Results popup; attached with setWidget so highlighting does not overwrite the query
+        self._search_results = []
+        self.search_results_model = QStandardItemModel(self)
+        self.search_completer = QCompleter(self.search_results_model, self)
+        self.search_completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.search_completer.setMaxVisibleItems(15)
+        self.search_completer.setWidget(self.global_search_edit)
+        self.search_completer.activated[QModelIndex].connect(self._on_search_result_activated)
+
+        # Debounce typing so a query runs once the user pauses
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(150)
+        self._search_timer.timeout.connect(self._run_global_search)
+        self.global_search_edit.textEdited.connect(lambda _text: self._search_timer.start())
+        self.global_search_edit.returnPressed.connect(self._run_global_search)
+
+
+    def global_search(self, search_text: str, limit: int = 30):
+        """Query every module's search and merge the results.
+
+        Loaded modules are asked through their search(); modules not created
+        yet through their descriptor's search hook, if they have one.
+
+        Args:
+            search_text: Text to search for
+            limit: Maximum number of results returned
+
+        Returns:
+            List of (module_key, result) tuples. Results carrying a 'score'
+            are ranked first by score; ties keep module order.
+        """
+        merged = []
+        module_keys = list(self.module_descriptors) + [key for key in self.modules if key not in self.module_descriptors]
+        for order, module_key in enumerate(module_keys):
+            module = self.modules.get(module_key)
+            try:
+                if module is not None:
+                    if not hasattr(module, 'search') or not callable(module.search):
+                        continue
+                    results = module.search(search_text) or []
+                elif module_key in self._failed_modules:
+                    continue
+                else:
+                    search_function = self.module_descriptors[module_key].load_search_function()
+                    if search_function is None:
+                        continue
+                    results = search_function(self, search_text) or []
+            except Exception as e:
+                self.logger.error(f"Error searching module {module_key}: {e}", exc_info=True)
+                continue
+            for position, result in enumerate(results):
+                merged.append((-float(result.get('score', 0) or 0), order, position, module_key, result))
+        merged.sort(key=lambda item: item[:3])
+        return [(module_key, result) for _, _, _, module_key, result in merged[:limit]]
+
+
+    def _run_global_search(self):
+        """Run the global search for the current query and show the results popup."""
+        search_text = self.global_search_edit.text().strip()
+        self.search_results_model.clear()
+        self._search_results = []
+        if len(search_text) < 2:
+            self.search_completer.popup().hide()
+            return
+
+        self._search_results = self.global_search(search_text)
+        for index, (module_key, result) in enumerate(self._search_results):
+            module = self.modules.get(module_key)
+            if module is not None and hasattr(module, 'get_title'):
+                module_title = module.get_title()
+            elif module_key in self.module_descriptors:
+                module_title = self.module_descriptors[module_key].title
+            else:
+                module_title = module_key
+            item = QStandardItem(f"{result.get('title', '')}  —  {module_title}")
+            item.setToolTip(str(result.get('details', '')))
+            item.setData(index, Qt.UserRole)
+            self.search_results_model.appendRow(item)
+
+        if self._search_results:
+            self.search_completer.complete()
+        else:
+            self.search_completer.popup().hide()
+            self.update_status(f"No results for '{search_text}'", 3000)
+
+
+    def _on_search_result_activated(self, index: QModelIndex):
+        """Switch to the module owning a search result and navigate to it."""
+        result_index = index.data(Qt.UserRole)
+        if result_index is None or not (0 <= result_index < len(self._search_results)):
+            return
+        module_key, result = self._search_results[result_index]
+        self.switch_module(module_key)
+        module = self.modules.get(module_key)
+        if module is not None and hasattr(module, 'navigate_to'):
+            try:
+                module.navigate_to(result)
+            except Exception as e:
+                self.logger.error(f"Error navigating to search result in {module_key}: {e}", exc_info=True)
+
+
     def _create_status_bar(self):
         """Create the status bar."""
         self.logger.debug("Creating status bar...")
@@ -290,101 +473,136 @@ class MainWindow(QMainWindow):
 
 
     def _load_modules(self):
-        """Load and initialize all application modules, passing only necessary dependencies."""
-        global IMPORTED_MODULES
-
-        if not IMPORTED_MODULES:
-             self.logger.error("No application module classes were successfully imported. Cannot load modules.")
+        """Create a toolbar action per registered module without importing any of them."""
+        if not self.module_descriptors:
+             self.logger.error("No application modules are registered. Cannot load modules.")
              return
 
-        module_keys_to_load = list(IMPORTED_MODULES.keys())
-        toolbar_actions = []
-
-        for module_key in module_keys_to_load:
-            ModuleClass = IMPORTED_MODULES[module_key]
-            module_instance = None
-            try:
-                self.logger.info(f"Attempting to initialize module: {module_key}")
-                module_args = {"main_window": self}
-
-                if module_key == self.DEAL_FORM_MODULE:
-                    module_args["sharepoint_manager"] = self.sharepoint_manager
-                elif module_key == self.JD_QUOTES_MODULE:
-                    module_args["logger"] = self.logger.getChild(module_key)
-                    module_args["quote_integration"] = self.quote_integration
-                    if not self.quote_integration: self.logger.warning(f"QuoteIntegration dependency missing for {module_key}")
-                elif module_key == self.RECENT_DEALS_MODULE:
-                    module_args["data_path"] = getattr(self.config, 'data_dir', None)
-                elif module_key == self.USED_INVENTORY_MODULE:
-                    module_args["sharepoint_manager"] = self.sharepoint_manager
-                elif module_key == self.PRICE_BOOK_MODULE:
-                    module_args["sharepoint_manager"] = self.sharepoint_manager
-
-                self.logger.debug(f"Instantiating {module_key} with args: {list(module_args.keys())}")
-                module_instance = ModuleClass(**module_args)
+        for module_key, descriptor in self.module_descriptors.items():
+            icon_path = get_resource_path(descriptor.icon_name, self.resources_dir)
+            action_icon = QIcon()
+            if icon_path and os.path.exists(icon_path):
+                action_icon = QIcon(icon_path)
+                self.logger.debug(f"Found icon for {module_key} at {icon_path}")
+            else:
+                self.logger.warning(f"Icon not found for module '{module_key}'. Looked for '{descriptor.icon_name}' at path: {icon_path}")
 
-                self.stackedWidget.addWidget(module_instance)
-                self.modules[module_key] = module_instance
-                self.logger.info(f"Module '{module_key}' initialized and added to stacked widget.")
+            action = QAction(action_icon, descriptor.title, self)
+            action.setStatusTip(f"Switch to {descriptor.title}")
+            action.triggered.connect(lambda checked=False, key=module_key: self.switch_module(key))
+            self.module_actions[module_key] = action
+            self.toolbar.addAction(action)
+        self.logger.debug("Toolbar actions added.")
 
-                display_name = module_key.replace("Module", "").replace("_", " ").title()
-                if hasattr(module_instance, 'get_title') and callable(module_instance.get_title):
-                     display_name = module_instance.get_title()
 
-                icon_name = f"{module_key.replace('Module', '').lower()}_icon.png"
-                if hasattr(module_instance, 'get_icon_name') and callable(module_instance.get_icon_name):
-                     icon_name_from_module = module_instance.get_icon_name()
-                     if icon_name_from_module: icon_name = icon_name_from_module
+    def _module_args(self, module_key):
+        """Constructor arguments for a module, passing only the dependencies it needs."""
+        module_args = {"main_window": self}
+        if module_key == self.DEAL_FORM_MODULE:
+            module_args["sharepoint_manager"] = self.sharepoint_manager
+        elif module_key == self.JD_QUOTES_MODULE:
+            module_args["logger"] = self.logger.getChild(module_key)
+            module_args["quote_integration"] = self.quote_integration
+            if not self.quote_integration: self.logger.warning(f"QuoteIntegration dependency missing for {module_key}")
+        elif module_key == self.RECENT_DEALS_MODULE:
+            module_args["data_path"] = getattr(self.config, 'data_dir', None)
+        elif module_key == self.USED_INVENTORY_MODULE:
+            module_args["sharepoint_manager"] = self.sharepoint_manager
+        elif module_key == self.PRICE_BOOK_MODULE:
+            module_args["sharepoint_manager"] = self.sharepoint_manager
+        return module_args
+
+
+    def _ensure_module(self, module_key: str, show_errors: bool = True):
+        """Import and instantiate a module on first use.
+
+        Args:
+            module_key: Key of a registered module
+            show_errors: Show a message box if the module fails to load
+
+        Returns:
+            The module widget, or None if it is unknown or failed to load
+        """
+        if module_key in self.modules:
+            return self.modules[module_key]
+        descriptor = self.module_descriptors.get(module_key)
+        if descriptor is None or module_key in self._failed_modules:
+            return None
 
-                icon_path = get_resource_path(icon_name, self.resources_dir)
-                action_icon = QIcon()
-                if icon_path and os.path.exists(icon_path):
-                    action_icon = QIcon(icon_path)
-                    self.logger.debug(f"Found icon for {module_key} at {icon_path}")
-                else:
-                    self.logger.warning(f"Icon not found for module '{module_key}'. Looked for '{icon_name}' at path: {icon_path}")
-
-                action = QAction(action_icon, display_name, self)
-                action.setStatusTip(f"Switch to {display_name}")
-                action.triggered.connect(lambda checked=False, key=module_key: self.switch_module(key))
-                self.module_actions[module_key] = action
-                toolbar_actions.append(action)
-                self.logger.debug(f"Toolbar action created for '{module_key}'.")
-
-            except AttributeError as ae:
-                 self.logger.error(f"FAILED to initialize module '{module_key}' due to AttributeError: {ae}", exc_info=True)
-                 error_message = f"Attribute Error loading module:\n{module_key}\n\n{ae}\n\nCheck logs for details."
-                 error_label = QLabel(error_message)
-                 error_label.setAlignment(Qt.AlignCenter)
-                 error_label.setStyleSheet("color: red; padding: 20px;")
-                 error_label.setWordWrap(True)
-                 self.stackedWidget.addWidget(error_label)
-                 if module_key in self.module_actions:
-                      self.module_actions[module_key].setEnabled(False)
-                      self.module_actions[module_key].setStatusTip(f"{display_name} failed to load")
+        module_instance = None
+        try:
+            self.logger.info(f"Attempting to initialize module: {module_key}")
+            with startup_phase(f"module:{module_key}"):
+                ModuleClass = descriptor.load_class()
+                module_args = self._module_args(module_key)
+                self.logger.debug(f"Instantiating {module_key} with args: {list(module_args.keys())}")
+                module_instance = ModuleClass(**module_args)
+        except (ImportError, AttributeError) as e:
+            self.logger.error(f"FAILED to import or initialize module '{module_key}': {e}", exc_info=True)
+            error_message = f"{type(e).__name__} loading module:\n{module_key}\n\n{e}\n\nCheck logs for details."
+        except Exception as e:
+            self.logger.error(f"FAILED to initialize module '{module_key}': {e}", exc_info=True)
+            error_message = f"Error loading module:\n{module_key}\n\n{e}\n\nCheck logs for details."
+
+        if module_instance is None:
+            self._failed_modules[module_key] = error_message
+            error_label = QLabel(error_message)
+            error_label.setAlignment(Qt.AlignCenter)
+            error_label.setStyleSheet("color: red; padding: 20px;")
+            error_label.setWordWrap(True)
+            self.stackedWidget.addWidget(error_label)
+            if module_key in self.module_actions:
+                 self.module_actions[module_key].setEnabled(False)
+                 self.module_actions[module_key].setStatusTip(f"{descriptor.title} failed to load")
+            if show_errors:
                  QMessageBox.warning(self, "Module Load Error", error_message)
-
-            except Exception as e:
-                self.logger.error(f"FAILED to initialize module '{module_key}': {e}", exc_info=True)
-                error_message = f"Error loading module:\n{module_key}\n\n{e}\n\nCheck logs for details."
-                error_label = QLabel(error_message)
-                error_label.setAlignment(Qt.AlignCenter)
-                error_label.setStyleSheet("color: red; padding: 20px;")
-                error_label.setWordWrap(True)
-                self.stackedWidget.addWidget(error_label)
-                if module_key in self.module_actions:
-                     self.module_actions[module_key].setEnabled(False)
-                     self.module_actions[module_key].setStatusTip(f"{display_name} failed to load")
-                QMessageBox.warning(self, "Module Load Error", error_message)
-
-        for action in toolbar_actions:
-            self.toolbar.addAction(action)
-        self.logger.debug("Toolbar actions added.")
+            return None
+
+        # init_ui already loaded the module's data, so the first switch to it is not a refresh
+        if hasattr(module_instance, 'mark_refreshed') and getattr(module_instance, 'last_refreshed', None) is None:
+            module_instance.mark_refreshed()
+        self.stackedWidget.addWidget(module_instance)
+        self.modules[module_key] = module_instance
+        self.logger.info(f"Module '{module_key}' initialized and added to stacked widget.")
+        return module_instance
+
+
+    def _schedule_module_warmup(self):
+        """Queue likely-next modules (config ``module_warmup``) for idle-time creation."""
+        warmup = self.config.get('module_warmup', '') or []
+        if isinstance(warmup, str):
+            warmup = [key.strip() for key in warmup.split(',') if key.strip()]
+        self._warmup_queue = [key for key in warmup
+                              if key in self.module_descriptors and key not in self.modules]
+        if self._warmup_queue:
+            delay = int(self.config.get('module_warmup_delay_ms', 3000))
+            self.logger.debug(f"Warming up modules in {delay} ms: {self._warmup_queue}")
+            QTimer.singleShot(delay, self._warm_up_next_module)
+
+
+    def _warm_up_next_module(self):
+        """Create one queued module, then yield to the event loop before the next."""
+        while self._warmup_queue:
+            module_key = self._warmup_queue.pop(0)
+            if module_key in self.modules or module_key in self._failed_modules:
+                continue
+            self.logger.debug(f"Warming up module: {module_key}")
+            self._ensure_module(module_key, show_errors=False)
+            break
+        if self._warmup_queue:
+            QTimer.singleShot(0, self._warm_up_next_module)
 
 
     @pyqtSlot(str)
     def switch_module(self, module_key: str):
-        """Switch the visible module in the stacked widget."""
+        """Switch the visible module in the stacked widget, creating it on first use."""
+        if module_key not in self.modules and module_key in self.module_descriptors \
+                and module_key not in self._failed_modules:
+            self.show_loading(f"Loading {self.module_descriptors[module_key].title}...")
+            try:
+                self._ensure_module(module_key, show_errors=False)
+            finally:
+                self.hide_loading()
         if module_key in self.modules:
             widget_to_show = self.modules[module_key]
             if self.stackedWidget.currentWidget() != widget_to_show:
@@ -394,17 +612,37 @@ class MainWindow(QMainWindow):
                 if hasattr(widget_to_show, 'get_title') and callable(widget_to_show.get_title):
                      display_name = widget_to_show.get_title()
                 self.update_status(f"{display_name} loaded")
-                if hasattr(widget_to_show, 'refresh') and callable(widget_to_show.refresh):
-                    self.logger.debug(f"Calling refresh for {module_key}")
-                    try:
-                        widget_to_show.refresh()
-                    except Exception as e:
-                         self.logger.error(f"Error calling refresh on module {module_key}: {e}", exc_info=True)
+                self._refresh_if_stale(module_key, widget_to_show)
         else:
             self.logger.warning(f"Attempted to switch to unknown or failed module key: {module_key}")
-            if module_key in self.module_actions and not self.module_actions[module_key].isEnabled():
-                 QMessageBox.warning(self, "Module Error", f"The '{module_key.replace('Module','')}' module failed to load correctly.")
+            if module_key in self._failed_modules:
+                 QMessageBox.warning(self, "Module Load Error", self._failed_modules[module_key])
+
 
+    def _refresh_if_stale(self, module_key, module):
+        """Refresh a module that was just shown, unless its data is still fresh.
+
+        The staleness threshold is the module's STALE_AFTER_SECONDS, falling back
+        to the 'module_stale_after_seconds' setting. Modules without freshness
+        tracking (not derived from BaseModule) are always refreshed.
+        """
+        if not (hasattr(module, 'refresh') and callable(module.refresh)):
+            return
+        if hasattr(module, 'is_stale'):
+            max_age = getattr(module, 'STALE_AFTER_SECONDS', None)
+            if max_age is None:
+                max_age = float(self.config.get('module_stale_after_seconds', 300))
+            if not module.is_stale(max_age):
+                self.logger.debug(f"Skipping refresh for {module_key}: data is less than {max_age:.0f}s old")
+                return
+        self.logger.debug(f"Calling refresh for {module_key}")
+        try:
+            module.refresh()
+        except Exception as e:
+             self.logger.error(f"Error calling refresh on module {module_key}: {e}", exc_info=True)
+             return
+        if hasattr(module, 'mark_refreshed'):
+            module.mark_refreshed()
 
     def resizeEvent(self, event):
         """Handle window resize events."""
@@ -418,6 +656,12 @@ class MainWindow(QMainWindow):
         self._reposition_notifications()
         super().moveEvent(event)
 
+    def changeEvent(self, event):
+        """Catch up refreshes deferred while the window was minimized."""
+        if event.type() == QEvent.WindowStateChange and not self.isMinimized():
+            QTimer.singleShot(0, self.refresh_scheduler.catch_up)
+        super().changeEvent(event)
+
 
     @pyqtSlot(str, int)
     def update_status(self, message: str, timeout: int = 5000):
@@ -505,63 +749,96 @@ class MainWindow(QMainWindow):
              self._reposition_notifications()
 
 
-    # --- Background Task Runner (TypeError Fixed V2 + AttributeError Fix) ---
+    def start_authentication(self):
+        """Start JD and Microsoft Graph token acquisition concurrently in the background.
+
+        Both identity providers are contacted on their own threads; modules
+        wait on ``jd_token_broker.ready`` / ``sharepoint_manager.auth_ready``
+        instead of the UI waiting on either.
+        """
+        if self.jd_token_broker:
+            if self.jd_token_broker.start():
+                self.logger.debug("JD token loaded from cache.")
+            else:
+                self.logger.info("No cached JD token; acquiring one in the background.")
+        if self.sharepoint_manager and hasattr(self.sharepoint_manager, 'start_authentication'):
+            self.sharepoint_manager.start_authentication()
+            self.logger.info("SharePoint sign-in started in the background.")
+
+    def refresh_jd_token(self, force: bool = False):
+        """Ask the JD token broker to refresh in the background (never blocks).
+
+        Args:
+            force: Refresh even if the current token is not close to expiry
+        """
+        if self.jd_token_broker:
+            self.jd_token_broker.refresh_async(force=force)
+
+
+    # --- Background Task Runner ---
     def run_background_task(self, task_function, *args, **kwargs):
-        """Runs a function in a background thread using QThreadPool and Worker."""
-        if not self.thread_pool:
-             self.logger.error("ThreadPool not available for background task.")
+        """Run a function on the task scheduler and wire its signals.
+
+        Args:
+            task_function: Function to run in the background. It receives
+                ``progress_callback``, ``status_callback`` and ``cancel_token``
+                only if its signature declares them.
+            *args: Positional arguments for task_function
+            on_result: Slot receiving the return value (default: _on_task_result)
+            on_error: Slot receiving a TaskError (exc_type, exc_value, traceback)
+            on_finished: Slot called after success, failure or cancellation
+            progress_callback_slot: Slot receiving int progress values
+            status_slot: Slot receiving str status messages
+            loading_message: Overlay message; pass None to run without the overlay
+            task_name: Name for logs and metrics (default: the function name)
+            priority: Higher runs first among queued tasks
+            dedup_key: Coalesce with an active task under the same key; the
+                returned handle is then the running task's, and slots already
+                attached to it are not connected again
+            **kwargs: Keyword arguments for task_function
+
+        Returns:
+            TaskHandle, or None if the task could not be started
+        """
+        if not self.task_scheduler:
+             self.logger.error("Task scheduler not available for background task.")
              QMessageBox.critical(self, "Error", "Background task runner is not available.")
-             return
-        if not Worker:
-             self.logger.error("Worker class not available for background task.")
-             QMessageBox.critical(self, "Error", "Background worker class is not available.")
-             return
+             return None
 
-        # *** FIX: Use getattr with default None for the default callback ***
         on_result_slot = kwargs.pop('on_result', getattr(self, '_on_task_result', None))
-        # If the default method doesn't exist, on_result_slot will be None
-        # Connect only if the slot is callable
-        # *** End Fix ***
-
-        on_error_slot = kwargs.pop('on_error', self._on_task_error) # Slot expects tuple
-        on_finished_slot = kwargs.pop('on_finished', self.hide_loading)
+        on_error_slot = kwargs.pop('on_error', self._on_task_error)
+        on_finished_slot = kwargs.pop('on_finished', None)
         progress_slot = kwargs.pop('progress_callback_slot', None)
+        status_slot = kwargs.pop('status_slot', None)
         loading_msg = kwargs.pop('loading_message', "Processing...")
-
-        self.show_loading(loading_msg)
-        worker = Worker(task_function, *args, **kwargs)
-
-        # Connect signals
-        # Connect result signal only if a valid slot is provided or found
-        if callable(on_result_slot):
-             worker.signals.result.connect(on_result_slot)
-        else:
-             self.logger.debug("No valid 'on_result' slot provided or found for background task.")
-
-        try:
-             worker.signals.error.connect(on_error_slot)
-             self.logger.debug("Connected worker error signal directly.")
-        except TypeError as te:
-             # Log error but don't crash the setup here, let the global hook catch it if it happens later
-             self.logger.error(f"Potential issue connecting worker error signal: {te}. Slot: {on_error_slot}")
-             # Fallback lambda (might still cause issues if slot signature is wrong)
-             try:
-                  worker.signals.error.connect(lambda err_info: on_error_slot(err_info))
-                  self.logger.warning("Used lambda fallback for worker error signal connection.")
-             except Exception as lambda_e:
-                   self.logger.error(f"CRITICAL: Lambda fallback for error signal failed: {lambda_e}")
-                   # If even lambda fails, don't proceed
-                   self.hide_loading()
-                   QMessageBox.critical(self, "Error", f"Failed setup background task error handler:\n{lambda_e}")
-                   return
-
-
-        worker.signals.finished.connect(on_finished_slot)
-        if progress_slot:
-            worker.signals.progress.connect(progress_slot)
-
-        self.thread_pool.start(worker)
-        self.logger.debug(f"Started background task: {getattr(task_function, '__name__', 'unknown')}")
+        task_name = kwargs.pop('task_name', None)
+        priority = kwargs.pop('priority', 0)
+        dedup_key = kwargs.pop('dedup_key', None)
+
+        # Created unstarted so every slot is connected before the task can emit
+        handle = self.task_scheduler.submit(task_function, *args, name=task_name, priority=priority,
+                                            dedup_key=dedup_key, start=False, **kwargs)
+        if handle is None:
+            return None
+
+        if loading_msg is not None and handle not in self._loading_tasks:
+            self._loading_tasks.add(handle)
+            self.show_loading(loading_msg)
+            handle.finished.connect(lambda h=handle: self._on_loading_task_finished(h))
+        for signal_name, slot in (('result', on_result_slot), ('error', on_error_slot),
+                                  ('finished', on_finished_slot), ('progress', progress_slot),
+                                  ('status', status_slot)):
+            if callable(slot):
+                handle.attach(signal_name, slot)
+        self.task_scheduler.start(handle)
+        return handle
+
+
+    def _on_loading_task_finished(self, handle):
+        """Hide the loading overlay once no overlay-showing task is left."""
+        self._loading_tasks.discard(handle)
+        if not self._loading_tasks:
+            self.hide_loading()
 
 
     # --- Slot for task result (default) ---
@@ -573,9 +850,8 @@ class MainWindow(QMainWindow):
         # Example: Show a success notification
         # self.show_notification("Task Complete", "Background process finished.", notification_type=Notification.SUCCESS)
 
-    # Ensure slot accepts tuple
-    @pyqtSlot(tuple)
-    def _on_task_error(self, error_info: tuple):
+    @pyqtSlot(object)
+    def _on_task_error(self, error_info):
         """Default handler for background task error."""
         self.logger.debug(f"Received error signal with type: {type(error_info)}, value: {error_info}")
         if isinstance(error_info, tuple) and len(error_info) == 3:
@@ -587,9 +863,32 @@ class MainWindow(QMainWindow):
              self.logger.error(f"Background task failed with unexpected error signal type: {type(error_info)}. Value: {error_info}")
              self.update_status(f"Unknown background task error: {error_info}", 10000)
              self.show_notification("Task Error", f"An unexpected error occurred:\n{error_info}", notification_type=Notification.ERROR, duration=0)
-        self.hide_loading()
 
 
+    def get_performance_metrics(self):
+        """Collect the metrics kept by the HTTP client, JD Quotes API, task and refresh schedulers.
+
+        Returns:
+            Dict keyed by source; sources that are not available are omitted
+        """
+        metrics = {'http': get_http_client(self.config).get_metrics()}
+        quotes_api = getattr(self.quote_integration, 'api', None)
+        if quotes_api and hasattr(quotes_api, 'get_metrics'):
+            metrics['jd_quotes_api'] = quotes_api.get_metrics()
+        if self.task_scheduler:
+            metrics['tasks'] = self.task_scheduler.get_metrics()
+        metrics['refresh_jobs'] = self.refresh_scheduler.get_metrics()
+        return metrics
+
+    def dump_performance_report(self):
+        """Write recorded timings plus the component metrics to a JSON file in the log directory.
+
+        Returns:
+            Path of the written report
+        """
+        report_dir = getattr(self.config, 'log_dir', None) or os.path.join(self.config.base_path, 'logs')
+        return get_instrumentation().dump(report_dir, extra=self.get_performance_metrics())
+
     def closeEvent(self, event):
         """Handle application close event."""
         self.logger.info("Close event triggered. Shutting down...")
@@ -611,17 +910,26 @@ class MainWindow(QMainWindow):
                       self.logger.warning(f"Active module '{current_module_key}' widget likely deleted even during early save attempt.")
                  QMessageBox.warning(self, "Save State Warning", f"Could not fully save state for {current_module_key} during shutdown.\nError: {e}")
 
+        self.refresh_scheduler.stop()
+        if self.config.get('performance_dump_on_exit', False):
+            try:
+                self.dump_performance_report()
+            except Exception as e:
+                 self.logger.error(f"Failed to write performance report: {e}")
         if self.sharepoint_manager and hasattr(self.sharepoint_manager, 'stop_background_update'):
             self.logger.info("Stopping SharePoint Manager background tasks...")
             try:
                 self.sharepoint_manager.stop_background_update()
             except Exception as e:
                  self.logger.error(f"Error stopping SharePoint Manager: {e}")
-        if self.thread_pool:
-            self.logger.info("Waiting for background threads to finish...")
-            self.thread_pool.clear()
-            if not self.thread_pool.waitForDone(2000):
+        if self.jd_token_broker:
+            self.jd_token_broker.stop()
+        if self.task_scheduler:
+            self.logger.info("Waiting for background tasks to finish...")
+            if not self.task_scheduler.shutdown(policy=self.config.get('task_shutdown_policy', 'cancel'),
+                                                timeout_ms=int(self.config.get('task_shutdown_timeout_ms', 2000))):
                  self.logger.warning("Some background threads did not finish cleanly.")
+        shutdown_http_client()
 
         self.logger.info("Saving state for potentially non-active modules (best effort)...")
         for key, module_instance in self.modules.items():
@@ -641,228 +949,280 @@ class MainWindow(QMainWindow):
 
 # --- Main Execution ---
 def main():
-    """Main application entry point."""
+    """Main application entry point.
+
+    Startup runs as a graph of phases (see StartupOrchestrator):
+    config -> logging -> caches / JD auth / SharePoint / HTTP client in parallel
+    -> main window -> modules. The splash shows real progress and closes as
+    soon as the first module is interactive.
+    """
+    mark_startup_phase("imports")
     QApplication.setApplicationName("BCApp")
     QApplication.setOrganizationName("YourOrganization")
     QApplication.setApplicationVersion("1.0.0")
 
-    config = None
-    try:
+    # Created first so the splash and error dialogs are available to every phase
+    app = QApplication(sys.argv)
+    thread_pool = QThreadPool.globalInstance()
+    state = {'config': None, 'logger': None, 'splash': None, 'window': None}
+
+    # --- Phases (each takes the results of the phases before it) ---
+
+    def load_config(results):
         config = Config()
         if not hasattr(config, 'base_path') or not config.base_path:
              raise ValueError("Config loaded, but 'base_path' is missing or empty.")
-    except Exception as e:
-        print(f"CRITICAL: FATAL: Failed to initialize configuration: {e}", file=sys.stderr)
-        traceback.print_exc(file=sys.stderr)
-        try:
-            _app_temp = QApplication.instance() or QApplication(sys.argv)
-            QMessageBox.critical(None, "Configuration Error", f"Failed to load configuration:\n{e}\nApplication cannot start.")
-        except Exception as qe:
-             print(f"CRITICAL: Could not display Qt error message: {qe}", file=sys.stderr)
-        sys.exit(1)
+        state['config'] = config
+        return config
 
-    log_level_str = config.get('log_level', 'INFO')
-    logger = None
-    try:
+    def init_logging(results):
+        config = results['config']
         log_dir_path = getattr(config, 'log_dir', None)
         if log_dir_path is None:
             print(f"WARNING: config.log_dir not found, attempting default 'logs' directory relative to {config.base_path}.", file=sys.stderr)
             log_dir_path = os.path.join(config.base_path, 'logs')
-        logger = setup_logging(log_dir=log_dir_path, log_level_str=log_level_str)
-    except Exception as e:
-        print(f"CRITICAL: FATAL: Failed to initialize logging: {e}", file=sys.stderr)
-        traceback.print_exc(file=sys.stderr)
-        try:
-            _app_temp = QApplication.instance() or QApplication(sys.argv)
-            QMessageBox.critical(None, "Logging Error", f"Failed to initialize logging:\n{e}\nApplication cannot start.")
-        except Exception as qe:
-             print(f"CRITICAL: Could not display Qt error message: {qe}", file=sys.stderr)
-        sys.exit(1)
-
-    logger.info("--- Application Start ---")
-    logger.info(f"Version: {QApplication.applicationVersion()}")
-    logger.info(f"Base path: {getattr(config, 'base_path', 'N/A')}")
-    logger.info(f"Log level set to: {log_level_str}")
-
-    logger.info("Initializing core handlers and managers...")
-    cache_handler = None
-    csv_handler = None
-    thread_pool = None
-    oauth_client = None
-    jd_auth_manager = None
-    sharepoint_manager_instance = None
-    quote_integration_instance = None
-    maintain_quotes_api = None
+        log_level_str = config.get('log_level', 'INFO')
+        logger = setup_logging(log_dir=log_dir_path, log_level_str=log_level_str,
+                               json_lines=config.get('log_json_lines', False),
+                               max_body_chars=int(config.get('log_max_body_chars', DEFAULT_MAX_BODY_CHARS)))
+        state['logger'] = logger
+        sys.excepthook = log_exception_hook
+        logger.info("--- Application Start ---")
+        logger.info(f"Version: {QApplication.applicationVersion()}")
+        logger.info(f"Base path: {getattr(config, 'base_path', 'N/A')}")
+        logger.info(f"Log level set to: {log_level_str}")
+        logger.debug(f"Using global QThreadPool instance. Max threads: {thread_pool.maxThreadCount()}")
+        return logger
 
-    try:
+    def show_splash(results):
+        if not SplashScreen:
+            logging.getLogger("main_app").warning("SplashScreen class not available, skipping splash screen.")
+            return None
+        config = results['config']
+        splash_image_filename = config.get("splash_image", "splash.png")
+        splash_image_path = get_resource_path(splash_image_filename, getattr(config, 'resources_dir', None))
+        splash_pixmap = QPixmap(splash_image_path)
+        if splash_pixmap.isNull():
+             logging.getLogger("main_app").error(f"Splash pixmap is null. Check image format/path: {splash_image_path}")
+             return None
+        splash = SplashScreen(splash_pixmap)
+        splash.show()
+        splash.showMessage("Loading core components...", Qt.AlignBottom | Qt.AlignHCenter, Qt.white)
+        state['splash'] = splash
+        return splash
+
+    def apply_theme(results):
+        config, logger = results['config'], results['logging']
+        qss_path = "C:\\Users\\smorley\\BC\\resources\\styles\\light.qss"
+        if os.path.exists(qss_path):
+            with open(qss_path, "r") as f:
+                app.setStyleSheet(f.read())
+            logger.info(f"Applied QSS stylesheet from: {qss_path}")
+        else:
+            logger.warning(f"QSS file not found: {qss_path}")
+        ui_theme = config.get('ui_theme', 'light')
+        logger.info(f"Applying UI theme: {ui_theme}")
+        ThemeManager.apply_theme(ui_theme)
+
+    def init_local_handlers(results):
+        config, logger = results['config'], results['logging']
+        cache_handler = csv_handler = None
         cache_dir_path = getattr(config, 'cache_dir', None)
         if cache_dir_path:
              cache_handler = CacheHandler(cache_dir=cache_dir_path)
              logger.debug(f"CacheHandler initialized with path: {cache_dir_path}")
         else:
              logger.warning("config.cache_dir not found, CacheHandler not initialized.")
-
         data_dir_path = getattr(config, 'data_dir', None)
         if data_dir_path:
              csv_handler = CSVHandler(data_path=data_dir_path)
              logger.debug(f"CSVHandler initialized with path: {data_dir_path}")
         else:
              logger.warning("config.data_dir not found, CSVHandler not initialized.")
+        return {'cache_handler': cache_handler, 'csv_handler': csv_handler}
 
-        thread_pool = QThreadPool.globalInstance()
-        logger.debug(f"Using global QThreadPool instance. Max threads: {thread_pool.maxThreadCount()}")
+    def init_http_client(results):
+        # One event loop thread carries all HTTP traffic (Graph, JD, dashboard feeds)
+        client = get_http_client(results['config'])
+        results['logging'].debug("Shared HTTP client started.")
+        return client
 
+    def init_jd_auth(results):
+        config, logger = results['config'], results['logging']
+        oauth_client = jd_token_broker = maintain_quotes_api = None
         jd_id = getattr(config, 'jd_client_id', None)
         jd_secret = getattr(config, 'jd_client_secret', None)
         if jd_id and jd_secret:
              jd_cache_path = getattr(config, 'cache_dir', None)
              if jd_cache_path:
-                  oauth_client = JohnDeereOAuthClient(client_id=jd_id, client_secret=jd_secret, cache_path=jd_cache_path, logger=logger.getChild("JDAuthClient"))
+                  oauth_client = JohnDeereOAuthClient(client_id=jd_id, client_secret=jd_secret, cache_path=jd_cache_path, logger=logger.getChild("JDAuthClient"),
+                                                      discovery_ttl=int(config.get('jd_oauth_discovery_ttl', 86400)),
+                                                      issuer_url=config.get('jd_oauth_issuer_url'))
                   logger.debug("JohnDeereOAuthClient initialized.")
              else:
                   logger.warning("config.cache_dir not found, cannot initialize JohnDeereOAuthClient with caching.")
         else:
              logger.warning("JD Client ID or Secret missing in config, JohnDeereOAuthClient not initialized.")
 
-        jd_auth_manager = JDAuthManager(config=config, logger=logger.getChild("JDAuthMan"))
-        logger.debug("JDAuthManager initialized.")
+        if oauth_client:
+             # One broker owns the JD token for every client; it is started once
+             # the window is shown, so startup never waits on it
+             jd_token_broker = TokenBroker(fetch_token=oauth_client.get_client_credentials_token,
+                                           load_cached_token=oauth_client.load_cached_token_data,
+                                           name="JD", logger=logger.getChild("JDTokenBroker"))
+             logger.debug("JD TokenBroker initialized.")
 
-        if SharePointManager:
-             sharepoint_manager_instance = SharePointManager(config=config, logger=logger.getChild("SPMan"))
-             logger.debug("SharePointManager initialized.")
-        else:
-             logger.error("SharePointManager class not available, cannot initialize instance.")
+        jd_auth_manager = JDAuthManager(config=config, logger=logger.getChild("JDAuthMan"), token_broker=jd_token_broker)
+        logger.debug("JDAuthManager initialized.")
 
-        if MaintainQuotesAPI and oauth_client:
-            maintain_quotes_api = MaintainQuotesAPI(logger=logger.getChild("MaintainQuotesAPI"))
-            token = None
-            try:
-                token = oauth_client.get_token()
-            except Exception as token_error:
-                 logger.error(f"Failed to get initial token for MaintainQuotesAPI: {token_error}", exc_info=False)
-            if token and hasattr(maintain_quotes_api, 'set_access_token'):
-                 maintain_quotes_api.set_access_token(token)
-                 logger.debug("MaintainQuotesAPI initialized and token set.")
-            elif not token:
-                 logger.error("Failed to get token for MaintainQuotesAPI, API calls will likely fail.")
-            elif not hasattr(maintain_quotes_api, 'set_access_token'):
+        if MaintainQuotesAPI and jd_token_broker:
+            maintain_quotes_api = MaintainQuotesAPI(base_url=config.get('jd_quotes_base_url'),
+                                                    logger=logger.getChild("MaintainQuotesAPI"),
+                                                    token_provider=jd_token_broker.token_provider,
+                                                    http_client=results['http_client'])
+            if hasattr(maintain_quotes_api, 'set_access_token'):
+                 jd_token_broker.subscribe(maintain_quotes_api.set_access_token)
+                 logger.debug("MaintainQuotesAPI initialized and subscribed to JD token updates.")
+            else:
                  logger.error("MaintainQuotesAPI instance does not have set_access_token method!")
         elif not MaintainQuotesAPI:
             logger.warning("MaintainQuotesAPI class not imported.")
         elif not oauth_client:
             logger.warning("OAuth client not available for MaintainQuotesAPI.")
 
+        return {'oauth_client': oauth_client, 'jd_token_broker': jd_token_broker,
+                'jd_auth_manager': jd_auth_manager, 'maintain_quotes_api': maintain_quotes_api}
+
+    def init_sharepoint(results):
+        logger = results['logging']
+        if not SharePointManager:
+             logger.error("SharePointManager class not available, cannot initialize instance.")
+             return None
+        sharepoint_manager = SharePointManager(config=results['config'], logger=logger.getChild("SPMan"),
+                                               http_client=results['http_client'])
+        logger.debug("SharePointManager initialized.")
+        return sharepoint_manager
+
+    def init_quote_integration(results):
+        logger = results['logging']
+        jd_auth = results['jd_auth']
+        maintain_quotes_api = jd_auth['maintain_quotes_api']
         if QuoteIntegration and maintain_quotes_api:
-             quote_integration_instance = QuoteIntegration(quotes_api=maintain_quotes_api, sharepoint_manager=sharepoint_manager_instance, logger=logger.getChild("QuoteIntegration"), config=config)
+             quote_integration = QuoteIntegration(quotes_api=maintain_quotes_api, sharepoint_manager=results['sharepoint'], logger=logger.getChild("QuoteIntegration"), config=results['config'], token_broker=jd_auth['jd_token_broker'])
              logger.debug("QuoteIntegration initialized.")
-        elif not QuoteIntegration:
+             return quote_integration
+        if not QuoteIntegration:
              logger.warning("QuoteIntegration class not imported.")
-        elif not maintain_quotes_api:
+        else:
              logger.warning("MaintainQuotesAPI not available, cannot initialize QuoteIntegration.")
+        return None
 
+    def create_main_window(results):
+        logger = results['logging']
         logger.info("Core handlers and managers initialized (or skipped where necessary).")
-
-    except Exception as e:
-         logger.critical(f"FATAL: Failed to initialize core managers: {e}", exc_info=True)
-         try:
-              _app_temp = QApplication.instance() or QApplication(sys.argv)
-              QMessageBox.critical(None, "Initialization Error", f"Failed to initialize core components:\n{e}\nApplication cannot start.")
-         except Exception as qe:
-              print(f"CRITICAL: Could not display Qt error message: {qe}", file=sys.stderr)
-         sys.exit(1)
-
-    app = QApplication(sys.argv)
-
-    # Load the QSS stylesheet here
-    try:
-        qss_path = "C:\\Users\\smorley\\BC\\resources\\styles\\light.qss"
-        if os.path.exists(qss_path):
-            with open(qss_path, "r") as f:
-                app.setStyleSheet(f.read())
-            logger.info(f"Applied QSS stylesheet from: {qss_path}")
-        else:
-            logger.warning(f"QSS file not found: {qss_path}")
-    except Exception as e:
-        logger.error(f"Failed to load QSS stylesheet: {e}", exc_info=True)
-
-    ui_theme = config.get('ui_theme', 'light')
-    logger.info(f"Applying UI theme: {ui_theme}")
-    try:
-        ThemeManager.apply_theme(ui_theme)
-    except Exception as e:
-         logger.error(f"Failed to apply theme '{ui_theme}': {e}", exc_info=True)
-
-    splash = None
-    if SplashScreen:
-        resources_dir_path = getattr(config, 'resources_dir', None)
-        splash_image_filename = config.get("splash_image", "splash.png")
-        splash_image_path = get_resource_path(splash_image_filename, resources_dir_path)
-        logger.debug(f"Attempting to load splash image from: {splash_image_path}")
+        logger.info("Creating MainWindow...")
+        handlers, jd_auth = results['local_handlers'], results['jd_auth']
+        window = MainWindow(config=results['config'], logger=logger, cache_handler=handlers['cache_handler'],
+                            csv_handler=handlers['csv_handler'], thread_pool=thread_pool,
+                            oauth_client=jd_auth['oauth_client'], jd_auth_manager=jd_auth['jd_auth_manager'],
+                            sharepoint_manager=results['sharepoint'], quote_integration=results['quote_integration'],
+                            jd_token_broker=jd_auth['jd_token_broker'])
+        state['window'] = window
+        return window
+
+    def load_modules(results):
+        window = results['main_window']
+        window.show()
+        logger = results['logging']
+        logger.debug("Main window shown.")
+        window.start_authentication()
+        window._load_modules_and_init()
+
+    # --- Phase graph ---
+
+    orchestrator = StartupOrchestrator(thread_pool=thread_pool, logger=logging.getLogger("main_app.startup"))
+    orchestrator.add_phase("config", load_config, message="Loading configuration...")
+    orchestrator.add_phase("logging", init_logging, depends_on=["config"], message="Starting logging...")
+    orchestrator.add_phase("splash", show_splash, depends_on=["config"], required=False, message="Loading core components...")
+    orchestrator.add_phase("theme", apply_theme, depends_on=["logging"], required=False, message="Applying theme...")
+    orchestrator.add_phase("local_handlers", init_local_handlers, depends_on=["logging"], background=True,
+                           message="Opening local caches...")
+    orchestrator.add_phase("http_client", init_http_client, depends_on=["logging"], background=True,
+                           message="Starting network client...")
+    # Both use the shared HTTP client, so it must exist (configured) before either runs
+    orchestrator.add_phase("jd_auth", init_jd_auth, depends_on=["http_client"], background=True,
+                           message="Preparing John Deere access...")
+    orchestrator.add_phase("sharepoint", init_sharepoint, depends_on=["http_client"], background=True,
+                           message="Preparing SharePoint access...")
+    orchestrator.add_phase("quote_integration", init_quote_integration, depends_on=["jd_auth", "sharepoint"],
+                           background=True, message="Preparing quote integration...")
+    orchestrator.add_phase("main_window", create_main_window,
+                           depends_on=["splash", "theme", "local_handlers", "http_client", "quote_integration"],
+                           message="Creating main window...")
+    orchestrator.add_phase("modules", load_modules, depends_on=["main_window"], message="Loading dashboard...")
+
+    def show_progress(percent, message):
+        splash = state['splash']
+        if splash:
+            splash.progress_bar.setValue(percent)
+            splash.showMessage(message, Qt.AlignBottom | Qt.AlignHCenter, Qt.white)
+
+    def finish_profiling():
+        """Write the --profile-startup report once the first module has painted, then quit."""
+        mark_startup_phase("first_paint")
+        profiler = stop_profiling()
+        if not profiler:
+            return
+        config, logger = state['config'], state['logger']
+        report_dir = getattr(config, 'log_dir', None) or os.path.join(config.base_path, 'logs')
         try:
-            splash_pixmap = QPixmap(splash_image_path)
-            if splash_pixmap.isNull():
-                 logger.error(f"Splash pixmap is null. Check image format/path: {splash_image_path}")
-                 splash = None
-            else:
-                 splash = SplashScreen(splash_pixmap)
-                 splash.show()
-                 splash.showMessage("Loading core components...", Qt.AlignBottom | Qt.AlignHCenter, Qt.white)
-                 QApplication.processEvents()
-                 logger.debug("Splash screen shown.")
+            report_path = profiler.write_report(report_dir, extra={'app_version': QApplication.applicationVersion()})
+            logger.info(f"{profiler.format_summary()}\nStartup profile written to {report_path}")
+            print(f"Startup profile written to {report_path}")
         except Exception as e:
-             logger.error(f"Failed to load or show splash screen image '{splash_image_path}': {e}")
-             splash = None
-    else:
-        logger.warning("SplashScreen class not available, skipping splash screen.")
-
-    logger.info("Creating MainWindow...")
-    window = None
-    try:
-        window = MainWindow(config=config, logger=logger, cache_handler=cache_handler, csv_handler=csv_handler, thread_pool=thread_pool, oauth_client=oauth_client, jd_auth_manager=jd_auth_manager, sharepoint_manager=sharepoint_manager_instance, quote_integration=quote_integration_instance)
-    except Exception as e:
-        logger.critical(f"FATAL: Failed to create MainWindow: {e}", exc_info=True)
-        if splash: splash.finish(None)
-        QMessageBox.critical(None, "Initialization Error", f"Failed to create main window:\n{e}\nApplication cannot start.")
-        sys.exit(1)
-
-    def finish_startup():
-        """Closes splash, shows window, loads modules, sets initial view."""
-        nonlocal window, splash
+            logger.error(f"Failed to write startup profile: {e}", exc_info=True)
+        app.quit()
+
+    def on_startup_finished():
+        mark_startup_phase("startup")
+        splash, window = state['splash'], state['window']
+        if splash:
+             splash.finish(window)
+             state['splash'] = None
+             state['logger'].debug("Splash screen finished.")
+        if get_profiler():
+             # Runs once the pending paint events have been processed
+             QTimer.singleShot(0, finish_profiling)
+
+    def on_startup_failed(phase_name, error):
+        logger = state['logger']
+        if logger:
+            logger.critical(f"FATAL: Startup phase '{phase_name}' failed: {error}")
+        else:
+            print(f"CRITICAL: FATAL: Startup phase '{phase_name}' failed: {error}", file=sys.stderr)
+        if state['splash']:
+            state['splash'].close()
         try:
-            if splash:
-                 splash.finish(window)
-                 logger.debug("Splash screen finished.")
-                 splash = None
-            if window:
-                 window.show()
-                 logger.debug("Main window shown.")
-                 window._load_modules_and_init()
-            else:
-                 logger.critical("Main window was not created successfully. Exiting.")
-                 if QApplication.instance(): QApplication.instance().quit()
-        except Exception as finish_error:
-             logger.critical(f"Error during final startup sequence: {finish_error}", exc_info=True)
-             if QApplication.instance(): QApplication.instance().quit()
-
-    if splash:
-        splash.showMessage("Launching application...", Qt.AlignBottom | Qt.AlignHCenter, Qt.white)
-        QTimer.singleShot(1500, finish_startup)
-    else:
-        QTimer.singleShot(50, finish_startup)
+            QMessageBox.critical(None, "Initialization Error", f"Failed during startup ({phase_name}):\n{error}\nApplication cannot start.")
+        except Exception as qe:
+             print(f"CRITICAL: Could not display Qt error message: {qe}", file=sys.stderr)
+        app.exit(1)
 
-    sys.excepthook = log_exception_hook
-    logger.info("Global exception hook set.")
+    orchestrator.progress.connect(show_progress)
+    orchestrator.finished.connect(on_startup_finished)
+    orchestrator.failed.connect(on_startup_failed)
+    orchestrator.start()
 
-    logger.info("Starting application event loop.")
     exit_code = 0
     try:
         exit_code = app.exec_()
-        logger.info(f"Application exited with code: {exit_code}")
+        logging.getLogger("main_app").info(f"Application exited with code: {exit_code}")
     except Exception as e_exec:
-         logger.critical(f"FATAL: Unhandled exception during app.exec_(): {e_exec}", exc_info=True)
+         logging.getLogger("main_app").critical(f"FATAL: Unhandled exception during app.exec_(): {e_exec}", exc_info=True)
          exit_code = 1
     finally:
-        logger.info("Exiting application.")
+        logging.getLogger("main_app").info("Exiting application.")
+        stop_queue_logging()
         sys.exit(exit_code)
 
 
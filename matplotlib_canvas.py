@@ -0,0 +1,140 @@
+# ui/matplotlib_canvas.py - Qt canvas for the dashboard's Matplotlib charts
+# Imported on demand (matplotlib/seaborn are slow to import), see HomeModule._create_charts
+import logging
+
+import matplotlib
+matplotlib.use('Qt5Agg')  # Use Qt5 backend for matplotlib
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+from PyQt5.QtWidgets import QSizePolicy
+from PyQt5.QtCore import QTimer
+
+logger = logging.getLogger(__name__)
+
+
+class MatplotlibCanvas(FigureCanvas):
+    """Canvas for Matplotlib figures in Qt.
+
+    Charts keep their artists between updates and call ``refresh()`` (an idle
+    redraw) instead of clearing and replotting. The layout is recomputed once
+    after a resize settles rather than on every update, and artists registered
+    with ``add_animated()`` can be redrawn alone with ``blit_animated()``.
+    """
+    LAYOUT_DELAY_MS = 150  # Resize debounce before tight_layout runs
+
+    def __init__(self, figure=None, parent=None, width=5, height=4, dpi=100):
+        if figure is None:
+            figure = Figure(figsize=(width, height), dpi=dpi)
+
+        self.figure = figure
+        self.axes = self.figure.add_subplot(111)
+
+        # Use ggplot style for better aesthetics
+        try:
+            plt.style.use('ggplot')
+        except Exception as e:
+             logger.warning(f"Could not apply 'ggplot' style: {e}")
+
+        # Set seaborn style if available
+        try:
+             sns.set_style("whitegrid")
+        except Exception as e:
+             logger.warning(f"Could not apply seaborn style: {e}")
+
+
+        super(MatplotlibCanvas, self).__init__(self.figure)
+        self.setParent(parent)
+
+        # Make the canvas expandable
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.updateGeometry()
+
+        self._message = None        # Persistent "no data"/error text
+        self._animated = []         # Artists redrawn by blit_animated()
+        self._background = None     # Pixels of the last full draw, minus animated artists
+        self._layout_dirty = True
+        self._layout_timer = QTimer(self)
+        self._layout_timer.setSingleShot(True)
+        self._layout_timer.timeout.connect(self._apply_layout)
+        self.mpl_connect('draw_event', self._on_draw)
+
+    def clear(self):
+        """Remove every artist and redraw the empty axes"""
+        try:
+            self.axes.clear()
+            self._message = None
+            self._animated = []
+            self._background = None
+            self._layout_dirty = True
+            self.refresh()
+        except Exception as e:
+             logger.error(f"Error clearing Matplotlib canvas: {e}")
+
+    def refresh(self, layout=False):
+        """Schedule a redraw, recomputing the layout only when needed.
+
+        Args:
+            layout: Force tight_layout (e.g. after tick labels changed)
+        """
+        if layout or self._layout_dirty:
+            try:
+                self.figure.tight_layout()
+            except Exception as e:
+                logger.debug(f"tight_layout failed: {e}")
+            self._layout_dirty = False
+        self.draw_idle()
+
+    def show_message(self, text, color='black'):
+        """Show a centred message over the axes (hidden by ``hide_message``)."""
+        if self._message is None:
+            self._message = self.axes.text(0.5, 0.5, "", ha='center', va='center',
+                                           transform=self.axes.transAxes, zorder=10)
+        self._message.set_text(text)
+        self._message.set_color(color)
+        self._message.set_visible(True)
+
+    def hide_message(self):
+        """Hide the message set by ``show_message``."""
+        if self._message is not None:
+            self._message.set_visible(False)
+
+    def add_animated(self, artist):
+        """Register an artist that ``blit_animated`` redraws on its own."""
+        artist.set_animated(True)
+        self._animated.append(artist)
+        return artist
+
+    def blit_animated(self):
+        """Redraw only the animated artists over the cached background.
+
+        Falls back to a full idle redraw when no background is cached yet.
+        """
+        if self._background is None:
+            self.draw_idle()
+            return
+        self.restore_region(self._background)
+        self._draw_animated()
+        self.blit(self.figure.bbox)
+
+    def resizeEvent(self, event):
+        super(MatplotlibCanvas, self).resizeEvent(event)
+        # The background no longer matches the widget size; relayout once resizing settles
+        self._background = None
+        self._layout_dirty = True
+        self._layout_timer.start(self.LAYOUT_DELAY_MS)
+
+    def _apply_layout(self):
+        self.refresh(layout=True)
+
+    def _on_draw(self, event):
+        # Cache the static scene, then paint the animated artists on top of it
+        self._background = self.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        for artist in self._animated:
+            if artist.get_visible() and artist.axes is not None:
+                artist.axes.draw_artist(artist)
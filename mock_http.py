@@ -0,0 +1,473 @@
+# benchmarks/mock_http.py - Local stand-in for Microsoft Graph, JD Quotes and their token endpoints
+#
+# Used in-process by the benchmark suite, or standalone for offline load testing:
+#   python -m benchmarks.mock_http --port 8765 --latency 0.05 --throttle-rate 0.1 --sheet-rows 20000
+# then point the app at it through the printed environment variables (or the same keys in config.json).
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from collections import Counter
+from urllib.parse import unquote, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from benchmarks.synthetic_data import sheet_rows, quotes
+
+GRAPH_BATCH_LIMIT = 20  # Graph rejects $batch requests with more sub-requests than this
+
+
+def _column_number(letters):
+    number = 0
+    for char in letters.upper():
+        number = number * 26 + (ord(char) - 64)
+    return number
+
+
+def _column_letters(number):
+    letters = ""
+    while number > 0:
+        number, remainder = divmod(number - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _graph_error(code, message):
+    return {"error": {"code": code, "message": message}}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real APIs
+
+    def log_message(self, format, *args):
+        if self.server.app.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def _dispatch(self, method):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        status, payload, headers = self.server.app.handle(method, self.path, dict(self.headers), body)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class MockApiServer:
+    """Serves the Graph, JD Quotes and OAuth calls the app makes, from memory.
+
+    Routes (relative to ``base_url``):
+
+    - ``/graph/v1.0/...``: site drive, drive root children/search/path lookup,
+      workbook ``usedRange`` (honouring ``$select``), range ``PATCH`` and ``$batch``
+    - ``/login/{tenant}/oauth2/v2.0/token``: Graph client-credentials tokens
+    - ``/jd-oauth/.well-known/oauth-authorization-server`` and ``/jd-oauth/v1/token``
+    - ``/jd/api/v1/...``: maintain-quotes search and quote details
+
+    Every request (including each ``$batch`` sub-request) can be delayed,
+    throttled with 429 + Retry-After, or failed with 503, at the configured
+    rates, so retry and batching logic can be load tested without a network.
+    GET responses are serialised once and cached until the data changes.
+    """
+
+    GRAPH_PREFIX = "/graph/v1.0"
+    GRAPH_LOGIN_PREFIX = "/login"
+    JD_PREFIX = "/jd"
+    JD_OAUTH_PREFIX = "/jd-oauth"
+
+    def __init__(self, latency=0.0, latency_jitter=0.0, throttle_rate=0.0, retry_after=1, failure_rate=0.0,
+                 default_sheet_rows=0, quote_count=0, require_auth=True, seed=None, host="127.0.0.1", port=0,
+                 verbose=False):
+        """Initialize the server (call ``start`` to begin serving).
+
+        Args:
+            latency: Seconds added to every response
+            latency_jitter: Up to this many extra seconds, chosen at random per request
+            throttle_rate: Fraction of requests answered 429 with a Retry-After header
+            retry_after: Retry-After value, in seconds, sent with 429 responses
+            failure_rate: Fraction of requests answered 503
+            default_sheet_rows: Rows generated for worksheets not set with ``set_sheet`` (0: 404)
+            quote_count: Quotes generated for searches until ``set_quotes`` is called
+            require_auth: Answer 401 to API calls without a bearer token
+            seed: Random seed for the throttle/failure draws (reproducible runs)
+            host: Interface to bind
+            port: Port to bind (0: any free port)
+            verbose: Log each request to stderr
+        """
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.failure_rate = failure_rate
+        self.default_sheet_rows = default_sheet_rows
+        self.require_auth = require_auth
+        self.host = host
+        self.port = port
+        self.verbose = verbose
+        self.sheets = {}                  # worksheet name -> usedRange text rows
+        self.quotes = quotes(quote_count) if quote_count else []
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._stats = Counter()
+        self._token_count = 0
+        self._server = None
+        self._thread = None
+
+    # --- URLs ---
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self._server.server_port}"
+
+    @property
+    def graph_url(self):
+        return f"{self.base_url}{self.GRAPH_PREFIX}"
+
+    @property
+    def graph_token_url(self):
+        return f"{self.base_url}{self.GRAPH_LOGIN_PREFIX}/mock-tenant/oauth2/v2.0/token"
+
+    @property
+    def jd_url(self):
+        return f"{self.base_url}{self.JD_PREFIX}"
+
+    @property
+    def jd_issuer_url(self):
+        return f"{self.base_url}{self.JD_OAUTH_PREFIX}"
+
+    def config_overrides(self):
+        """Config keys that point the app at this server."""
+        return {
+            'graph_base_url': self.graph_url,
+            'graph_token_url': self.graph_token_url,
+            'jd_quotes_base_url': self.jd_url,
+            'jd_oauth_issuer_url': self.jd_issuer_url,
+        }
+
+    # --- Lifecycle ---
+
+    def start(self):
+        """Start serving on a background thread. Returns self."""
+        self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self._server.app = self
+        self._thread = threading.Thread(target=self._server.serve_forever, name="MockApiServer", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    # --- Data ---
+
+    def set_sheet(self, name, rows):
+        with self._lock:
+            self.sheets[name] = [list(row) for row in rows]
+            self._cache.clear()
+
+    def get_sheet(self, name):
+        with self._lock:
+            return [list(row) for row in self.sheets.get(name, [])]
+
+    def set_quotes(self, quote_list):
+        with self._lock:
+            self.quotes = quote_list
+            self._cache.clear()
+
+    def stats(self):
+        """Request counts keyed by "<route> <status>", e.g. "graph.usedRange 429"."""
+        with self._lock:
+            return dict(self._stats)
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
+
+    # --- Request handling ---
+
+    def handle(self, method, raw_path, headers, body):
+        """Answer one HTTP request.
+
+        Returns:
+            (status, body bytes, extra headers)
+        """
+        path, _, query = raw_path.partition("?")
+        path = unquote(path)
+        params = {key: values[0] for key, values in parse_qs(query).items()}
+
+        delay = self.latency + (self._rng.uniform(0, self.latency_jitter) if self.latency_jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+
+        if path.startswith(self.GRAPH_PREFIX) and path[len(self.GRAPH_PREFIX):] == "/$batch" and method == "POST":
+            route, status, payload, extra = self._handle_batch(headers, body)
+            self._count(route, status)
+            return status, json.dumps(payload).encode("utf-8"), extra
+
+        route, status, payload, extra = self._handle_one(method, path, params, headers, body)
+        self._count(route, status)
+        return status, payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8"), extra
+
+    def _handle_one(self, method, path, params, headers, body):
+        """Route a single (possibly batched) request: chaos first, then auth, then the handler."""
+        route, handler, args = self._match(method, path)
+        if handler is None:
+            return "unmatched", 404, _graph_error("itemNotFound", f"No mock route for {method} {path}"), {}
+
+        with self._lock:
+            draw = self._rng.random()
+        if draw < self.throttle_rate:
+            return (route, 429, _graph_error("TooManyRequests", "Mock throttling"),
+                    {"Retry-After": str(self.retry_after)})
+        if draw < self.throttle_rate + self.failure_rate:
+            return route, 503, _graph_error("serviceNotAvailable", "Mock failure"), {}
+
+        if self.require_auth and not route.endswith("token") and not route.endswith("discovery"):
+            auth = next((value for key, value in headers.items() if key.lower() == "authorization"), "")
+            if not auth.startswith("Bearer ") or not auth[7:].strip():
+                return route, 401, _graph_error("InvalidAuthenticationToken", "Access token is empty."), {}
+
+        if method == "GET":
+            key = (path, tuple(sorted(params.items())))
+            with self._lock:
+                cached = self._cache.get(key)
+            if cached is not None:
+                return route, 200, cached, {}
+            status, payload = handler(params, body, *args)
+            if status == 200:
+                payload = json.dumps(payload).encode("utf-8")
+                with self._lock:
+                    self._cache[key] = payload
+            return route, status, payload, {}
+
+        status, payload = handler(params, body, *args)
+        return route, status, payload, {}
+
+    def _handle_batch(self, headers, body):
+        """Graph JSON batching: run each sub-request and collect the responses."""
+        try:
+            requests_ = json.loads(body or b"{}").get("requests", [])
+        except ValueError:
+            return "graph.batch", 400, _graph_error("BadRequest", "Invalid batch payload"), {}
+        if len(requests_) > GRAPH_BATCH_LIMIT:
+            return ("graph.batch", 400,
+                    _graph_error("BadRequest", f"Batch cannot exceed {GRAPH_BATCH_LIMIT} requests"), {})
+
+        responses = []
+        for request in requests_:
+            url = request.get("url", "")
+            path, _, query = url.partition("?")
+            path = self.GRAPH_PREFIX + "/" + unquote(path).lstrip("/")
+            params = {key: values[0] for key, values in parse_qs(query).items()}
+            sub_body = json.dumps(request["body"]).encode("utf-8") if "body" in request else b""
+            route, status, payload, extra = self._handle_one(request.get("method", "GET").upper(), path, params,
+                                                             {**headers, **request.get("headers", {})}, sub_body)
+            self._count(route, status)
+            if isinstance(payload, bytes):
+                payload = json.loads(payload)
+            responses.append({"id": request.get("id"), "status": status,
+                              "headers": {"Content-Type": "application/json", **extra}, "body": payload})
+        return "graph.batch", 200, {"responses": responses}, {}
+
+    def _count(self, route, status):
+        with self._lock:
+            self._stats[f"{route} {status}"] += 1
+
+    def _match(self, method, path):
+        """Return (route name, handler, path args) for a request, or (None, None, None)."""
+        for prefix, routes in ((self.GRAPH_PREFIX, self._graph_routes), (self.JD_PREFIX + "/", self._jd_routes),
+                               (self.GRAPH_LOGIN_PREFIX, self._login_routes),
+                               (self.JD_OAUTH_PREFIX, self._jd_oauth_routes)):
+            if path.startswith(prefix):
+                rest = path[len(prefix.rstrip("/")):]
+                for route_method, pattern, name, handler in routes():
+                    match = re.fullmatch(pattern, rest) if route_method == method else None
+                    if match:
+                        return name, handler, match.groups()
+        return None, None, None
+
+    # --- Graph ---
+
+    def _graph_routes(self):
+        return (
+            ("GET", r"/sites/[^/]+/drive", "graph.drive", self._drive),
+            ("GET", r"/drives/[^/]+/root/children", "graph.children", self._children),
+            ("GET", r"/drives/[^/]+/root/search\(q='(.*)'\)", "graph.search", self._search),
+            ("GET", r"/drives/[^/]+/root:/(.+)", "graph.item", self._item),
+            ("GET", r"/sites/[^/]+/drive/items/[^/]+/workbook/worksheets/([^/]+)/usedRange(?:\(valuesOnly=true\))?",
+             "graph.usedRange", self._used_range),
+            ("PATCH", r"/sites/[^/]+/drive/items/[^/]+/workbook/worksheets/([^/]+)/range\(address='([^']+)'\)",
+             "graph.range.patch", self._patch_range),
+        )
+
+    def _drive(self, params, body):
+        return 200, {"id": "mock-drive", "driveType": "documentLibrary"}
+
+    def _children(self, params, body):
+        return 200, {"value": [{"id": "mock-item", "name": "mock.xlsx", "file": {}}]}
+
+    def _search(self, params, body, query):
+        return 200, {"value": [{"id": "mock-item", "name": query, "file": {},
+                                "parentReference": {"path": "/drive/root:"}}]}
+
+    def _item(self, params, body, item_path):
+        return 200, {"id": "mock-item", "name": item_path.rsplit("/", 1)[-1], "file": {}}
+
+    def _sheet_for_read(self, name):
+        with self._lock:
+            rows = self.sheets.get(name)
+            if rows is None and self.default_sheet_rows:
+                rows = self.sheets[name] = sheet_rows(self.default_sheet_rows)
+            return rows
+
+    def _used_range(self, params, body, name):
+        rows = self._sheet_for_read(name)
+        if rows is None:
+            return 404, _graph_error("ItemNotFound", f"The requested worksheet '{name}' was not found.")
+        column_count = max((len(row) for row in rows), default=0)
+        result = {
+            "address": f"{name}!A1:{_column_letters(max(column_count, 1))}{max(len(rows), 1)}",
+            "rowCount": len(rows),
+            "columnCount": column_count,
+            "text": rows,
+        }
+        select = params.get("$select")
+        if select:
+            result = {key: value for key, value in result.items() if key in select.split(",")}
+        return 200, result
+
+    def _patch_range(self, params, body, name, address):
+        match = re.fullmatch(r"(?:[^!]+!)?([A-Z]+)(\d+)(?::([A-Z]+)(\d+))?", address)
+        try:
+            values = json.loads(body or b"{}")["values"]
+        except (ValueError, KeyError):
+            return 400, _graph_error("InvalidArgument", "Request body must contain 'values'.")
+        if not match:
+            return 400, _graph_error("InvalidArgument", f"Invalid range address '{address}'.")
+        first_col, first_row = _column_number(match.group(1)) - 1, int(match.group(2)) - 1
+        with self._lock:
+            rows = self.sheets.setdefault(name, [])
+            for offset, row_values in enumerate(values):
+                while len(rows) <= first_row + offset:
+                    rows.append([])
+                row = rows[first_row + offset]
+                row.extend([""] * (first_col + len(row_values) - len(row)))
+                row[first_col:first_col + len(row_values)] = ["" if v is None else str(v) for v in row_values]
+            self._cache.clear()
+        return 200, {"address": f"{name}!{address.split('!')[-1]}", "rowCount": len(values),
+                     "values": values}
+
+    # --- Token endpoints ---
+
+    def _login_routes(self):
+        return (("POST", r"/[^/]+/oauth2/v2\.0/token", "graph.token", self._graph_token),)
+
+    def _jd_oauth_routes(self):
+        return (
+            ("GET", r"/\.well-known/oauth-authorization-server", "jd.discovery", self._jd_discovery),
+            ("POST", r"/v1/token", "jd.token", self._jd_token),
+        )
+
+    def _issue_token(self, prefix):
+        with self._lock:
+            self._token_count += 1
+            return f"{prefix}-{self._token_count}"
+
+    def _graph_token(self, params, body):
+        form = parse_qs(body.decode("utf-8"))
+        if form.get("grant_type", [""])[0] != "client_credentials":
+            return 400, {"error": "unsupported_grant_type", "error_description": "Mock supports client_credentials only."}
+        return 200, {"token_type": "Bearer", "expires_in": 3599, "ext_expires_in": 3599,
+                     "access_token": self._issue_token("mock-graph")}
+
+    def _jd_discovery(self, params, body):
+        return 200, {"issuer": self.jd_issuer_url, "token_endpoint": f"{self.jd_issuer_url}/v1/token",
+                     "authorization_endpoint": f"{self.jd_issuer_url}/v1/authorize",
+                     "scopes_supported": ["offline_access"]}
+
+    def _jd_token(self, params, body):
+        form = parse_qs(body.decode("utf-8"))
+        return 200, {"token_type": "Bearer", "expires_in": 43200, "scope": form.get("scope", [""])[0],
+                     "access_token": self._issue_token("mock-jd")}
+
+    # --- JD Quotes ---
+
+    def _jd_routes(self):
+        return (
+            ("POST", r"/api/v1/dealers/([^/]+)/maintain-quotes", "jd.maintain-quotes", self._maintain_quotes),
+            ("GET", r"/api/v1/quotes/([^/]+)/maintain-quote-details", "jd.quote-details", self._quote_details),
+        )
+
+    def _maintain_quotes(self, params, body, dealer_racf_id):
+        try:
+            criteria = json.loads(body or b"{}")
+        except ValueError:
+            return 400, {"type": "ERROR", "message": "Invalid JSON body"}
+        with self._lock:
+            found = self.quotes
+        if criteria.get("quoteId"):
+            found = [q for q in found if str(q.get("quoteId")) == str(criteria["quoteId"])]
+        return 200, {"type": "SUCCESS", "body": found}
+
+    def _quote_details(self, params, body, quote_id):
+        return 200, {"type": "SUCCESS", "body": {"quoteId": quote_id, "equipmentData": [],
+                                                 "tradeInData": [], "customerData": {}}}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local mock of the Graph, JD Quotes and OAuth endpoints.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--latency-jitter", type=float, default=0.0, help="Random extra seconds, up to this")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of requests answered 503")
+    parser.add_argument("--sheet-rows", type=int, default=5000, help="Rows served for every worksheet")
+    parser.add_argument("--quotes", type=int, default=500, help="Quotes returned by maintain-quotes searches")
+    parser.add_argument("--seed", type=int, help="Random seed for throttling/failures")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args(argv)
+
+    server = MockApiServer(latency=args.latency, latency_jitter=args.latency_jitter,
+                           throttle_rate=args.throttle_rate, retry_after=args.retry_after,
+                           failure_rate=args.failure_rate, default_sheet_rows=args.sheet_rows,
+                           quote_count=args.quotes, seed=args.seed, host=args.host, port=args.port,
+                           verbose=args.verbose).start()
+    print(f"Mock API server listening on {server.base_url}")
+    print("Point the app at it with:")
+    for key, value in server.config_overrides().items():
+        print(f"  {key.upper()}={value}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print("Request counts:")
+        for key, count in sorted(server.stats().items()):
+            print(f"  {key:<32} {count}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
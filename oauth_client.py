@@ -1,20 +1,26 @@
 # utils/oauth_client.py - Consolidated version
-import requests
 import base64
 import json
 import time
 import logging
 import os
+import threading
 import traceback
 
+from utils.http_client import get_http_client, HttpClientError
+
 class JohnDeereOAuthClient:
     """Client for handling John Deere OAuth authentication with consolidated token handling."""
     
-    # OAuth endpoints from documentation
-    TOKEN_URL = "https://signin.johndeere.com/oauth2/aus78tnlaysMraFhC1t7/v1/token"
-    WELL_KNOWN_URL = "https://signin.johndeere.com/oauth2/aus78tnlaysMraFhC1t7/.well-known/oauth-authorization-server"
+    # OAuth endpoints from documentation (relative to the issuer, which Config can override)
+    ISSUER_URL = "https://signin.johndeere.com/oauth2/aus78tnlaysMraFhC1t7"
+    TOKEN_URL = f"{ISSUER_URL}/v1/token"
+    WELL_KNOWN_URL = f"{ISSUER_URL}/.well-known/oauth-authorization-server"
+    
+    # How long a cached discovery document is trusted before it is fetched again
+    DISCOVERY_TTL = 24 * 3600
     
-    def __init__(self, client_id, client_secret, cache_path=None, logger=None):
+    def __init__(self, client_id, client_secret, cache_path=None, logger=None, discovery_ttl=None, issuer_url=None):
         """Initialize the OAuth client.
         
         Args:
@@ -22,31 +28,94 @@ class JohnDeereOAuthClient:
             client_secret: Application Client Secret
             cache_path: Path to cache directory for storing tokens
             logger: Logger instance
+            discovery_ttl: Seconds the cached discovery document stays fresh (default: DISCOVERY_TTL)
+            issuer_url: OAuth issuer, e.g. a local mock server (default: ISSUER_URL)
         """
         self.client_id = client_id
         self.client_secret = client_secret
         self.cache_path = cache_path
         self.logger = logger or logging.getLogger(__name__)
+        self.discovery_ttl = self.DISCOVERY_TTL if discovery_ttl is None else discovery_ttl
+        self.issuer_url = (issuer_url or self.ISSUER_URL).rstrip('/')
+        self.token_url = f"{self.issuer_url}/v1/token"
+        self.well_known_url = f"{self.issuer_url}/.well-known/oauth-authorization-server"
+        
+        # Discovery results kept in memory once loaded (see get_oauth_endpoints)
+        self._endpoints = None
+        self._endpoints_fetched_at = 0.0
+        self._endpoints_lock = threading.Lock()
         
         # Ensure cache directory exists
         if self.cache_path:
             os.makedirs(self.cache_path, exist_ok=True)
             self.token_file = os.path.join(self.cache_path, "jd_token.json")
+            self.discovery_file = os.path.join(self.cache_path, "jd_oauth_discovery.json")
         else:
             self.token_file = None
+            self.discovery_file = None
             
         # Log initialization
         self.logger.info(f"Initialized JohnDeereOAuthClient with client_id: {client_id[:5]}...")
     
-    def get_oauth_endpoints(self):
-        """Get OAuth endpoints from the well-known URL."""
+    def get_oauth_endpoints(self, force_refresh=False):
+        """Get OAuth endpoints, using the cached discovery document while it is fresh.
+        
+        The well-known document is read from memory, then from the on-disk
+        cache, and only fetched when both are older than ``discovery_ttl``.
+        If the fetch fails, a stale cached copy is preferred over the defaults.
+        
+        Args:
+            force_refresh: Ignore the cache and fetch the document again
+            
+        Returns:
+            Dictionary with token_endpoint, authorization_endpoint and scopes_supported
+        """
+        with self._endpoints_lock:
+            if not force_refresh:
+                if self._endpoints and self._is_discovery_fresh(self._endpoints_fetched_at):
+                    return dict(self._endpoints)
+                cached = self._load_cached_discovery()
+                if cached and self._is_discovery_fresh(cached['fetched_at']):
+                    self._endpoints = cached['endpoints']
+                    self._endpoints_fetched_at = cached['fetched_at']
+                    self.logger.debug(f"Using cached OAuth endpoints from {self.discovery_file}")
+                    return dict(self._endpoints)
+            
+            endpoints = self._fetch_oauth_endpoints()
+            if endpoints:
+                self._endpoints = endpoints
+                self._endpoints_fetched_at = time.time()
+                self._save_cached_discovery(endpoints, self._endpoints_fetched_at)
+                return dict(endpoints)
+            
+            # Fetch failed: a stale document beats the hard-coded defaults
+            stale = self._endpoints
+            if not stale:
+                cached = self._load_cached_discovery()
+                stale = cached['endpoints'] if cached else None
+            if stale:
+                self.logger.warning("Using stale cached OAuth endpoints after discovery failure")
+                return dict(stale)
+            return {
+                'token_endpoint': self.token_url
+            }
+    
+    def _is_discovery_fresh(self, fetched_at):
+        return (time.time() - fetched_at) < self.discovery_ttl
+    
+    def _fetch_oauth_endpoints(self):
+        """Fetch OAuth endpoints from the well-known URL.
+        
+        Returns:
+            Endpoints dictionary or None if the fetch failed
+        """
         try:
-            self.logger.info(f"Fetching OAuth endpoints from {self.WELL_KNOWN_URL}")
-            response = requests.get(self.WELL_KNOWN_URL, timeout=30)
+            self.logger.info(f"Fetching OAuth endpoints from {self.well_known_url}")
+            response = get_http_client().get(self.well_known_url, timeout=30)
             if response.status_code == 200:
                 data = response.json()
                 endpoints = {
-                    'token_endpoint': data.get('token_endpoint', self.TOKEN_URL),
+                    'token_endpoint': data.get('token_endpoint', self.token_url),
                     'authorization_endpoint': data.get('authorization_endpoint'),
                     'scopes_supported': data.get('scopes_supported', [])
                 }
@@ -54,15 +123,45 @@ class JohnDeereOAuthClient:
                 return endpoints
             else:
                 self.logger.error(f"Failed to get OAuth endpoints: {response.status_code} - {response.text}")
-                return {
-                    'token_endpoint': self.TOKEN_URL
-                }
+                return None
         except Exception as e:
             self.logger.error(f"Error getting OAuth endpoints: {str(e)}")
             self.logger.error(traceback.format_exc())
-            return {
-                'token_endpoint': self.TOKEN_URL
-            }
+            return None
+    
+    def _load_cached_discovery(self):
+        """Read the discovery cache file.
+        
+        Returns:
+            Dict with 'endpoints' and 'fetched_at', or None if missing or unreadable
+        """
+        if not self.discovery_file or not os.path.exists(self.discovery_file):
+            return None
+        try:
+            with open(self.discovery_file, 'r') as f:
+                data = json.load(f)
+            endpoints = data.get('endpoints')
+            if not isinstance(endpoints, dict) or not endpoints.get('token_endpoint'):
+                return None
+            if data.get('issuer', self.ISSUER_URL) != self.issuer_url:
+                return None  # Cached for a different issuer (e.g. a mock server)
+            return {'endpoints': endpoints, 'fetched_at': float(data.get('fetched_at', 0))}
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable OAuth discovery cache: {str(e)}")
+            return None
+    
+    def _save_cached_discovery(self, endpoints, fetched_at):
+        """Write the discovery cache file atomically."""
+        if not self.discovery_file:
+            return
+        tmp_path = f"{self.discovery_file}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({'endpoints': endpoints, 'fetched_at': fetched_at, 'issuer': self.issuer_url}, f)
+            os.replace(tmp_path, self.discovery_file)
+            self.logger.debug(f"Saved OAuth endpoints to {self.discovery_file}")
+        except Exception as e:
+            self.logger.error(f"Error saving OAuth discovery cache: {str(e)}")
     
     def get_client_credentials_token(self, scope="offline_access"):
         """Get a token using the client credentials grant type.
@@ -75,7 +174,7 @@ class JohnDeereOAuthClient:
         """
         # Get token endpoint URL
         endpoints = self.get_oauth_endpoints()
-        token_url = endpoints.get('token_endpoint', self.TOKEN_URL)
+        token_url = endpoints.get('token_endpoint', self.token_url)
         
         # Create authorization header
         auth_string = f"{self.client_id}:{self.client_secret}"
@@ -96,7 +195,7 @@ class JohnDeereOAuthClient:
         
         try:
             self.logger.info(f"Requesting access token from {token_url}")
-            response = requests.post(token_url, headers=headers, data=data, timeout=30)
+            response = get_http_client().post(token_url, headers=headers, data=data, timeout=30)
             
             # Log response details for debugging
             self.logger.debug(f"Token response status: {response.status_code}")
@@ -129,11 +228,11 @@ class JohnDeereOAuthClient:
             self.logger.error(traceback.format_exc())
             return None
     
-    def load_cached_token(self):
-        """Load a token from cache if available and not expired.
+    def load_cached_token_data(self):
+        """Load the cached token data if available and not expired.
         
         Returns:
-            Token string or None if no valid cached token
+            Token dict (with access_token and expires_at) or None if no valid cached token
         """
         if not self.token_file or not os.path.exists(self.token_file):
             self.logger.info(f"No cached token file found at {self.token_file}")
@@ -147,7 +246,7 @@ class JohnDeereOAuthClient:
             if 'expires_at' in token_data and token_data['expires_at'] > time.time() + 300:
                 self.logger.info("Using cached token that expires at " + 
                                time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(token_data['expires_at'])))
-                return token_data.get('access_token')
+                return token_data
             else:
                 self.logger.info("Cached token has expired or will expire soon")
                 return None
@@ -155,6 +254,15 @@ class JohnDeereOAuthClient:
             self.logger.error(f"Error loading cached token: {str(e)}")
             return None
     
+    def load_cached_token(self):
+        """Load a token from cache if available and not expired.
+        
+        Returns:
+            Token string or None if no valid cached token
+        """
+        token_data = self.load_cached_token_data()
+        return token_data.get('access_token') if token_data else None
+    
     def get_token(self, force_refresh=False):
         """Get a valid token, using cache if available.
         
@@ -282,7 +390,7 @@ class JohnDeereOAuthClient:
         
         try:
             self.logger.info(f"Testing token against {test_url}")
-            response = requests.post(test_url, headers=headers, json=data, timeout=15)
+            response = get_http_client().post(test_url, headers=headers, json=data, timeout=15)
             
             # Even 401/404 responses can indicate the token format is valid but permissions/paths are wrong
             # So we consider this a valid test unless it's a connection error
@@ -297,7 +405,7 @@ class JohnDeereOAuthClient:
                 # Still return True for format validity if we get any response
                 return True, f"Token format is valid, but API returned: {response.status_code}"
                 
-        except requests.exceptions.RequestException as e:
+        except HttpClientError as e:
             self.logger.error(f"Request error during token test: {str(e)}")
             return False, f"Connection error: {str(e)}"
         except Exception as e:
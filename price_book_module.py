@@ -6,7 +6,9 @@ import traceback # Added for error handling in worker
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
                              QPushButton, QTableWidget, QTableWidgetItem,
                              QHeaderView, QMessageBox, QAbstractItemView)
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, pyqtSlot
+
+from utils.instrumentation import timed
 
 # Try importing SharePoint manager from the correct location
 try:
@@ -244,7 +246,8 @@ class PriceBookModule(BaseModule): # Inherit from BaseModule
                 on_result=self._handle_load_result,
                 on_error=self._handle_load_error,
                 on_finished=self._load_finished,
-                loading_message="Loading Price Book..."
+                loading_message="Loading Price Book...",
+                dedup_key="price_book_load" # Repeated reloads join the one in flight
             )
         else:
             # Run synchronously if no background task runner
@@ -394,6 +397,8 @@ class PriceBookModule(BaseModule): # Inherit from BaseModule
             self.table.setSortingEnabled(True)
 
 
+    @pyqtSlot()  # Explicit signature: the timing wrapper must not receive textChanged's argument
+    @timed("table.price_book")
     def filter_data(self):
         """Hides rows that do not contain the search text in any column."""
         # Ensure UI elements exist before proceeding
@@ -13,6 +13,12 @@ except ImportError:
     # Logging might not be set up yet, use print
     print("ERROR: PyAutoGUI not installed. Receiving Automation module will not function.")
 
+try:
+    from utils.screen_automation import ScreenAutomation
+except ImportError:
+    ScreenAutomation = None
+
+from utils.constants import TRAFFIC_TEMPLATES
 
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
                              QPushButton, QTextEdit, QMessageBox, QProgressBar)
@@ -100,6 +106,13 @@ class ReceivingModule(BaseModule):
         self.pyautogui_pause = self.config.get('pyautogui_pause', 0.2) if self.config else 0.2
         self.pyautogui_timeout = self.config.get('pyautogui_timeout', 10) if self.config else 10
         self.pyautogui_confidence = self.config.get('pyautogui_confidence', 0.8) if self.config else 0.8
+        self.automation_scale = float(self.config.get('automation_template_scale', 0.5)) if self.config else 0.5
+        self.automation_poll_interval = float(self.config.get('automation_poll_interval', 0.1)) if self.config else 0.1
+        self.automation_settle_delay = float(self.config.get('automation_settle_delay', 0.15)) if self.config else 0.15
+        self.automation_type_interval = float(self.config.get('automation_type_interval', 0.02)) if self.config else 0.02
+        cache_dir = getattr(self.config, 'cache_dir', None) if self.config else None
+        self.region_cache_file = os.path.join(cache_dir, "traffic_regions.json") if cache_dir else None
+        self.automation = None # ScreenAutomation, created per run in the worker thread
 
         # Check if image directory exists
         if not os.path.isdir(self.images_dir):
@@ -188,75 +201,65 @@ class ReceivingModule(BaseModule):
 
     # --- Automation Logic (Adapted from TrafficAuto.py) ---
 
-    def _get_image_path(self, image_name):
-        """Constructs the full path to an image file."""
-        if not hasattr(self, 'images_dir') or not self.images_dir:
-             self.logger.error("Image directory path not configured.")
-             return None
-        return os.path.join(self.images_dir, image_name)
-
-    def _click_element(self, image_name, description, timeout=None, click=True, conf=None, region=None):
-        """Clicks an element identified by an image, adapted for module context."""
-        if pyautogui is None: raise RuntimeError("PyAutoGUI is not installed.")
-
+    def _create_automation(self):
+        """Build the screen automation engine and preload every template.
+
+        Raises:
+            RuntimeError: OpenCV/PyAutoGUI missing
+            FileNotFoundError: A template image is missing
+        """
+        if ScreenAutomation is None: raise RuntimeError("Screen automation engine is not available.")
+        automation = ScreenAutomation(self.images_dir, confidence=self.pyautogui_confidence,
+                                      scale=self.automation_scale, poll_interval=self.automation_poll_interval,
+                                      settle_delay=self.automation_settle_delay,
+                                      type_interval=self.automation_type_interval,
+                                      region_cache_file=self.region_cache_file, logger=self.logger)
+        automation.preload(TRAFFIC_TEMPLATES)
+        return automation
+
+    def _click_element(self, image_name, description, timeout=None):
+        """Waits for an element identified by an image and clicks it."""
         timeout = timeout if timeout is not None else self.pyautogui_timeout
-        conf = conf if conf is not None else self.pyautogui_confidence
-        img_file = self._get_image_path(image_name)
-
-        if not img_file or not os.path.exists(img_file):
-            self.logger.error(f"Image file not found for '{description}': {img_file or image_name}")
-            raise FileNotFoundError(f"Image file not found: {img_file or image_name}")
-
-        self.logger.debug(f"Attempting to find '{description}' using image: {img_file}")
-        start_time = time.time()
-        location = None
-        original_pause = pyautogui.PAUSE
-        pyautogui.PAUSE = 0.05
+        try:
+            return self.automation.click(image_name, timeout=timeout, description=description)
+        except TimeoutError:
+            self.logger.warning(f"Timeout: Could not find '{description}' ({image_name}) within {timeout} seconds.")
+            raise TimeoutError(f"Timeout finding {description}")
 
+    def _wait_for_element(self, image_name, description, timeout=None):
+        """Waits until an element identified by an image is visible, without clicking."""
+        timeout = timeout if timeout is not None else self.pyautogui_timeout
         try:
-            while time.time() - start_time < timeout:
-                try:
-                    locate_args = {'confidence': conf}
-                    if region: locate_args['region'] = region
-                    location = pyautogui.locateCenterOnScreen(img_file, **locate_args)
-                except pyautogui.ImageNotFoundException:
-                    location = None
-                except Exception as e:
-                    self.logger.warning(f"PyAutoGUI Exception locating '{description}' ({img_file}): {e}")
-                    location = None
-
-                if location:
-                    self.logger.info(f"Found '{description}' at {location}.")
-                    if click:
-                        try:
-                            pyautogui.click(location)
-                            self.logger.debug(f"Clicked '{description}' at {location}.")
-                            time.sleep(0.1)
-                        except Exception as e_click:
-                             self.logger.error(f"Failed to click '{description}' at {location}: {e_click}")
-                             raise RuntimeError(f"Failed to click {description}") from e_click
-                    return location
-                time.sleep(0.3)
-        finally:
-            pyautogui.PAUSE = original_pause
+            return self.automation.wait_for(image_name, timeout=timeout, description=description)
+        except TimeoutError:
+            self.logger.warning(f"Timeout: '{description}' ({image_name}) did not appear within {timeout} seconds.")
+            raise TimeoutError(f"Timeout waiting for {description}")
 
-        self.logger.warning(f"Timeout: Could not find '{description}' ({img_file}) within {timeout} seconds.")
-        raise TimeoutError(f"Timeout finding {description}")
+    def _wait_until_gone(self, image_name, description, timeout=None):
+        """Waits until an element identified by an image is no longer visible."""
+        timeout = timeout if timeout is not None else self.pyautogui_timeout
+        try:
+            return self.automation.wait_until_gone(image_name, timeout=timeout, description=description)
+        except TimeoutError:
+            self.logger.warning(f"Timeout: '{description}' ({image_name}) still visible after {timeout} seconds.")
+            raise TimeoutError(f"Timeout waiting for {description} to close")
 
-    def _click_and_type(self, image_name, text_to_type, description, timeout=None, conf=None, region=None):
+    def _click_and_type(self, image_name, text_to_type, description, timeout=None):
         """Clicks an element and types text, adapted for module context."""
-        if pyautogui is None: raise RuntimeError("PyAutoGUI is not installed.")
-        location = self._click_element(image_name, description, timeout, click=True, conf=conf, region=region)
+        self._click_element(image_name, description, timeout)
         self.logger.debug(f"Typing '{text_to_type}' into '{description}'.")
         try:
-            pyautogui.typewrite(str(text_to_type), interval=0.05)
-            time.sleep(0.1)
+            self.automation.type_text(text_to_type)
         except Exception as e:
             self.logger.error(f"Failed to type '{text_to_type}' into '{description}': {e}")
             raise RuntimeError(f"Failed to type into {description}") from e
 
     def _process_traffic_entry(self, customer_name, stock_item):
-        """Automates a single traffic entry, adapted for module context."""
+        """Automates a single traffic entry, adapted for module context.
+
+        Each step waits for the element it needs instead of sleeping a fixed
+        time after the previous one; the engine pauses briefly after clicks.
+        """
         if pyautogui is None: raise RuntimeError("PyAutoGUI is not installed.")
         self.logger.info(f"--- Processing entry: Customer='{customer_name}', Stock='{stock_item}' ---")
         original_pause = pyautogui.PAUSE
@@ -264,43 +267,34 @@ class ReceivingModule(BaseModule):
         try:
             self.logger.info("Step 1: Click New Traffic Button")
             self._click_element("new_traffic.png", "New Traffic Button", timeout=15)
-            time.sleep(0.5)
             self.logger.info("Step 2: Click Customer Lookup")
             self._click_element("customer_lookup.png", "Customer Lookup Button")
-            time.sleep(0.5)
             self.logger.info(f"Step 3: Search for customer '{customer_name}'")
             try:
                 self._click_and_type("customer_name_field.png", customer_name, "Customer Name Field")
-            except (FileNotFoundError, TimeoutError, RuntimeError) as e:
+            except (TimeoutError, RuntimeError) as e:
                 self.logger.warning(f"Could not click Customer Name Field based on image ({e}), attempting direct type.")
-                pyautogui.typewrite(customer_name, interval=0.05)
-                time.sleep(0.2)
+                self.automation.type_text(customer_name)
             self._click_element("search_button.png", "Search Button")
-            time.sleep(1)
             self.logger.info("Step 4: Click Customer Result")
             self._click_element("select_result.png", "Customer Result Row")
-            time.sleep(0.5)
             self.logger.info("Step 5: Click Save (waiting for CONV01)")
-            self._click_element("conv01.png", "CONV01 Confirmation", click=False, timeout=15)
+            self._wait_for_element("conv01.png", "CONV01 Confirmation", timeout=15)
             self._click_element("save.png", "Save Button (after CONV01)")
-            time.sleep(2)
             self.logger.info(f"Step 6: Enter stock number '{stock_item}'")
             self._click_and_type("stock_number.png", stock_item, "Stock Number Field", timeout=15)
-            time.sleep(0.3)
             self.logger.info("Step 7: Click Save (after stock number)")
             self._click_element("save.png", "Save Button (after stock number)")
-            time.sleep(0.5)
             self.logger.info("Step 8: Select Comp/Pay status")
             self._click_element("pending.png", "Pending Dropdown")
-            time.sleep(0.3)
-            pyautogui.press("c")
+            self.automation.press("c")
             self.logger.info("Pressed 'c' for Comp/Pay status.")
-            time.sleep(0.3)
             self.logger.info("Step 9: Enter Trucker")
             self._click_and_type("trucker.png", "BRITRK", "Trucker Field")
             self.logger.info("Step 10: Click Final Save")
             self._click_element("save.png", "Final Save Button", timeout=15)
-            time.sleep(2)
+            # The entry window closes once the save completes
+            self._wait_until_gone("trucker.png", "Traffic entry window", timeout=15)
             self.logger.info(f"--- Successfully processed entry for Customer='{customer_name}', Stock='{stock_item}' ---")
             return True
         except Exception as e:
@@ -341,6 +335,8 @@ class ReceivingModule(BaseModule):
         results_details = []
         success_count = 0
         fail_count = 0
+        # Load templates before any input is sent, so a missing image fails the run up front
+        self.automation = self._create_automation()
         status_callback.emit(f"Found {total_tasks} tasks. Starting in 3 seconds...")
         time.sleep(3)
 
@@ -368,8 +364,9 @@ class ReceivingModule(BaseModule):
                  fail_count += 1
                  # Continue processing remaining tasks
 
-            time.sleep(0.5) # Small pause between entries
-
+        # Learned regions let the next run skip full-screen searches
+        self.automation.save_region_cache()
+        self.logger.info(f"Screen automation stats: {self.automation.get_stats()}")
         summary = f"Automation complete. Processed {total_tasks} tasks. Success: {success_count}, Failed: {fail_count}."
         self.logger.info(summary)
         return {"summary": summary, "details": results_details}
@@ -408,7 +405,9 @@ class ReceivingModule(BaseModule):
                  on_error=self.handle_automation_error,
                  on_finished=self.handle_automation_finished,
                  progress_callback_slot=self.update_progress_bar, # Pass progress slot
-                 loading_message="Running Traffic Automation..." # Custom loading message
+                 status_slot=self.update_status_display,
+                 loading_message="Running Traffic Automation...", # Custom loading message
+                 dedup_key="traffic_automation" # Never run two automations at once
              )
         else:
              # Fallback: Run directly in thread pool if helper not available (less ideal)
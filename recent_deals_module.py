@@ -2,6 +2,7 @@ from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
                            QTableWidget, QTableWidgetItem, QHeaderView)
 from PyQt5.QtCore import Qt
 from ui.base_module import BaseModule
+from utils.instrumentation import timed
 import os
 import json
 
@@ -72,6 +73,7 @@ class RecentDealsModule(BaseModule):
                 if hasattr(self, 'logger'):
                     self.logger.error(f"Error loading deals from CSV: {str(e)}")
     
+    @timed("table.recent_deals")
     def populate_table(self, deals):
         """Populate the table with deal data.
         
@@ -0,0 +1,311 @@
+# utils/refresh_scheduler.py - One timer for every periodic refresh in the application
+import time
+import heapq
+import random
+import logging
+
+from PyQt5.QtCore import QObject, QTimer, QEvent, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+MAX_TIMER_MS = 2 ** 31 - 1  # QTimer intervals are a signed 32-bit millisecond count
+
+_refresh_scheduler = None
+
+
+class RefreshJob:
+    """State of one periodic job registered with the RefreshScheduler."""
+
+    def __init__(self, name, callback, interval, jitter, retry_delay, background, widget):
+        self.name = name
+        self.callback = callback
+        self.interval = float(interval)
+        self.jitter = float(jitter)
+        self.retry_delay = float(retry_delay)
+        self.background = background
+        self.widget = widget              # Job waits while this widget is hidden
+        self.due_at = None                # Monotonic time of the next run
+        self.paused = False
+        self.missed = False               # Came due while paused/hidden; runs on resume/show
+        self.running = False
+        self.failures = 0                 # Consecutive failures (drives the retry backoff)
+        self.last_run = None              # Wall-clock time of the last completed run
+        self.last_success = None
+        self.run_count = 0
+        self._generation = 0              # Invalidates heap entries when rescheduled
+
+    def is_hidden(self):
+        """Whether the job's widget is hidden or its window minimized."""
+        if self.widget is None:
+            return False
+        try:
+            return not self.widget.isVisible() or self.widget.window().isMinimized()
+        except RuntimeError:  # Widget already deleted
+            return True
+
+
+class RefreshScheduler(QObject):
+    """Central scheduler for periodic refresh jobs.
+
+    Jobs are kept in a heap ordered by due time and a single-shot QTimer is
+    armed for the earliest one, so nothing wakes up between runs. Each job
+    gets:
+      - a random jitter of +/- ``jitter`` x interval, so feeds registered
+        together do not all refresh in the same second,
+      - exponential retry backoff after failures (``retry_delay`` doubling,
+        capped at the interval),
+      - pause semantics: a job tied to a widget does not run while that widget
+        is hidden or its window minimized; it is marked missed and runs as
+        soon as the widget is shown again.
+
+    Callbacks run on the GUI thread, or on the TaskScheduler when registered
+    with ``background=True``. Returning False (or raising) counts as a failure.
+    Must be created and used on the GUI thread.
+    """
+
+    # Emitted from pool threads when a background job ends; queued to the GUI thread
+    _background_finished = pyqtSignal(str, bool)    # job name, succeeded
+
+    def __init__(self, task_scheduler=None, logger=None, parent=None):
+        """Initialize the scheduler.
+
+        Args:
+            task_scheduler: TaskScheduler for background jobs (optional)
+            logger: Logger instance (optional)
+            parent: Parent QObject (optional)
+        """
+        super().__init__(parent)
+        self.task_scheduler = task_scheduler
+        self.logger = logger or logging.getLogger(__name__)
+        self._jobs = {}
+        self._heap = []                   # (due_at, generation, name)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._run_due_jobs)
+        self._stopped = False
+        self._background_finished.connect(self._on_background_finished)
+
+    # --- Registration ---
+
+    def add_job(self, name, callback, interval, jitter=0.1, first_delay=None,
+                retry_delay=60, background=False, widget=None):
+        """Register (or replace) a periodic job.
+
+        Args:
+            name: Unique job name, e.g. "home.weather"
+            callback: Callable run on every tick; return False to report a failure
+            interval: Seconds between successful runs
+            jitter: Random spread as a fraction of the interval (default: 0.1)
+            first_delay: Seconds until the first run (default: one jittered interval)
+            retry_delay: Seconds before the first retry after a failure (doubles per failure)
+            background: Run the callback on the task scheduler instead of the GUI thread
+            widget: Pause the job while this widget is hidden (optional)
+
+        Returns:
+            The RefreshJob
+        """
+        self.remove_job(name)
+        job = RefreshJob(name, callback, interval, jitter, retry_delay, background, widget)
+        self._jobs[name] = job
+        if widget is not None:
+            widget.installEventFilter(self)
+        self._schedule(job, self._jittered(job.interval if first_delay is None else first_delay, job.jitter))
+        self.logger.debug(f"Registered refresh job '{name}' every {job.interval:.0f}s")
+        return job
+
+    def remove_job(self, name):
+        """Unregister a job (its heap entry is discarded lazily)."""
+        job = self._jobs.pop(name, None)
+        if job is not None:
+            job._generation += 1
+            if job.widget is not None and not any(j.widget is job.widget for j in self._jobs.values()):
+                try:
+                    job.widget.removeEventFilter(self)
+                except RuntimeError:
+                    pass
+
+    def get_job(self, name):
+        """Return a registered job or None."""
+        return self._jobs.get(name)
+
+    # --- Control ---
+
+    def trigger(self, name):
+        """Run a job now (if not already running); its schedule restarts afterwards."""
+        job = self._jobs.get(name)
+        if job is not None and not job.running:
+            self._run_job(job)
+
+    def pause(self, name):
+        """Stop a job from running until ``resume``."""
+        job = self._jobs.get(name)
+        if job is not None:
+            job.paused = True
+
+    def resume(self, name, catch_up=True):
+        """Resume a paused job.
+
+        Args:
+            name: Job name
+            catch_up: Run immediately if the job came due while paused
+        """
+        job = self._jobs.get(name)
+        if job is None or not job.paused:
+            return
+        job.paused = False
+        if job.missed and catch_up:
+            self._catch_up(job)
+
+    def catch_up(self):
+        """Run every missed job whose widget is visible again (e.g. after un-minimizing)."""
+        for job in list(self._jobs.values()):
+            if job.missed:
+                self._catch_up(job)
+
+    def stop(self):
+        """Stop all jobs (used at shutdown)."""
+        self._stopped = True
+        self._timer.stop()
+        self._heap.clear()
+
+    def get_metrics(self):
+        """Per-job state: interval, seconds until due, failures, runs and last success."""
+        now = time.monotonic()
+        return {name: {'interval': job.interval,
+                       'due_in': None if job.due_at is None else max(job.due_at - now, 0.0),
+                       'paused': job.paused or job.is_hidden(), 'missed': job.missed,
+                       'running': job.running, 'failures': job.failures,
+                       'runs': job.run_count, 'last_success': job.last_success}
+                for name, job in self._jobs.items()}
+
+    # --- Visibility ---
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Show:
+            for job in list(self._jobs.values()):
+                if job.widget is watched and job.missed and not job.paused:
+                    # Let the widget finish showing before the catch-up run
+                    QTimer.singleShot(0, lambda job=job: self._catch_up(job))
+        return False
+
+    # --- Internal helpers ---
+
+    @staticmethod
+    def _jittered(delay, jitter):
+        if delay <= 0 or jitter <= 0:
+            return max(delay, 0.0)
+        return max(delay * (1.0 + random.uniform(-jitter, jitter)), 0.0)
+
+    def _schedule(self, job, delay):
+        if self._stopped:
+            return
+        job._generation += 1
+        job.due_at = time.monotonic() + delay
+        heapq.heappush(self._heap, (job.due_at, job._generation, job.name))
+        self._arm_timer()
+
+    def _arm_timer(self):
+        # Drop entries of removed or rescheduled jobs
+        while self._heap:
+            due_at, generation, name = self._heap[0]
+            job = self._jobs.get(name)
+            if job is not None and job._generation == generation:
+                break
+            heapq.heappop(self._heap)
+        if not self._heap:
+            self._timer.stop()
+            return
+        delay_ms = int(max(self._heap[0][0] - time.monotonic(), 0.0) * 1000)
+        self._timer.start(min(delay_ms, MAX_TIMER_MS))
+
+    def _run_due_jobs(self):
+        now = time.monotonic()
+        while self._heap and self._heap[0][0] <= now:
+            due_at, generation, name = heapq.heappop(self._heap)
+            job = self._jobs.get(name)
+            if job is None or job._generation != generation:
+                continue
+            job.due_at = None
+            if job.paused or job.is_hidden():
+                job.missed = True
+                self.logger.debug(f"Refresh job '{name}' due while paused/hidden; deferred")
+                continue
+            self._run_job(job)
+        self._arm_timer()
+
+    def _catch_up(self, job):
+        if self._jobs.get(job.name) is not job or not job.missed or job.running:
+            return
+        if job.paused or job.is_hidden():
+            return
+        self.logger.debug(f"Catching up missed refresh job '{job.name}'")
+        self._run_job(job)
+
+    def _run_job(self, job):
+        job.missed = False
+        job.running = True
+        job._generation += 1              # Any pending heap entry is superseded by this run
+        job.due_at = None
+        if job.background and self.task_scheduler is not None:
+            handle = self.task_scheduler.submit(self._run_background, job.name, job.callback,
+                                                name=f"refresh:{job.name}", dedup_key=f"refresh:{job.name}",
+                                                start=False)
+            if handle is None:
+                self._job_finished(job, False)
+            else:
+                handle.cancelled.connect(lambda name=job.name: self._background_finished.emit(name, False))
+                self.task_scheduler.start(handle)
+            return
+        try:
+            ok = job.callback() is not False
+        except Exception as e:
+            self.logger.error(f"Refresh job '{job.name}' failed: {e}", exc_info=True)
+            ok = False
+        self._job_finished(job, ok)
+
+    def _run_background(self, name, callback):
+        # Runs on a pool thread; the outcome goes back through the queued signal
+        try:
+            ok = callback() is not False
+        except Exception as e:
+            self.logger.error(f"Refresh job '{name}' failed: {e}", exc_info=True)
+            ok = False
+        self._background_finished.emit(name, ok)
+
+    def _on_background_finished(self, name, ok):
+        job = self._jobs.get(name)
+        if job is not None:
+            self._job_finished(job, ok)
+
+    def _job_finished(self, job, ok):
+        if not job.running:
+            return
+        job.running = False
+        job.run_count += 1
+        job.last_run = time.time()
+        if ok:
+            job.failures = 0
+            job.last_success = job.last_run
+            delay = self._jittered(job.interval, job.jitter)
+        else:
+            job.failures += 1
+            delay = self._jittered(min(job.retry_delay * 2 ** (job.failures - 1), job.interval), job.jitter)
+            self.logger.warning(f"Refresh job '{job.name}' failed ({job.failures} in a row); retrying in {delay:.0f}s")
+        if self._jobs.get(job.name) is job:
+            self._schedule(job, delay)
+
+
+def get_refresh_scheduler(task_scheduler=None, logger=None):
+    """Return the application's RefreshScheduler, creating it on first use.
+
+    The first call must happen on the GUI thread (MainWindow does this at
+    startup); later calls just return the shared instance.
+
+    Args:
+        task_scheduler: TaskScheduler for background jobs (first call only)
+        logger: Logger instance (first call only)
+    """
+    global _refresh_scheduler
+    if _refresh_scheduler is None:
+        _refresh_scheduler = RefreshScheduler(task_scheduler=task_scheduler, logger=logger)
+    return _refresh_scheduler
@@ -0,0 +1,106 @@
+# benchmarks/run_benchmarks.py - Headless benchmark suite for the app's data paths
+#
+# Usage:
+#   python -m benchmarks.run_benchmarks                 # default sizes, compare with benchmarks/baseline.json
+#   python -m benchmarks.run_benchmarks --quick         # smallest sizes only
+#   python -m benchmarks.run_benchmarks --full          # include the 1M-row cases
+#   python -m benchmarks.run_benchmarks --only csv.     # cases whose name contains "csv."
+#   python -m benchmarks.run_benchmarks --save-baseline # record the current results as the baseline
+#
+# Exits with status 1 when a case is slower than the baseline by more than --tolerance.
+import os
+import sys
+import shutil
+import logging
+import argparse
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")  # Before any Qt import
+
+from benchmarks.harness import BenchmarkRunner, load_report, write_report, compare_to_baseline
+from benchmarks import cases
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# (csv sizes, sheet sizes, deal sizes as (equipment, trades, parts), quote counts)
+PROFILES = {
+    'quick': ([10_000], [1_000], [(50, 10, 100)], [100]),
+    'default': ([10_000, 100_000], [1_000, 10_000], [(50, 10, 100), (500, 100, 2_000)], [100, 1_000]),
+    'full': ([10_000, 100_000, 1_000_000], [1_000, 10_000, 50_000],
+             [(50, 10, 100), (500, 100, 2_000), (2_000, 500, 10_000)], [100, 1_000, 10_000]),
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the BCBRI data-path benchmarks headlessly.")
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument("--quick", action="store_true", help="Smallest sizes only")
+    size.add_argument("--full", action="store_true", help="Include the largest (1M row) cases")
+    parser.add_argument("--only", help="Only run cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case (default: 5)")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Seconds of latency added by the mock HTTP server (default: 0)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results to the baseline file")
+    parser.add_argument("--output", help="Also write the report to this file")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown vs the baseline, as a fraction (default: 0.25)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    profile = 'quick' if args.quick else 'full' if args.full else 'default'
+    csv_sizes, sheet_sizes, deal_sizes, quote_counts = PROFILES[profile]
+
+    # Module code logs heavily at INFO; keep only problems so output stays readable
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+
+    runner = BenchmarkRunner(repeat=args.repeat, only=args.only)
+    workdir = tempfile.mkdtemp(prefix="bcbri_bench_")
+    print(f"Running '{profile}' benchmarks (workdir: {workdir})")
+    try:
+        cases.run_data_cases(runner, workdir, csv_sizes)
+        cases.run_table_cases(runner, workdir, sheet_sizes)
+        cases.run_deal_form_cases(runner, workdir, deal_sizes)
+        cases.run_http_cases(runner, workdir, sheet_sizes, quote_counts, latency=args.latency)
+        cases.run_automation_cases(runner, workdir)
+        app.processEvents()
+    finally:
+        try:
+            from utils.http_client import shutdown_http_client
+            shutdown_http_client()
+        except ImportError:
+            pass
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = runner.report({'profile': profile, 'repeat': args.repeat})
+    if args.output:
+        write_report(report, args.output)
+        print(f"Report written to {args.output}")
+
+    if args.save_baseline:
+        write_report(report, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    baseline = load_report(args.baseline)
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+
+    regressions = compare_to_baseline(runner.results, baseline, tolerance=args.tolerance)
+    if not regressions:
+        print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%}).")
+        return 0
+    print(f"{len(regressions)} regression(s) against {args.baseline}:")
+    for name, before, now, ratio in regressions:
+        print(f"  {name:<48} {before:>10.2f} ms -> {now:>10.2f} ms  (x{ratio:.2f})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,365 @@
+# utils/screen_automation.py - Template-matching screen automation with region caching
+# Replaces per-call pyautogui.locateCenterOnScreen polling: one screen grab per poll,
+# several templates matched against it, and each template's last on-screen region reused
+import os
+import json
+import time
+import logging
+from collections import namedtuple
+
+try:
+    import numpy as np
+    import cv2
+except ImportError:
+    np = cv2 = None
+
+try:
+    import pyautogui
+except ImportError:
+    pyautogui = None
+
+from utils.instrumentation import record_duration, increment
+
+logger = logging.getLogger(__name__)
+
+# Screen coordinates of a hit: centre (x, y), bounding box (left, top, width, height) and match score
+Match = namedtuple('Match', 'name x y box score')
+
+
+class Template:
+    """A reference image, preprocessed once, plus the region it was last found in."""
+
+    __slots__ = ('name', 'path', 'confidence', 'full', 'image', 'width', 'height', 'region', 'hits', 'region_hits')
+
+    def __init__(self, name, path, confidence, full, image):
+        self.name = name
+        self.path = path
+        self.confidence = confidence
+        self.full = full            # Grayscale, full resolution
+        self.image = image          # Grayscale, downscaled by the engine's scale
+        self.height, self.width = full.shape[:2]
+        self.region = None          # (left, top, width, height) of the last hit, screen pixels
+        self.hits = 0
+        self.region_hits = 0
+
+
+class ScreenAutomation:
+    """Finds, clicks and waits on screen elements identified by template images.
+
+    Templates are loaded once, converted to grayscale and downscaled by
+    ``scale``; every screen grab gets the same treatment, so full-screen
+    searches run on a quarter of the pixels at the default 0.5 and the best
+    candidate is then confirmed at full resolution. After a template is found
+    its region is remembered: while every template being waited on has a known
+    region, polls grab and search only those regions (plus ``region_margin``)
+    at full resolution; a miss makes the next poll grab the full screen again.
+
+    Screen capture and input are injectable (``grab`` and ``actions``), so
+    flows can run against synthetic screenshots or a virtual framebuffer.
+    """
+
+    # Downscaling blurs edges that fall between pixels, so coarse candidates are
+    # accepted this far below the confidence and then checked at full resolution
+    COARSE_SLACK = 0.15
+
+    def __init__(self, images_dir, confidence=0.8, scale=0.5, poll_interval=0.1, region_margin=40,
+                 settle_delay=0.1, type_interval=0.02, region_cache_file=None, grab=None, actions=None,
+                 logger=None):
+        """Initialize the engine.
+
+        Args:
+            images_dir: Directory holding the template images
+            confidence: Default minimum match score (0-1, normalised correlation)
+            scale: Downscale factor applied to templates and grabs (1.0 disables)
+            poll_interval: Seconds between polls while waiting
+            region_margin: Pixels added around a cached region when searching it
+            settle_delay: Seconds to pause after a click so the target app reacts
+            type_interval: Seconds between typed characters
+            region_cache_file: JSON file persisting learned regions between runs (optional)
+            grab: Callable ``grab(region=None)`` returning an RGB(A) image or array
+                  (default: pyautogui.screenshot)
+            actions: Object with ``click(x, y, clicks=1)``, ``write(text, interval=0)``
+                     and ``press(key)`` (default: pyautogui)
+            logger: Logger instance (optional)
+
+        Raises:
+            RuntimeError: OpenCV/NumPy, or PyAutoGUI for the default grab/actions, is missing
+        """
+        if cv2 is None:
+            raise RuntimeError("OpenCV (opencv-python) and NumPy are required for screen automation.")
+        if pyautogui is None and (grab is None or actions is None):
+            raise RuntimeError("PyAutoGUI is required for screen capture and input.")
+        self.images_dir = images_dir
+        self.confidence = confidence
+        self.scale = scale
+        self.poll_interval = poll_interval
+        self.region_margin = region_margin
+        self.settle_delay = settle_delay
+        self.type_interval = type_interval
+        self.region_cache_file = region_cache_file
+        self.logger = logger or logging.getLogger(__name__)
+        self._grab = grab or (lambda region=None: pyautogui.screenshot(region=region))
+        self.actions = actions or pyautogui
+        self._templates = {}
+        self._screen_size = None
+        self._full_grab_next = False
+        self._learned_regions = self._load_region_cache()
+        self.stats = {'grabs': 0, 'full_grabs': 0, 'region_grabs': 0, 'polls': 0}
+
+    # --- Templates ---
+
+    def template(self, name, confidence=None):
+        """Return the named template, loading and preprocessing it on first use.
+
+        Raises:
+            FileNotFoundError: The image file does not exist or cannot be decoded
+        """
+        template = self._templates.get(name)
+        if template is None:
+            path = os.path.join(self.images_dir, name)
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Image file not found: {path}")
+            # imdecode copes with non-ASCII Windows paths, which imread does not
+            image = cv2.imdecode(np.fromfile(path, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+            if image is None:
+                raise FileNotFoundError(f"Image file could not be decoded: {path}")
+            template = Template(name, path, confidence or self.confidence, image, self._downscale(image))
+            template.region = self._learned_regions.get(name)
+            self._templates[name] = template
+            self.logger.debug(f"Loaded template '{name}' ({template.width}x{template.height}, "
+                              f"region {template.region})")
+        elif confidence is not None:
+            template.confidence = confidence
+        return template
+
+    def preload(self, names):
+        """Load templates up front so missing files fail before any input is sent."""
+        return [self.template(name) for name in names]
+
+    def forget_regions(self):
+        """Drop every learned region (e.g. after the target window moved)."""
+        for template in self._templates.values():
+            template.region = None
+        self._learned_regions = {}
+
+    # --- Capture and matching ---
+
+    def _downscale(self, gray):
+        if self.scale == 1.0:
+            return gray
+        return cv2.resize(gray, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+
+    def _to_gray(self, image):
+        array = np.asarray(image)
+        if array.ndim == 2:
+            return array
+        if array.shape[2] == 4:
+            return cv2.cvtColor(array, cv2.COLOR_RGBA2GRAY)
+        return cv2.cvtColor(array, cv2.COLOR_RGB2GRAY)
+
+    def grab(self, region=None):
+        """Capture the screen (or a region) once, preprocessed for matching.
+
+        Returns:
+            (gray, small, origin): full-resolution and downscaled grayscale
+            frames, and the frame's (left, top) on screen
+        """
+        start = time.perf_counter()
+        gray = self._to_gray(self._grab(region=region))
+        if region is None:
+            self._screen_size = (gray.shape[1], gray.shape[0])
+            self.stats['full_grabs'] += 1
+        else:
+            self.stats['region_grabs'] += 1
+        self.stats['grabs'] += 1
+        # Region grabs are searched at full resolution only, so skip their downscale
+        small = self._downscale(gray) if region is None else None
+        record_duration("automation.grab", time.perf_counter() - start)
+        return gray, small, (region[0], region[1]) if region else (0, 0)
+
+    def _search_area(self, templates):
+        """Union of the templates' cached regions, or None when a full grab is needed."""
+        if self._full_grab_next or any(t.region is None for t in templates):
+            return None
+        margin = self.region_margin
+        left = max(0, min(t.region[0] for t in templates) - margin)
+        top = max(0, min(t.region[1] for t in templates) - margin)
+        right = max(t.region[0] + t.region[2] for t in templates) + margin
+        bottom = max(t.region[1] + t.region[3] for t in templates) + margin
+        if self._screen_size:
+            right = min(right, self._screen_size[0])
+            bottom = min(bottom, self._screen_size[1])
+        return (left, top, right - left, bottom - top)
+
+    @staticmethod
+    def _best(haystack, needle, x0=0, y0=0, x1=None, y1=None):
+        """Best (score, (x, y)) of needle within haystack[y0:y1, x0:x1], in haystack coordinates."""
+        x0, y0 = max(0, x0), max(0, y0)
+        crop = haystack[y0:y1, x0:x1]
+        if crop.shape[0] < needle.shape[0] or crop.shape[1] < needle.shape[1]:
+            return -1.0, None
+        _, score, _, location = cv2.minMaxLoc(cv2.matchTemplate(crop, needle, cv2.TM_CCOEFF_NORMED))
+        return score, (x0 + location[0], y0 + location[1])
+
+    def _match(self, template, gray, small, origin):
+        """Find a template in a grab: cached region first, then (full grabs only) coarse-to-fine."""
+        score, location = -1.0, None
+        if template.region is not None:
+            margin = self.region_margin
+            left, top = template.region[0] - origin[0], template.region[1] - origin[1]
+            score, location = self._best(gray, template.full, left - margin, top - margin,
+                                         left + template.width + margin, top + template.height + margin)
+            if score >= template.confidence:
+                template.region_hits += 1
+        if score < template.confidence and small is not None:
+            if small is gray:
+                score, location = self._best(gray, template.full)
+            else:
+                coarse, candidate = self._best(small, template.image)
+                if coarse >= template.confidence - self.COARSE_SLACK:
+                    # Confirm at full resolution around the candidate
+                    pad = int(1 / self.scale) + 2
+                    x, y = int(candidate[0] / self.scale), int(candidate[1] / self.scale)
+                    score, location = self._best(gray, template.full, x - pad, y - pad,
+                                                 x + template.width + pad, y + template.height + pad)
+        if score < template.confidence:
+            return None
+        left, top = origin[0] + location[0], origin[1] + location[1]
+        box = (left, top, template.width, template.height)
+        return Match(template.name, left + template.width // 2, top + template.height // 2, box, float(score))
+
+    def find(self, names):
+        """Grab the screen once and match every named template against it.
+
+        Returns:
+            Dict of name -> Match for the templates found
+        """
+        templates = [self.template(name) for name in names]
+        area = self._search_area(templates)
+        gray, small, origin = self.grab(area)
+        start = time.perf_counter()
+        found = {}
+        for template in templates:
+            match = self._match(template, gray, small, origin)
+            if match:
+                template.hits += 1
+                if template.region != match.box:
+                    template.region = match.box
+                    self._learned_regions[template.name] = match.box
+                found[template.name] = match
+        record_duration("automation.match", time.perf_counter() - start)
+        # A template missing from its region may have moved: search the full screen next poll
+        self._full_grab_next = area is not None and len(found) < len(templates)
+        self.stats['polls'] += 1
+        return found
+
+    # --- Waiting ---
+
+    def _poll(self, names, condition, timeout, description):
+        deadline = time.monotonic() + timeout
+        while True:
+            started = time.monotonic()
+            found = self.find(names)
+            result = condition(found)
+            if result:
+                return result
+            if started >= deadline:
+                increment("automation.timeouts")
+                raise TimeoutError(f"Timeout waiting for {description}")
+            time.sleep(max(0.0, min(self.poll_interval - (time.monotonic() - started),
+                                    deadline - time.monotonic())))
+
+    def wait_for(self, names, timeout=10, description=None):
+        """Wait until any of the templates appears.
+
+        Args:
+            names: Template name or list of names (earlier names win if several appear)
+            timeout: Seconds before giving up
+            description: Text for log/exception messages
+
+        Returns:
+            The Match of the first template found
+
+        Raises:
+            TimeoutError: Nothing appeared in time
+        """
+        names = [names] if isinstance(names, str) else list(names)
+        description = description or " or ".join(names)
+        match = self._poll(names, lambda found: next((found[n] for n in names if n in found), None),
+                           timeout, f"'{description}' to appear")
+        self.logger.info(f"Found '{description}' at ({match.x}, {match.y}), score {match.score:.2f}.")
+        return match
+
+    def wait_until_gone(self, names, timeout=10, description=None):
+        """Wait until none of the templates is visible.
+
+        Raises:
+            TimeoutError: Still visible after ``timeout`` seconds
+        """
+        names = [names] if isinstance(names, str) else list(names)
+        description = description or " or ".join(names)
+        self._poll(names, lambda found: not found, timeout, f"'{description}' to disappear")
+        self.logger.debug(f"'{description}' is no longer visible.")
+        return True
+
+    def is_visible(self, name):
+        """Single-poll check for a template."""
+        return name in self.find([name])
+
+    # --- Input ---
+
+    def click(self, name, timeout=10, description=None, clicks=1):
+        """Wait for a template, click its centre and let the target app settle.
+
+        Returns:
+            The Match that was clicked
+        """
+        match = self.wait_for(name, timeout=timeout, description=description)
+        self.actions.click(match.x, match.y, clicks=clicks)
+        if self.settle_delay:
+            time.sleep(self.settle_delay)
+        return match
+
+    def click_and_type(self, name, text, timeout=10, description=None):
+        """Click a field identified by a template and type into it."""
+        match = self.click(name, timeout=timeout, description=description)
+        self.type_text(text)
+        return match
+
+    def type_text(self, text):
+        self.actions.write(str(text), interval=self.type_interval)
+
+    def press(self, key):
+        self.actions.press(key)
+
+    # --- Region cache persistence ---
+
+    def _load_region_cache(self):
+        if not self.region_cache_file or not os.path.exists(self.region_cache_file):
+            return {}
+        try:
+            with open(self.region_cache_file, 'r', encoding='utf-8') as f:
+                return {name: tuple(box) for name, box in json.load(f).get('regions', {}).items()}
+        except (IOError, ValueError, TypeError) as e:
+            self.logger.warning(f"Ignoring unreadable automation region cache {self.region_cache_file}: {e}")
+            return {}
+
+    def save_region_cache(self):
+        """Persist learned regions so the next run starts with region-only grabs."""
+        if not self.region_cache_file:
+            return
+        tmp_path = f"{self.region_cache_file}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.region_cache_file) or '.', exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'screen': self._screen_size, 'regions': self._learned_regions}, f, indent=2)
+            os.replace(tmp_path, self.region_cache_file)
+        except (IOError, OSError) as e:
+            self.logger.error(f"Failed to save automation region cache {self.region_cache_file}: {e}")
+
+    def get_stats(self):
+        """Grab counts plus per-template hit/region-hit counts."""
+        stats = dict(self.stats)
+        stats['templates'] = {t.name: {'hits': t.hits, 'region_hits': t.region_hits, 'region': t.region}
+                              for t in self._templates.values()}
+        return stats
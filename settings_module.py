@@ -1,11 +1,13 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, 
                             QPushButton, QCheckBox, QLineEdit, QFormLayout, 
                             QTabWidget, QScrollArea, QFrame, QGroupBox, QSlider,
-                            QSpinBox, QMessageBox, QFileDialog)
+                            QSpinBox, QMessageBox, QFileDialog, QTableWidget,
+                            QTableWidgetItem, QHeaderView, QAbstractItemView)
 from PyQt5.QtCore import Qt, QSettings, pyqtSignal
 from ui.base_module import BaseModule
 from utils.constants import *
 from utils.theme_manager import ThemeManager
+from utils.instrumentation import get_instrumentation
 import os
 import logging
 
@@ -14,6 +16,11 @@ class SettingsModule(BaseModule):
     
     # Signal emitted when settings change
     settings_changed = pyqtSignal(str, object)
+
+    # Refresh the performance figures every time the module is shown
+    STALE_AFTER_SECONDS = 0
+
+    PERF_COLUMNS = ["Operation", "Count", "Errors", "p50 (ms)", "p95 (ms)", "Max (ms)"]
     
     def __init__(self, main_window=None):
         """Initialize the settings module.
@@ -24,6 +31,7 @@ class SettingsModule(BaseModule):
         self.logger = logging.getLogger(__name__)
         self.settings = QSettings("BRIDeal", "BRIDeal")
         super().__init__(main_window)
+        self.init_ui()
         
     def init_ui(self):
         """Initialize the user interface."""
@@ -44,6 +52,7 @@ class SettingsModule(BaseModule):
         tab_widget.addTab(self.create_appearance_tab(), "Appearance")
         tab_widget.addTab(self.create_connection_tab(), "Connections")
         tab_widget.addTab(self.create_advanced_tab(), "Advanced")
+        tab_widget.addTab(self.create_performance_tab(), "Performance")
         
         # Add save/cancel buttons
         button_layout = QHBoxLayout()
@@ -325,6 +334,99 @@ class SettingsModule(BaseModule):
         
         return tab
     
+    def create_performance_tab(self):
+        """Create the performance tab with recorded latencies per operation.
+        
+        Returns:
+            QWidget: The tab widget
+        """
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        
+        self.perf_summary_label = QLabel()
+        self.perf_summary_label.setWordWrap(True)
+        layout.addWidget(self.perf_summary_label)
+        
+        self.perf_table = QTableWidget(0, len(self.PERF_COLUMNS))
+        self.perf_table.setHorizontalHeaderLabels(self.PERF_COLUMNS)
+        self.perf_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.perf_table.setAlternatingRowColors(True)
+        self.perf_table.verticalHeader().setVisible(False)
+        self.perf_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        layout.addWidget(self.perf_table)
+        
+        button_layout = QHBoxLayout()
+        
+        refresh_button = QPushButton("Refresh")
+        refresh_button.clicked.connect(self.refresh_performance)
+        
+        reset_button = QPushButton("Reset")
+        reset_button.clicked.connect(self.reset_performance)
+        
+        export_button = QPushButton("Export JSON")
+        export_button.clicked.connect(self.export_performance)
+        
+        button_layout.addWidget(refresh_button)
+        button_layout.addWidget(reset_button)
+        button_layout.addStretch()
+        button_layout.addWidget(export_button)
+        layout.addLayout(button_layout)
+        
+        return tab
+    
+    def refresh(self):
+        """Update the performance tab when the module is shown."""
+        self.refresh_performance()
+    
+    def refresh_performance(self):
+        """Fill the performance table from the recorded timings."""
+        snapshot = get_instrumentation().snapshot()
+        operations = snapshot['operations']
+        
+        self.perf_table.setSortingEnabled(False)
+        self.perf_table.setRowCount(len(operations))
+        for row, (name, stats) in enumerate(operations.items()):
+            values = [name, stats['count'], stats['errors'], stats['p50_ms'], stats['p95_ms'], stats['max_ms']]
+            for column, value in enumerate(values):
+                if isinstance(value, float):
+                    item = QTableWidgetItem(f"{value:,.1f}")
+                else:
+                    item = QTableWidgetItem(str(value))
+                if column > 0:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.perf_table.setItem(row, column, item)
+        self.perf_table.setSortingEnabled(True)
+        
+        summary = f"{len(operations)} operations recorded since {snapshot['since']}."
+        if self.main_window and hasattr(self.main_window, 'get_performance_metrics'):
+            try:
+                metrics = self.main_window.get_performance_metrics()
+                http = metrics.get('http', {})
+                summary += (f" HTTP: {http.get('requests', 0)} requests, {http.get('failures', 0)} failures"
+                            f" ({http.get('backend', 'n/a')}).")
+                tasks = metrics.get('tasks', {})
+                summary += f" Background tasks: {sum(t['completed'] + t['failed'] for t in tasks.values())} run."
+            except Exception as e:
+                self.logger.warning(f"Could not collect component metrics: {e}")
+        self.perf_summary_label.setText(summary)
+    
+    def reset_performance(self):
+        """Discard the recorded timings."""
+        get_instrumentation().reset()
+        self.refresh_performance()
+    
+    def export_performance(self):
+        """Write the recorded timings and component metrics to a JSON file."""
+        try:
+            if self.main_window and hasattr(self.main_window, 'dump_performance_report'):
+                path = self.main_window.dump_performance_report()
+            else:
+                path = get_instrumentation().dump(os.path.join(os.getcwd(), 'logs'))
+        except Exception as e:
+            QMessageBox.critical(self, "Export Failed", f"Could not write performance report: {str(e)}")
+            return
+        QMessageBox.information(self, "Performance Report", f"Performance report written to:\n{path}")
+    
     def load_settings(self):
         """Load settings from QSettings."""
         # General tab
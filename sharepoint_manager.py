@@ -3,16 +3,21 @@ import os
 import json
 import time
 import logging
-import requests
+from urllib.parse import quote
 from datetime import datetime, timedelta
 import traceback
 import msal # Microsoft Authentication Library
 import threading
+from concurrent.futures import Future
 import csv
 import io
 import re # Added re import
 from typing import List, Dict, Any, Optional, Union
 
+from utils.http_client import get_http_client, HttpClientError, HttpStatusError
+from utils.instrumentation import record_duration
+from utils.async_logging import LazyJson, truncate
+
 
 # --- Cache Handling (Simple file-based cache) ---
 class SimpleCache:
@@ -65,8 +70,15 @@ class SharePointManager:
     GRAPH_ENDPOINT = 'https://graph.microsoft.com/v1.0'
     DEFAULT_SCOPES = ['https://graph.microsoft.com/.default']
 
-    def __init__(self, config=None, logger=None):
-        """Initialize the SharePoint manager."""
+    def __init__(self, config=None, logger=None, msal_app=None, http_client=None):
+        """Initialize the SharePoint manager.
+
+        Args:
+            config: Config object (falls back to environment variables)
+            logger: Logger instance (optional)
+            msal_app: Pre-built MSAL client application, e.g. a stub (optional)
+            http_client: AsyncHttpClient for Graph calls (default: shared client)
+        """
         self.logger = logger or logging.getLogger(__name__).getChild("SPMan")
         self.config = config
         self.tenant_id = None
@@ -77,6 +89,10 @@ class SharePointManager:
         self.file_path = None # This is the PREFERRED path used first
         self.target_filename = None # Extracted filename for searching
         self.cache_dir = None
+        # Graph root and an optional plain OAuth token endpoint; both can be
+        # pointed at a local mock server through Config
+        self.graph_endpoint = self.GRAPH_ENDPOINT
+        self.token_url = None
 
         if config:
             self.tenant_id = getattr(config, 'azure_tenant_id', None)
@@ -86,6 +102,9 @@ class SharePointManager:
             self.site_name = getattr(config, 'sharepoint_site_name', None)
             self.file_path = getattr(config, 'sharepoint_file_path', None)
             self.cache_dir = getattr(config, 'cache_dir', 'cache')
+            if hasattr(config, 'get'):
+                self.graph_endpoint = (config.get('graph_base_url') or self.GRAPH_ENDPOINT).rstrip('/')
+                self.token_url = config.get('graph_token_url') or None
             self.logger.debug("Loaded SharePoint config from Config object.")
         else:
             # Load from environment variables as fallback
@@ -96,6 +115,8 @@ class SharePointManager:
             self.site_name = os.getenv('SHAREPOINT_SITE_NAME')
             self.file_path = os.getenv('FILE_PATH') # Uses FILE_PATH from .env
             self.cache_dir = os.getenv('CACHE_DIR', 'cache')
+            self.graph_endpoint = os.getenv('GRAPH_BASE_URL', self.GRAPH_ENDPOINT).rstrip('/')
+            self.token_url = os.getenv('GRAPH_TOKEN_URL') or None
             self.logger.debug("Loaded SharePoint config from environment variables.")
 
         missing_configs = []
@@ -116,8 +137,16 @@ class SharePointManager:
                  self.target_filename = os.path.basename(self.file_path.replace('\\', '/')) # Handle windows/unix separators
                  self.logger.debug(f"Target filename for search: {self.target_filename}")
 
-        self.msal_app = self._init_msal_app()
-        self.token_cache_file = os.path.join(self.cache_dir or '.', "sharepoint_token.dat")
+        # The MSAL app is built on first use: constructing it contacts the
+        # authority, which must not happen before the UI is up
+        self._msal_app = msal_app
+        self._http_client = http_client
+        self._missing_configs = missing_configs
+        # MSAL's own token cache, serialized to disk so restarts can skip the
+        # token endpoint; it is only read when the MSAL app is created
+        self.token_cache_file = os.path.join(self.cache_dir or '.', "sharepoint_msal_cache.json")
+        self._legacy_token_file = os.path.join(self.cache_dir or '.', "sharepoint_token.dat")
+        self.token_cache = msal.SerializableTokenCache()
         self.cache = SimpleCache(cache_dir=self.cache_dir)
         self.access_token = None
         self.token_expiry = None
@@ -125,16 +154,96 @@ class SharePointManager:
         self._file_item_id = None
         self._file_path_used = None # Store the path that actually found the file
 
-        # Add a lock for thread-safe token acquisition/cache access if needed
-        # self._token_lock = threading.Lock()
+        # Serializes token acquisition between the startup task and request threads
+        self._token_lock = threading.Lock()
 
-        # Call diagnostic function on init
-        if not missing_configs:
-             self.list_drive_root_children()
+        # Resolves to True/False once the background sign-in started by
+        # start_authentication() settles; request threads wait on it
+        self.auth_ready = Future()
+        self._auth_thread = None
 
         self.logger.info("SharePoint Manager initialized")
 
-    # ...(rest of __init__ methods like _init_msal_app, _load_token_from_cache etc remain the same)...
+    @property
+    def http(self):
+        """HTTP client used for Graph calls (the shared client unless one was injected)."""
+        if self._http_client is None:
+            self._http_client = get_http_client()
+        return self._http_client
+
+    @property
+    def msal_app(self):
+        """MSAL confidential client, created lazily on first use."""
+        if self._msal_app is None:
+            self._load_msal_cache()
+            self._msal_app = self._init_msal_app()
+        return self._msal_app
+
+    def start_authentication(self):
+        """Acquire the Graph token on a background thread.
+
+        Safe to call more than once; only the first call starts a thread.
+
+        Returns:
+            The ``auth_ready`` Future, resolving to True if a token was obtained
+        """
+        if self._auth_thread is not None or self.auth_ready.done():
+            return self.auth_ready
+        if self._missing_configs:
+            self.logger.warning("Skipping SharePoint sign-in: configuration incomplete.")
+            self.auth_ready.set_result(False)
+            return self.auth_ready
+        self._auth_thread = threading.Thread(target=self._authenticate_in_background,
+                                             name="graph-token-startup", daemon=True)
+        self._auth_thread.start()
+        return self.auth_ready
+
+    def wait_until_ready(self, timeout=None):
+        """Block until the background sign-in settles.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if a valid token is available
+        """
+        if self._auth_thread is not None:
+            try:
+                self.auth_ready.result(timeout=timeout)
+            except Exception as e:
+                self.logger.warning(f"Timed out waiting for SharePoint sign-in: {e}")
+        return self._has_valid_token()
+
+    def _authenticate_in_background(self):
+        authenticated = False
+        try:
+            authenticated = self._acquire_token()
+            if authenticated:
+                self.logger.info("SharePoint sign-in completed in background.")
+            else:
+                self.logger.error("SharePoint sign-in failed in background.")
+        except Exception as e:
+            self.logger.error(f"Error during background SharePoint sign-in: {e}", exc_info=True)
+        finally:
+            self.auth_ready.set_result(authenticated)
+        if authenticated:
+            # Diagnostic listing, formerly run synchronously from __init__
+            try:
+                self.list_drive_root_children()
+            except Exception as e:
+                self.logger.error(f"Drive root diagnostic failed: {e}")
+
+    def _has_valid_token(self):
+        return bool(self.access_token and self.token_expiry and
+                    self.token_expiry > datetime.now() + timedelta(minutes=5))
+
+    def _acquire_token(self):
+        """Get a token under the lock unless another thread already did."""
+        with self._token_lock:
+            if self._has_valid_token():
+                return True
+            return self.get_access_token() is not None
+
     def _init_msal_app(self):
         """Initialize the MSAL confidential client application."""
         if not self.tenant_id or not self.client_id or not self.client_secret:
@@ -146,6 +255,7 @@ class SharePointManager:
                 client_id=self.client_id,
                 authority=authority,
                 client_credential=self.client_secret,
+                token_cache=self.token_cache,
             )
             self.logger.debug("MSAL Confidential Client Application initialized.")
             return app
@@ -153,81 +263,103 @@ class SharePointManager:
             self.logger.error(f"Failed to initialize MSAL application: {e}", exc_info=True)
             return None
 
-    def _load_token_from_cache(self):
-        """Loads token from a simple file cache if it exists and hasn't expired."""
+    def _load_msal_cache(self):
+        """Deserializes the persisted MSAL token cache, if present."""
         if not os.path.exists(self.token_cache_file):
-            return None
+            return
         try:
-            # with self._token_lock: # Optional locking
             with open(self.token_cache_file, 'r') as f:
-                data = json.load(f)
-            expiry_time = datetime.fromisoformat(data.get("expires_on"))
-            if expiry_time > datetime.now() + timedelta(minutes=5):
-                self.logger.info("Loaded valid token from cache.")
-                self.access_token = data.get("access_token")
-                self.token_expiry = expiry_time
-                return self.access_token
-            else:
-                self.logger.info("Token found in cache but has expired.")
-                # with self._token_lock: # Optional locking
-                if os.path.exists(self.token_cache_file): os.remove(self.token_cache_file)
-                return None
-        except (IOError, json.JSONDecodeError, KeyError, ValueError, Exception) as e:
-            self.logger.error(f"Failed to load token from cache file {self.token_cache_file}: {e}")
+                self.token_cache.deserialize(f.read())
+            self.logger.debug(f"Loaded MSAL token cache from {self.token_cache_file}")
+        except (IOError, ValueError, Exception) as e:
+            self.logger.error(f"Failed to load MSAL token cache {self.token_cache_file}: {e}")
             try:
-                # with self._token_lock: # Optional locking
-                if os.path.exists(self.token_cache_file): os.remove(self.token_cache_file)
+                os.remove(self.token_cache_file)
             except OSError as rm_err:
-                self.logger.error(f"Failed to remove corrupt token cache file: {rm_err}")
-            return None
+                self.logger.error(f"Failed to remove corrupt MSAL token cache: {rm_err}")
 
-    def _save_token_to_cache(self, token_response):
-        """Saves token information to a simple file cache."""
-        if not token_response or 'access_token' not in token_response or 'expires_in' not in token_response:
-            self.logger.warning("Invalid token response received, cannot save to cache.")
+    def _persist_msal_cache(self):
+        """Writes the MSAL token cache atomically if MSAL changed it."""
+        if not self.token_cache.has_state_changed:
             return
+        tmp_path = f"{self.token_cache_file}.tmp"
         try:
-            expires_in_seconds = int(token_response['expires_in'])
-            expiry_time = datetime.now() + timedelta(seconds=expires_in_seconds)
-            cache_data = {
-                "access_token": token_response['access_token'],
-                "expires_on": expiry_time.isoformat(),
-                "scopes": token_response.get('scope', '')
-            }
-            # with self._token_lock: # Optional locking
-            os.makedirs(os.path.dirname(self.token_cache_file), exist_ok=True)
-            with open(self.token_cache_file, 'w') as f:
-                json.dump(cache_data, f)
-            self.logger.info("Token saved to cache.")
-        except (IOError, TypeError, Exception) as e:
-            self.logger.error(f"Failed to save token to cache file {self.token_cache_file}: {e}")
-
-    def get_access_token(self):
-        """Acquires a new access token using MSAL client credentials flow."""
-        # with self._token_lock: # Optional locking
+            os.makedirs(os.path.dirname(self.token_cache_file) or '.', exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                f.write(self.token_cache.serialize())
+            os.replace(tmp_path, self.token_cache_file)
+            self.token_cache.has_state_changed = False
+            self.logger.debug("MSAL token cache persisted.")
+            # The hand-rolled token file is superseded by the MSAL cache
+            if os.path.exists(self._legacy_token_file):
+                os.remove(self._legacy_token_file)
+        except (IOError, OSError, Exception) as e:
+            self.logger.error(f"Failed to persist MSAL token cache {self.token_cache_file}: {e}")
+
+    def _acquire_token_with_msal(self):
+        """Token result from MSAL (cache first, then client credentials), or None on error."""
         if not self.msal_app:
             self.logger.error("MSAL app not initialized. Cannot acquire token.")
             return None
 
-        cached_token = self._load_token_from_cache()
-        if cached_token:
-            return cached_token
-
-        self.logger.info(f"Acquiring new access token for scopes: {self.DEFAULT_SCOPES}")
         result = None
         try:
-            result = self.msal_app.acquire_token_for_client(scopes=self.DEFAULT_SCOPES)
+            result = self.msal_app.acquire_token_silent(self.DEFAULT_SCOPES, account=None)
+            if result and "access_token" in result:
+                self.logger.info("Acquired access token from MSAL cache.")
+            else:
+                self.logger.info(f"Acquiring new access token for scopes: {self.DEFAULT_SCOPES}")
+                result = self.msal_app.acquire_token_for_client(scopes=self.DEFAULT_SCOPES)
         except Exception as e:
-             self.logger.error(f"Exception during acquire_token_for_client: {e}", exc_info=True)
+             self.logger.error(f"Exception during MSAL token acquisition: {e}", exc_info=True)
              return None
+        finally:
+            self._persist_msal_cache()
+        return result
+
+    def _request_token_from_endpoint(self):
+        """Client credentials grant posted straight to ``token_url``, bypassing MSAL.
+
+        Used when ``graph_token_url`` is configured (MSAL only accepts HTTPS
+        Microsoft authorities, so a local mock server needs this path).
+
+        Returns:
+            Token response dict in MSAL's shape, or None if the request failed
+        """
+        data = {
+            'grant_type': 'client_credentials',
+            'client_id': self.client_id,
+            'client_secret': self.client_secret,
+            'scope': ' '.join(self.DEFAULT_SCOPES),
+        }
+        self.logger.info(f"Requesting Graph token from {self.token_url}")
+        try:
+            response = self.http.post(self.token_url, data=data, headers={'Accept': 'application/json'}, timeout=30)
+            return response.json()
+        except (HttpClientError, ValueError) as e:
+            self.logger.error(f"Graph token request to {self.token_url} failed: {e}")
+            return None
+
+    def get_access_token(self):
+        """Acquires an access token, preferring MSAL's cache over the network.
+
+        ``acquire_token_silent`` is tried first; the client credentials flow
+        only runs when the cache holds no usable token. With ``token_url``
+        configured the grant is posted there directly instead.
+        """
+        # Callers serialize through _acquire_token, which holds self._token_lock
+        if self.token_url:
+            result = self._request_token_from_endpoint()
+        else:
+            result = self._acquire_token_with_msal()
 
-        if "access_token" in result:
+        if result and "access_token" in result:
             self.access_token = result['access_token']
             self.token_expiry = datetime.now() + timedelta(seconds=int(result.get('expires_in', 3599)))
-            self.logger.info(f"Successfully acquired new access token, expires around: {self.token_expiry}")
-            self._save_token_to_cache(result)
+            self.logger.info(f"Access token ready, expires around: {self.token_expiry}")
             return self.access_token
         else:
+            result = result or {}
             error = result.get("error")
             error_description = result.get("error_description")
             self.logger.error(f"Failed to acquire token. Error: {error}. Description: {error_description}")
@@ -235,23 +367,41 @@ class SharePointManager:
             self.token_expiry = None
             return None
 
-    def ensure_authenticated(self):
-        """Ensures a valid, non-expired token is available, acquiring one if needed."""
-        if self.access_token and self.token_expiry and self.token_expiry > datetime.now() + timedelta(minutes=5):
+    def ensure_authenticated(self, timeout=60):
+        """Ensures a valid, non-expired token is available, acquiring one if needed.
+
+        The check is in memory only, so the per-request path does no disk
+        I/O. If the startup sign-in is still running, waits for it instead of
+        starting a second acquisition.
+
+        Args:
+            timeout: Maximum seconds to wait for the startup sign-in (default: 60)
+        """
+        if self._has_valid_token():
              self.logger.debug("Existing token is valid.")
              return True
-        else:
-             self.logger.info("Existing token missing or expired. Attempting to get/refresh token.")
-             new_token = self.get_access_token()
-             return new_token is not None
+        if self._auth_thread is not None and not self.auth_ready.done():
+             self.logger.debug("Waiting for background SharePoint sign-in...")
+             if self.wait_until_ready(timeout):
+                  return True
+        self.logger.info("Existing token missing or expired. Attempting to get/refresh token.")
+        return self._acquire_token()
 
     def make_graph_request(self, method, url_suffix, **kwargs):
+        """Makes a request to the Microsoft Graph API, timed as ``sharepoint.graph.<METHOD>``."""
+        start = time.perf_counter()
+        response_data, status_code = self._send_graph_request(method, url_suffix, **kwargs)
+        record_duration(f"sharepoint.graph.{method.upper()}", time.perf_counter() - start,
+                        error=status_code >= 400)
+        return response_data, status_code
+
+    def _send_graph_request(self, method, url_suffix, **kwargs):
         """Makes a request to the Microsoft Graph API with enhanced logging."""
         if not self.ensure_authenticated():
             self.logger.error(f"Authentication failed. Cannot make Graph request to {url_suffix}.")
             return None, 503 # Return None and a simulated service unavailable status
 
-        api_url = f"{self.GRAPH_ENDPOINT}/{url_suffix}"
+        api_url = f"{self.graph_endpoint}/{url_suffix}"
         headers = {
             'Authorization': f'Bearer {self.access_token}',
             'Accept': 'application/json'
@@ -261,33 +411,32 @@ class SharePointManager:
 
         self.logger.info(f"Making Graph API request: {method} {api_url}")
         if 'json' in kwargs:
-            payload_str = json.dumps(kwargs['json'])
-            log_payload = payload_str[:1000] + ('...' if len(payload_str) > 1000 else '')
-            self.logger.debug(f"Request JSON payload (truncated): {log_payload}")
+            self.logger.debug("Request JSON payload: %s", LazyJson(kwargs['json']))
 
         response_data = None
         status_code = 500 # Default internal error
         try:
-            response = requests.request(method, api_url, headers=headers, timeout=30, **kwargs)
+            response = self.http.request(method, api_url, headers=headers, timeout=30, **kwargs)
             status_code = response.status_code # Store actual status code
             self.logger.info(f"Graph API response status: {status_code} {response.reason}")
 
             try:
                 response_data = response.json()
-                self.logger.debug(f"Graph API Response JSON: {json.dumps(response_data, indent=2)}")
+                self.logger.debug("Graph API Response JSON: %s", LazyJson(response_data))
             except json.JSONDecodeError:
                 response_data = response.text
-                self.logger.debug(f"Graph API Response Text: {response_data}")
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(f"Graph API Response Text: {truncate(response_data)}")
 
             response.raise_for_status() # Raise HTTPError for bad responses AFTER logging
 
             self.logger.debug(f"Graph API request successful: {method} {api_url}")
             return response_data if status_code != 204 else {}, status_code # Return data and status
 
-        except requests.exceptions.HTTPError as http_err:
+        except HttpStatusError as http_err:
             self.logger.error(f"HTTP error calling Graph API {method} {api_url}: {http_err}")
             return response_data, status_code # Return potentially parsed error details and status code
-        except requests.exceptions.RequestException as req_err:
+        except HttpClientError as req_err:
             self.logger.error(f"Request exception calling Graph API {method} {api_url}: {req_err}", exc_info=True)
             return None, 500 # Return None and internal error status
         except Exception as e:
@@ -352,7 +501,7 @@ class SharePointManager:
 
         # Note: Graph search can be slow and might require specific permissions depending on scope.
         # URL encoding the filename is important.
-        encoded_filename = requests.utils.quote(filename)
+        encoded_filename = quote(filename)
         url_suffix = f"drives/{drive_id}/root/search(q='{encoded_filename}')"
         self.logger.info(f"Searching for file '{filename}' using Graph API path: /{url_suffix}")
         response, status = self.make_graph_request('GET', url_suffix)
@@ -539,7 +688,7 @@ class SharePointManager:
         payload = { "values": values_payload }
 
         self.logger.info(f"Attempting PATCH request to: {update_url_suffix}")
-        self.logger.debug(f"PATCH Payload (first row): {json.dumps(payload['values'][0]) if payload['values'] else 'N/A'}")
+        self.logger.debug("PATCH Payload (first row): %s", LazyJson(payload['values'][0]) if payload['values'] else 'N/A')
 
         response, status = self.make_graph_request('PATCH', update_url_suffix, json=payload)
 
@@ -572,55 +721,52 @@ class SharePointManager:
             self.cache.set(cache_key, live_data)
         return live_data
 
-    # --- Background Update (Placeholder) ---
-    # (Keep V4 code for background update, start, stop)
-    def _background_update_task(self, sheet_names):
-        self.logger.info(f"Background update thread started for sheets: {sheet_names}")
-        while not self._stop_event.is_set():
-            for sheet_name in sheet_names:
-                if self._stop_event.is_set(): break
-                self.logger.info(f"[Background] Updating data for sheet: {sheet_name}")
-                try:
-                    data = self.read_sheet(sheet_name, use_cache=False)
-                    if data is None:
-                         self.logger.warning(f"[Background] Failed to fetch fresh data for sheet '{sheet_name}'.")
-                except Exception as e:
-                    self.logger.error(f"[Background] Error updating sheet '{sheet_name}': {e}", exc_info=True)
-                time.sleep(5)
-
-            if self._stop_event.is_set(): break
-            wait_time = self._update_interval_seconds
-            self.logger.debug(f"[Background] Update cycle complete. Waiting {wait_time} seconds.")
-            self._stop_event.wait(wait_time)
-        self.logger.info("Background update thread stopped.")
+    # --- Background Update ---
+    # Each sheet is a job on the application's refresh scheduler (no thread of its own)
+    BACKGROUND_SHEET_STAGGER_SECONDS = 5  # Gap between the first refreshes of consecutive sheets
+
+    def _refresh_sheet_job(self, sheet_name):
+        """Refresh one sheet's cache; returns False so the scheduler retries with backoff."""
+        self.logger.info(f"[Background] Updating data for sheet: {sheet_name}")
+        data = self.read_sheet(sheet_name, use_cache=False)
+        if data is None:
+            self.logger.warning(f"[Background] Failed to fetch fresh data for sheet '{sheet_name}'.")
+            return False
+        return True
 
     def start_background_update(self, sheet_names, interval_hours=6):
-        if hasattr(self, '_update_thread') and self._update_thread.is_alive():
-            self.logger.warning("Background update thread already running.")
+        """Register a periodic refresh job per sheet. Must be called on the GUI thread.
+
+        Args:
+            sheet_names: Worksheet names to keep fresh in the cache
+            interval_hours: Hours between refreshes of each sheet
+        """
+        from utils.refresh_scheduler import get_refresh_scheduler
+        if getattr(self, '_background_jobs', None):
+            self.logger.warning("Background update already running.")
             return
-        # --- Added stop event initialization if missing ---
-        if not hasattr(self, '_stop_event'):
-             self._stop_event = threading.Event()
-        # --- End change ---
-        self._update_interval_seconds = interval_hours * 3600
-        self._stop_event.clear() # Ensure event is clear before starting
-        self._update_thread = threading.Thread(target=self._background_update_task, args=(sheet_names,), daemon=True)
-        self._update_thread.start()
-        self.logger.info(f"Background update thread initiated for sheets {sheet_names} with interval {interval_hours} hours.")
+        scheduler = get_refresh_scheduler()
+        self._background_jobs = []
+        for index, sheet_name in enumerate(sheet_names):
+            job_name = f"sharepoint.sheet:{sheet_name}"
+            scheduler.add_job(job_name, lambda sheet_name=sheet_name: self._refresh_sheet_job(sheet_name),
+                              interval_hours * 3600, first_delay=index * self.BACKGROUND_SHEET_STAGGER_SECONDS,
+                              background=True)
+            self._background_jobs.append(job_name)
+        self.logger.info(f"Background update scheduled for sheets {sheet_names} with interval {interval_hours} hours.")
 
     def stop_background_update(self):
-        if hasattr(self, '_stop_event'):
-            self.logger.info("Requesting background update thread to stop...")
-            self._stop_event.set()
-        if hasattr(self, '_update_thread') and self._update_thread.is_alive():
-            self.logger.debug("Waiting for background thread to join...")
-            self._update_thread.join(timeout=10)
-            if self._update_thread.is_alive():
-                 self.logger.warning("Background thread did not stop gracefully after 10 seconds.")
-            else:
-                 self.logger.info("Background thread joined successfully.")
-        else:
-             self.logger.info("Background update thread was not running.")
+        """Unregister the sheet refresh jobs."""
+        jobs = getattr(self, '_background_jobs', None)
+        if not jobs:
+            self.logger.info("Background update was not running.")
+            return
+        from utils.refresh_scheduler import get_refresh_scheduler
+        scheduler = get_refresh_scheduler()
+        for job_name in jobs:
+            scheduler.remove_job(job_name)
+        self._background_jobs = []
+        self.logger.info("Background update stopped.")
 
 
 # --- Compatibility Wrapper Class ---
@@ -0,0 +1,163 @@
+# utils/startup_orchestrator.py - Runs application startup phases as a dependency graph
+import time
+import logging
+from collections import namedtuple
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from utils.worker import Worker
+from utils.startup_profiler import startup_phase
+
+logger = logging.getLogger(__name__)
+
+StartupPhase = namedtuple('StartupPhase', 'name func depends_on background message required')
+
+
+class StartupOrchestrator(QObject):
+    """Runs startup phases as soon as their dependencies have finished.
+
+    Each phase is a callable taking the dict of results so far and returning
+    its own result. Background phases run on the thread pool and may overlap.
+    The others run on the GUI thread, one event-loop turn apart so the splash
+    screen can repaint. Progress is reported through ``progress`` as the
+    percentage of finished phases plus the message of the phase just started.
+
+    A required phase that raises stops the startup and emits ``failed``.
+    Optional phases that fail are logged and their result is None.
+    """
+
+    progress = pyqtSignal(int, str)       # percent complete, message
+    phase_finished = pyqtSignal(str)      # phase name
+    finished = pyqtSignal()
+    failed = pyqtSignal(str, str)         # phase name, error message
+
+    # Emitted from pool threads; queued to this object's (GUI) thread
+    _background_done = pyqtSignal(str, object)
+    _background_error = pyqtSignal(str, str)
+
+    def __init__(self, thread_pool=None, logger=None, parent=None):
+        """Initialize the orchestrator.
+
+        Args:
+            thread_pool: QThreadPool for background phases (None runs them on the GUI thread)
+            logger: Logger instance (optional)
+            parent: Parent QObject (optional)
+        """
+        super().__init__(parent)
+        self.thread_pool = thread_pool
+        self.logger = logger or logging.getLogger(__name__)
+        self.phases = {}
+        self.results = {}
+        self.timings = {}                 # phase name -> seconds
+        self._running = set()
+        self._done = set()
+        self._started_at = {}
+        self._aborted = False
+        self._background_done.connect(self._on_phase_done)
+        self._background_error.connect(self._on_phase_error)
+
+    def add_phase(self, name, func, depends_on=(), background=False, message=None, required=True):
+        """Register a phase.
+
+        Args:
+            name: Unique phase name (also the key of its result)
+            func: Callable taking the results dict and returning the phase result
+            depends_on: Names of phases that must finish first
+            background: Run on the thread pool instead of the GUI thread
+            message: Progress message shown while the phase runs
+            required: Abort startup if the phase fails
+        """
+        if name in self.phases:
+            raise ValueError(f"Startup phase '{name}' is already registered")
+        self.phases[name] = StartupPhase(name, func, tuple(depends_on), background,
+                                         message or f"Starting {name}...", required)
+
+    def start(self):
+        """Check the graph and start every phase without dependencies."""
+        for phase in self.phases.values():
+            missing = [dep for dep in phase.depends_on if dep not in self.phases]
+            if missing:
+                raise ValueError(f"Startup phase '{phase.name}' depends on unknown phases: {missing}")
+        self.logger.debug(f"Starting {len(self.phases)} startup phases")
+        self._schedule()
+
+    def is_finished(self):
+        """Whether every phase has finished."""
+        return len(self._done) == len(self.phases)
+
+    # --- Internal helpers ---
+
+    def _schedule(self):
+        if self._aborted:
+            return
+        if self.is_finished():
+            self.logger.info("Startup phases finished: " + ", ".join(
+                f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.timings.items()))
+            self.finished.emit()
+            return
+        for phase in self.phases.values():
+            if phase.name in self._done or phase.name in self._running:
+                continue
+            if not all(dep in self._done for dep in phase.depends_on):
+                continue
+            self._running.add(phase.name)
+            self._started_at[phase.name] = time.perf_counter()
+            self.progress.emit(self._percent(), phase.message)
+            if phase.background and self.thread_pool is not None:
+                self._start_background(phase)
+            else:
+                QTimer.singleShot(0, lambda phase=phase: self._run_inline(phase))
+
+    def _start_background(self, phase):
+        self.thread_pool.start(Worker(self._run_background, phase))
+
+    def _run_background(self, phase, progress_callback=None, status_callback=None):
+        # Runs on a pool thread; progress/status callbacks are injected by Worker and unused
+        try:
+            result = self._call_phase(phase)
+        except Exception as e:
+            self._background_error.emit(phase.name, str(e))
+            return
+        self._background_done.emit(phase.name, result)
+
+    def _run_inline(self, phase):
+        if self._aborted:
+            return
+        try:
+            result = self._call_phase(phase)
+        except Exception as e:
+            self._on_phase_error(phase.name, str(e))
+            return
+        self._on_phase_done(phase.name, result)
+
+    def _call_phase(self, phase):
+        with startup_phase(phase.name):
+            try:
+                return phase.func(self.results)
+            except Exception as e:
+                self.logger.error(f"Startup phase '{phase.name}' failed: {e}", exc_info=True)
+                raise
+
+    def _on_phase_done(self, name, result):
+        if self._aborted or name in self._done:
+            return
+        self.timings[name] = time.perf_counter() - self._started_at[name]
+        self.results[name] = result
+        self._running.discard(name)
+        self._done.add(name)
+        self.logger.debug(f"Startup phase '{name}' finished in {self.timings[name] * 1000:.0f} ms")
+        self.phase_finished.emit(name)
+        self._schedule()
+
+    def _on_phase_error(self, name, error):
+        phase = self.phases[name]
+        if phase.required:
+            self._aborted = True
+            self._running.discard(name)
+            self.failed.emit(name, error)
+            return
+        self.logger.warning(f"Optional startup phase '{name}' failed, continuing without it: {error}")
+        self._on_phase_done(name, None)
+
+    def _percent(self):
+        return int(100 * len(self._done) / max(len(self.phases), 1))
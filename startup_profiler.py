@@ -0,0 +1,186 @@
+# utils/startup_profiler.py - Per-phase and per-import timings for cold-start profiling
+# Standard library only: main.py imports this before anything else it profiles
+import os
+import sys
+import json
+import time
+import builtins
+import platform
+import threading
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+PROFILE_STARTUP_FLAG = '--profile-startup'
+
+_active_profiler = None
+
+
+class StartupProfiler:
+    """Records how long startup phases and first-time imports take.
+
+    Imports are timed by wrapping ``builtins.__import__`` while installed. Each
+    module imported for the first time on the main thread gets its inclusive
+    time and its self time (inclusive minus the first-time imports nested in
+    it). Phases are named spans recorded with ``phase()`` or ``mark()``.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = []            # (name, start offset, duration), seconds
+        self.imports = {}           # module name -> {'inclusive', 'self', 'depth'}
+        self._last_mark = self.started
+        self._child_time = []       # Stack of nested import time per active import
+        self._original_import = None
+        self._thread_id = threading.get_ident()
+
+    # --- Import timing ---
+
+    def install(self):
+        """Start timing imports. Returns self."""
+        if self._original_import is None:
+            self._original_import = builtins.__import__
+            builtins.__import__ = self._timed_import
+        return self
+
+    def uninstall(self):
+        """Stop timing imports."""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import or builtins.__import__
+        if level or name in sys.modules or threading.get_ident() != self._thread_id:
+            return original(name, globals, locals, fromlist, level)
+
+        self._child_time.append(0.0)
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._child_time.pop()
+            if self._child_time:
+                self._child_time[-1] += elapsed
+            self.imports.setdefault(name, {'inclusive': elapsed,
+                                           'self': max(elapsed - children, 0.0),
+                                           'depth': len(self._child_time)})
+
+    # --- Phases ---
+
+    @contextmanager
+    def phase(self, name):
+        """Context manager recording the enclosed block as a (possibly nested) phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, start - self.started, time.perf_counter() - start))
+
+    def mark(self, name):
+        """Record the time since the previous mark (or the start) as a phase."""
+        now = time.perf_counter()
+        self.phases.append((name, self._last_mark - self.started, now - self._last_mark))
+        self._last_mark = now
+
+    def elapsed(self):
+        """Seconds since profiling started."""
+        return time.perf_counter() - self.started
+
+    # --- Reporting ---
+
+    def report(self, top=50, extra=None):
+        """Build the report as a JSON-serialisable dict.
+
+        Args:
+            top: Number of slowest imports (by self time) to include
+            extra: Optional dict merged into the report (e.g. app version)
+
+        Returns:
+            Report dict
+        """
+        slowest = sorted(self.imports.items(), key=lambda item: item[1]['self'], reverse=True)[:top]
+        report = {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'total_seconds': round(self.elapsed(), 4),
+            'phases': [{'name': name, 'start': round(start, 4), 'seconds': round(duration, 4)}
+                       for name, start, duration in self.phases],
+            'import_count': len(self.imports),
+            'import_seconds': round(sum(info['inclusive'] for info in self.imports.values()
+                                        if info['depth'] == 0), 4),
+            'imports': [{'module': name, 'self': round(info['self'], 4),
+                         'inclusive': round(info['inclusive'], 4), 'depth': info['depth']}
+                        for name, info in slowest],
+        }
+        if extra:
+            report.update(extra)
+        return report
+
+    def format_summary(self, top=15):
+        """Return a short human-readable summary of phases and slowest imports."""
+        lines = [f"Startup profile: {self.elapsed():.3f}s total"]
+        for name, start, duration in self.phases:
+            lines.append(f"  {name:<28} {duration * 1000:8.1f} ms  (at {start * 1000:.0f} ms)")
+        lines.append(f"Slowest imports (self time, {len(self.imports)} modules imported):")
+        slowest = sorted(self.imports.items(), key=lambda item: item[1]['self'], reverse=True)[:top]
+        for name, info in slowest:
+            lines.append(f"  {name:<40} {info['self'] * 1000:8.1f} ms  (incl. {info['inclusive'] * 1000:.1f} ms)")
+        return "\n".join(lines)
+
+    def write_report(self, report_dir, top=50, extra=None):
+        """Write the report to ``startup_profile_<timestamp>.json`` in report_dir.
+
+        Args:
+            report_dir: Directory for the report (created if missing)
+            top: Number of slowest imports to include
+            extra: Optional dict merged into the report
+
+        Returns:
+            Path of the written report
+        """
+        os.makedirs(report_dir, exist_ok=True)
+        path = os.path.join(report_dir, f"startup_profile_{datetime.now():%Y%m%d_%H%M%S}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(top=top, extra=extra), f, indent=2)
+        return path
+
+
+def start_profiling():
+    """Create, install and return the process-wide startup profiler."""
+    global _active_profiler
+    if _active_profiler is None:
+        _active_profiler = StartupProfiler().install()
+    return _active_profiler
+
+
+def stop_profiling():
+    """Uninstall the import hook and stop recording phases.
+
+    Returns:
+        The profiler that was active (for reporting), or None
+    """
+    global _active_profiler
+    profiler, _active_profiler = _active_profiler, None
+    if profiler:
+        profiler.uninstall()
+    return profiler
+
+
+def get_profiler():
+    """Return the active startup profiler, or None when not profiling."""
+    return _active_profiler
+
+
+def startup_phase(name):
+    """Context manager timing a startup phase; does nothing when not profiling."""
+    profiler = _active_profiler
+    return profiler.phase(name) if profiler else nullcontext()
+
+
+def mark_startup_phase(name):
+    """Record the time since the previous mark as a phase; does nothing when not profiling."""
+    profiler = _active_profiler
+    if profiler:
+        profiler.mark(name)
@@ -0,0 +1,89 @@
+# benchmarks/synthetic_data.py - Deterministic synthetic CSVs, sheets and quotes for benchmarks
+import os
+import csv
+import random
+
+_FIRST = ["Alex", "Sam", "Jordan", "Casey", "Taylor", "Morgan", "Riley", "Jamie", "Drew", "Avery"]
+_LAST = ["Smith", "Brown", "Wilson", "Martin", "Olsen", "Dube", "Singh", "Nguyen", "Fraser", "Leblanc"]
+_MODELS = ["Tractor", "Combine", "Baler", "Sprayer", "Gator", "Mower", "Planter", "Loader", "Disc", "Header"]
+_TOWNS = ["Camrose", "Killam", "Wainwright", "Provost", "Vermilion", "Daysland", "Sedgewick"]
+
+
+def _rng(seed):
+    return random.Random(seed)
+
+
+def _write_csv(path, header, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def make_data_dir(directory, rows, seed=1):
+    """Write customers/products/parts/salesmen CSVs in the DataLoader's format.
+
+    Args:
+        directory: Target directory (created if missing)
+        rows: Rows per file (salesmen are capped at 1,000)
+        seed: Random seed, so every run parses identical files
+
+    Returns:
+        The directory
+    """
+    os.makedirs(directory, exist_ok=True)
+    rng = _rng(seed)
+    _write_csv(os.path.join(directory, 'customers.csv'), ["Name", "Town"],
+               ((f"{rng.choice(_FIRST)} {rng.choice(_LAST)} {i}", rng.choice(_TOWNS)) for i in range(rows)))
+    _write_csv(os.path.join(directory, 'products.csv'), ["ProductName", "ProductCode", "Price"],
+               ((f"{rng.choice(_MODELS)} {i:07d}", f"P{i:07d}", f"{rng.uniform(500, 750000):.2f}")
+                for i in range(rows)))
+    _write_csv(os.path.join(directory, 'parts.csv'), ["Part Number", "Part Name"],
+               ((f"AH{i:08d}", f"{rng.choice(_MODELS)} part {i}") for i in range(rows)))
+    _write_csv(os.path.join(directory, 'salesmen.csv'), ["Name", "Email"],
+               ((f"{rng.choice(_FIRST)} {rng.choice(_LAST)} {i}", f"sales{i}@example.com")
+                for i in range(min(rows, 1000))))
+    return directory
+
+
+def sheet_rows(rows, columns=12, seed=2):
+    """Return a header row plus ``rows`` rows of strings, like Graph's usedRange ``text``."""
+    rng = _rng(seed)
+    header = ["Stock #", "Description", "Year", "Make", "Model", "Hours", "Price", "Location"]
+    header += [f"Column {c}" for c in range(len(header), columns)]
+    header = header[:columns]
+    data = [header]
+    for i in range(rows):
+        row = [f"S{i:06d}", f"{rng.choice(_MODELS)} {rng.choice(_LAST)} edition", str(rng.randint(1995, 2025)),
+               "John Deere", f"{rng.choice('ABCDEFGHJKLMNPRSTVWXZ')}{rng.randint(100, 9999)}",
+               str(rng.randint(0, 12000)), f"${rng.uniform(1000, 650000):,.2f}", rng.choice(_TOWNS)]
+        row += [f"v{i}-{c}" for c in range(len(row), columns)]
+        data.append(row[:columns])
+    return data
+
+
+def quotes(count, dealer_racf_id="X000000", seed=3):
+    """Return ``count`` quote summaries shaped like the maintain-quotes search results."""
+    rng = _rng(seed)
+    return [{
+        "quoteId": 10000000 + i,
+        "quoteName": f"{rng.choice(_MODELS)} for {rng.choice(_LAST)}",
+        "dealerRacfID": dealer_racf_id,
+        "customerFirstName": rng.choice(_FIRST),
+        "customerLastName": rng.choice(_LAST),
+        "quoteStatus": rng.choice(["Draft", "Sent", "Won", "Lost"]),
+        "totalAmount": round(rng.uniform(1000, 900000), 2),
+        "lastModifiedDate": f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/2025",
+    } for i in range(count)]
+
+
+def deal_items(equipment, trades, parts, seed=4):
+    """Return (equipment, trades, parts) list entries in the Deal Form's display formats."""
+    rng = _rng(seed)
+    equipment_items = [f'"{rng.choice(_MODELS)} {i}" (Code: P{i:07d}) STK#S{i:06d} ${rng.uniform(500, 750000):,.2f}'
+                       for i in range(equipment)]
+    trade_items = [f'"Trade {rng.choice(_MODELS)} {i}" STK#T{i:06d} ${rng.uniform(500, 200000):,.2f}'
+                   for i in range(trades)]
+    part_items = [f"{rng.randint(1, 20)}x AH{i:08d} Part{i} {rng.choice(_TOWNS)} Shop"
+                  for i in range(parts)]
+    return equipment_items, trade_items, part_items
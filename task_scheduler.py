@@ -0,0 +1,402 @@
+# utils/task_scheduler.py - Prioritised, cancellable background tasks on a QThreadPool
+import time
+import inspect
+import logging
+import threading
+import traceback
+from collections import namedtuple
+from concurrent.futures import Future, CancelledError
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+from utils.instrumentation import record_duration
+
+logger = logging.getLogger(__name__)
+
+# Error payload emitted by TaskHandle.error; unpacks like the (type, value, traceback) tuples
+# the existing error slots expect
+TaskError = namedtuple('TaskError', 'exc_type exc_value traceback')
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task (via CancelToken.raise_if_cancelled) to stop it early."""
+
+
+class CancelToken:
+    """Cooperative cancellation flag shared between a task and its handle."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self):
+        """Whether cancellation was requested."""
+        return self._event.is_set()
+
+    def cancel(self):
+        """Request cancellation."""
+        self._event.set()
+
+    def raise_if_cancelled(self):
+        """Raise TaskCancelled if cancellation was requested."""
+        if self._event.is_set():
+            raise TaskCancelled()
+
+
+class TaskCallback:
+    """Callable handed to tasks as progress_callback/status_callback.
+
+    Supports both ``callback(value)`` and the signal-style ``callback.emit(value)``.
+    """
+
+    def __init__(self, signal):
+        self._signal = signal
+
+    def __call__(self, value):
+        self._signal.emit(value)
+
+    emit = __call__
+
+
+class TaskHandle(QObject):
+    """Handle to a submitted task.
+
+    Signals are emitted from the pool thread and delivered queued to slots of
+    GUI-thread objects. ``future`` resolves with the result (or raises the
+    task's exception / CancelledError) for callers that need to wait.
+    """
+
+    result = pyqtSignal(object)
+    error = pyqtSignal(object)        # TaskError
+    cancelled = pyqtSignal()
+    finished = pyqtSignal()           # Always emitted last, whatever the outcome
+    progress = pyqtSignal(int)
+    status = pyqtSignal(str)
+
+    QUEUED, RUNNING, DONE, FAILED, CANCELLED = 'queued', 'running', 'done', 'failed', 'cancelled'
+
+    def __init__(self, name, priority=0, dedup_key=None, parent=None):
+        super().__init__(parent)
+        self.name = name
+        self.priority = priority
+        self.dedup_key = dedup_key
+        self.token = CancelToken()
+        self.future = Future()
+        self.state = self.QUEUED
+        self.queued_at = time.monotonic()
+        self.started_at = None
+        self.finished_at = None
+        self._scheduler = None
+        self._runnable = None
+        self._started = False
+        self._attached = set()        # (signal name, slot) pairs connected through attach()
+
+    @property
+    def wait_time(self):
+        """Seconds spent queued (None until started)."""
+        return None if self.started_at is None else self.started_at - self.queued_at
+
+    @property
+    def run_time(self):
+        """Seconds spent running (None until finished; 0 if cancelled while queued)."""
+        if self.finished_at is None:
+            return None
+        return self.finished_at - (self.started_at or self.finished_at)
+
+    def is_active(self):
+        """Whether the task is still queued or running."""
+        return self.state in (self.QUEUED, self.RUNNING)
+
+    def cancel(self):
+        """Cancel the task: dequeued if not started, otherwise asked to stop cooperatively."""
+        self.token.cancel()
+        if self._scheduler is not None:
+            self._scheduler._try_dequeue(self)
+
+    def attach(self, signal_name, slot):
+        """Connect a slot to one of the handle's signals unless it is already attached.
+
+        Coalesced submits share a handle, so callers passing the same slot
+        again must not have it invoked twice.
+
+        Returns:
+            True if the slot was connected
+        """
+        key = (signal_name, slot)
+        if key in self._attached:
+            return False
+        self._attached.add(key)
+        getattr(self, signal_name).connect(slot)
+        return True
+
+    def wait(self, timeout=None):
+        """Block until the task finishes. Returns True if it finished in time."""
+        try:
+            self.future.exception(timeout=timeout)
+        except CancelledError:
+            pass
+        except Exception:
+            return False
+        return True
+
+
+class _TaskRunnable(QRunnable):
+    """QRunnable executing one TaskHandle's function."""
+
+    def __init__(self, scheduler, handle, fn, args, kwargs):
+        super().__init__()
+        self.scheduler = scheduler
+        self.handle = handle
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        self.scheduler._run(self)
+
+
+class TaskScheduler(QObject):
+    """Runs functions on a QThreadPool with priorities, cancellation and coalescing.
+
+    - ``submit`` returns a TaskHandle; tasks with the same ``dedup_key`` that
+      are still queued or running are coalesced into the existing handle.
+      With ``start=False`` the task is only queued once ``start(handle)`` is
+      called, so signals can be connected before it can emit.
+    - Task functions receive ``progress_callback``, ``status_callback`` and
+      ``cancel_token`` only if their signature declares them (or ``**kwargs``).
+    - Errors are emitted as TaskError with the formatted traceback.
+    - Per-task-name timing is kept for ``get_metrics``.
+    """
+
+    def __init__(self, thread_pool, logger=None, parent=None):
+        """Initialize the scheduler.
+
+        Args:
+            thread_pool: QThreadPool the tasks run on
+            logger: Logger instance (optional)
+            parent: Parent QObject (optional)
+        """
+        super().__init__(parent)
+        self.thread_pool = thread_pool
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._active = set()          # Handles queued or running
+        self._by_key = {}             # dedup_key -> active handle
+        self._stats = {}              # task name -> counters and timings
+        self._accepting = True
+
+    # --- Submitting ---
+
+    def submit(self, fn, *args, name=None, priority=0, dedup_key=None, start=True, **kwargs):
+        """Queue a function to run on the thread pool.
+
+        Args:
+            fn: Function to run
+            *args: Positional arguments for fn
+            name: Task name for logs and metrics (default: the function name)
+            priority: Higher runs first among queued tasks (QThreadPool priority)
+            dedup_key: Coalesce with an active task submitted under the same key
+            start: Queue the task right away; pass False to connect the handle's
+                   signals first, then call ``start(handle)``
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            TaskHandle (the existing one when coalesced), or None after shutdown
+        """
+        name = name or getattr(fn, '__name__', 'task')
+        with self._lock:
+            if not self._accepting:
+                self.logger.warning(f"Task '{name}' rejected: scheduler is shutting down")
+                return None
+            if dedup_key is not None:
+                existing = self._by_key.get(dedup_key)
+                if existing is not None and existing.is_active() and not existing.token.cancelled:
+                    self.logger.debug(f"Task '{name}' coalesced with running task for key {dedup_key!r}")
+                    self._stat(existing.name)['coalesced'] += 1
+                    return existing
+
+            handle = TaskHandle(name, priority=priority, dedup_key=dedup_key)
+            handle._scheduler = self
+            runnable = _TaskRunnable(self, handle, fn, args, self._with_callbacks(fn, handle, kwargs))
+            handle._runnable = runnable
+            self._active.add(handle)
+            if dedup_key is not None:
+                self._by_key[dedup_key] = handle
+            self._stat(name)['submitted'] += 1
+
+        if start:
+            self.start(handle)
+        return handle
+
+    def start(self, handle):
+        """Queue a task submitted with ``start=False``. No-op if it already started or finished."""
+        with self._lock:
+            runnable = handle._runnable
+            if handle._started or runnable is None:
+                return
+            handle._started = True
+        self.thread_pool.start(runnable, handle.priority)
+        self.logger.debug(f"Queued task '{handle.name}' (priority {handle.priority})")
+
+    def active_tasks(self):
+        """Return the handles of tasks still queued or running."""
+        with self._lock:
+            return list(self._active)
+
+    def cancel_all(self):
+        """Cancel every queued or running task."""
+        for handle in self.active_tasks():
+            handle.cancel()
+
+    # --- Shutdown ---
+
+    def shutdown(self, policy='cancel', timeout_ms=2000):
+        """Stop accepting tasks and wind down the running ones.
+
+        Args:
+            policy: 'drain' lets queued tasks run until the timeout, then cancels
+                    the rest; 'cancel' cancels everything immediately
+            timeout_ms: Maximum time to wait for running tasks
+
+        Returns:
+            True if every task finished within the timeout
+        """
+        with self._lock:
+            self._accepting = False
+            pending = len(self._active)
+        self.logger.info(f"Shutting down task scheduler ({policy}, {pending} active tasks)")
+
+        if policy == 'drain' and self.thread_pool.waitForDone(timeout_ms):
+            return True
+        self.cancel_all()
+        self.thread_pool.clear()  # Also drops queued runnables not started through the scheduler
+        finished = self.thread_pool.waitForDone(timeout_ms if policy != 'drain' else 0)
+        if not finished:
+            names = sorted(handle.name for handle in self.active_tasks())
+            self.logger.warning(f"Tasks still running at shutdown: {names}")
+        return finished
+
+    # --- Metrics ---
+
+    def get_metrics(self):
+        """Per-task-name counters and timings.
+
+        Returns:
+            Dict mapping task name to a dict with submitted/completed/failed/
+            cancelled/coalesced counts and avg/max wait and run times (seconds)
+        """
+        with self._lock:
+            metrics = {}
+            for name, stat in self._stats.items():
+                runs = stat['completed'] + stat['failed']
+                metrics[name] = {
+                    'submitted': stat['submitted'], 'completed': stat['completed'],
+                    'failed': stat['failed'], 'cancelled': stat['cancelled'],
+                    'coalesced': stat['coalesced'],
+                    'avg_wait': stat['total_wait'] / runs if runs else 0.0,
+                    'avg_run': stat['total_run'] / runs if runs else 0.0,
+                    'max_run': stat['max_run'],
+                }
+            return metrics
+
+    # --- Internal helpers ---
+
+    def _with_callbacks(self, fn, handle, kwargs):
+        callbacks = {'progress_callback': TaskCallback(handle.progress),
+                     'status_callback': TaskCallback(handle.status),
+                     'cancel_token': handle.token}
+        try:
+            parameters = inspect.signature(fn).parameters
+        except (TypeError, ValueError):
+            return kwargs
+        accepts_any = any(p.kind == inspect.Parameter.VAR_KEYWORD for p in parameters.values())
+        injected = {key: value for key, value in callbacks.items()
+                    if (accepts_any or key in parameters) and key not in kwargs}
+        return {**injected, **kwargs}
+
+    def _stat(self, name):
+        # Caller holds self._lock
+        return self._stats.setdefault(name, {'submitted': 0, 'completed': 0, 'failed': 0, 'cancelled': 0,
+                                             'coalesced': 0, 'total_wait': 0.0, 'total_run': 0.0,
+                                             'max_run': 0.0})
+
+    def _try_dequeue(self, handle):
+        runnable = handle._runnable
+        if runnable is None or handle.state != TaskHandle.QUEUED:
+            return
+        if not handle._started:
+            self._complete(handle, TaskHandle.CANCELLED)  # Never handed to the pool
+            return
+        try:
+            taken = self.thread_pool.tryTake(runnable)
+        except (AttributeError, RuntimeError):
+            taken = False  # Not supported / already deleted; the run() check handles it
+        if taken:
+            self._complete(handle, TaskHandle.CANCELLED)
+
+    def _run(self, runnable):
+        handle = runnable.handle
+        with self._lock:
+            if handle.state != TaskHandle.QUEUED:
+                return
+            if handle.token.cancelled:
+                cancelled_before_start = True
+            else:
+                cancelled_before_start = False
+                handle.state = TaskHandle.RUNNING
+                handle.started_at = time.monotonic()
+        if cancelled_before_start:
+            self._complete(handle, TaskHandle.CANCELLED)
+            return
+
+        try:
+            result = runnable.fn(*runnable.args, **runnable.kwargs)
+        except TaskCancelled:
+            self._complete(handle, TaskHandle.CANCELLED)
+        except Exception as e:
+            error = TaskError(type(e), e, traceback.format_exc())
+            self.logger.error(f"Task '{handle.name}' failed: {e}", exc_info=True)
+            self._complete(handle, TaskHandle.FAILED, error=error)
+        else:
+            if handle.token.cancelled:
+                self._complete(handle, TaskHandle.CANCELLED)
+            else:
+                self._complete(handle, TaskHandle.DONE, result=result)
+
+    def _complete(self, handle, state, result=None, error=None):
+        with self._lock:
+            if not handle.is_active():
+                return
+            handle.state = state
+            handle.finished_at = time.monotonic()
+            self._active.discard(handle)
+            if handle.dedup_key is not None and self._by_key.get(handle.dedup_key) is handle:
+                del self._by_key[handle.dedup_key]
+            handle._runnable = None
+            stat = self._stat(handle.name)
+            if state == TaskHandle.CANCELLED:
+                stat['cancelled'] += 1
+            else:
+                stat['completed' if state == TaskHandle.DONE else 'failed'] += 1
+                stat['total_wait'] += handle.wait_time or 0.0
+                stat['total_run'] += handle.run_time or 0.0
+                stat['max_run'] = max(stat['max_run'], handle.run_time or 0.0)
+
+        if state != TaskHandle.CANCELLED:
+            record_duration(f"task.{handle.name}", handle.run_time or 0.0, error=state == TaskHandle.FAILED)
+
+        # Signals and the future are resolved after the handle left the active set,
+        # so a coalesced submit never attaches to a task that has already reported
+        if state == TaskHandle.DONE:
+            self.logger.debug(f"Task '{handle.name}' finished in {handle.run_time:.3f}s "
+                              f"(queued {handle.wait_time:.3f}s)")
+            handle.future.set_result(result)
+            handle.result.emit(result)
+        elif state == TaskHandle.FAILED:
+            handle.future.set_exception(error.exc_value)
+            handle.error.emit(error)
+        else:
+            self.logger.debug(f"Task '{handle.name}' cancelled")
+            handle.future.cancel()
+            handle.cancelled.emit()
+        handle.finished.emit()
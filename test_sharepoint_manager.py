@@ -0,0 +1,116 @@
+# tests/test_sharepoint_manager.py - SharePointManager token acquisition against a stubbed MSAL app
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+from modules.sharepoint_manager import SharePointManager
+
+
+class FakeTokenCache:
+    """Stands in for msal.SerializableTokenCache: a dict serialized as text."""
+
+    def __init__(self):
+        self.tokens = {}
+        self.has_state_changed = False
+
+    def serialize(self):
+        return repr(sorted(self.tokens.items()))
+
+    def deserialize(self, state):
+        self.has_state_changed = False
+
+
+class FakeMsalApp:
+    """Minimal ConfidentialClientApplication: a cache lookup plus a counted client credentials grant."""
+
+    def __init__(self, token_cache, expires_in=3600):
+        self.token_cache = token_cache
+        self.expires_in = expires_in
+        self.silent_calls = 0
+        self.client_calls = 0
+
+    def seed(self, token, expires_in):
+        """Put a token in the cache as if an earlier run had acquired it."""
+        self.token_cache.tokens['graph'] = (token, datetime.now() + timedelta(seconds=expires_in))
+
+    def acquire_token_silent(self, scopes, account=None):
+        self.silent_calls += 1
+        cached = self.token_cache.tokens.get('graph')
+        if cached is None or cached[1] <= datetime.now():
+            return None
+        return {'access_token': cached[0], 'expires_in': int((cached[1] - datetime.now()).total_seconds())}
+
+    def acquire_token_for_client(self, scopes):
+        self.client_calls += 1
+        token = f"token-{self.client_calls}"
+        self.seed(token, self.expires_in)
+        self.token_cache.has_state_changed = True
+        return {'access_token': token, 'expires_in': self.expires_in, 'token_type': 'Bearer'}
+
+
+class SharePointTokenTests(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp(prefix="sp_token_test_")
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        config = SimpleNamespace(azure_tenant_id="tenant", azure_client_id="client", azure_client_secret="secret",
+                                 sharepoint_site_id="site", sharepoint_site_name="site",
+                                 sharepoint_file_path="Shared Documents/test.xlsx", cache_dir=self.cache_dir,
+                                 get=lambda key, default=None: default)
+        self.token_cache = FakeTokenCache()
+        self.app = FakeMsalApp(self.token_cache)
+        self.manager = SharePointManager(config=config, msal_app=self.app)
+        self.manager.token_cache = self.token_cache
+
+    def test_cache_hit_skips_client_credentials(self):
+        self.app.seed("cached-token", expires_in=3600)
+
+        self.assertEqual(self.manager.get_access_token(), "cached-token")
+        self.assertEqual(self.app.silent_calls, 1)
+        self.assertEqual(self.app.client_calls, 0)
+        self.assertFalse(os.path.exists(self.manager.token_cache_file))  # Nothing changed, nothing written
+
+    def test_new_token_persists_cache_atomically(self):
+        with mock.patch("modules.sharepoint_manager.os.replace", wraps=os.replace) as replace:
+            self.assertEqual(self.manager.get_access_token(), "token-1")
+
+        self.assertEqual(self.app.client_calls, 1)
+        replace.assert_called_once_with(f"{self.manager.token_cache_file}.tmp", self.manager.token_cache_file)
+        self.assertFalse(os.path.exists(f"{self.manager.token_cache_file}.tmp"))
+        with open(self.manager.token_cache_file) as f:
+            self.assertEqual(f.read(), self.token_cache.serialize())
+        self.assertFalse(self.token_cache.has_state_changed)
+
+    def test_expired_token_is_reacquired(self):
+        self.app.seed("expired-token", expires_in=-60)
+
+        self.assertTrue(self.manager.ensure_authenticated())
+        self.assertEqual(self.manager.access_token, "token-1")
+        self.assertEqual(self.app.client_calls, 1)
+
+        # Still valid: served from memory without touching MSAL
+        self.assertTrue(self.manager.ensure_authenticated())
+        self.assertEqual(self.app.silent_calls, 1)
+
+        # Past expiry (in memory and in MSAL's cache): a new grant is made
+        self.manager.token_expiry = datetime.now() - timedelta(seconds=1)
+        self.app.seed("token-1", expires_in=-1)
+        self.assertTrue(self.manager.ensure_authenticated())
+        self.assertEqual(self.manager.access_token, "token-2")
+        self.assertEqual(self.app.client_calls, 2)
+
+    def test_failed_grant_clears_token(self):
+        self.app.acquire_token_for_client = lambda scopes: {'error': 'invalid_client',
+                                                            'error_description': 'bad secret'}
+
+        self.assertIsNone(self.manager.get_access_token())
+        self.assertIsNone(self.manager.access_token)
+        self.assertFalse(self.manager.ensure_authenticated())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+# utils/timeseries_store.py - Append-only price history persisted as NumPy arrays
+import os
+import logging
+import threading
+
+# NumPy is imported where it is used, so the dashboard can create a store without loading it
+
+logger = logging.getLogger(__name__)
+
+
+def downsample_minmax(timestamps, values, max_points):
+    """Reduce a series for plotting while keeping its peaks and troughs.
+
+    The series is split into ``max_points // 2`` buckets and each bucket
+    contributes its minimum and maximum (in time order), so spikes survive
+    the reduction. Series already within ``max_points`` are returned as-is.
+
+    Args:
+        timestamps: 1-D array of epoch seconds (sorted)
+        values: 1-D array of values, same length
+        max_points: Upper bound on returned points
+
+    Returns:
+        Tuple (timestamps, values) as NumPy arrays
+    """
+    import numpy as np
+    count = len(timestamps)
+    if max_points < 4 or count <= max_points:
+        return timestamps, values
+    buckets = max_points // 2
+    edges = np.linspace(0, count, buckets + 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+    starts, ends = starts[ends > starts], ends[ends > starts]
+    # One argmin/argmax per bucket; buckets number in the hundreds, not the data size
+    min_idx = np.array([s + np.argmin(values[s:e]) for s, e in zip(starts, ends)])
+    max_idx = np.array([s + np.argmax(values[s:e]) for s, e in zip(starts, ends)])
+    keep = np.unique(np.concatenate([min_idx, max_idx, [0, count - 1]]))
+    return timestamps[keep], values[keep]
+
+
+class TimeSeriesStore:
+    """Named series of (timestamp, value) points kept in memory and on disk.
+
+    Each series is a pair of sorted NumPy arrays saved as ``<name>.npz`` in
+    ``store_dir``. Appends only accept points newer than the last stored
+    timestamp, so callers can hand over a whole API response and only the
+    missing range is added.
+    """
+
+    def __init__(self, store_dir=None, logger=None):
+        """Initialize the store.
+
+        Args:
+            store_dir: Directory for the .npz files (None keeps series in memory only)
+            logger: Logger instance (optional)
+        """
+        self.store_dir = store_dir
+        self.logger = logger or logging.getLogger(__name__)
+        self._series = {}
+        self._lock = threading.RLock()
+        if self.store_dir:
+            os.makedirs(self.store_dir, exist_ok=True)
+
+    # --- Reading ---
+
+    def last_timestamp(self, name):
+        """Return the newest timestamp of a series, or None if it is empty."""
+        with self._lock:
+            timestamps, _ = self._get(name)
+            return int(timestamps[-1]) if len(timestamps) else None
+
+    def read(self, name, start=None, end=None, max_points=None):
+        """Return a series' points in [start, end], optionally downsampled.
+
+        Args:
+            name: Series name
+            start: Earliest epoch seconds to include (optional)
+            end: Latest epoch seconds to include (optional)
+            max_points: Downsample to at most this many points (optional)
+
+        Returns:
+            Tuple (timestamps, values) of NumPy arrays (views; do not modify)
+        """
+        import numpy as np
+        with self._lock:
+            timestamps, values = self._get(name)
+        lo = 0 if start is None else int(np.searchsorted(timestamps, start, side='left'))
+        hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, end, side='right'))
+        timestamps, values = timestamps[lo:hi], values[lo:hi]
+        if max_points:
+            timestamps, values = downsample_minmax(timestamps, values, max_points)
+        return timestamps, values
+
+    def __len__(self):
+        with self._lock:
+            return len(self._series)
+
+    # --- Writing ---
+
+    def append(self, name, timestamps, values):
+        """Append points newer than the series' last timestamp and persist.
+
+        Args:
+            name: Series name
+            timestamps: Iterable of epoch seconds (any order)
+            values: Iterable of values, same length
+
+        Returns:
+            Number of points added
+        """
+        import numpy as np
+        new_t = np.asarray(timestamps, dtype=np.int64)
+        new_v = np.asarray(values, dtype=np.float64)
+        if new_t.size == 0:
+            return 0
+        order = np.argsort(new_t, kind='stable')
+        new_t, new_v = new_t[order], new_v[order]
+        with self._lock:
+            old_t, old_v = self._get(name)
+            if len(old_t):
+                mask = new_t > old_t[-1]
+                new_t, new_v = new_t[mask], new_v[mask]
+            # Drop duplicate timestamps within the batch, keeping the last value
+            if new_t.size > 1:
+                last_of_run = np.append(new_t[1:] != new_t[:-1], True)
+                new_t, new_v = new_t[last_of_run], new_v[last_of_run]
+            if new_t.size == 0:
+                return 0
+            merged = (np.concatenate([old_t, new_t]), np.concatenate([old_v, new_v]))
+            self._series[name] = merged
+            self._save(name, *merged)
+        self.logger.debug(f"Appended {new_t.size} points to series {name}")
+        return int(new_t.size)
+
+    def append_point(self, name, timestamp, value):
+        """Append a single point (ignored unless newer than the last one)."""
+        return self.append(name, [timestamp], [value])
+
+    # --- Internal helpers ---
+
+    def _path(self, name):
+        safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+        return os.path.join(self.store_dir, f"{safe}.npz")
+
+    def _get(self, name):
+        series = self._series.get(name)
+        if series is None:
+            series = self._load(name)
+            self._series[name] = series
+        return series
+
+    def _load(self, name):
+        import numpy as np
+        empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64))
+        if not self.store_dir:
+            return empty
+        path = self._path(name)
+        if not os.path.exists(path):
+            return empty
+        try:
+            with np.load(path) as data:
+                return data['t'].astype(np.int64), data['v'].astype(np.float64)
+        except Exception as e:
+            self.logger.error(f"Failed to load series {name} from {path}: {e}")
+            return empty
+
+    def _save(self, name, timestamps, values):
+        if not self.store_dir:
+            return
+        import numpy as np
+        path = self._path(name)
+        tmp_path = f"{path}.tmp.npz"
+        try:
+            np.savez(tmp_path, t=timestamps, v=values)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            self.logger.error(f"Failed to save series {name} to {path}: {e}")
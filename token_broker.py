@@ -0,0 +1,281 @@
+# utils/token_broker.py - Single in-memory owner of an OAuth access token
+import time
+import logging
+import threading
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBroker:
+    """Holds one OAuth token in memory and keeps it fresh for every client.
+
+    The broker is the only place that acquires tokens. It:
+      - seeds itself once from the on-disk cache (no disk reads per request),
+      - refreshes proactively on a timer ``refresh_margin`` seconds before expiry,
+      - collapses concurrent refresh requests into a single in-flight fetch,
+      - pushes every new token to subscribers (e.g. ``MaintainQuotesAPI.set_access_token``),
+      - exposes ``ready``, a Future resolved once the first acquisition settles.
+
+    ``fetch_token`` is called on a background thread and must return a dict
+    with ``access_token`` and ``expires_at`` (or ``expires_in``), or None.
+    """
+
+    def __init__(self, fetch_token, load_cached_token=None, name="token",
+                 refresh_margin=300, retry_delay=30, logger=None):
+        """Initialize the token broker.
+
+        Args:
+            fetch_token: Callable returning new token data (dict) or None
+            load_cached_token: Optional callable returning cached token data (dict) or None
+            name: Name used in log messages and thread names
+            refresh_margin: Seconds before expiry at which the token is refreshed (default: 300)
+            retry_delay: Seconds to wait before retrying a failed refresh (default: 30)
+            logger: Logger instance (optional)
+        """
+        self.fetch_token = fetch_token
+        self.load_cached_token = load_cached_token
+        self.name = name
+        self.refresh_margin = refresh_margin
+        self.retry_delay = retry_delay
+        self.logger = logger or logging.getLogger(__name__).getChild(name)
+
+        self._lock = threading.Lock()
+        self._access_token = None
+        self._expires_at = 0.0
+        self._inflight = None       # Future of the refresh currently running
+        self._timer = None
+        self._subscribers = []
+        self._stopped = False
+
+        # Resolves to the first usable token, or None if the first refresh failed
+        self.ready = Future()
+        self._ready_marked = False
+
+    # --- Token state ---
+
+    @property
+    def access_token(self):
+        """Current token (may be None or close to expiry)."""
+        return self._access_token
+
+    @property
+    def expires_at(self):
+        """Epoch seconds at which the current token expires (0 if none)."""
+        return self._expires_at
+
+    def is_valid(self, margin=0):
+        """Whether the current token is set and valid for at least ``margin`` seconds."""
+        return bool(self._access_token) and self._expires_at > time.time() + margin
+
+    def wait_ready(self, timeout=None):
+        """Block until the first token acquisition has settled.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if a valid token is held afterwards
+        """
+        try:
+            self.ready.result(timeout=timeout)
+        except Exception:
+            pass
+        return self.is_valid()
+
+    # --- Subscribers ---
+
+    def subscribe(self, callback):
+        """Register a callback receiving every new access token.
+
+        The callback is invoked immediately if a valid token is already held.
+        Callbacks run on the refreshing thread and must not touch Qt widgets.
+
+        Args:
+            callback: Callable taking the token string
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+            token = self._access_token if self.is_valid() else None
+        if token:
+            self._notify(callback, token)
+
+    def unsubscribe(self, callback):
+        """Remove a previously registered callback."""
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    # --- Lifecycle ---
+
+    def start(self):
+        """Seed from the on-disk cache and make sure a refresh is scheduled.
+
+        Never blocks on the network: if no usable cached token exists, a
+        refresh is started in the background.
+
+        Returns:
+            True if a valid cached token was loaded
+        """
+        self._stopped = False
+        loaded = False
+        if self.load_cached_token:
+            try:
+                token_data = self.load_cached_token()
+            except Exception as e:
+                self.logger.error(f"Error loading cached {self.name} token: {e}")
+                token_data = None
+            if token_data and token_data.get('access_token'):
+                loaded = self._set_token(token_data, source="cache")
+
+        if not self.is_valid(self.refresh_margin):
+            self.refresh_async()
+        return loaded
+
+    def stop(self):
+        """Cancel the proactive refresh timer."""
+        self._stopped = True
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+
+    # --- Acquisition ---
+
+    def get_token(self, timeout=30):
+        """Return a valid token, waiting for a refresh only if none is usable.
+
+        Args:
+            timeout: Maximum seconds to wait for a refresh (default: 30)
+
+        Returns:
+            Token string or None if no token could be obtained
+        """
+        if self.is_valid():
+            # Still valid; a refresh is already scheduled if it is near expiry
+            return self._access_token
+        try:
+            return self.refresh_async().result(timeout=timeout)
+        except Exception as e:
+            self.logger.error(f"Timed out or failed waiting for {self.name} token: {e}")
+            return None
+
+    def token_provider(self, force_refresh=False):
+        """Token-provider callback for API clients (see MaintainQuotesAPI).
+
+        Args:
+            force_refresh: Discard the current token (it was rejected) and refresh
+
+        Returns:
+            Token string or None
+        """
+        return self.refresh() if force_refresh else self.get_token()
+
+    def refresh(self, timeout=30):
+        """Force a refresh and wait for it.
+
+        Args:
+            timeout: Maximum seconds to wait (default: 30)
+
+        Returns:
+            New token string or None if the refresh failed
+        """
+        try:
+            return self.refresh_async(force=True).result(timeout=timeout)
+        except Exception as e:
+            self.logger.error(f"Forced {self.name} token refresh failed: {e}")
+            return None
+
+    def refresh_async(self, force=False):
+        """Start a background refresh unless one is already running.
+
+        Args:
+            force: Refresh even if the current token is still fresh
+
+        Returns:
+            Future resolving to the token string (or None on failure)
+        """
+        with self._lock:
+            if self._inflight is not None:
+                return self._inflight
+            if not force and self.is_valid(self.refresh_margin):
+                future = Future()
+                future.set_result(self._access_token)
+                return future
+            future = self._inflight = Future()
+
+        thread = threading.Thread(target=self._run_refresh, args=(future,),
+                                  name=f"{self.name}-token-refresh", daemon=True)
+        thread.start()
+        return future
+
+    # --- Internal helpers ---
+
+    def _run_refresh(self, future):
+        token = None
+        try:
+            self.logger.info(f"Refreshing {self.name} access token")
+            token_data = self.fetch_token()
+            if token_data and token_data.get('access_token'):
+                if self._set_token(token_data, source="refresh"):
+                    token = self._access_token
+            else:
+                self.logger.error(f"{self.name} token refresh returned no token")
+        except Exception as e:
+            self.logger.error(f"Error refreshing {self.name} token: {e}", exc_info=True)
+        finally:
+            with self._lock:
+                self._inflight = None
+            if token is None:
+                self._schedule(self.retry_delay)
+            future.set_result(token)
+            self._mark_ready(token)
+
+    def _set_token(self, token_data, source):
+        access_token = str(token_data.get('access_token', '')).strip()
+        expires_at = token_data.get('expires_at')
+        if not expires_at and token_data.get('expires_in'):
+            expires_at = time.time() + float(token_data['expires_in'])
+        expires_at = float(expires_at or 0)
+        if not access_token or expires_at <= time.time():
+            self.logger.info(f"Ignoring expired {self.name} token from {source}")
+            return False
+
+        with self._lock:
+            self._access_token = access_token
+            self._expires_at = expires_at
+            subscribers = list(self._subscribers)
+
+        self.logger.info(f"{self.name} token from {source} valid until "
+                         f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(expires_at))}")
+        for callback in subscribers:
+            self._notify(callback, access_token)
+        self._schedule(max(expires_at - self.refresh_margin - time.time(), self.retry_delay))
+        self._mark_ready(access_token)
+        return True
+
+    def _mark_ready(self, token):
+        # Resolve outside the lock: done-callbacks run synchronously here
+        with self._lock:
+            if self._ready_marked:
+                return
+            self._ready_marked = True
+        self.ready.set_result(token)
+
+    def _schedule(self, delay):
+        if self._stopped:
+            return
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+            self._timer = threading.Timer(delay, lambda: self.refresh_async(force=True))
+            self._timer.daemon = True
+            self._timer.name = f"{self.name}-token-timer"
+            self._timer.start()
+        self.logger.debug(f"Next {self.name} token refresh in {delay:.0f}s")
+
+    def _notify(self, callback, token):
+        try:
+            callback(token)
+        except Exception as e:
+            self.logger.error(f"Token subscriber {callback!r} failed: {e}", exc_info=True)
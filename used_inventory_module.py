@@ -4,7 +4,8 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QTableWidget, QTableWidgetItem, QLineEdit,
                              QPushButton, QMessageBox, QAbstractItemView,
                              QHeaderView, QApplication)
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, pyqtSlot
+from utils.instrumentation import timed
 try:
     # Import from modules package
     from modules.sharepoint_manager import SharePointExcelManager
@@ -109,6 +110,8 @@ class UsedInventoryModule(QWidget):
         self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
 
 
+    @pyqtSlot()  # Explicit signature: the timing wrapper must not receive clicked's argument
+    @timed("table.used_inventory")
     def load_inventory_data(self):
         """Loads data from the 'Used AMS' sheet via SharePointManager."""
         if not self.sharepoint_manager: